@@ -1,8 +1,10 @@
+import hmac
 from fastapi import Depends, HTTPException, status, Header
 from sqlmodel import Session, select
 from typing import Optional
 from app.core.database import get_session
 from app.core.security import verify_api_key_format
+from app.middleware.rate_limit import enforce_plan_rate_limit
 from app.models.user import User, APIKey
 
 
@@ -56,21 +58,49 @@ async def get_current_user(
             detail="User account is inactive"
         )
 
-    # Update last used timestamp
+    # Update last used timestamp (without expiring the user just loaded,
+    # which would cost a second SELECT in the endpoint)
     from datetime import datetime
     db_api_key.last_used_at = datetime.utcnow()
     session.add(db_api_key)
-    session.commit()
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = True
+
+    # Per-plan request limits (429 with Retry-After when exceeded)
+    enforce_plan_rate_limit(api_key, user.plan.value)
 
     return user
 
 
-def check_quota(user: User) -> bool:
+async def require_profiling_admin(x_profile_token: Optional[str] = Header(None)):
+    """
+    Dependency for the request-profiling admin endpoints (X-Profile-Token
+    must equal PROFILING_ADMIN_TOKEN)
+    """
+    from app.core.config import settings
+
+    token = settings.PROFILING_ADMIN_TOKEN
+    if not token or not hmac.compare_digest((x_profile_token or "").encode(), token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Request profiling admin token required"
+        )
+
+
+def check_quota(user: User, reservation_id: Optional[str] = None) -> bool:
     """
     Check if user has available quota
     Raises HTTPException if quota exceeded
+
+    With a reservation_id (the contract id), one file is also reserved
+    atomically against the plan (app.services.quota); processing commits or
+    releases it when it ends.
     """
     from app.core.config import settings
+    from app.services.quota import quota_reservations
 
     plan_config = settings.PLANS.get(user.plan.value)
     if not plan_config:
@@ -79,15 +109,24 @@ def check_quota(user: User) -> bool:
             detail="Invalid plan configuration"
         )
 
+    if reservation_id is not None:
+        exceeded = quota_reservations.reserve(user, reservation_id, plan_config)
+    elif user.files_used_current_period >= plan_config["files_per_month"]:
+        exceeded = "files"
+    elif user.pages_used_current_period >= plan_config["pages_per_month"]:
+        exceeded = "pages"
+    else:
+        exceeded = None
+
     # Check file quota
-    if user.files_used_current_period >= plan_config["files_per_month"]:
+    if exceeded == "files":
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"File quota exceeded. Limit: {plan_config['files_per_month']} files/month. Upgrade your plan."
         )
 
     # Check page quota
-    if user.pages_used_current_period >= plan_config["pages_per_month"]:
+    if exceeded == "pages":
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Page quota exceeded. Limit: {plan_config['pages_per_month']} pages/month. Upgrade your plan."
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, migrate, migrate_enum, debug, contracts, users, billing, comparisons, clauses, compliance, research, drafting, analytics, citations, intake, conveyancing, instant_analysis, timeline, universal_ask, exports, search, settings
+from app.api.v1 import auth, migrate, migrate_enum, debug, contracts, users, billing, comparisons, clauses, compliance, research, drafting, analytics, citations, intake, conveyancing, instant_analysis, timeline, universal_ask, exports, search, settings, sse
 
 api_router = APIRouter()
 
@@ -25,3 +25,4 @@ api_router.include_router(universal_ask.router)
 api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
 api_router.include_router(search.router)
 api_router.include_router(settings.router)
+api_router.include_router(sse.router)
@@ -4,18 +4,21 @@ Analytics API Endpoints
 Dashboard metrics and analytics for admin users.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
-from app.core.database import get_session
-from app.api.dependencies import get_current_user
+from app.core.database import get_read_session, replica_router
+from app.core.config import settings
+from app.core.executors import executor_stats
+from app.core.profiling import slow_requests
+from app.api.dependencies import get_current_user, require_profiling_admin
 from app.models.user import User
 from app.services.analytics_service import AnalyticsService
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-def get_analytics_service(db: Session = Depends(get_session)) -> AnalyticsService:
+def get_analytics_service(db: Session = Depends(get_read_session)) -> AnalyticsService:
     """Dependency to get analytics service"""
     return AnalyticsService(db=db)
 
@@ -82,3 +85,48 @@ async def get_compliance_stats(
 ):
     """Get compliance checking statistics"""
     return service.get_compliance_stats()
+
+
+@router.get("/database-pools", dependencies=[Depends(require_profiling_admin)])
+async def get_database_pools(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get connection pool usage and replica lag per database engine
+    (requires X-Profile-Token)
+    """
+    return {"engines": replica_router.pool_metrics()}
+
+
+@router.get("/executors")
+async def get_executors(
+    current_user: User = Depends(get_current_user)
+):
+    """Get usage of the worker pools that run parsing and blocking calls"""
+    return {"executors": executor_stats()}
+
+
+@router.get("/slow-requests", dependencies=[Depends(require_profiling_admin)])
+async def get_slow_requests(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the requests captured by this process (slow or explicitly profiled),
+    newest first
+    """
+    return {
+        "threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+        "requests": slow_requests.summaries()
+    }
+
+
+@router.get("/slow-requests/{capture_id}", dependencies=[Depends(require_profiling_admin)])
+async def get_slow_request(
+    capture_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a captured request with its query log, LLM calls and sampled stacks"""
+    capture = slow_requests.get(capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail="Capture not found")
+    return capture
@@ -5,6 +5,7 @@ from datetime import timedelta
 from typing import Annotated
 
 from app.core.database import get_session
+from app.core.executors import run_blocking
 from app.core.security import verify_password, create_access_token
 from app.models.user import User
 from app.schemas.auth import Token, GoogleAuthRequest
@@ -31,7 +32,7 @@ async def login_for_access_token(
     user = session.exec(statement).first()
 
     # Verify credentials
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await run_blocking(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -77,7 +78,7 @@ async def login(
     user = session.exec(statement).first()
 
     # Verify credentials
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await run_blocking(verify_password, password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -20,6 +20,7 @@ from app.schemas.citation_checker import (
 )
 from app.services.citation_checker_service import CitationCheckerService
 from app.core.config import settings
+from app.core.executors import run_blocking
 
 router = APIRouter(prefix="/citations", tags=["citations"])
 
@@ -42,7 +43,9 @@ async def check_citations(
     and identifies format errors, missing elements, and broken citations.
     """
     try:
-        check = service.check_citations(
+        # Regex extraction and OpenAI validation are blocking; keep them off the event loop
+        check = await run_blocking(
+            service.check_citations,
             user_id=current_user.id,
             document_text=check_data.document_text,
             document_name=check_data.document_name,
@@ -64,6 +67,8 @@ async def check_citations(
             created_at=check.created_at
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Citation check failed: {str(e)}")
 
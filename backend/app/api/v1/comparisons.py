@@ -1,9 +1,10 @@
 import secrets
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlmodel import Session, select
 from typing import List
 
 from app.core.database import get_session
+from app.core.response_cache import response_cache
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.contract import Contract, ContractStatus, ContractComparison, ContractAnalysis
@@ -86,6 +87,7 @@ async def create_comparison(
 @router.get("/{comparison_id}", response_model=ContractComparisonResponse)
 async def get_comparison(
     comparison_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -105,11 +107,11 @@ async def get_comparison(
             detail="Comparison not found"
         )
 
-    # Get contract references
-    original_contract = session.get(Contract, comparison.original_contract_id)
-    revised_contract = session.get(Contract, comparison.revised_contract_id)
-
     if comparison.status == ContractStatus.PROCESSING:
+        # Get contract references
+        original_contract = session.get(Contract, comparison.original_contract_id)
+        revised_contract = session.get(Contract, comparison.revised_contract_id)
+
         return ContractComparisonResponse(
             comparison_id=comparison.comparison_id,
             status=comparison.status,
@@ -134,24 +136,35 @@ async def get_comparison(
             detail=comparison.error_message or "Comparison failed"
         )
 
-    # Return completed comparison
-    return ContractComparisonResponse(
-        comparison_id=comparison.comparison_id,
-        status=comparison.status,
-        original_contract_id=original_contract.contract_id,
-        revised_contract_id=revised_contract.contract_id,
-        summary=comparison.summary,
-        additions=[TextChange(**change) for change in comparison.additions],
-        deletions=[TextChange(**change) for change in comparison.deletions],
-        modifications=[TextChange(**change) for change in comparison.modifications],
-        clause_changes=[ClauseChange(**change) for change in comparison.clause_changes],
-        risk_delta=comparison.risk_delta,
-        substantive_changes=[TextChange(**change) for change in comparison.substantive_changes],
-        cosmetic_changes=[TextChange(**change) for change in comparison.cosmetic_changes],
-        processing_time_seconds=comparison.processing_time_seconds,
-        created_at=comparison.created_at,
-        processed_at=comparison.processed_at
-    )
+    def build_response() -> ContractComparisonResponse:
+        # Get contract references
+        original_contract = session.get(Contract, comparison.original_contract_id)
+        revised_contract = session.get(Contract, comparison.revised_contract_id)
+
+        # Return completed comparison
+        return ContractComparisonResponse(
+            comparison_id=comparison.comparison_id,
+            status=comparison.status,
+            original_contract_id=original_contract.contract_id,
+            revised_contract_id=revised_contract.contract_id,
+            summary=comparison.summary,
+            additions=[TextChange(**change) for change in comparison.additions],
+            deletions=[TextChange(**change) for change in comparison.deletions],
+            modifications=[TextChange(**change) for change in comparison.modifications],
+            clause_changes=[ClauseChange(**change) for change in comparison.clause_changes],
+            risk_delta=comparison.risk_delta,
+            substantive_changes=[TextChange(**change) for change in comparison.substantive_changes],
+            cosmetic_changes=[TextChange(**change) for change in comparison.cosmetic_changes],
+            processing_time_seconds=comparison.processing_time_seconds,
+            created_at=comparison.created_at,
+            processed_at=comparison.processed_at
+        )
+
+    if comparison.status != ContractStatus.COMPLETED:
+        return build_response()
+
+    # A completed comparison doesn't change: answer from the client's ETag or the response cache
+    return response_cache.respond(request, "comparison", comparison.id, comparison.processed_at, build_response)
 
 
 @router.get("/", response_model=List[ContractComparisonResponse])
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlmodel import Session, select
 from typing import List
 
 from app.core.database import get_session
+from app.core.response_cache import response_cache
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.compliance import Playbook, ComplianceRule, ComplianceCheck, ComplianceException
@@ -325,6 +326,7 @@ async def create_compliance_check(
 @router.get("/checks/{check_id}", response_model=ComplianceResultResponse)
 async def get_compliance_check(
     check_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -344,34 +346,41 @@ async def get_compliance_check(
             detail="Compliance check not found"
         )
 
-    # Get contract and playbook IDs
-    from app.models.contract import Contract
-    contract = session.get(Contract, check.contract_id)
-    playbook = session.get(Playbook, check.playbook_id)
-
-    violations = [ViolationDetail(**v) for v in check.violations] if check.violations else []
-    warnings = [ViolationDetail(**w) for w in check.warnings] if check.warnings else []
-
-    return ComplianceResultResponse(
-        check_id=check.check_id,
-        status=check.status,
-        contract_id=contract.contract_id if contract else "",
-        playbook_id=playbook.playbook_id if playbook else "",
-        overall_status=check.overall_status,
-        compliance_score=check.compliance_score,
-        rules_checked=check.rules_checked,
-        rules_passed=check.rules_passed,
-        rules_failed=check.rules_failed,
-        rules_warning=check.rules_warning,
-        violations=violations,
-        passed_rules=check.passed_rules or [],
-        warnings=warnings,
-        executive_summary=check.executive_summary,
-        recommendations=check.recommendations or [],
-        processing_time_seconds=check.processing_time_seconds,
-        created_at=check.created_at,
-        processed_at=check.processed_at
-    )
+    def build_response() -> ComplianceResultResponse:
+        # Get contract and playbook IDs
+        from app.models.contract import Contract
+        contract = session.get(Contract, check.contract_id)
+        playbook = session.get(Playbook, check.playbook_id)
+
+        violations = [ViolationDetail(**v) for v in check.violations] if check.violations else []
+        warnings = [ViolationDetail(**w) for w in check.warnings] if check.warnings else []
+
+        return ComplianceResultResponse(
+            check_id=check.check_id,
+            status=check.status,
+            contract_id=contract.contract_id if contract else "",
+            playbook_id=playbook.playbook_id if playbook else "",
+            overall_status=check.overall_status,
+            compliance_score=check.compliance_score,
+            rules_checked=check.rules_checked,
+            rules_passed=check.rules_passed,
+            rules_failed=check.rules_failed,
+            rules_warning=check.rules_warning,
+            violations=violations,
+            passed_rules=check.passed_rules or [],
+            warnings=warnings,
+            executive_summary=check.executive_summary,
+            recommendations=check.recommendations or [],
+            processing_time_seconds=check.processing_time_seconds,
+            created_at=check.created_at,
+            processed_at=check.processed_at
+        )
+
+    if check.processed_at is None:
+        return build_response()
+
+    # A finished check doesn't change: answer from the client's ETag or the response cache
+    return response_cache.respond(request, "compliance_check", check.id, check.processed_at, build_response)
 
 
 # Exception Endpoints
@@ -1,10 +1,12 @@
 import secrets
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Request
+from sqlalchemy.orm import defer
 from sqlmodel import Session, select
 from typing import List
 from datetime import datetime
 
 from app.core.database import get_session
+from app.core.response_cache import response_cache
 from app.api.dependencies import get_current_user, check_quota
 from app.models.user import User
 from app.models.contract import Contract, ContractStatus, ContractAnalysis
@@ -15,7 +17,8 @@ from app.schemas.contract import (
     KeyTerms,
     DetectedClause
 )
-from app.services.storage import S3Storage
+from app.services.quota import quota_reservations
+from app.services.storage import get_storage
 from app.services.virus_scanner import get_virus_scanner
 from app.workers.tasks import process_contract_task
 from app.middleware.rate_limit import limiter
@@ -35,9 +38,25 @@ async def upload_contract(
     Upload a contract for analysis
     Rate limit: 10 uploads per minute
     """
-    # Check quota
-    check_quota(current_user)
+    # Generate contract ID
+    contract_id = f"ctr_{secrets.token_urlsafe(16)}"
+
+    # Check quota, reserving one file until processing commits or releases it
+    check_quota(current_user, reservation_id=contract_id)
+    try:
+        return await _accept_upload(contract_id, file, current_user, session)
+    except Exception:
+        quota_reservations.release(current_user, contract_id)
+        raise
 
+
+async def _accept_upload(
+    contract_id: str,
+    file: UploadFile,
+    current_user: User,
+    session: Session
+) -> ContractUploadResponse:
+    """Validate, scan and store an upload, then queue it for processing"""
     # Validate file type
     allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
     if file.content_type not in allowed_types:
@@ -70,12 +89,9 @@ async def upload_contract(
     # Determine file type
     file_type = "pdf" if file.content_type == "application/pdf" else "docx"
 
-    # Generate contract ID
-    contract_id = f"ctr_{secrets.token_urlsafe(16)}"
-
     # Upload to S3
     s3_key = f"contracts/{current_user.id}/{contract_id}.{file_type}"
-    storage = S3Storage()
+    storage = get_storage()
 
     try:
         storage.upload_file(file_content, s3_key, file.content_type)
@@ -114,6 +130,7 @@ async def upload_contract(
 @router.get("/{contract_id}", response_model=ContractAnalysisResponse)
 async def get_contract_analysis(
     contract_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -147,35 +164,44 @@ async def get_contract_analysis(
             detail=f"Contract is still {contract.status.value}. Please poll again."
         )
 
-    # Get analysis
-    analysis = session.exec(
-        select(ContractAnalysis).where(ContractAnalysis.contract_id == contract.id)
-    ).first()
+    def build_response() -> ContractAnalysisResponse:
+        # Get analysis
+        # Legacy inline text isn't part of the response; don't load it
+        analysis = session.exec(
+            select(ContractAnalysis)
+            .where(ContractAnalysis.contract_id == contract.id)
+            .options(defer(ContractAnalysis.extracted_text))
+        ).first()
 
-    if not analysis:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Analysis not found"
+        if not analysis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis not found"
+            )
+
+        # Build response
+        return ContractAnalysisResponse(
+            contract_id=contract.contract_id,
+            status=contract.status,
+            executive_summary=analysis.executive_summary,
+            key_terms=KeyTerms(
+                parties=analysis.parties,
+                effective_date=analysis.effective_date,
+                term=analysis.term_duration,
+                payment=analysis.payment_terms
+            ),
+            detected_clauses=[DetectedClause(**clause) for clause in analysis.detected_clauses],
+            missing_clauses=analysis.missing_clauses,
+            risk_score=analysis.risk_score,
+            overall_risk_level=analysis.overall_risk_level,
+            pages_processed=contract.page_count or 0,
+            processing_time_seconds=analysis.processing_time_seconds,
+            created_at=contract.created_at
         )
 
-    # Build response
-    return ContractAnalysisResponse(
-        contract_id=contract.contract_id,
-        status=contract.status,
-        executive_summary=analysis.executive_summary,
-        key_terms=KeyTerms(
-            parties=analysis.parties,
-            effective_date=analysis.effective_date,
-            term=analysis.term_duration,
-            payment=analysis.payment_terms
-        ),
-        detected_clauses=[DetectedClause(**clause) for clause in analysis.detected_clauses],
-        missing_clauses=analysis.missing_clauses,
-        risk_score=analysis.risk_score,
-        overall_risk_level=analysis.overall_risk_level,
-        pages_processed=contract.page_count or 0,
-        processing_time_seconds=analysis.processing_time_seconds,
-        created_at=contract.created_at
+    # A completed analysis doesn't change: answer from the client's ETag or the response cache
+    return response_cache.respond(
+        request, "contract_analysis", contract.id, contract.processed_at or contract.updated_at, build_response
     )
 
 
@@ -241,7 +267,7 @@ async def get_clause_suggestions(
         analysis = session.exec(
             select(ContractAnalysis).where(
                 ContractAnalysis.contract_id == contract.id
-            )
+            ).options(defer(ContractAnalysis.extracted_text))
         ).first()
 
         if analysis:
@@ -250,3 +276,47 @@ async def get_clause_suggestions(
             )
 
     return {"suggestions": suggestions}
+
+
+@router.get("/{contract_id}/sections")
+async def get_contract_sections(
+    contract_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get the section/clause tree of an analyzed contract
+    (numbering, title, character offsets and page of each section)
+    """
+    from app.services.section_index import ContractSectionService
+    from app.services.text_store import ContractTextStore
+
+    statement = select(Contract).where(
+        Contract.contract_id == contract_id,
+        Contract.user_id == current_user.id
+    )
+    contract = session.exec(statement).first()
+
+    if not contract:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contract not found"
+        )
+
+    analysis = session.exec(
+        select(ContractAnalysis).where(ContractAnalysis.contract_id == contract.id)
+    ).first()
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+
+    sections = ContractSectionService(session).get(contract.id, ContractTextStore(session).text_for(analysis))
+
+    return {
+        "contract_id": contract.contract_id,
+        "section_count": len(sections),
+        "sections": sections.tree()
+    }
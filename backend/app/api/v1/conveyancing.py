@@ -11,7 +11,7 @@ from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.conveyancing import (
@@ -34,6 +34,7 @@ from app.schemas.conveyancing import (
 from app.services.conveyancing_service import (
     ConveyancingWorkflowService, StampDutyCalculator, DueDiligenceService
 )
+from app.services.statistics_service import StatisticsService, snapshot_cache
 
 router = APIRouter(prefix="/conveyancing", tags=["conveyancing"])
 
@@ -112,6 +113,7 @@ async def create_transaction(
 
     session.commit()
     session.refresh(new_transaction)
+    snapshot_cache.invalidate(current_user.id)
 
     return new_transaction
 
@@ -202,6 +204,7 @@ async def update_transaction(
     session.add(transaction)
     session.commit()
     session.refresh(transaction)
+    snapshot_cache.invalidate(current_user.id)
 
     return transaction
 
@@ -254,6 +257,7 @@ async def update_workflow_status(
 
     session.add(transaction)
     session.commit()
+    snapshot_cache.invalidate(current_user.id)
 
     # Get workflow progress
     stages = workflow_service.get_workflow_stages(transaction.transaction_type)
@@ -415,6 +419,7 @@ async def create_search(
     session.add(new_search)
     session.commit()
     session.refresh(new_search)
+    snapshot_cache.invalidate(current_user.id)
 
     return new_search
 
@@ -463,6 +468,10 @@ async def update_search(
     session.add(search)
     session.commit()
     session.refresh(search)
+    # Statistics are kept per owner of the transaction
+    transaction = session.get(ConveyancingTransaction, search.transaction_id)
+    if transaction:
+        snapshot_cache.invalidate(transaction.user_id)
 
     return search
 
@@ -601,64 +610,15 @@ async def calculate_stamp_duty(
 
 @router.get("/statistics/summary", response_model=ConveyancingStatistics)
 async def get_conveyancing_statistics(
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """
     Get conveyancing statistics
-    """
-    transactions = session.exec(
-        select(ConveyancingTransaction).where(ConveyancingTransaction.user_id == current_user.id)
-    ).all()
 
-    total = len(transactions)
-    active = len([t for t in transactions if t.is_active and t.status not in ["completion", "cancelled"]])
-    completed = len([t for t in transactions if t.status == "completion"])
-    cancelled = len([t for t in transactions if t.status == "cancelled"])
-
-    # By transaction type
-    by_type = {}
-    by_status = {}
-    by_stage = {}
-    total_value = Decimal("0.00")
-
-    for t in transactions:
-        by_type[t.transaction_type] = by_type.get(t.transaction_type, 0) + 1
-        by_status[t.status] = by_status.get(t.status, 0) + 1
-        by_stage[t.current_stage] = by_stage.get(t.current_stage, 0) + 1
-        if t.purchase_price:
-            total_value += t.purchase_price
-
-    # Calculate averages
-    completed_trans = [t for t in transactions if t.completed_at]
-    if completed_trans:
-        durations = [(t.completed_at - t.instruction_date).days for t in completed_trans]
-        avg_days = sum(durations) / len(durations)
-    else:
-        avg_days = 0.0
-
-    # Search and document stats
-    all_searches = session.exec(select(OfficialSearch)).all()
-    searches_pending = len([s for s in all_searches if s.status in ["pending", "applied"]])
-    searches_with_issues = len([s for s in all_searches if s.has_issues])
-
-    all_docs = session.exec(select(ConveyancingDocument)).all()
-    docs_pending = len([d for d in all_docs if d.status in ["draft", "review"]])
-
-    return ConveyancingStatistics(
-        total_transactions=total,
-        active_transactions=active,
-        completed_transactions=completed,
-        cancelled_transactions=cancelled,
-        by_transaction_type=by_type,
-        by_status=by_status,
-        by_stage=by_stage,
-        total_property_value=total_value,
-        average_transaction_days=avg_days,
-        average_completion_rate=100.0 * completed / total if total > 0 else 0.0,
-        searches_pending=searches_pending,
-        searches_with_issues=searches_with_issues,
-        documents_pending_execution=docs_pending,
-        stamp_duty_collected=Decimal("0.00"),  # Would sum from calculations
-        legal_fees_collected=Decimal("0.00")  # Would sum from transactions
+    Served from a short-lived snapshot unless refresh=true.
+    """
+    return StatisticsService(session).get_conveyancing_statistics(
+        current_user.id, use_cache=not refresh
     )
@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
 from app.core.database import get_session
+from app.core.executors import run_blocking
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.drafting import (
@@ -152,7 +153,9 @@ async def generate_contract(
     - Analyze risks
     """
     try:
-        contract = service.generate_contract(
+        # Template filling and the OpenAI enhancement are blocking; keep them off the event loop
+        contract = await run_blocking(
+            service.generate_contract,
             user_id=current_user.id,
             template_id=request.template_id,
             name=request.name,
@@ -179,6 +182,8 @@ async def generate_contract(
             created_at=contract.created_at
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
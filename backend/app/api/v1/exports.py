@@ -7,12 +7,12 @@ from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 from typing import List
 
-from app.core.database import get_session
+from app.core.database import get_read_session
 from app.api.dependencies import get_current_user
-from app.models.contract import Contract
+from app.models.contract import Contract, ContractAnalysis
 from app.models.user import User
 from app.models.clause import Clause
-from app.models.compliance import ComplianceCheck
+from app.models.compliance import ComplianceCheck, Playbook
 from app.services.export_service import ExportService
 
 router = APIRouter()
@@ -21,34 +21,50 @@ router = APIRouter()
 @router.get("/contracts/{contract_id}/pdf")
 async def export_contract_pdf(
     contract_id: str,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """Export contract analysis as PDF"""
-    # Get contract
-    contract = db.get(Contract, contract_id)
+    # Get contract by its public ID
+    contract = db.exec(select(Contract).where(Contract.contract_id == contract_id)).first()
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
     if contract.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    analysis = db.exec(select(ContractAnalysis).where(ContractAnalysis.contract_id == contract.id)).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Contract analysis not available yet")
+
     # Prepare contract data
     contract_data = {
-        'contract_name': contract.file_name,
-        'risk_level': contract.risk_level,
-        'risk_score': contract.risk_score,
-        'summary': contract.summary,
-        'key_terms': contract.key_terms or [],
+        'contract_name': contract.filename,
+        'risk_level': analysis.overall_risk_level.value.title(),
+        'risk_score': round(analysis.risk_score * 10),
+        'summary': " ".join(analysis.executive_summary or []) or 'No summary available.',
+        'key_terms': [
+            f"{label}: {value}"
+            for label, value in [
+                ("Parties", ", ".join(analysis.parties or [])),
+                ("Effective date", analysis.effective_date),
+                ("Term", analysis.term_duration),
+                ("Payment", analysis.payment_terms),
+            ]
+            if value
+        ],
         'clauses': [
             {
                 'type': c.get('type', 'Unknown'),
                 'text': c.get('text', ''),
                 'risk_level': c.get('risk_level', 'Low')
             }
-            for c in (contract.clauses or [])
+            for c in (analysis.detected_clauses or [])
         ],
-        'risks': contract.risks or []
+        'risks': [
+            {'severity': 'Medium', 'description': f"Missing clause: {clause.replace('_', ' ')}"}
+            for clause in (analysis.missing_clauses or [])
+        ]
     }
 
     # Generate PDF
@@ -67,24 +83,33 @@ async def export_contract_pdf(
 @router.get("/compliance/{check_id}/pdf")
 async def export_compliance_pdf(
     check_id: str,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """Export compliance check as PDF"""
-    # Get compliance check
-    check = db.get(ComplianceCheck, check_id)
+    # Get compliance check by its public ID
+    check = db.exec(select(ComplianceCheck).where(ComplianceCheck.check_id == check_id)).first()
     if not check:
         raise HTTPException(status_code=404, detail="Compliance check not found")
 
     if check.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    playbook = db.get(Playbook, check.playbook_id)
+
     # Prepare compliance data
     compliance_data = {
-        'playbook_name': check.playbook_name if hasattr(check, 'playbook_name') else 'Unknown',
-        'score': check.score,
-        'status': check.status,
-        'issues': check.issues or []
+        'playbook_name': playbook.name if playbook else 'Unknown',
+        'score': round(check.compliance_score or 0),
+        'status': check.overall_status.value,
+        'issues': [
+            {
+                'severity': v.get('severity', 'Unknown'),
+                'rule_name': v.get('rule_name', ''),
+                'description': v.get('message', '')
+            }
+            for v in (check.violations or []) + (check.warnings or [])
+        ]
     }
 
     # Generate PDF
@@ -101,7 +126,7 @@ async def export_compliance_pdf(
 
 @router.get("/clauses/docx")
 async def export_clauses_docx(
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """Export user's clauses as DOCX"""
@@ -138,7 +163,7 @@ async def export_clauses_docx(
 
 @router.get("/contracts/csv")
 async def export_contracts_csv(
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """Export contracts list as CSV"""
@@ -176,7 +201,7 @@ async def export_contracts_csv(
 
 @router.get("/analytics/csv")
 async def export_analytics_csv(
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """Export analytics data as CSV (admin only)"""
@@ -9,6 +9,7 @@ from datetime import datetime
 import time
 
 from app.api.dependencies import get_current_user, get_session
+from app.core.executors import run_blocking, run_cpu
 from app.models.user import User
 from app.services.document_processor import DocumentProcessor
 from app.services.instant_analyzer import InstantDocumentAnalyzer
@@ -79,24 +80,18 @@ async def analyze_document_instant(
     - Risk flags with severity and recommendations
     - Suggested revisions to improve the document
 
-    Supports: PDF, DOCX, DOC, TXT
+    Supports: PDF, DOCX, DOC, TXT, EML
     Max size: 25MB
     Target response: <30 seconds
     """
     start_time = time.time()
 
     # Validate file type
-    allowed_types = [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/msword",
-        "text/plain"
-    ]
-
-    if file.content_type not in allowed_types:
+    file_type = DocumentProcessor.file_type_for(file.filename, file.content_type)
+    if file_type is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type: {file.content_type}. Allowed: PDF, DOCX, DOC, TXT"
+            detail=f"Unsupported file type: {file.content_type}. Allowed: PDF, DOCX, DOC, TXT, EML"
         )
 
     # Read file content
@@ -111,7 +106,7 @@ async def analyze_document_instant(
 
     # Scan for viruses
     scanner = get_virus_scanner()
-    is_clean, virus_name = scanner.scan_bytes(content, file.filename)
+    is_clean, virus_name = await run_blocking(scanner.scan_bytes, content, file.filename)
 
     if not is_clean:
         raise HTTPException(
@@ -119,12 +114,9 @@ async def analyze_document_instant(
             detail=f"File rejected: Virus detected - {virus_name}"
         )
 
-    # Determine file type
-    file_type = "pdf" if "pdf" in file.content_type else "docx" if "document" in file.content_type else "txt"
-
     try:
         # Extract text from document
-        extracted_text, page_count, word_count = DocumentProcessor.process_file(content, file_type)
+        extracted_text, page_count, word_count = await run_cpu(DocumentProcessor.process_file, content, file_type)
 
         if not extracted_text or len(extracted_text.strip()) < 100:
             raise HTTPException(
@@ -134,7 +126,7 @@ async def analyze_document_instant(
 
         # Perform instant AI analysis
         analyzer = InstantDocumentAnalyzer()
-        analysis_result = analyzer.analyze(extracted_text, file.filename)
+        analysis_result = await run_blocking(analyzer.analyze, extracted_text, file.filename)
 
         processing_time = time.time() - start_time
 
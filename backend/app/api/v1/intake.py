@@ -11,7 +11,7 @@ from sqlmodel import Session, select
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.intake import (
@@ -29,6 +29,7 @@ from app.schemas.intake import (
     IntakeStatistics
 )
 from app.services.intake_service import IntakeTriageService
+from app.services.statistics_service import StatisticsService, snapshot_cache
 
 router = APIRouter(prefix="/intake", tags=["intake"])
 
@@ -133,6 +134,7 @@ async def submit_intake(
         session.commit()
         session.refresh(new_intake)
 
+    snapshot_cache.invalidate(current_user.id)
     return new_intake
 
 
@@ -241,6 +243,7 @@ async def update_intake(
     session.add(intake)
     session.commit()
     session.refresh(intake)
+    snapshot_cache.invalidate(current_user.id)
 
     return intake
 
@@ -293,6 +296,7 @@ async def assign_intake(
     session.add(intake)
     session.commit()
     session.refresh(new_assignment)
+    snapshot_cache.invalidate(current_user.id)
 
     return new_assignment
 
@@ -337,59 +341,17 @@ async def add_intake_note(
 
 @router.get("/statistics/summary", response_model=IntakeStatistics)
 async def get_intake_statistics(
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """
     Get intake statistics for user's firm
-    """
-    intakes = session.exec(
-        select(ClientIntake).where(ClientIntake.user_id == current_user.id)
-    ).all()
 
-    # Calculate statistics
-    total = len(intakes)
-    pending = len([i for i in intakes if i.status == "pending"])
-    assigned = len([i for i in intakes if i.status == "assigned"])
-    completed = len([i for i in intakes if i.status == "completed"])
-    declined = len([i for i in intakes if i.status == "declined"])
-
-    # By matter type
-    by_matter_type = {}
-    by_practice_area = {}
-    by_urgency = {}
-    by_complexity = {}
-
-    for intake in intakes:
-        by_matter_type[intake.matter_type] = by_matter_type.get(intake.matter_type, 0) + 1
-        by_practice_area[intake.practice_area] = by_practice_area.get(intake.practice_area, 0) + 1
-        by_urgency[intake.urgency] = by_urgency.get(intake.urgency, 0) + 1
-        by_complexity[intake.complexity] = by_complexity.get(intake.complexity, 0) + 1
-
-    # Processing times
-    processing_times = [i.processing_time_seconds for i in intakes if i.processing_time_seconds]
-    avg_processing = sum(processing_times) / len(processing_times) if processing_times else 0
-
-    # Conflict checks
-    conflict_required = len([i for i in intakes if i.conflict_check_required])
-    conflict_passed = len([i for i in intakes if i.conflict_check_passed == True])
-    conflict_failed = len([i for i in intakes if i.conflict_check_passed == False])
-
-    return IntakeStatistics(
-        total_intakes=total,
-        pending_intakes=pending,
-        assigned_intakes=assigned,
-        completed_intakes=completed,
-        declined_intakes=declined,
-        by_matter_type=by_matter_type,
-        by_practice_area=by_practice_area,
-        by_urgency=by_urgency,
-        by_complexity=by_complexity,
-        average_processing_time_seconds=avg_processing,
-        average_response_time_hours=0.0,  # Would calculate from assignment records
-        conflict_checks_required=conflict_required,
-        conflict_checks_passed=conflict_passed,
-        conflict_checks_failed=conflict_failed
+    Served from a short-lived snapshot unless refresh=true.
+    """
+    return StatisticsService(session).get_intake_statistics(
+        current_user.id, use_cache=not refresh
     )
 
 
@@ -11,6 +11,7 @@ from sqlmodel import Session
 from pydantic import BaseModel
 
 from app.core.database import get_session
+from app.core.executors import run_blocking
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.research import (
@@ -137,8 +138,9 @@ async def execute_research(
     real legal databases like Westlaw, LexisNexis, or public APIs.
     """
     try:
-        # Perform research
-        results = service.perform_research(
+        # Perform research (OpenAI round trip; keep it off the event loop)
+        results = await run_blocking(
+            service.perform_research,
             query_id=query_id,
             max_results=max_results
         )
@@ -180,6 +182,8 @@ async def execute_research(
             processing_time_seconds=query.processing_time_seconds
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -461,7 +465,8 @@ async def chat_research(
     Supported jurisdictions: AU, UK, US, CA
     """
     try:
-        result = research_chat_instance.research(
+        result = await run_blocking(
+            research_chat_instance.research,
             query=request.query,
             conversation_id=request.conversation_id,
             jurisdiction=request.jurisdiction,
@@ -506,6 +511,8 @@ async def chat_research(
             )
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Research failed: {str(e)}")
 
@@ -9,6 +9,7 @@ from datetime import datetime
 from pydantic import BaseModel, EmailStr
 
 from app.core.database import get_session
+from app.core.executors import run_blocking
 from app.api.dependencies import get_current_user
 from app.models.user import User, APIKey
 from app.core.security import (
@@ -146,7 +147,7 @@ async def change_password(
     Change user password
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await run_blocking(verify_password, password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -160,7 +161,7 @@ async def change_password(
         )
 
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await run_blocking(get_password_hash, password_data.new_password)
     current_user.updated_at = datetime.utcnow()
     db.add(current_user)
     db.commit()
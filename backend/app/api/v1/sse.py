@@ -30,11 +30,11 @@ async def event_stream(contract_id: str, user_id: int, db: Session) -> AsyncIter
 
     try:
         while timeout_counter < max_timeout:
-            # Fetch current contract status
+            # Fetch current contract status (populate_existing: the worker updates it in another session)
             statement = select(Contract).where(
                 Contract.contract_id == contract_id,
                 Contract.user_id == user_id
-            )
+            ).execution_options(populate_existing=True)
             contract = db.exec(statement).first()
 
             if not contract:
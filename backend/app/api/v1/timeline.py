@@ -3,23 +3,35 @@ Matter Timeline & Fact Chronology Builder API
 Upload documents and build a searchable, clickable timeline with hot docs.
 """
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from sqlmodel import Session, select
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from datetime import date, datetime
+import asyncio
+import json
 import time
 import uuid
 
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.executors import ExecutorSaturated, run_blocking, run_cpu
+from app.core.metrics import record_cache
 from app.api.dependencies import get_current_user
 from app.models.user import User
+from app.models.timeline import TimelineMatter, MatterDocument, TimelineBatch, TimelineBatchItem
 from app.services.document_processor import DocumentProcessor
-from app.services.timeline_builder import TimelineBuilder
+from app.services.storage import get_storage
+from app.services.timeline_batch import batch_progress, delete_spooled_files, extract_document_text
+from app.services.timeline_builder import TimelineBuilder, SUMMARY_UNAVAILABLE
+from app.services.timeline_service import TimelineService, document_to_dict, event_to_dict
 from app.services.virus_scanner import get_virus_scanner
+from app.workers.tasks import process_timeline_batch_task
 
 router = APIRouter(prefix="/timeline", tags=["timeline"])
 
-# In-memory storage for demo (replace with database in production)
-matters_store: Dict[str, Dict] = {}
-documents_store: Dict[str, Dict] = {}
+BATCH_STREAM_TIMEOUT_SECONDS = 1800
+SUMMARY_DATES = 30  # Timeline dates the matter summary is generated from
 
 
 class TimelineEvent(BaseModel):
@@ -103,78 +115,122 @@ class DocumentUploadResponse(BaseModel):
     processing_time_seconds: float
 
 
+def _get_owned_matter(service: TimelineService, matter_id: str, user: User) -> TimelineMatter:
+    """Load a matter, raising 404/403 if missing or owned by someone else"""
+    matter = service.get_matter(matter_id)
+    if not matter:
+        raise HTTPException(status_code=404, detail="Matter not found")
+    if matter.user_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return matter
+
+
+def _matter_info(matter: TimelineMatter) -> MatterInfo:
+    return MatterInfo(
+        matter_id=matter.matter_id,
+        name=matter.name,
+        description=matter.description,
+        created_at=matter.created_at,
+        document_count=matter.document_count,
+        event_count=matter.event_count,
+        hot_docs_count=matter.hot_docs_count
+    )
+
+
+def _document_info(document: MatterDocument) -> DocumentInfo:
+    return DocumentInfo(
+        doc_id=document.doc_id,
+        filename=document.filename,
+        doc_type=document.doc_type,
+        doc_date=document.doc_date,
+        importance=document.importance,
+        is_hot_doc=document.is_hot_doc,
+        hot_doc_reason=document.hot_doc_reason,
+        summary=document.summary,
+        event_count=document.event_count,
+        uploaded_at=document.uploaded_at
+    )
+
+
+async def _validate_upload(file: UploadFile, content: bytes) -> Tuple[str, str]:
+    """Check type, size and virus scan of an uploaded file; returns (filename, file_type)"""
+    content_type = file.content_type or "application/octet-stream"
+    filename = file.filename or "document"
+    file_type = DocumentProcessor.file_type_for(filename, content_type)
+    if file_type is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: PDF, DOCX, DOC, TXT, EML"
+        )
+
+    if len(content) > 25 * 1024 * 1024:
+        raise HTTPException(status_code=400, detail="File too large. Maximum size is 25MB.")
+
+    # Scan for viruses
+    scanner = get_virus_scanner()
+    is_clean, virus_name = await run_blocking(scanner.scan_bytes, content, filename)
+
+    if not is_clean:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File rejected: Virus detected - {virus_name}"
+        )
+
+    return filename, file_type
+
+
+def _get_owned_batch(session: Session, batch_id: str, user: User) -> TimelineBatch:
+    batch = session.exec(select(TimelineBatch).where(TimelineBatch.batch_id == batch_id)).first()
+    if not batch or batch.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+def _batch_items(session: Session, batch_id: str) -> List[TimelineBatchItem]:
+    return session.exec(
+        select(TimelineBatchItem)
+        .where(TimelineBatchItem.batch_id == batch_id)
+        .order_by(TimelineBatchItem.position)
+    ).all()
+
+
 @router.post("/matters", response_model=MatterInfo)
 async def create_matter(
     request: MatterCreateRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Create a new matter/case for timeline building"""
-    matter_id = f"mat_{uuid.uuid4().hex[:12]}"
-
-    matter = {
-        "matter_id": matter_id,
-        "name": request.name,
-        "description": request.description,
-        "user_id": current_user.id,
-        "created_at": datetime.utcnow(),
-        "documents": [],
-        "timeline_data": None
-    }
-
-    matters_store[matter_id] = matter
-
-    return MatterInfo(
-        matter_id=matter_id,
+    matter = TimelineService(session).create_matter(
+        user_id=current_user.id,
         name=request.name,
-        description=request.description,
-        created_at=matter["created_at"],
-        document_count=0,
-        event_count=0,
-        hot_docs_count=0
+        description=request.description
     )
+    return _matter_info(matter)
 
 
 @router.get("/matters", response_model=List[MatterInfo])
 async def list_matters(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """List all matters for the current user"""
-    user_matters = [m for m in matters_store.values() if m.get("user_id") == current_user.id]
-
-    return [
-        MatterInfo(
-            matter_id=m["matter_id"],
-            name=m["name"],
-            description=m.get("description"),
-            created_at=m["created_at"],
-            document_count=len(m.get("documents", [])),
-            event_count=sum(d.get("event_count", 0) for d in m.get("documents", [])),
-            hot_docs_count=sum(1 for d in m.get("documents", []) if d.get("is_hot_doc"))
-        )
-        for m in sorted(user_matters, key=lambda x: x["created_at"], reverse=True)
-    ]
+    return [_matter_info(m) for m in TimelineService(session).list_matters(current_user.id)]
 
 
 @router.delete("/matters/{matter_id}")
 async def delete_matter(
     matter_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Delete a matter and all its documents"""
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
-
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Remove associated documents
-    for doc in matter.get("documents", []):
-        doc_id = doc.get("doc_id")
-        if doc_id in documents_store:
-            del documents_store[doc_id]
+    service = TimelineService(session)
+    matter = _get_owned_matter(service, matter_id, current_user)
 
-    del matters_store[matter_id]
+    spool_keys = service.delete_matter(matter)
+    if spool_keys:
+        await run_blocking(delete_spooled_files, get_storage(), spool_keys)
     return {"status": "deleted", "matter_id": matter_id}
 
 
@@ -182,64 +238,21 @@ async def delete_matter(
 async def upload_document(
     matter_id: str,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Upload a document to a matter and extract timeline events"""
     start_time = time.time()
 
-    # Validate matter exists
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
-
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    service = TimelineService(session)
+    matter = _get_owned_matter(service, matter_id, current_user)
 
-    # Validate file type
-    allowed_types = [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/msword",
-        "text/plain",
-        "message/rfc822",  # .eml files
-        "application/vnd.ms-outlook"  # .msg files
-    ]
-
-    content_type = file.content_type or "application/octet-stream"
-    if content_type not in allowed_types and not file.filename.endswith(('.pdf', '.docx', '.doc', '.txt', '.eml')):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type. Allowed: PDF, DOCX, DOC, TXT, EML"
-        )
-
-    # Read file content
     content = await file.read()
-
-    if len(content) > 25 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large. Maximum size is 25MB.")
-
-    # Scan for viruses
-    scanner = get_virus_scanner()
-    is_clean, virus_name = scanner.scan_bytes(content, file.filename or "document")
-
-    if not is_clean:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File rejected: Virus detected - {virus_name}"
-        )
-
-    # Determine file type
-    filename = file.filename or "document"
-    if filename.endswith('.pdf') or 'pdf' in content_type:
-        file_type = "pdf"
-    elif filename.endswith(('.docx', '.doc')) or 'document' in content_type:
-        file_type = "docx"
-    else:
-        file_type = "txt"
+    filename, file_type = await _validate_upload(file, content)
 
     try:
         # Extract text from document
-        extracted_text, page_count, word_count = DocumentProcessor.process_file(content, file_type)
+        extracted_text, page_count, word_count = await run_cpu(extract_document_text, content, file_type)
 
         if not extracted_text or len(extracted_text.strip()) < 50:
             raise HTTPException(
@@ -252,23 +265,10 @@ async def upload_document(
 
         # Extract events using timeline builder
         builder = TimelineBuilder()
-        extraction = builder.extract_events_from_document(extracted_text, filename, doc_id)
-
-        # Store document data
-        doc_data = {
-            **extraction,
-            "content": extracted_text[:50000],  # Store first 50k chars
-            "page_count": page_count,
-            "word_count": word_count,
-            "uploaded_at": datetime.utcnow(),
-            "event_count": len(extraction.get("events", []))
-        }
+        extraction = await run_blocking(builder.extract_events_from_document, extracted_text, filename, doc_id)
 
-        documents_store[doc_id] = doc_data
-
-        # Add to matter
-        matter["documents"].append(doc_data)
-        matter["timeline_data"] = None  # Invalidate cached timeline
+        # Store document, extracted text and events
+        service.add_document(matter, extraction, extracted_text, page_count, word_count)
 
         processing_time = time.time() - start_time
 
@@ -288,54 +288,152 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=f"Document processing failed: {str(e)}")
 
 
-@router.post("/matters/{matter_id}/documents/batch")
+@router.post("/matters/{matter_id}/documents/batch", status_code=202)
 async def upload_documents_batch(
     matter_id: str,
     files: List[UploadFile] = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
-    """Upload multiple documents at once"""
-    results = []
-    errors = []
+    """
+    Upload multiple documents at once
+
+    Files are validated and spooled to storage, then processed by a
+    background job. Follow progress with GET /timeline/batches/{batch_id}
+    or the event stream at /timeline/batches/{batch_id}/events.
+    """
+    service = TimelineService(session)
+    _get_owned_matter(service, matter_id, current_user)
 
-    for file in files:
+    if len(files) > settings.TIMELINE_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum is {settings.TIMELINE_BATCH_MAX_FILES} per batch."
+        )
+
+    batch = TimelineBatch(
+        batch_id=f"bat_{uuid.uuid4().hex[:12]}",
+        matter_id=matter_id,
+        user_id=current_user.id,
+        total_documents=len(files)
+    )
+    storage = get_storage()
+
+    for position, file in enumerate(files):
+        item = TimelineBatchItem(
+            batch_id=batch.batch_id,
+            position=position,
+            filename=file.filename or "document",
+            file_type="txt"
+        )
         try:
-            result = await upload_document(matter_id, file, current_user)
-            results.append(result)
+            content = await file.read()
+            item.filename, item.file_type = await _validate_upload(file, content)
+            spool_key = f"timeline/{current_user.id}/{batch.batch_id}/{position}.{item.file_type}"
+            await run_blocking(storage.upload_file, content, spool_key, file.content_type or "application/octet-stream")
+            item.spool_key = spool_key
+        except ExecutorSaturated:
+            raise
         except HTTPException as e:
-            errors.append({"filename": file.filename, "error": e.detail})
+            item.status, item.error = "failed", e.detail
         except Exception as e:
-            errors.append({"filename": file.filename, "error": str(e)})
+            item.status, item.error = "failed", f"Failed to upload file: {str(e)}"
 
-    return {
-        "uploaded": len(results),
-        "failed": len(errors),
-        "results": results,
-        "errors": errors
-    }
+        if item.status == "failed":
+            batch.failed_documents += 1
+        session.add(item)
+
+    if batch.failed_documents == batch.total_documents:
+        batch.status = "completed"
+        batch.completed_at = datetime.utcnow()
+
+    session.add(batch)
+    session.commit()
+    session.refresh(batch)
+
+    if batch.status == "queued":
+        process_timeline_batch_task.delay(batch.batch_id)
+
+    return batch_progress(batch, _batch_items(session, batch.batch_id))
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """Get the progress of a batch upload"""
+    batch = _get_owned_batch(session, batch_id, current_user)
+    return batch_progress(batch, _batch_items(session, batch_id))
+
+
+@router.get("/batches/{batch_id}/events")
+async def stream_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Stream per-document progress of a batch upload via Server-Sent Events
+
+    Sends a `document` event whenever a file changes status and a `close`
+    event with the final batch summary once every file is done.
+    """
+    _get_owned_batch(session, batch_id, current_user)
+    # The dependency's session is closed once the response starts; each poll
+    # opens its own, off the event loop
+    bind = session.get_bind()
+
+    def poll() -> Dict[str, Any]:
+        with Session(bind) as poll_session:
+            batch = _get_owned_batch(poll_session, batch_id, current_user)
+            return batch_progress(batch, _batch_items(poll_session, batch_id))
+
+    async def event_stream() -> AsyncIterator[str]:
+        sent: Dict[int, str] = {}
+        for _ in range(BATCH_STREAM_TIMEOUT_SECONDS):
+            try:
+                progress = await run_blocking(poll)
+            except ExecutorSaturated:
+                await asyncio.sleep(1)
+                continue
+
+            documents = progress.pop("documents")
+            for position, document in enumerate(documents):
+                if sent.get(position) != document["status"]:
+                    sent[position] = document["status"]
+                    yield f"event: document\ndata: {json.dumps(document)}\n\n"
+
+            if progress["status"] == "completed":
+                yield f"event: close\ndata: {json.dumps(progress)}\n\n"
+                return
+
+            await asyncio.sleep(1)
+
+        yield f"event: timeout\ndata: {json.dumps({'error': 'Stream timeout reached'})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.delete("/matters/{matter_id}/documents/{doc_id}")
 async def delete_document(
     matter_id: str,
     doc_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Remove a document from a matter"""
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
-
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    service = TimelineService(session)
+    matter = _get_owned_matter(service, matter_id, current_user)
 
-    # Remove from matter
-    matter["documents"] = [d for d in matter["documents"] if d.get("doc_id") != doc_id]
-    matter["timeline_data"] = None  # Invalidate cache
-
-    # Remove from store
-    if doc_id in documents_store:
-        del documents_store[doc_id]
+    document = service.get_document(matter_id, doc_id)
+    if document:
+        service.delete_document(matter, document)
 
     return {"status": "deleted", "doc_id": doc_id}
 
@@ -344,22 +442,24 @@ async def delete_document(
 async def get_timeline(
     matter_id: str,
     include_summary: bool = Query(default=True, description="Generate AI summary of the matter"),
-    current_user: User = Depends(get_current_user)
+    offset: int = Query(default=0, ge=0, description="First timeline date to return"),
+    limit: int = Query(default=500, ge=1, le=5000, description="Timeline dates per page"),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
-    """Get the complete timeline for a matter"""
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
-
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    """
+    Get the timeline for a matter, one page of dates at a time
+    (statistics.total_dates is the number of dates in the whole timeline)
+    """
+    service = TimelineService(session)
+    matter = _get_owned_matter(service, matter_id, current_user)
 
-    documents = matter.get("documents", [])
+    documents = service.list_documents(matter_id)
 
     if not documents:
         return TimelineResponse(
             matter_id=matter_id,
-            matter_name=matter["name"],
+            matter_name=matter.name,
             date_range={"start": None, "end": None},
             key_parties=[],
             hot_docs=[],
@@ -369,40 +469,41 @@ async def get_timeline(
                 "total_events": 0,
                 "total_documents": 0,
                 "hot_docs_count": 0,
-                "date_range_days": 0
+                "date_range_days": 0,
+                "total_dates": 0
             },
             matter_summary=None
         )
 
-    # Build timeline
+    # Assemble one page from the stored events and the matter's aggregates
     builder = TimelineBuilder()
-    timeline_data = builder.build_timeline(documents)
+    timeline_data = builder.assemble_timeline(
+        service.timeline_entries(matter_id, offset=offset, limit=limit),
+        service.timeline_overview(matter_id),
+        [document_to_dict(d, []) for d in documents]
+    )
 
-    # Generate summary if requested
+    # Generate summary if requested (from the first dates; reused until they change)
     matter_summary = None
-    if include_summary and timeline_data.get("timeline"):
-        matter_summary = builder.generate_matter_summary(timeline_data)
-
-    # Build document info list
-    doc_infos = [
-        DocumentInfo(
-            doc_id=d["doc_id"],
-            filename=d["filename"],
-            doc_type=d.get("doc_type", "Other"),
-            doc_date=d.get("doc_date"),
-            importance=d.get("importance", "medium"),
-            is_hot_doc=d.get("is_hot_doc", False),
-            hot_doc_reason=d.get("hot_doc_reason", ""),
-            summary=d.get("summary", ""),
-            event_count=len(d.get("events", [])),
-            uploaded_at=d.get("uploaded_at", datetime.utcnow())
-        )
-        for d in documents
-    ]
+    summary_data = timeline_data
+    if include_summary and (offset or limit < SUMMARY_DATES):
+        summary_data = {"timeline": service.timeline_entries(matter_id, limit=SUMMARY_DATES)}
+    if include_summary and summary_data.get("timeline"):
+        summary_key = TimelineBuilder.summary_key(summary_data)
+        reuse = matter.summary_key == summary_key and bool(matter.matter_summary)
+        record_cache("matter_summary", reuse)
+        if reuse:
+            matter_summary = matter.matter_summary
+        else:
+            matter_summary = await run_blocking(builder.generate_matter_summary, summary_data)
+            if matter_summary != SUMMARY_UNAVAILABLE:
+                service.store_summary(matter, summary_key, matter_summary)
+
+    doc_infos = [_document_info(d) for d in documents]
 
     return TimelineResponse(
         matter_id=matter_id,
-        matter_name=matter["name"],
+        matter_name=matter.name,
         date_range=timeline_data["date_range"],
         key_parties=timeline_data["key_parties"],
         hot_docs=[HotDoc(**hd) for hd in timeline_data["hot_docs"]],
@@ -417,85 +518,53 @@ async def get_timeline(
 async def get_document(
     matter_id: str,
     doc_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Get document details including extracted text"""
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
+    service = TimelineService(session)
+    _get_owned_matter(service, matter_id, current_user)
 
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if doc_id not in documents_store:
+    doc = service.get_document(matter_id, doc_id)
+    if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    doc = documents_store[doc_id]
-
     return {
-        "doc_id": doc["doc_id"],
-        "filename": doc["filename"],
-        "doc_type": doc.get("doc_type", "Other"),
-        "doc_date": doc.get("doc_date"),
-        "importance": doc.get("importance", "medium"),
-        "is_hot_doc": doc.get("is_hot_doc", False),
-        "hot_doc_reason": doc.get("hot_doc_reason", ""),
-        "summary": doc.get("summary", ""),
-        "events": doc.get("events", []),
-        "content_preview": doc.get("content", "")[:5000],
-        "page_count": doc.get("page_count", 0),
-        "word_count": doc.get("word_count", 0)
+        "doc_id": doc.doc_id,
+        "filename": doc.filename,
+        "doc_type": doc.doc_type,
+        "doc_date": doc.doc_date,
+        "importance": doc.importance,
+        "is_hot_doc": doc.is_hot_doc,
+        "hot_doc_reason": doc.hot_doc_reason,
+        "summary": doc.summary,
+        "events": [event_to_dict(e) for e in service.list_events(matter_id, doc_id=doc_id)],
+        "content_preview": service.get_document_text(doc_id)[:5000],
+        "page_count": doc.page_count,
+        "word_count": doc.word_count
     }
 
 
 @router.get("/matters/{matter_id}/search")
 async def search_timeline(
     matter_id: str,
-    query: str = Query(..., min_length=2, description="Search query"),
-    current_user: User = Depends(get_current_user)
+    query: str = Query(..., min_length=2, description='Search query; all terms must match, "quoted phrases" match exactly'),
+    party: Optional[str] = Query(default=None, description="Only events involving this party"),
+    date_from: Optional[date] = Query(default=None, description="Only events on or after this date"),
+    date_to: Optional[date] = Query(default=None, description="Only events on or before this date"),
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
 ):
     """Search across all events and documents in a matter"""
-    if matter_id not in matters_store:
-        raise HTTPException(status_code=404, detail="Matter not found")
-
-    matter = matters_store[matter_id]
-    if matter.get("user_id") != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    service = TimelineService(session)
+    matter = _get_owned_matter(service, matter_id, current_user)
 
-    query_lower = query.lower()
-    results = []
-
-    for doc in matter.get("documents", []):
-        # Search document metadata
-        doc_matches = query_lower in doc.get("filename", "").lower() or \
-                      query_lower in doc.get("summary", "").lower()
-
-        # Search events
-        for event in doc.get("events", []):
-            if query_lower in event.get("description", "").lower() or \
-               query_lower in (event.get("quote") or "").lower() or \
-               any(query_lower in p.lower() for p in event.get("parties_involved", [])):
-                results.append({
-                    "type": "event",
-                    "date": event.get("date"),
-                    "description": event.get("description"),
-                    "source_doc_id": doc["doc_id"],
-                    "source_filename": doc["filename"],
-                    "is_hot_doc": doc.get("is_hot_doc", False),
-                    "quote": event.get("quote")
-                })
-
-        if doc_matches:
-            results.append({
-                "type": "document",
-                "doc_id": doc["doc_id"],
-                "filename": doc["filename"],
-                "summary": doc.get("summary", ""),
-                "is_hot_doc": doc.get("is_hot_doc", False)
-            })
+    found = service.search(matter, query, party=party, date_from=date_from, date_to=date_to, limit=limit)
 
     return {
         "query": query,
-        "result_count": len(results),
-        "results": results
+        "result_count": len(found["results"]),
+        "results": found["results"],
+        "facets": found["facets"]
     }
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import List
 
 from app.core.database import get_session
+from app.core.executors import run_blocking
 from app.core.security import get_password_hash, create_api_key
 from app.api.dependencies import get_current_user
 from app.models.user import User, APIKey, PlanType
@@ -33,7 +34,7 @@ async def register_user(
     # Create user with FREE plan
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await run_blocking(get_password_hash, user_data.password),
         full_name=user_data.full_name,
         plan=PlanType.FREE,
         billing_period_start=datetime.utcnow(),
@@ -0,0 +1,66 @@
+"""
+Bulk persistence helpers
+
+Insert many child rows (research results, citation issues, clause
+suggestions) in a single multi-row INSERT instead of one statement per row.
+"""
+
+import secrets
+from typing import Any, Dict, List, Sequence, Type, TypeVar
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def generate_ids(prefix: str, count: int, nbytes: int = 8) -> List[str]:
+    """
+    Generate `count` public IDs like "res_1a2b3c4d5e6f7a8b"
+
+    Draws all randomness in one call rather than one `token_hex` per row.
+    """
+    raw = secrets.token_bytes(nbytes * count).hex()
+    width = nbytes * 2
+    return [f"{prefix}_{raw[i * width:(i + 1) * width]}" for i in range(count)]
+
+
+def _column_values(instance: SQLModel) -> Dict[str, Any]:
+    """Column values for an INSERT, with model-level defaults applied"""
+    values = {}
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.key)
+        if column.primary_key and value is None:
+            continue
+        values[column.key] = value
+    return values
+
+
+def bulk_insert(
+    session: Session,
+    model: Type[ModelT],
+    rows: Sequence[Dict[str, Any]],
+    returning: bool = True
+) -> List[ModelT]:
+    """
+    Insert rows for `model` in one round-trip
+
+    Each row is first built through the model so default factories
+    (timestamps, empty JSON lists) match what `session.add` would persist.
+    SQLAlchemy sends the batch as a multi-row INSERT (paged automatically for
+    very large batches) and, when `returning` is set, hands back persistent
+    instances in the same order as `rows`, with primary keys populated.
+
+    The caller still owns the transaction and must commit.
+    """
+    if not rows:
+        return []
+
+    values = [_column_values(model(**row)) for row in rows]
+
+    if not returning:
+        session.execute(insert(model), values)
+        return []
+
+    statement = insert(model).returning(model, sort_by_parameter_order=True)
+    return list(session.scalars(statement, values).all())
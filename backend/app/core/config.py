@@ -15,6 +15,12 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Read replicas (Optional - comma-separated URLs, reads fall back to primary)
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Skip replicas lagging more than this
+    DATABASE_REPLICA_LAG_CHECK_SECONDS: int = 10  # How often replica lag is measured
+    READ_YOUR_WRITES_WINDOW_SECONDS: int = 15  # Keep callers on primary after a write
+
     # Redis
     REDIS_URL: str
 
@@ -22,11 +28,22 @@ class Settings(BaseSettings):
     CLOUDINARY_CLOUD_NAME: Optional[str] = None
     CLOUDINARY_API_KEY: Optional[str] = None
     CLOUDINARY_API_SECRET: Optional[str] = None
+    STORAGE_BACKEND: str = "cloudinary"  # "cloudinary", or "local" for development and load tests
+    LOCAL_STORAGE_PATH: str = "./storage"  # Root directory when STORAGE_BACKEND is "local"
 
     # OpenAI (Required for AI features)
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"  # Options: gpt-4o-mini, gpt-5.1, gpt-4o
 
+    # LLM provider ("openai", or "mock" for offline load tests and benchmarks)
+    LLM_PROVIDER: str = "openai"
+    LLM_MOCK_LATENCY_MS: float = 400  # Median time to first token
+    LLM_MOCK_LATENCY_SIGMA: float = 0.5  # Log-normal spread of the latency (0 = fixed)
+    LLM_MOCK_TOKENS_PER_SECOND: float = 80  # Completion throughput (0 = instant)
+    LLM_MOCK_ERROR_RATE: float = 0.0  # Fraction of calls failing with a 500
+    LLM_MOCK_RATE_LIMIT_RATE: float = 0.0  # Fraction of calls failing with a 429
+    LLM_MOCK_SEED: Optional[int] = None  # Seed for reproducible latency and errors
+
     # Stripe (Optional - payment processing)
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
@@ -40,8 +57,37 @@ class Settings(BaseSettings):
     # Healthchecks.io
     HEALTHCHECK_URL: Optional[str] = None
 
+    # Prometheus metrics (GET /metrics; multiprocess mode via PROMETHEUS_MULTIPROC_DIR)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None  # Bearer token required to scrape; without it production serves no /metrics
+    METRICS_WORKER_PORT: Optional[int] = None  # Celery workers serve metrics here, if set
+
+    # Request profiling (opt-in per request) and slow-request capture
+    PROFILING_ADMIN_TOKEN: Optional[str] = None  # X-Profile-Token value that forces profiling and reads captures
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled without the header
+    PROFILING_INTERVAL_MS: int = 5  # Stack sampling interval
+    SLOW_REQUEST_THRESHOLD_MS: int = 1000  # Requests at least this slow are captured
+    SLOW_REQUEST_LOG_SIZE: int = 50  # Captures kept per process (oldest dropped first)
+
+    # Query guard (staging: counts statements per request, logs budget overruns and N+1 patterns)
+    QUERY_GUARD_ENABLED: bool = False
+    QUERY_GUARD_MAX_QUERIES: int = 25
+
+    # Response compression (brotli when installed and accepted, otherwise gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_ENABLED: bool = True  # Per-plan limits on authenticated requests (RATE_LIMITS, per API key)
+    RATE_LIMIT_SYNC_SECONDS: float = 1.0  # Lifetime of a process's local lease of requests
+    RATE_LIMIT_LEASE_FRACTION: float = 0.1  # Lease size, as a fraction of the plan's per-minute limit
+
+    # Upload quota reservations (Redis counters per user and billing period, see app/services/quota.py)
+    QUOTA_COUNTER_TTL_SECONDS: int = 40 * 24 * 3600  # Counters outlive their billing period
+    QUOTA_RESERVATION_TIMEOUT_SECONDS: int = 3600  # Unsettled reservations are dropped by the reconcile task
+    QUOTA_RECONCILE_SECONDS: int = 300  # Interval of the reconcile task (celery beat)
 
     # Plans Configuration
     PLANS: ClassVar[Dict[str, Any]] = {
@@ -78,6 +124,37 @@ class Settings(BaseSettings):
     # Document Processing
     MAX_FILE_SIZE_MB: int = 25
     WORDS_PER_PAGE: int = 800  # Average for page counting
+    EMAIL_ATTACHMENT_WORKERS: int = 4  # Processes for extracting email attachments in parallel
+    EMAIL_ATTACHMENT_PARALLEL_BYTES: int = 256 * 1024  # Smaller attachments are extracted inline
+    CONTRACT_TEXT_CODEC: str = "zstd"  # Compression for stored contract text: zstd (falls back to zlib if not installed), zlib
+    CONTRACT_TEXT_PAGES_PER_SEGMENT: int = 10  # Pages per compressed text segment
+
+    # Executors for blocking work in async endpoints (queue = jobs waiting beyond the workers)
+    CPU_EXECUTOR_WORKERS: int = 2  # Processes for document parsing
+    CPU_EXECUTOR_MAX_QUEUE: int = 16
+    IO_EXECUTOR_WORKERS: int = 16  # Threads for OpenAI calls, storage, virus scans
+    IO_EXECUTOR_MAX_QUEUE: int = 64
+    EXECUTOR_RETRY_AFTER_SECONDS: int = 5  # Retry-After sent with 503 when saturated
+
+    # Local clause pre-classifier (selects the contract sections sent for analysis)
+    CLAUSE_MODEL_THRESHOLD: float = 0.6  # Model probability needed to tag a section
+    CLAUSE_MODEL_MAX_ANALYSES: int = 2000  # Most recent analyses used as training data
+    CLAUSE_MODEL_MAX_EXAMPLES: int = 4000  # Cap on clause excerpts per training run
+    CLAUSE_MODEL_REFRESH_SECONDS: int = 3600  # Retrain interval (train_clause_model beat task)
+    CLAUSE_MODEL_RELOAD_SECONDS: int = 300  # How often workers load the stored model
+
+    # Timeline batch ingestion (background job)
+    TIMELINE_BATCH_MAX_FILES: int = 100
+    TIMELINE_BATCH_EXTRACT_WORKERS: int = 4  # Processes for text extraction
+    TIMELINE_BATCH_LLM_CONCURRENCY: int = 4  # Event extraction calls in flight per batch
+    TIMELINE_BATCH_STALE_SECONDS: int = 900  # Files extracting/analyzing this long are retried (worker lost)
+
+    # Dashboard statistics snapshot cache (0 disables caching)
+    STATISTICS_CACHE_TTL_SECONDS: int = 30
+
+    # Response cache for completed analyses, comparisons and compliance checks (0 disables caching)
+    RESPONSE_CACHE_TTL_SECONDS: int = 24 * 3600
+    RESPONSE_CACHE_LOCAL_ENTRIES: int = 256  # In-process entries while Redis is unavailable
 
     # ClamAV Virus Scanning (Optional - gracefully degrades if not available)
     CLAMAV_ENABLED: bool = False  # Disabled by default until ClamAV service is configured
@@ -1,20 +1,225 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import redis
+from fastapi import Depends, Request
+from sqlalchemy import Select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from sqlmodel import SQLModel, Session, create_engine
+
+from app.core import metrics, profiling, query_guard  # noqa: F401 - register the query listeners
 from app.core.config import settings
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
+logger = logging.getLogger(__name__)
 
-# Create engine
+# Create engine (primary - all writes go here)
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.ENVIRONMENT == "development",
     pool_pre_ping=True
 )
 
+# Read replicas (optional, comma-separated DATABASE_REPLICA_URLS)
+replica_engines: List[Engine] = [
+    create_engine(
+        url.strip(),
+        echo=settings.ENVIRONMENT == "development",
+        pool_pre_ping=True
+    )
+    for url in (settings.DATABASE_REPLICA_URLS or "").split(",")
+    if url.strip()
+]
+
 
 def create_db_and_tables():
     """Create database tables"""
     SQLModel.metadata.create_all(engine)
 
 
-def get_session():
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a read replica
+
+    Anything else (flushes, INSERT/UPDATE/DELETE, raw SQL) goes to the
+    primary, and once that happens the session stays on the primary so it
+    reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = self.info.get("replica")
+        if replica is not None:
+            if not self._flushing and isinstance(clause, Select):
+                return replica
+            if self._flushing or clause is not None:
+                self.info["replica"] = None
+        return engine
+
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only requests
+
+    Replicas whose replay lag exceeds DATABASE_REPLICA_MAX_LAG_SECONDS are
+    skipped until the next lag check, and callers that wrote recently are
+    kept on the primary (read-your-writes).
+    """
+
+    def __init__(self, replicas: List[Engine]):
+        self.replicas = replicas
+        self._cycle = itertools.cycle(range(len(replicas))) if replicas else None
+        self._lag: Dict[int, Optional[float]] = {i: None for i in range(len(replicas))}
+        self._lag_checked_at = 0.0
+        self._recent_writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ===== Replica selection =====
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica (round-robin), or None to use the primary"""
+        if not self.replicas:
+            return None
+
+        self._refresh_lag()
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            lag = self._lag.get(index)
+            if lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+                return self.replicas[index]
+        return None
+
+    def _refresh_lag(self):
+        now = time.monotonic()
+        if now - self._lag_checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+            return
+        with self._lock:
+            if now - self._lag_checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+                return
+            self._lag_checked_at = now
+            for index, replica in enumerate(self.replicas):
+                self._lag[index] = self._measure_lag(replica)
+
+    @staticmethod
+    def _measure_lag(replica: Engine) -> Optional[float]:
+        """Replay lag in seconds, or None if the replica is unreachable"""
+        if replica.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with replica.connect() as conn:
+                return float(conn.execute(text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )).scalar() or 0.0)
+        except Exception as e:
+            logger.warning(f"Replica lag check failed for {replica.url.host}: {e}")
+            return None
+
+    # ===== Read-your-writes =====
+
+    @staticmethod
+    def caller_key(request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+    def mark_write(self, request: Request):
+        """Keep this caller on the primary for the read-your-writes window"""
+        key = self.caller_key(request)
+        if not self.replicas or not key:
+            return
+
+        window = settings.READ_YOUR_WRITES_WINDOW_SECONDS
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(f"db:recent-write:{key}", 1, ex=window)
+                return
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        with self._lock:
+            now = time.monotonic()
+            if len(self._recent_writes) > 10000:
+                self._recent_writes = {k: t for k, t in self._recent_writes.items() if t > now}
+            self._recent_writes[key] = now + window
+
+    def wrote_recently(self, request: Request) -> bool:
+        key = self.caller_key(request)
+        if not self.replicas or not key:
+            return False
+
+        client = get_redis()
+        if client is not None:
+            try:
+                return bool(client.exists(f"db:recent-write:{key}"))
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        return self._recent_writes.get(key, 0.0) > time.monotonic()
+
+    # ===== Metrics =====
+
+    def pool_metrics(self) -> List[dict]:
+        """Connection pool usage per engine"""
+        metrics = [self._engine_metrics("primary", engine, None)]
+        for index, replica in enumerate(self.replicas):
+            metrics.append(self._engine_metrics(f"replica_{index}", replica, self._lag.get(index)))
+        return metrics
+
+    @staticmethod
+    def _engine_metrics(name: str, target: Engine, lag: Optional[float]) -> dict:
+        pool = target.pool
+        # Only QueuePool counts its connections (SingletonThreadPool.size, for one, is an int)
+        counted = isinstance(pool, QueuePool)
+        return {
+            "name": name,
+            "host": target.url.host,
+            "pool_size": pool.size() if counted else None,
+            "checked_out": pool.checkedout() if counted else None,
+            "checked_in": pool.checkedin() if counted else None,
+            "overflow": pool.overflow() if counted else None,
+            "replica_lag_seconds": lag
+        }
+
+
+replica_router = ReplicaRouter(replica_engines)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def get_session(request: Request):
     """Get database session dependency"""
+    if request.method not in SAFE_METHODS:
+        replica_router.mark_write(request)
+
     with Session(engine) as session:
         yield session
+
+
+def get_read_session(request: Request, primary: Session = Depends(get_session)):
+    """
+    Get a database session for read-heavy endpoints
+
+    SELECTs go to a healthy replica when one is configured; otherwise, for
+    non-GET requests, or right after the caller wrote something, this is
+    the regular primary session.
+    """
+    replica = None
+    if request.method in SAFE_METHODS:
+        # Only pay for the recent-write lookup when there is a replica to route to
+        replica = replica_router.choose()
+        if replica is not None and replica_router.wrote_recently(request):
+            replica = None
+
+    if replica is None:
+        yield primary
+        return
+
+    with RoutingSession(engine, info={"replica": replica}) as session:
+        yield session
@@ -0,0 +1,185 @@
+"""
+Managed executors for blocking work called from async endpoints
+
+CPU-bound parsing (pypdf, pdfminer, python-docx) runs in a process pool and
+blocking I/O (OpenAI, virus scans, storage uploads, password hashing) runs
+in a thread pool, so the event loop keeps serving other requests.
+
+Each pool admits at most `max_workers + max_queue` jobs; beyond that callers
+get a 503 with Retry-After instead of piling up behind a saturated pool.
+
+    text, pages, words = await run_cpu(DocumentProcessor.process_file, content, "pdf")
+    result = await run_blocking(analyzer.analyze, text, filename)
+
+Functions sent to the process pool must be picklable (module-level
+functions or static methods) and must not use the database session.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(HTTPException):
+    """Raised when a pool's queue is full (returned to the client as 503)"""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({pool_name} workers saturated). Please retry shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+_worker = threading.local()
+
+
+def _mark_pool_worker():
+    _worker.in_pool = True
+
+
+def in_pool_worker() -> bool:
+    """Whether this is a worker of a CPU pool from make_pool("process", ...)"""
+    return getattr(_worker, "in_pool", False)
+
+
+def make_pool(kind: str, max_workers: int) -> Executor:
+    """
+    Create a process or thread pool
+
+    Daemonic processes (e.g. Celery prefork children) may not start child
+    processes, so there process pools fall back to threads. Workers of
+    either report in_pool_worker(), so CPU work they run doesn't start
+    pools of its own.
+    """
+    if kind == "process" and not multiprocessing.current_process().daemon:
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_mark_pool_worker)
+    initializer = _mark_pool_worker if kind == "process" else None
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{kind}-pool", initializer=initializer)
+
+
+class BoundedExecutor:
+    """Lazily started pool with an admission limit"""
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = make_pool(self.kind, self.max_workers)
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(self.name, settings.EXECUTOR_RETRY_AFTER_SECONDS)
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` on the pool and await its result"""
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args, **kwargs)
+            if self.kind == "thread":
+                # Carry request-scoped context (e.g. the request profile) into the thread
+                call = functools.partial(contextvars.copy_context().run, call)
+            return await loop.run_in_executor(self._get_executor(), call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge PDF); start a fresh pool for the next caller
+            logger.error(f"{self.name} executor pool broke; restarting it")
+            with self._lock:
+                self._executor = None
+            raise
+        finally:
+            self._release()
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        """
+        Submit `fn(*args)` from synchronous code (e.g. inside a CPU worker)
+
+        Not admission-limited: the caller is already running admitted work
+        and simply waits for the pool.
+        """
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+cpu_executor = BoundedExecutor(
+    "cpu", "process", settings.CPU_EXECUTOR_WORKERS, settings.CPU_EXECUTOR_MAX_QUEUE
+)
+io_executor = BoundedExecutor(
+    "io", "thread", settings.IO_EXECUTOR_WORKERS, settings.IO_EXECUTOR_MAX_QUEUE
+)
+# Shared by email extraction for large PDF/DOCX attachments; started once per process
+attachment_executor = BoundedExecutor(
+    "attachments", "process", settings.EMAIL_ATTACHMENT_WORKERS, 0
+)
+
+
+async def run_cpu(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound work (document parsing) in the process pool"""
+    return await cpu_executor.run(fn, *args, **kwargs)
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking I/O (OpenAI, storage, virus scan, hashing) in the thread pool"""
+    return await io_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> List[Dict[str, Any]]:
+    return [cpu_executor.stats(), io_executor.stats(), attachment_executor.stats()]
+
+
+def shutdown_executors():
+    cpu_executor.shutdown()
+    io_executor.shutdown()
+    attachment_executor.shutdown()
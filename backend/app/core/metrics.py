@@ -0,0 +1,203 @@
+"""
+Prometheus metrics
+
+Metric definitions and the helpers that record them. The API exposes them
+at GET /metrics; Celery workers record into the same metrics.
+
+- HTTP: request latency per route template, method and status
+- Database: query count and duration per statement type (SQLAlchemy events)
+- Workers: task outcomes, per-stage durations (download, extract, llm,
+  persist) and Celery queue depth (read from the broker at scrape time)
+- LLM: tokens in/out and call latency per feature and model
+- Caches: hits and misses per cache
+- Storage and virus scanning: operation durations
+
+With several processes (uvicorn workers, prefork Celery children) set
+PROMETHEUS_MULTIPROC_DIR to a shared, empty directory before they start;
+/metrics then aggregates every process on the host. A worker host without
+an API can serve its own metrics on METRICS_WORKER_PORT.
+
+    with task_stage("process_contract", "extract"):
+        text, pages, words = processor.process_file(content, file_type)
+
+    @STORAGE_SECONDS.labels(backend="local", operation="upload").time()
+    def upload(...): ...
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Buckets for work that takes seconds to minutes (extraction, LLM calls, tasks)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "daflegal_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "daflegal_http_requests_in_progress", "HTTP requests being served",
+    multiprocess_mode="livesum"
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "daflegal_db_query_duration_seconds", "Database statement latency",
+    ["operation"], buckets=DB_BUCKETS
+)
+
+TASKS_TOTAL = Counter(
+    "daflegal_tasks_total", "Background tasks finished",
+    ["task", "status"]
+)
+TASK_STAGE_SECONDS = Histogram(
+    "daflegal_task_stage_duration_seconds", "Duration of background task stages",
+    ["task", "stage"], buckets=SLOW_BUCKETS
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "daflegal_llm_request_duration_seconds", "LLM chat-completion latency",
+    ["feature", "model", "outcome"], buckets=SLOW_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "daflegal_llm_tokens_total", "LLM tokens used",
+    ["feature", "model", "direction"]
+)
+
+CACHE_REQUESTS = Counter(
+    "daflegal_cache_requests_total", "Cache lookups",
+    ["cache", "result"]
+)
+
+STORAGE_SECONDS = Histogram(
+    "daflegal_storage_operation_duration_seconds", "Document storage operation latency",
+    ["backend", "operation"], buckets=SLOW_BUCKETS
+)
+VIRUS_SCAN_SECONDS = Histogram(
+    "daflegal_virus_scan_duration_seconds", "Virus scan latency",
+    ["result"], buckets=SLOW_BUCKETS
+)
+
+# Celery queues whose depth is reported (Redis lists named after the queue)
+CELERY_QUEUES = ("celery",)
+
+
+# ===== Helpers =====
+
+@contextmanager
+def task_stage(task: str, stage: str) -> Iterator[None]:
+    """Time one stage of a background task"""
+    with TASK_STAGE_SECONDS.labels(task=task, stage=stage).time():
+        yield
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_llm_call(
+    feature: str,
+    model: Optional[str],
+    seconds: float,
+    outcome: str = "ok",
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0
+):
+    model = model or "unknown"
+    LLM_REQUEST_SECONDS.labels(feature=feature, model=model, outcome=outcome).observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(feature=feature, model=model, direction="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(feature=feature, model=model, direction="completion").inc(completion_tokens)
+
+
+def statement_operation(statement: str) -> str:
+    """select / insert / update / delete / other, from the first keyword of a SQL statement"""
+    keyword = statement.lstrip()[:6].lower()
+    return keyword if keyword in ("select", "insert", "update", "delete") else "other"
+
+
+# ===== Database instrumentation =====
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if started:
+        DB_QUERY_SECONDS.labels(operation=statement_operation(statement)).observe(time.perf_counter() - started.pop())
+
+
+# ===== Exposition =====
+
+class CeleryQueueCollector:
+    """Celery queue depth, read from the Redis broker when metrics are scraped"""
+
+    def collect(self):
+        from app.core.redis_client import get_redis, mark_redis_unavailable
+
+        gauge = GaugeMetricFamily("daflegal_celery_queue_depth", "Tasks waiting in the Celery queue", labels=["queue"])
+        client = get_redis()
+        if client is not None:
+            try:
+                for queue in CELERY_QUEUES:
+                    gauge.add_metric([queue], client.llen(queue))
+            except Exception as e:
+                mark_redis_unavailable(e)
+        yield gauge
+
+
+_scrape_registry = CollectorRegistry(auto_describe=True)
+_scrape_registry.register(CeleryQueueCollector())
+
+
+def metrics_registry() -> CollectorRegistry:
+    """All processes' metrics in multiprocess mode, otherwise this process's"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(body, content type) of the Prometheus text exposition"""
+    return generate_latest(metrics_registry()) + generate_latest(_scrape_registry), CONTENT_TYPE_LATEST
+
+
+def start_worker_metrics_server():
+    """Serve metrics on METRICS_WORKER_PORT (Celery hosts without an API)"""
+    if settings.METRICS_WORKER_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.METRICS_WORKER_PORT, registry=metrics_registry())
+        logger.info(f"Serving worker metrics on port {settings.METRICS_WORKER_PORT}")
+
+
+def mark_process_dead(pid: int):
+    """Drop a finished process's live gauges in multiprocess mode"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
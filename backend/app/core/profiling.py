@@ -0,0 +1,222 @@
+"""
+Per-request profiling and slow-request capture
+
+A profiled request records, while it runs:
+
+- a sampling profile: the stacks of the threads serving it, read every
+  PROFILING_INTERVAL_MS by a background thread and aggregated in collapsed
+  form ("module:function;module:function" -> samples, flamegraph-ready)
+- every SQL statement with its duration
+- every LLM call with its latency, outcome and tokens
+
+A request is profiled when it carries X-Profile-Token equal to
+PROFILING_ADMIN_TOKEN, or at random with probability PROFILING_SAMPLE_RATE.
+Requests at least SLOW_REQUEST_THRESHOLD_MS slow (profiled or not) and
+every explicitly profiled request are kept in a per-process ring buffer of
+the last SLOW_REQUEST_LOG_SIZE captures, readable by admins.
+
+The profile follows the request through contextvars, so it reaches the
+threadpool running sync endpoints and run_blocking() calls. The threads it
+samples are the event loop thread and any thread that runs a query or LLM
+call for the request; the event loop thread also runs other requests, so
+under concurrency its samples include their work. With profiling off the
+cost per request is one clock read and a context variable lookup per query.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+MAX_QUERIES = 500  # Statements kept per profile (all are counted)
+MAX_STATEMENT_LENGTH = 1000
+MAX_STACK_DEPTH = 64
+MAX_STACKS = 200  # Distinct stacks returned, most sampled first
+
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def new_capture_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def collapse_stack(frame) -> str:
+    """Root-to-leaf "module:function" frames joined by ";" """
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        frames.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class RequestProfile:
+    """Sampling profile, query log and LLM spans of one request"""
+
+    def __init__(self, reason: str, interval_ms: Optional[int] = None):
+        self.id = new_capture_id()
+        self.reason = reason
+        self.interval = (interval_ms or settings.PROFILING_INTERVAL_MS) / 1000
+        self.threads: Set[int] = set()
+        self.queries: List[Dict[str, Any]] = []
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.llm_calls: List[Dict[str, Any]] = []
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def attach_current_thread(self):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+
+    def start(self):
+        self.attach_current_thread()
+        self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """
+        Signal the sampler to exit without joining it (stop() runs on the
+        event loop); samples are taken under the lock, so none land after this
+        """
+        with self._lock:
+            self._stopped.set()
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                if self._stopped.is_set():
+                    return
+                for ident in self.threads:
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        self.stacks[collapse_stack(frame)] += 1
+
+    def add_query(self, statement: str, seconds: float):
+        self.attach_current_thread()
+        with self._lock:
+            self.query_count += 1
+            self.query_seconds += seconds
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append({
+                    "statement": statement[:MAX_STATEMENT_LENGTH],
+                    "duration_ms": round(1000 * seconds, 3)
+                })
+
+    def add_llm_call(self, **span):
+        self.attach_current_thread()
+        with self._lock:
+            self.llm_calls.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query_count": self.query_count,
+            "query_ms": round(1000 * self.query_seconds, 3),
+            "queries": self.queries,
+            "llm_calls": self.llm_calls,
+            "sample_interval_ms": round(1000 * self.interval, 3),
+            "sample_count": sum(self.stacks.values()),
+            "stacks": [{"stack": stack, "samples": n} for stack, n in self.stacks.most_common(MAX_STACKS)]
+        }
+
+
+def record_llm_span(
+    feature: str,
+    model: Optional[str],
+    seconds: float,
+    outcome: str = "ok",
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0
+):
+    """Add an LLM call to the current request's profile, if it is profiled"""
+    profile = current_profile.get()
+    if profile is not None:
+        profile.add_llm_call(
+            feature=feature, model=model, duration_ms=round(1000 * seconds, 3), outcome=outcome,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+
+
+# ===== Database instrumentation =====
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    started = conn.info.get("profile_started_at")
+    if profile is not None and started:
+        profile.add_query(statement, time.perf_counter() - started.pop())
+
+
+# ===== Slow-request ring buffer =====
+
+SUMMARY_FIELDS = (
+    "id", "method", "path", "route", "status", "duration_ms", "started_at", "profiled", "reason",
+    "query_count", "query_ms"
+)
+
+
+class SlowRequestLog:
+    """The last `size` captured requests of this process"""
+
+    def __init__(self, size: Optional[int] = None):
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size or settings.SLOW_REQUEST_LOG_SIZE)
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        route: str,
+        status: int,
+        seconds: float,
+        profile: Optional[RequestProfile] = None
+    ) -> Dict[str, Any]:
+        entry = {
+            "id": profile.id if profile is not None else new_capture_id(),
+            "method": method,
+            "path": path,
+            "route": route,
+            "status": status,
+            "duration_ms": round(1000 * seconds, 3),
+            "started_at": datetime.utcfromtimestamp(time.time() - seconds).isoformat(),
+            "profiled": profile is not None,
+            "reason": profile.reason if profile is not None else "slow",
+            **(profile.to_dict() if profile is not None else {})
+        }
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, without the query log, spans and stacks"""
+        with self._lock:
+            entries = list(self._entries)
+        return [{k: e[k] for k in SUMMARY_FIELDS if k in e} for e in reversed(entries)]
+
+    def get(self, capture_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((e for e in self._entries if e["id"] == capture_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_requests = SlowRequestLog()
@@ -0,0 +1,129 @@
+"""
+Query-count guard and N+1 detection
+
+Counts the SQL statements executed in a block of code and reports
+statements repeated with different parameters (the N+1 pattern: one query
+per row of an earlier result). Statements are compared in normalised form,
+so `... WHERE id IN (?, ?, ?)` and `... WHERE id IN (?, ?)` are the same.
+
+Tests assert query budgets:
+
+    with query_budget(4):
+        client.get(f"/api/v1/contracts/{contract_id}/clause-suggestions", headers=auth)
+
+    with count_queries() as counter:
+        ...
+    assert counter.count <= 6 and not counter.repeated()
+
+count_queries() sees every statement the process executes (the TestClient
+serves requests on another thread). In staging, QUERY_GUARD_ENABLED adds
+QueryGuardMiddleware, which counts per request, returns X-Query-Count and
+logs requests over QUERY_GUARD_MAX_QUERIES or with repeated statements.
+"""
+
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# A normalised statement executed this many times in one request or block is reported as N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and IN-lists of bound parameters"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryCounter:
+    """Statements executed while the counter is active"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str):
+        with self._lock:
+            self.statements.append(statement)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Normalised statements executed at least `threshold` times"""
+        counts = Counter(normalize_statement(s) for s in self.statements)
+        return {statement: n for statement, n in counts.most_common() if n >= threshold}
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries"]
+        lines += [f"  {n}x {statement}" for statement, n in Counter(
+            normalize_statement(s) for s in self.statements
+        ).most_common()]
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_process_counters: List[QueryCounter] = []
+_process_lock = threading.Lock()
+request_counter: ContextVar[Optional[QueryCounter]] = ContextVar("request_query_counter", default=None)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = request_counter.get()
+    if counter is not None:
+        counter.record(statement)
+    if _process_counters:
+        for counter in list(_process_counters):
+            counter.record(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count every statement the process executes inside the block"""
+    counter = QueryCounter()
+    with _process_lock:
+        _process_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _process_lock:
+            _process_counters.remove(counter)
+
+
+@contextmanager
+def query_budget(
+    max_queries: int,
+    max_repeats: Optional[int] = N_PLUS_ONE_THRESHOLD - 1
+) -> Iterator[QueryCounter]:
+    """
+    Fail if the block executes more than `max_queries` statements, or one
+    statement more than `max_repeats` times (None disables the N+1 check)
+    """
+    with count_queries() as counter:
+        yield counter
+    problems = []
+    if counter.count > max_queries:
+        problems.append(f"{counter.count} queries, budget {max_queries}")
+    if max_repeats is not None:
+        problems += [
+            f"N+1: {n}x {statement}" for statement, n in counter.repeated(max_repeats + 1).items()
+        ]
+    if problems:
+        raise QueryBudgetExceeded("\n".join(problems + [counter.report()]))
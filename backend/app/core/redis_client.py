@@ -0,0 +1,55 @@
+"""
+Shared Redis connection
+
+Lazily connects to REDIS_URL and backs off for a while after a failure, so
+features that use Redis opportunistically degrade to their in-process
+fallback instead of stalling every request on connection timeouts.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before trying Redis again after an error
+RETRY_BACKOFF_SECONDS = 30
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Get the shared Redis client, or None while Redis is marked unavailable
+    """
+    global _client
+
+    if not settings.REDIS_URL or time.monotonic() < _unavailable_until:
+        return None
+
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_timeout=0.5,
+                    socket_connect_timeout=0.5,
+                    health_check_interval=30
+                )
+    return _client
+
+
+def mark_redis_unavailable(error: Exception):
+    """Record a Redis failure and stop using it for the backoff period"""
+    global _unavailable_until
+
+    if time.monotonic() >= _unavailable_until:
+        logger.warning(f"Redis unavailable, using local fallback for {RETRY_BACKOFF_SECONDS}s: {error}")
+    _unavailable_until = time.monotonic() + RETRY_BACKOFF_SECONDS
@@ -0,0 +1,132 @@
+"""
+Response cache and conditional GET for immutable resources
+
+A completed contract analysis, comparison or compliance check never changes
+(reprocessing gives it a new processed_at), so its response is identified by
+resource kind, id and processing version:
+
+- the strong ETag is derived from that identity, so a request whose
+  If-None-Match matches gets a 304 without the response being built
+- the serialised body is cached in Redis (an in-process LRU without Redis),
+  so other hot reads cost one cache lookup instead of loading the result
+  and constructing its Pydantic models
+
+The endpoint still loads the resource row first: it checks ownership and
+status and supplies the version.
+
+    return response_cache.respond(request, "contract_analysis", contract.id,
+                                  contract.processed_at, build_response)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Optional, Union
+
+import redis
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
+# Bump when a cached response schema changes, so old ETags and bodies are not served
+RESPONSE_FORMAT_VERSION = 1
+
+CACHE_CONTROL = "private, no-cache"  # Clients keep the body but revalidate with If-None-Match
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Serialised responses of immutable resources, keyed by their ETag"""
+
+    def __init__(self, local_entries: Optional[int] = None):
+        self.local_entries = settings.RESPONSE_CACHE_LOCAL_ENTRIES if local_entries is None else local_entries
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def etag(kind: str, resource_id: Union[int, str], version: Optional[datetime]) -> str:
+        identity = f"{RESPONSE_FORMAT_VERSION}:{kind}:{resource_id}:{version.isoformat() if version else ''}"
+        return '"' + hashlib.sha256(identity.encode()).hexdigest()[:32] + '"'
+
+    def respond(
+        self,
+        request: Request,
+        kind: str,
+        resource_id: Union[int, str],
+        version: Optional[datetime],
+        build: Callable[[], BaseModel]
+    ) -> Response:
+        """304 if the client has this version, otherwise the cached or freshly built body"""
+        etag = self.etag(kind, resource_id, version)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        key = f"response:{kind}:{resource_id}:" + etag.strip('"')
+        body = self.get(key)
+        record_cache("response", body is not None)
+        if body is None:
+            body = build().model_dump_json().encode()
+            self.set(key, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def get(self, key: str) -> Optional[bytes]:
+        if settings.RESPONSE_CACHE_TTL_SECONDS <= 0:
+            return None
+
+        client = get_redis()
+        if client is not None:
+            try:
+                return client.get(key)
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        with self._lock:
+            body = self._local.get(key)
+            if body is not None:
+                self._local.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes):
+        if settings.RESPONSE_CACHE_TTL_SECONDS <= 0:
+            return
+
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, body, ex=settings.RESPONSE_CACHE_TTL_SECONDS)
+                return
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        with self._lock:
+            self._local[key] = body
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_entries:
+                self._local.popitem(last=False)
+
+    def clear(self):
+        """Forget the in-process entries (tests)"""
+        with self._lock:
+            self._local.clear()
+
+
+# Shared across requests within a worker process
+response_cache = ResponseCache()
@@ -0,0 +1,33 @@
+"""
+Default JSON response class
+
+FastAPI first turns an endpoint's return value into JSON-compatible data
+(through the response model or jsonable_encoder); the response class then
+renders it to bytes. DefaultJSONResponse renders with orjson, several times
+faster than json.dumps on large payloads (see perf/payloads.py), and keeps
+the output of JSONResponse: compact separators, UTF-8 rather than \\u
+escapes, datetimes as isoformat(), and Decimal, sets and anything else
+orjson does not know converted by jsonable_encoder. Without orjson it is
+JSONResponse.
+"""
+
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional; json.dumps is used instead
+    orjson = None
+
+
+if orjson is not None:
+    # Datetimes go through jsonable_encoder (isoformat), like the rest of the API's output
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    class DefaultJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, default=jsonable_encoder, option=ORJSON_OPTIONS)
+else:
+    DefaultJSONResponse = JSONResponse
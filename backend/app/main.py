@@ -1,14 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import sentry_sdk
 import asyncio
+import hmac
 
 from app.core.config import settings
 from app.core.database import create_db_and_tables
+from app.core.executors import shutdown_executors
+from app.core.metrics import render_metrics
+from app.core.responses import DefaultJSONResponse
 from app.api.v1 import api_router
 from app.middleware.security import SecurityHeadersMiddleware, RequestSizeLimitMiddleware
 from app.middleware.rate_limit import limiter, RateLimitMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_guard import QueryGuardMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.services.healthcheck_monitor import healthcheck
@@ -52,12 +60,15 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    shutdown_executors()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="AI-powered contract intelligence API",
+    default_response_class=DefaultJSONResponse,  # orjson (see app.core.responses)
     lifespan=lifespan
 )
 
@@ -93,6 +104,25 @@ app.add_middleware(
     max_age=3600  # Cache preflight requests for 1 hour
 )
 
+# 5. Query counting and N+1 logging (staging)
+if settings.QUERY_GUARD_ENABLED:
+    app.add_middleware(QueryGuardMiddleware, max_queries=settings.QUERY_GUARD_MAX_QUERIES)
+
+# 6. Response compression (JSON and other text above COMPRESSION_MINIMUM_SIZE; never SSE)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
+# 7. Request profiling and slow-request capture (opt-in per request, see app.core.profiling)
+app.add_middleware(ProfilingMiddleware)
+
+# 8. Request metrics (outermost, so rejected and rate-limited requests are counted too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -114,3 +144,17 @@ async def health_check():
         "status": "healthy",
         "version": settings.VERSION
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    token = settings.METRICS_TOKEN
+    # Production only serves metrics to scrapers with METRICS_TOKEN
+    if not settings.METRICS_ENABLED or (not token and settings.ENVIRONMENT == "production"):
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("Authorization", "")
+    if token and not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -3,7 +3,9 @@ Middleware package for DafLegal API
 """
 
 from app.middleware.security import SecurityHeadersMiddleware, RequestSizeLimitMiddleware
-from app.middleware.rate_limit import limiter, user_limiter, get_user_rate_limit, RateLimitMiddleware
+from app.middleware.rate_limit import (
+    limiter, user_limiter, get_user_rate_limit, plan_rate_limiter, enforce_plan_rate_limit, RateLimitMiddleware
+)
 
 __all__ = [
     "SecurityHeadersMiddleware",
@@ -11,5 +13,7 @@ __all__ = [
     "limiter",
     "user_limiter",
     "get_user_rate_limit",
+    "plan_rate_limiter",
+    "enforce_plan_rate_limit",
     "RateLimitMiddleware"
 ]
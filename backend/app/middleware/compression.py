@@ -0,0 +1,169 @@
+"""
+Response compression middleware for DafLegal API
+"""
+
+import zlib
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is used instead
+    brotli = None
+
+# Never compressed: already compressed, partial, or without a body
+SKIPPED_STATUSES = {204, 206, 304}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The encoding to use for an Accept-Encoding header: "br" (if installed), "gzip" or None"""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(status: int, headers: List[Tuple[bytes, bytes]]) -> bool:
+    """Text-like responses that are not event streams or already encoded"""
+    if status < 200 or status in SKIPPED_STATUSES:
+        return False
+    content_type = b""
+    for name, value in headers:
+        name = name.lower()
+        if name == b"content-encoding":
+            return False
+        if name == b"cache-control" and b"no-transform" in value.lower():
+            return False
+        if name == b"content-type":
+            content_type = value.split(b";")[0].strip().lower()
+    if content_type == b"text/event-stream":  # SSE must reach the client event by event
+        return False
+    return content_type.startswith(b"text/") or content_type.endswith((b"json", b"xml", b"javascript"))
+
+
+class _BrotliCompressor:
+    """compress/flush interface of zlib compressors over brotli.Compressor"""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress text-like responses (JSON, CSV, HTML, ...) of at least
+    `minimum_size` bytes with brotli or gzip, as the client accepts.
+
+    Server-sent events, responses that are already encoded and those marked
+    no-transform are passed through. Streaming bodies are compressed as they
+    are sent (without Content-Length). A strong ETag becomes weak, since
+    the compressed bytes differ from the identity representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31: gzip framing
+
+    @staticmethod
+    def _encoded_headers(headers, encoding: str, length: Optional[int]):
+        result = []
+        vary = b"Accept-Encoding"
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"vary":
+                vary = value + b", Accept-Encoding"
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            result.append((name, value))
+        result += [(b"content-encoding", encoding.encode()), (b"vary", vary)]
+        if length is not None:
+            result.append((b"content-length", str(length).encode()))
+        return result
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate_encoding(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None  # held until the first body chunk decides
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if is_compressible(message["status"], message.get("headers", [])):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = self._compressor(encoding)
+                compressed = compressor.compress(body)
+                if not more_body:
+                    compressed += compressor.flush()
+                start["headers"] = self._encoded_headers(
+                    start.get("headers", []), encoding, None if more_body else len(compressed)
+                )
+                await send(start)
+            else:
+                compressed = compressor.compress(body)
+                if not more_body:
+                    compressed += compressor.flush()
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
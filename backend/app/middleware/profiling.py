@@ -0,0 +1,74 @@
+"""
+Request profiling middleware for DafLegal API
+"""
+
+import hmac
+import random
+import time
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiling import RequestProfile, current_profile, slow_requests
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that ask for it (X-Profile-Token: PROFILING_ADMIN_TOKEN)
+    or are sampled (PROFILING_SAMPLE_RATE), and capture slow requests.
+
+    Captured requests are kept in app.core.profiling.slow_requests; an
+    explicitly profiled request gets its capture id in X-Profile-Id.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _profile_reason(self, scope: Scope):
+        token = settings.PROFILING_ADMIN_TOKEN
+        supplied = Headers(scope=scope).get(PROFILE_TOKEN_HEADER, "")
+        if token and hmac.compare_digest(supplied.encode(), token.encode()):
+            return "requested"
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._profile_reason(scope)
+        profile = RequestProfile(reason) if reason else None
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if reason == "requested":
+                    message.setdefault("headers", []).append((PROFILE_ID_HEADER, profile.id.encode()))
+            await send(message)
+
+        if profile is not None:
+            profile.start()
+            token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                current_profile.reset(token)
+                profile.stop()
+            if reason == "requested" or elapsed * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+                route = scope.get("route")
+                slow_requests.add(
+                    scope["method"], scope["path"],
+                    getattr(route, "path_format", None) or getattr(route, "path", "unmatched"),
+                    status, elapsed, profile
+                )
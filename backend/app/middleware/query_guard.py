@@ -0,0 +1,51 @@
+"""
+Query guard middleware for DafLegal API
+"""
+
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.query_guard import QueryCounter, request_counter
+
+logger = logging.getLogger(__name__)
+
+
+class QueryGuardMiddleware:
+    """
+    Count the SQL statements of each request (staging). Adds X-Query-Count
+    to the response and logs requests over `max_queries` or with a
+    statement repeated enough to look like an N+1.
+    """
+
+    def __init__(self, app: ASGIApp, max_queries: int = 25):
+        self.app = app
+        self.max_queries = max_queries
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = request_counter.set(counter)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # Statements run after the headers (streaming bodies, background tasks) are only logged
+                message.setdefault("headers", []).append((b"x-query-count", str(counter.count).encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_counter.reset(token)
+            repeated = counter.repeated()
+            if counter.count > self.max_queries or repeated:
+                route = scope.get("route")
+                logger.warning(
+                    f"Query guard: {scope['method']} "
+                    f"{getattr(route, 'path_format', None) or getattr(route, 'path', scope['path'])} "
+                    f"ran {counter.count} queries (budget {self.max_queries})"
+                    + "".join(f"; N+1 {n}x: {statement[:200]}" for statement, n in repeated.items())
+                )
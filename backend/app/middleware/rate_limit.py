@@ -1,15 +1,38 @@
 """
 Rate limiting for DafLegal API
+
+`limiter` (slowapi, per IP) guards individual endpoints. Authenticated
+requests are also held to their plan's per-minute/hour/day limits
+(RATE_LIMITS) by `plan_rate_limiter`, per API key and shared by all workers:
+
+- Each window is a GCRA (generic cell rate algorithm) state in Redis, a
+  single "theoretical arrival time"; one Lua script checks and updates all
+  of a caller's windows atomically.
+- Each process leases a few requests at a time (RATE_LIMIT_LEASE_FRACTION
+  of the smallest window) and admits them locally, so most requests never
+  wait on Redis. A lease lasts RATE_LIMIT_SYNC_SECONDS; its unspent requests
+  are given back with the next acquisition. A denial is also kept locally
+  (until the retry time, at most RATE_LIMIT_SYNC_SECONDS).
+- Without Redis the same algorithm runs on per-process state.
 """
 
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
+from app.core.redis_client import get_redis, mark_redis_unavailable
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,31 +83,53 @@ user_limiter = Limiter(
 )
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Custom rate limiting middleware with better error messages
+
+    Plain ASGI (no BaseHTTPMiddleware) so streaming responses are not
+    buffered through an extra task; a RateLimitExceeded that reaches it
+    before the response has started becomes a JSON 429.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except RateLimitExceeded as e:
-            from fastapi.responses import JSONResponse
+            if response_started:
+                raise
+            await rate_limit_response(e)(scope, receive, send)
+
 
-            # Extract retry-after from exception if available
-            retry_after = getattr(e, 'retry_after', 60)
+def rate_limit_response(e: RateLimitExceeded) -> JSONResponse:
+    # Extract retry-after from exception if available
+    retry_after = getattr(e, 'retry_after', 60)
 
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "detail": "Rate limit exceeded. Please try again later.",
-                    "retry_after": retry_after,
-                    "limit": str(e),
-                    "message": "You have sent too many requests. Please wait before trying again."
-                },
-                headers={"Retry-After": str(retry_after)}
-            )
+    return JSONResponse(
+        status_code=429,
+        content={
+            "detail": "Rate limit exceeded. Please try again later.",
+            "retry_after": retry_after,
+            "limit": str(e),
+            "message": "You have sent too many requests. Please wait before trying again."
+        },
+        headers={"Retry-After": str(retry_after)}
+    )
 
 
 # Rate limit configurations for different plan tiers
@@ -112,14 +157,231 @@ RATE_LIMITS = {
 }
 
 
+# User plan values (PlanType) that are named differently in RATE_LIMITS
+PLAN_ALIASES = {
+    "free": "free_trial",
+    "basic": "starter",
+    "enterprise": "team"
+}
+
+WINDOW_SECONDS = {
+    "requests_per_minute": 60,
+    "requests_per_hour": 3600,
+    "requests_per_day": 86400
+}
+
+
+def get_plan_rate_limits(plan: str = "free_trial") -> Dict[str, int]:
+    """Rate limits for a plan (unknown plans get the free trial limits)"""
+    return RATE_LIMITS.get(PLAN_ALIASES.get(plan, plan), RATE_LIMITS["free_trial"])
+
+
 def get_user_rate_limit(plan: str = "free_trial") -> str:
     """
     Get rate limit string for a given plan
     Returns: slowapi limit string (e.g., "10/minute;100/hour;500/day")
     """
-    config = RATE_LIMITS.get(plan, RATE_LIMITS["free_trial"])
+    config = get_plan_rate_limits(plan)
     return f"{config['requests_per_minute']}/minute;{config['requests_per_hour']}/hour;{config['requests_per_day']}/day"
 
 
+# KEYS: one GCRA state per window; ARGV: requested, returned, then limit and period of each window.
+# "now" is the Redis server clock, so workers with skewed clocks share one timeline
+# (TIME before writes relies on effects replication, the default since Redis 5).
+# Gives back `returned` unspent requests, then grants as many of `requested` as every window allows.
+# Returns {granted, seconds until one more request is allowed (when none were)}.
+_ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local requested = tonumber(ARGV[1])
+local returned = tonumber(ARGV[2])
+local granted = requested
+local retry_after = 0
+local tats, intervals = {}, {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local period = tonumber(ARGV[2 + 2 * i])
+    local interval = period / limit
+    local tat = math.max(tonumber(redis.call('GET', key) or now) - returned * interval, now)
+    local available = math.floor((now + period - tat) / interval + 1e-9)
+    if available < 1 then
+        retry_after = math.max(retry_after, tat + interval - period - now)
+    end
+    granted = math.min(granted, math.max(available, 0))
+    tats[i], intervals[i] = tat, interval
+end
+for i, key in ipairs(KEYS) do
+    local tat = tats[i] + granted * intervals[i]
+    if tat > now then
+        redis.call('SET', key, tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+    else
+        redis.call('DEL', key)
+    end
+end
+return {granted, tostring(retry_after)}
+"""
+
+
+def gcra_acquire(
+    tats: Dict[str, float],
+    windows: List[Tuple[str, int, int]],
+    requested: int,
+    now: float,
+    returned: int = 0
+) -> Tuple[int, float]:
+    """
+    In-process twin of _ACQUIRE_SCRIPT over `tats` (state key -> theoretical
+    arrival time); `windows` are (state key, limit, period seconds)
+    """
+    granted = requested
+    retry_after = 0.0
+    updated = []
+    for key, limit, period in windows:
+        interval = period / limit
+        tat = max(tats.get(key, now) - returned * interval, now)
+        available = math.floor((now + period - tat) / interval + 1e-9)
+        if available < 1:
+            retry_after = max(retry_after, tat + interval - period - now)
+        granted = min(granted, max(available, 0))
+        updated.append((key, tat, interval))
+    for key, tat, interval in updated:
+        tat += granted * interval
+        if tat > now:
+            tats[key] = tat
+        else:
+            tats.pop(key, None)
+    return granted, retry_after
+
+
+class PlanRateLimitExceeded(HTTPException):
+    """Raised when a caller is over a limit of their plan (returned to the client as 429)"""
+
+    def __init__(self, retry_after: float):
+        retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            status_code=429,
+            detail="Rate limit exceeded. Please try again later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class PlanRateLimiter:
+    """
+    Per-caller, plan-aware rate limits shared across workers (see the module
+    docstring). Callers are API keys, identified by a hash of the key.
+    """
+
+    def __init__(self, sync_seconds: Optional[float] = None, lease_fraction: Optional[float] = None):
+        from app.core.config import settings
+
+        self.sync_seconds = settings.RATE_LIMIT_SYNC_SECONDS if sync_seconds is None else sync_seconds
+        self.lease_fraction = settings.RATE_LIMIT_LEASE_FRACTION if lease_fraction is None else lease_fraction
+        self._leases: Dict[str, Dict[str, float]] = {}  # caller -> {"remaining", "expires", "retry_at"}
+        self._local_tats: Dict[str, float] = {}  # GCRA state while Redis is unavailable
+        self._script = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def caller_id(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def windows(caller: str, plan: str) -> List[Tuple[str, int, int]]:
+        """(state key, limit, period seconds) of each window, smallest first"""
+        limits = get_plan_rate_limits(plan)
+        return [
+            (f"ratelimit:{caller}:{period}", limits[name], period)
+            for name, period in WINDOW_SECONDS.items()
+        ]
+
+    def lease_size(self, windows: List[Tuple[str, int, int]]) -> int:
+        return max(1, int(windows[0][1] * self.lease_fraction))
+
+    def hit(self, caller: str, plan: str) -> Optional[float]:
+        """Count one request; None if it is allowed, otherwise seconds until one will be"""
+        now = time.monotonic()
+        with self._lock:
+            lease = self._leases.pop(caller, None)
+            if lease is not None and lease["expires"] > now:
+                if lease["remaining"] > 0:
+                    lease["remaining"] -= 1
+                    self._leases[caller] = lease
+                    return None
+                if lease["retry_at"]:
+                    # Denied recently: answer locally instead of asking Redis again
+                    self._leases[caller] = lease
+                    return lease["retry_at"] - now
+        returned = int(lease["remaining"]) if lease is not None else 0
+
+        windows = self.windows(caller, plan)
+        granted, retry_after = self._acquire(windows, self.lease_size(windows), returned)
+
+        with self._lock:
+            if len(self._leases) > 10000:
+                self._leases = {k: v for k, v in self._leases.items() if v["expires"] > now}
+            if granted == 0:
+                self._leases[caller] = {
+                    "remaining": 0,
+                    "expires": now + min(retry_after, self.sync_seconds),
+                    "retry_at": now + retry_after
+                }
+                return retry_after
+            current = self._leases.get(caller)
+            if current is not None and current["expires"] > now and not current["retry_at"]:
+                current["remaining"] += granted - 1
+            else:
+                self._leases[caller] = {"remaining": granted - 1, "expires": now + self.sync_seconds, "retry_at": 0.0}
+        return None
+
+    def _acquire(self, windows: List[Tuple[str, int, int]], requested: int, returned: int) -> Tuple[int, float]:
+        client = get_redis()
+        if client is not None:
+            try:
+                if self._script is None or self._script.registered_client is not client:
+                    self._script = client.register_script(_ACQUIRE_SCRIPT)
+                args = [requested, returned]
+                for _, limit, period in windows:
+                    args += [limit, period]
+                granted, retry_after = self._script(keys=[key for key, _, _ in windows], args=args)
+                return int(granted), float(retry_after)
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+
+        now = time.time()
+        with self._lock:
+            if len(self._local_tats) > 10000:
+                self._local_tats = {k: t for k, t in self._local_tats.items() if t > now}
+            return gcra_acquire(self._local_tats, windows, requested, now, returned)
+
+    def reset(self):
+        """Forget local leases and state (tests)"""
+        with self._lock:
+            self._leases.clear()
+            self._local_tats.clear()
+
+
+plan_rate_limiter = PlanRateLimiter()
+
+
+def enforce_plan_rate_limit(api_key: str, plan: str):
+    """Count a request against its API key's plan limits; raises PlanRateLimitExceeded (429)"""
+    from app.core.config import settings
+
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    retry_after = plan_rate_limiter.hit(PlanRateLimiter.caller_id(api_key), plan)
+    if retry_after is not None:
+        raise PlanRateLimitExceeded(retry_after)
+
+
 # Export limiter instances
-__all__ = ["limiter", "user_limiter", "get_user_rate_limit", "RateLimitMiddleware"]
+__all__ = [
+    "limiter",
+    "user_limiter",
+    "get_user_rate_limit",
+    "get_plan_rate_limits",
+    "plan_rate_limiter",
+    "enforce_plan_rate_limit",
+    "PlanRateLimitExceeded",
+    "RateLimitMiddleware"
+]
@@ -1,84 +1,171 @@
 """
 Security middleware for DafLegal API
-"""
-
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
 
+Both middlewares are plain ASGI callables rather than BaseHTTPMiddleware
+subclasses, so a request does not pay for an extra task and memory stream,
+and streaming responses (SSE progress, CSV exports) pass straight through.
+"""
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+import json
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+SECURITY_HEADERS: Dict[str, str] = {
+    # Strict Transport Security (HSTS)
+    # Force HTTPS for 1 year, include subdomains
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+
+    # Content Security Policy (CSP)
+    # Restrict resource loading to prevent XSS
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data: https:; "
+        "font-src 'self' data:; "
+        "connect-src 'self' https://api.openai.com https://api.stripe.com; "
+        "frame-ancestors 'none'; "
+        "base-uri 'self'; "
+        "form-action 'self'"
+    ),
+
+    # Prevent clickjacking
+    "X-Frame-Options": "DENY",
+
+    # Prevent MIME type sniffing
+    "X-Content-Type-Options": "nosniff",
+
+    # XSS Protection (legacy but still useful for older browsers)
+    "X-XSS-Protection": "1; mode=block",
+
+    # Referrer Policy - only send origin when cross-origin
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+
+    # Permissions Policy (formerly Feature Policy)
+    # Disable unnecessary browser features
+    "Permissions-Policy": (
+        "geolocation=(), "
+        "microphone=(), "
+        "camera=(), "
+        "payment=(), "
+        "usb=(), "
+        "magnetometer=(), "
+        "gyroscope=(), "
+        "accelerometer=()"
+    ),
+}
+
+
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses
+
+    The raw header list is built once; each response start only filters out
+    any same-named headers the endpoint set and appends the list.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-
-        # Strict Transport Security (HSTS)
-        # Force HTTPS for 1 year, include subdomains
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-        # Content Security Policy (CSP)
-        # Restrict resource loading to prevent XSS
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self' https://api.openai.com https://api.stripe.com; "
-            "frame-ancestors 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'"
-        )
+    def __init__(self, app: ASGIApp, headers: Optional[Dict[str, str]] = None):
+        self.app = app
+        headers = SECURITY_HEADERS if headers is None else headers
+        self.raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                            for name, value in headers.items()]
+        self._names = frozenset(name for name, _ in self.raw_headers)
 
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # XSS Protection (legacy but still useful for older browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer Policy - only send origin when cross-origin
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions Policy (formerly Feature Policy)
-        # Disable unnecessary browser features
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=(), "
-            "usb=(), "
-            "magnetometer=(), "
-            "gyroscope=(), "
-            "accelerometer=()"
-        )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = [h for h in message.get("headers", ()) if h[0].lower() not in self._names]
+                headers.extend(self.raw_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
-        return response
 
+class RequestTooLarge(HTTPException):
+    """Raised from receive() once a request body passes the size limit"""
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, max_size: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body too large. Maximum size: {max_size / (1024 * 1024):.1f}MB"
+        )
+
+
+class RequestSizeLimitMiddleware:
     """
     Limit request body size to prevent DoS attacks
+
+    A declared Content-Length over the limit is rejected before the app
+    runs. Bodies without one (chunked uploads) are counted as they are
+    received, and reading stops at the first chunk past the limit instead
+    of buffering the whole upload. The endpoint sees RequestTooLarge, an
+    HTTPException, so FastAPI answers 413; anything else that lets it
+    escape gets the same 413 here, provided the response has not started.
     """
 
-    def __init__(self, app, max_size: int = 100 * 1024 * 1024):  # 100MB default
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, max_size: int = 100 * 1024 * 1024):  # 100MB default
+        self.app = app
         self.max_size = max_size
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Check Content-Length header
-        content_length = request.headers.get("content-length")
-
-        if content_length and int(content_length) > self.max_size:
-            from fastapi import HTTPException, status
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"Request body too large. Maximum size: {self.max_size / (1024 * 1024):.1f}MB"
-            )
-
-        return await call_next(request)
+        self._error = RequestTooLarge(max_size)
+        self._error_body = json.dumps({"detail": self._error.detail}).encode()
+
+    def _declared_length(self, scope: Scope) -> Optional[int]:
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                return int(value) if value.isdigit() else None
+        return None
+
+    async def _reject(self, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self._error.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self._error_body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self._error_body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        declared = self._declared_length(scope)
+        if declared is not None and declared > self.max_size:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise RequestTooLarge(self.max_size)
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except RequestTooLarge:
+            if response_started:
+                raise
+            await self._reject(send)
@@ -1,5 +1,5 @@
 from .user import User, APIKey
-from .contract import Contract, ContractAnalysis, ContractComparison
+from .contract import Contract, ContractAnalysis, ContractComparison, ContractText, ContractSectionIndex
 from .usage import UsageRecord
 from .clause import Clause, ClauseLibrary, ClauseLibraryMembership, ClauseUsageLog, ClauseSuggestion
 from .compliance import Playbook, ComplianceRule, ComplianceCheck, ComplianceException, ComplianceTemplate
@@ -11,10 +11,14 @@ from .conveyancing import (
     ConveyancingTransaction, Property, TransactionParty, TransactionMilestone,
     OfficialSearch, ConveyancingDocument, StampDutyCalculation, ConveyancingChecklist
 )
+from .timeline import (
+    TimelineMatter, MatterDocument, MatterDocumentText, MatterEvent, MatterEventParty, MatterSearchPosting,
+    TimelineBatch, TimelineBatchItem
+)
 
 __all__ = [
     "User", "APIKey",
-    "Contract", "ContractAnalysis", "ContractComparison",
+    "Contract", "ContractAnalysis", "ContractComparison", "ContractText", "ContractSectionIndex",
     "UsageRecord",
     "Clause", "ClauseLibrary", "ClauseLibraryMembership", "ClauseUsageLog", "ClauseSuggestion",
     "Playbook", "ComplianceRule", "ComplianceCheck", "ComplianceException", "ComplianceTemplate",
@@ -23,5 +27,7 @@ __all__ = [
     "CitationCheck", "CitationIssue", "CitationFormat",
     "ClientIntake", "IntakeNote", "RoutingRule", "MatterType", "LawyerSpecialization", "IntakeAssignment",
     "ConveyancingTransaction", "Property", "TransactionParty", "TransactionMilestone",
-    "OfficialSearch", "ConveyancingDocument", "StampDutyCalculation", "ConveyancingChecklist"
+    "OfficialSearch", "ConveyancingDocument", "StampDutyCalculation", "ConveyancingChecklist",
+    "TimelineMatter", "MatterDocument", "MatterDocumentText", "MatterEvent", "MatterEventParty", "MatterSearchPosting",
+    "TimelineBatch", "TimelineBatchItem"
 ]
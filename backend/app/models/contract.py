@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import LargeBinary
 from enum import Enum
 
 
@@ -76,7 +77,8 @@ class ContractAnalysis(SQLModel, table=True):
     risk_score: float = Field(default=0.0)  # 0-10 scale
     overall_risk_level: RiskLevel = Field(default=RiskLevel.LOW)
 
-    # Full extracted text (for reference)
+    # Legacy inline copy of the extracted text (first 50k chars); new analyses
+    # store the full text compressed in contract_texts (see ContractTextStore)
     extracted_text: Optional[str] = None
 
     # Metadata
@@ -88,6 +90,42 @@ class ContractAnalysis(SQLModel, table=True):
     contract: Contract = Relationship(back_populates="analysis")
 
 
+class ContractText(SQLModel, table=True):
+    """
+    Compressed extracted text of a contract, split into segments of whole
+    pages so features can load only the pages they need
+    """
+    __tablename__ = "contract_texts"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    contract_id: int = Field(foreign_key="contracts.id", index=True)
+    segment: int  # 0-based position of the segment in the document
+
+    first_page: int  # 1-based page number of the segment's first page
+    page_count: int
+    start_offset: int  # Offset of the segment in the full text
+    char_length: int  # Uncompressed length
+
+    codec: str  # zstd, zlib
+    content: bytes = Field(sa_column=Column(LargeBinary))
+
+
+class ContractSectionIndex(SQLModel, table=True):
+    """Section/clause tree of a contract's extracted text, built without the LLM"""
+    __tablename__ = "contract_section_indexes"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    contract_id: int = Field(foreign_key="contracts.id", unique=True, index=True)
+
+    # One row per section in document order:
+    # [start, end, level, parent_index, page, number, title]
+    sections: list = Field(default=[], sa_column=Column(JSON))
+    section_count: int = Field(default=0)
+    text_length: int = Field(default=0)  # Length of the text the offsets refer to
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class ContractComparison(SQLModel, table=True):
     """Comparison between two contract versions"""
     __tablename__ = "contract_comparisons"
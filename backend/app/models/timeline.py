@@ -0,0 +1,177 @@
+"""
+Matter Timeline Models
+
+Matters, their uploaded documents and the dated events extracted from them.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import Column, Index, Text, JSON
+
+
+class TimelineMatter(SQLModel, table=True):
+    """A matter/case whose documents are assembled into a timeline"""
+    __tablename__ = "timeline_matters"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    matter_id: str = Field(unique=True, index=True)  # mat_xxx
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    name: str
+    description: Optional[str] = Field(default=None, sa_column=Column(Text))
+
+    # Aggregates kept up to date on upload/delete
+    document_count: int = Field(default=0)
+    event_count: int = Field(default=0)
+    hot_docs_count: int = Field(default=0)
+
+    # AI matter summary cached against a hash of the events it was built from
+    matter_summary: Optional[str] = Field(default=None, sa_column=Column(Text))
+    summary_key: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    documents: list["MatterDocument"] = Relationship(back_populates="matter")
+
+
+class MatterDocument(SQLModel, table=True):
+    """Document uploaded to a matter, with its extraction metadata"""
+    __tablename__ = "timeline_documents"
+    __table_args__ = (
+        Index("ix_timeline_documents_matter_hot", "matter_id", "is_hot_doc"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    doc_id: str = Field(unique=True, index=True)  # doc_xxx
+    matter_id: str = Field(foreign_key="timeline_matters.matter_id", index=True)
+
+    filename: str
+    doc_type: str = Field(default="Other")  # Email, Letter, Contract, Court Filing, etc.
+    doc_date: Optional[str] = None
+    importance: str = Field(default="medium")  # high, medium, low
+    is_hot_doc: bool = Field(default=False)
+    hot_doc_reason: str = Field(default="", sa_column=Column(Text))
+    summary: str = Field(default="", sa_column=Column(Text))
+
+    page_count: int = Field(default=0)
+    word_count: int = Field(default=0)
+    event_count: int = Field(default=0)
+
+    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Relationships
+    matter: TimelineMatter = Relationship(back_populates="documents")
+
+
+class MatterDocumentText(SQLModel, table=True):
+    """Extracted text of a matter document, stored apart so it is only loaded on demand"""
+    __tablename__ = "timeline_document_texts"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    doc_id: str = Field(foreign_key="timeline_documents.doc_id", unique=True, index=True)
+    content: str = Field(sa_column=Column(Text))
+
+
+class MatterEvent(SQLModel, table=True):
+    """Dated event extracted from a matter document"""
+    __tablename__ = "timeline_events"
+    __table_args__ = (
+        Index("ix_timeline_events_matter_date", "matter_id", "sort_date"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    matter_id: str = Field(foreign_key="timeline_matters.matter_id")
+    doc_id: str = Field(foreign_key="timeline_documents.doc_id", index=True)
+
+    event_date: str  # As extracted, usually YYYY-MM-DD
+    sort_date: date  # Parsed date used for ordering (1900-01-01 if unparseable)
+    date_precision: str = Field(default="exact")  # exact, approximate, inferred
+    event_type: str = Field(default="other")  # communication, agreement, breach, payment, etc.
+    description: str = Field(sa_column=Column(Text))
+    parties_involved: list[str] = Field(default=[], sa_column=Column(JSON))
+    significance: str = Field(default="medium")  # high, medium, low
+    quote: Optional[str] = Field(default=None, sa_column=Column(Text))
+
+    # Denormalized from the source document for timeline rendering
+    source_filename: str
+    source_is_hot: bool = Field(default=False)
+
+
+class MatterEventParty(SQLModel, table=True):
+    """Party mentioned in a matter event (for party lookups and key-party lists)"""
+    __tablename__ = "timeline_event_parties"
+    __table_args__ = (
+        Index("ix_timeline_event_parties_matter_party", "matter_id", "party"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    matter_id: str = Field(foreign_key="timeline_matters.matter_id")
+    event_id: int = Field(foreign_key="timeline_events.id", index=True)
+    party: str
+
+
+class MatterSearchPosting(SQLModel, table=True):
+    """
+    Inverted index posting: one token in one field of an event or document
+
+    Document-level postings (filename, summary) have no event_id.
+    """
+    __tablename__ = "timeline_search_postings"
+    __table_args__ = (
+        # text_pattern_ops lets PostgreSQL use the index for prefix LIKE under non-C collations
+        Index(
+            "ix_timeline_search_postings_matter_token", "matter_id", "token",
+            postgresql_ops={"token": "text_pattern_ops"}
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    matter_id: str = Field(foreign_key="timeline_matters.matter_id")
+    token: str
+    doc_id: str = Field(foreign_key="timeline_documents.doc_id", index=True)
+    event_id: Optional[int] = Field(default=None, foreign_key="timeline_events.id")
+    field: str  # description, quote, party, filename, summary
+    positions: list[int] = Field(default=[], sa_column=Column(JSON))  # Token offsets within the field
+
+
+class TimelineBatch(SQLModel, table=True):
+    """Batch of documents ingested into a matter by a background job"""
+    __tablename__ = "timeline_batches"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    batch_id: str = Field(unique=True, index=True)  # bat_xxx
+    matter_id: str = Field(foreign_key="timeline_matters.matter_id", index=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    status: str = Field(default="queued")  # queued, processing, completed
+    total_documents: int = Field(default=0)
+    processed_documents: int = Field(default=0)
+    failed_documents: int = Field(default=0)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class TimelineBatchItem(SQLModel, table=True):
+    """One file of a batch, spooled to storage until it is processed"""
+    __tablename__ = "timeline_batch_items"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    batch_id: str = Field(foreign_key="timeline_batches.batch_id", index=True)
+    position: int = Field(default=0)
+
+    filename: str
+    file_type: str  # pdf, docx, txt
+    spool_key: Optional[str] = None  # Storage key while waiting to be processed
+
+    status: str = Field(default="queued")  # queued, extracting, analyzing, completed, failed
+    doc_id: Optional[str] = None
+    event_count: int = Field(default=0)
+    is_hot_doc: bool = Field(default=False)
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
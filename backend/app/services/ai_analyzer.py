@@ -1,26 +1,27 @@
 import json
-from typing import Dict, Any, List
-from openai import OpenAI
+from typing import Dict, Any, List, Optional
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
-from app.services.document_processor import DocumentProcessor
+from app.services.clause_classifier import ClauseClassifier
+
+ANALYSIS_MAX_TOKENS = 4000
 
 
 class AIContractAnalyzer:
     """Analyze contracts using OpenAI GPT-4o mini"""
 
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, classifier: Optional[ClauseClassifier] = None):
+        self.client = get_llm_client(feature="contract_analysis")
         self.model = settings.OPENAI_MODEL
+        self.classifier = classifier or ClauseClassifier()
 
     def analyze_contract(self, extracted_text: str) -> Dict[str, Any]:
         """
         Analyze contract and return structured results
         """
-        # Chunk text if needed
-        chunks = DocumentProcessor.chunk_text(extracted_text, max_chunk_size=8000)
-
-        # For MVP, analyze first chunk or combine if small enough
-        text_to_analyze = extracted_text[:15000]  # Limit for cost control
+        # Limit for cost control: the preamble and the sections the local
+        # pre-classifier tags as clauses of interest, within the token budget
+        text_to_analyze = self.classifier.select_relevant(extracted_text, ANALYSIS_MAX_TOKENS)["text"]
 
         # Build the analysis prompt
         prompt = self._build_analysis_prompt(text_to_analyze)
@@ -91,6 +92,8 @@ Identify which of these standard clauses are MISSING (return as array of strings
 - overall_risk_level: "low", "medium", or "high"
 
 **Contract Text:**
+(Long contracts are reduced to their opening and the sections relevant to the clauses above;
+"[...]" marks omitted text. Only report a standard clause as missing if it does not appear.)
 {text}
 
 Return ONLY valid JSON with this exact structure:
@@ -0,0 +1,283 @@
+"""
+Structure-Aware Document Chunker
+
+Splits extracted document text into chunks sized in (approximate) model
+tokens rather than characters. Chunks break at clause and section
+boundaries detected from numbering (1., 1.1, (a), (iv), Article IV,
+Section 3) where possible, can overlap, and carry character offsets into
+the source text plus the pages they span, so results can be traced back
+to the document.
+
+Page boundaries are form feeds ("\f"), which DocumentProcessor places
+between PDF pages.
+"""
+import bisect
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # Not installed, or the encoding can't be loaded offline
+    _ENCODING = None
+
+PAGE_BREAK = "\f"
+
+# Approximation of a BPE tokenizer: words cost about one token per 4 characters,
+# every other non-space character is its own token
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+# truncate_to_tokens chunks at most this many characters per token of budget
+CHARS_PER_TOKEN_BOUND = 8
+
+HEADING_PATTERNS = [
+    # Article IV / ARTICLE 4 / Section 3 / SCHEDULE 2 / Part B
+    (re.compile(r"^(ARTICLE|Article|SECTION|Section|SCHEDULE|Schedule|PART|Part)\s+([IVXLC]+|\d+|[A-Z])\b"), 1),
+    # 1. / 1.1 / 1.1.1 / 2)
+    (re.compile(r"^(\d{1,3}(?:\.\d{1,3})*)(?:[.)]\s+|\s+(?=[A-Z\"\u201c(]))"), None),
+    # (a) / (iv) / (A)
+    (re.compile(r"^\(([a-z]{1,2}|[ivxlc]{1,5}|[A-Z])\)\s+"), 4),
+]
+
+
+def count_tokens(text: str) -> int:
+    """Token count of text (exact with tiktoken installed, otherwise approximated)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return sum(
+        math.ceil(len(token) / 4) if token[0].isalnum() or token[0] == "_" else 1
+        for token in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def parse_heading(line: str) -> Optional[Tuple[int, str, str]]:
+    """
+    (level, number, title) of a numbered heading/clause line, or None
+
+        "ARTICLE IV Termination" -> (1, "Article IV", "Termination")
+        "3.2 Payment terms"      -> (2, "3.2", "Payment terms")
+        "(a) the Fees; and"      -> (4, "(a)", "the Fees; and")
+    """
+    stripped = line.strip()
+    if not stripped:
+        return None
+    for pattern, level in HEADING_PATTERNS:
+        match = pattern.match(stripped)
+        if not match:
+            continue
+        title = stripped[match.end():].lstrip(" .:-\t")
+        if level == 1 and match.lastindex == 2:
+            return level, f"{match.group(1).title()} {match.group(2)}", title
+        if level is None:
+            return match.group(1).count(".") + 1, match.group(1), title
+        return level, f"({match.group(1)})", title
+    return None
+
+
+def heading_level(line: str) -> Optional[int]:
+    """Nesting level of a numbered heading/clause line (1 = top), or None"""
+    heading = parse_heading(line)
+    return heading[0] if heading else None
+
+
+def _blocks(text: str) -> List[Dict[str, Any]]:
+    """
+    Split text into blocks: paragraphs, with a new block at every heading,
+    blank line or page break. Offsets index into the original text.
+    """
+    blocks = []
+    start = None
+    level = None
+    offset = 0
+
+    def close(end: int):
+        if start is not None:
+            # Trim trailing whitespace so chunk text ends on content
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if end > start:
+                blocks.append({"start": start, "end": end, "level": level})
+
+    for line in text.splitlines(keepends=True):
+        content = line.strip()
+        line_level = heading_level(line)
+        if not content or PAGE_BREAK in line or line_level is not None:
+            close(offset)
+            start, level = None, None
+        if content and start is None:
+            start = offset + (len(line) - len(line.lstrip()))
+            level = line_level
+        offset += len(line)
+    close(offset)
+
+    return blocks
+
+
+def _piece(text: str, start: int, end: int) -> Dict[str, Any]:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return {"start": start, "end": end, "level": None}
+
+
+def _split_block(text: str, block: Dict[str, Any], max_tokens: int) -> List[Dict[str, Any]]:
+    """Split an oversized block at sentence ends, then at word boundaries"""
+    pieces = []
+    start = block["start"]
+    boundaries = [m.end() for m in _SENTENCE_END.finditer(text, block["start"], block["end"])]
+    boundaries.append(block["end"])
+
+    piece_start = start
+    last_fit = None
+    fit_tokens = 0  # Tokens in text[piece_start:last_fit], summed sentence by sentence
+    for boundary in boundaries:
+        sentence_tokens = count_tokens(text[last_fit if last_fit is not None else piece_start:boundary])
+        if fit_tokens + sentence_tokens <= max_tokens:
+            last_fit = boundary
+            fit_tokens += sentence_tokens
+            continue
+        if last_fit is not None and last_fit > piece_start:
+            pieces.append(_piece(text, piece_start, last_fit))
+            piece_start = last_fit
+        # A single sentence still too long: cut on whitespace
+        while count_tokens(text[piece_start:boundary]) > max_tokens:
+            cut = _word_cut(text, piece_start, boundary, max_tokens)
+            pieces.append(_piece(text, piece_start, cut))
+            piece_start = cut
+            while piece_start < boundary and text[piece_start].isspace():
+                piece_start += 1
+        last_fit = boundary
+        fit_tokens = count_tokens(text[piece_start:boundary])
+
+    if piece_start < block["end"]:
+        pieces.append(_piece(text, piece_start, block["end"]))
+
+    if pieces:
+        pieces[0]["level"] = block["level"]
+    return [p for p in pieces if p["end"] > p["start"]]
+
+
+def _word_cut(text: str, start: int, end: int, max_tokens: int) -> int:
+    """Largest whitespace position in (start, end) keeping the piece within max_tokens"""
+    low, high = start + 1, end
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[start:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    space = text.rfind(" ", start + 1, low)
+    return space if space > start else max(low, start + 1)
+
+
+def chunk_document(
+    text: str,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 0,
+    min_fill: float = 0.5,
+    page_offsets: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Split text into token-bounded chunks along its clause structure
+
+    A chunk ends early (once it is at least `min_fill` full) rather than
+    cutting into a new top-level section, and `overlap_tokens` worth of
+    trailing blocks are repeated at the start of the next chunk.
+
+    `page_offsets` are the start offsets of pages 2, 3, ...; by default
+    they are the positions of form feeds in the text.
+
+    Returns:
+    [
+        {
+            "index": 0,
+            "text": "1. Definitions ...",   # == text[start:end]
+            "start": 0,
+            "end": 1830,
+            "token_count": 412,
+            "page_start": 1,
+            "page_end": 2,
+            "heading": "1. Definitions"     # Nearest heading at or before the chunk start
+        }
+    ]
+    """
+    if page_offsets is None:
+        page_offsets = [m.start() for m in re.finditer(PAGE_BREAK, text)]
+
+    blocks = []
+    for block in _blocks(text):
+        block["tokens"] = count_tokens(text[block["start"]:block["end"]])
+        if block["tokens"] > max_tokens:
+            for piece in _split_block(text, block, max_tokens):
+                piece["tokens"] = count_tokens(text[piece["start"]:piece["end"]])
+                blocks.append(piece)
+        else:
+            blocks.append(block)
+
+    chunks: List[Dict[str, Any]] = []
+    current: List[Dict[str, Any]] = []
+    current_tokens = 0
+    last_heading: Optional[str] = None
+
+    def flush():
+        start, end = current[0]["start"], current[-1]["end"]
+        chunks.append({
+            "index": len(chunks),
+            "text": text[start:end],
+            "start": start,
+            "end": end,
+            "token_count": count_tokens(text[start:end]),
+            "page_start": bisect.bisect_right(page_offsets, start) + 1,
+            "page_end": bisect.bisect_right(page_offsets, end - 1) + 1,
+            "heading": current[0]["heading"]
+        })
+
+    for block in blocks:
+        # Lettered sub-clauses are too fine-grained to label a chunk
+        if block["level"] is not None and block["level"] < 4:
+            last_heading = text[block["start"]:block["end"]].split("\n", 1)[0].strip()[:200]
+        block["heading"] = last_heading
+
+        would_overflow = current_tokens + block["tokens"] > max_tokens
+        section_break = (
+            block["level"] is not None and block["level"] <= 1
+            and current_tokens >= max_tokens * min_fill
+        )
+        if current and (would_overflow or section_break):
+            flush()
+            carried = []
+            carried_tokens = 0
+            for previous in reversed(current):
+                if carried_tokens + previous["tokens"] > overlap_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous["tokens"]
+            if carried_tokens + block["tokens"] > max_tokens:
+                carried, carried_tokens = [], 0
+            current, current_tokens = carried, carried_tokens
+
+        current.append(block)
+        current_tokens += block["tokens"]
+
+    if current:
+        flush()
+
+    return chunks
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Leading part of text within a token budget, ending on a clause or
+    sentence boundary where possible (for prompts with a size limit)
+    """
+    # Tokens average about 4 characters, so the budget ends well inside this
+    # prefix; chunking only the prefix keeps the cost independent of the
+    # document's length
+    prefix = text[:max_tokens * CHARS_PER_TOKEN_BOUND]
+    if len(prefix) == len(text) and count_tokens(text) <= max_tokens:
+        return text
+    chunks = chunk_document(prefix, max_tokens=max_tokens, min_fill=1.0)
+    if chunks and chunks[0]["token_count"] <= max_tokens:
+        return chunks[0]["text"]
+    return prefix[:max_tokens * 4]  # Hard cut at about 4 characters per token
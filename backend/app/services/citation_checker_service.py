@@ -10,9 +10,13 @@ import secrets
 from datetime import datetime
 from typing import Optional
 from sqlmodel import Session, select
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 
 from app.models.citation_checker import CitationCheck, CitationIssue, CitationFormat
+from app.core.bulk import bulk_insert, generate_ids
+from app.services.chunker import truncate_to_tokens
+
+CITATION_PROMPT_MAX_TOKENS = 800
 
 
 class CitationCheckerService:
@@ -20,7 +24,7 @@ class CitationCheckerService:
 
     def __init__(self, db: Session, openai_api_key: str):
         self.db = db
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_llm_client(openai_api_key, feature="citation_check")
 
     def check_citations(
         self,
@@ -63,10 +67,11 @@ class CitationCheckerService:
                 check_id=check.check_id
             )
 
-            # Save issues
-            for issue_data in issues:
-                issue = CitationIssue(
-                    issue_id=f"iss_{secrets.token_hex(8)}",
+            # Save issues in one multi-row INSERT
+            issue_ids = generate_ids("iss", len(issues))
+            bulk_insert(self.db, CitationIssue, [
+                dict(
+                    issue_id=issue_id,
                     check_id=check.check_id,
                     citation_text=issue_data["citation_text"],
                     citation_type=issue_data.get("citation_type", "unknown"),
@@ -82,7 +87,8 @@ class CitationCheckerService:
                     verification_status=issue_data.get("verification_status"),
                     surrounding_text=issue_data.get("surrounding_text")
                 )
-                self.db.add(issue)
+                for issue_id, issue_data in zip(issue_ids, issues)
+            ], returning=False)
 
             # Calculate statistics
             total_citations = len(issues) if issues else self._count_citations(document_text)
@@ -127,8 +133,8 @@ class CitationCheckerService:
 
 Analyze this legal document and identify ALL legal citations. For each citation found, determine if it follows proper {citation_format} format.
 
-Document (first 3000 chars):
-{document_text[:3000]}
+Document (opening section):
+{truncate_to_tokens(document_text, CITATION_PROMPT_MAX_TOKENS)}
 
 For each citation, provide:
 1. The citation text as it appears
@@ -0,0 +1,348 @@
+"""
+Local Clause Pre-Classifier
+
+Tags the sections of a contract that are likely to hold the clauses the
+analyzer asks the LLM about (termination, indemnity, liability cap, IP,
+confidentiality, payment, renewal, plus the standard clauses it reports as
+missing), so only those sections are sent instead of the leading part of
+the document.
+
+Two deterministic signals are combined:
+- a keyword automaton: one compiled alternation with a named group per
+  clause type, run once over each section
+- a TF-IDF + one-vs-rest logistic regression model trained on the clause
+  excerpts stored in ContractAnalysis.detected_clauses, which catches
+  clauses worded without the usual keywords
+
+The model is trained by the train_clause_model beat task every
+CLAUSE_MODEL_REFRESH_SECONDS and stored in Redis; workers load the stored
+model (checking for a new one every CLAUSE_MODEL_RELOAD_SECONDS) and never
+train while processing a contract. Without Redis each process trains its
+own, on at most CLAUSE_MODEL_MAX_EXAMPLES examples. Without enough stored
+examples only keywords are used.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.redis_client import get_redis, mark_redis_unavailable
+from app.models.contract import ContractAnalysis
+from app.services.chunker import chunk_document, count_tokens, truncate_to_tokens
+
+CLAUSE_PATTERNS: Dict[str, List[str]] = {
+    "termination": [r"terminat\w*", r"notice of non-renewal", r"for convenience", r"material breach"],
+    "indemnity": [r"indemni\w*", r"hold harmless", r"defend and"],
+    "liability": [
+        r"limitation of liability", r"limit(?:ed|s)? (?:its|their)? ?liability", r"consequential damages",
+        r"aggregate liability", r"in no event shall", r"liability cap"
+    ],
+    "intellectual_property": [
+        r"intellectual property", r"copyrights?", r"patents?", r"trade ?marks?", r"licen[cs]e[ds]?\b",
+        r"work product", r"moral rights"
+    ],
+    "confidentiality": [r"confidential\w*", r"non-disclosure", r"proprietary information", r"trade secrets?"],
+    "payment": [r"payments?\b", r"invoic\w*", r"\bfees?\b", r"late (?:payment|charge)", r"net \d+ days"],
+    "renewal": [r"renew\w*", r"successive (?:terms?|periods?)", r"evergreen"],
+    # Standard clauses the analyzer reports as missing; sent so it can see the ones that exist
+    "force_majeure": [r"force majeure", r"acts? of god"],
+    "dispute_resolution": [r"arbitrat\w*", r"dispute resolution", r"mediat\w*"],
+    "governing_law": [r"governing law", r"governed by the laws?", r"exclusive jurisdiction"],
+    "data_protection": [r"data protection", r"personal data", r"gdpr", r"data processing"],
+    "warranties": [r"warrant(?:y|ies|s)\b", r"represents and warrants"],
+    "assignment_restrictions": [r"\bassignment\b", r"may not assign", r"shall not assign", r"change of control"],
+}
+
+# Clause types as the LLM tends to name them -> keys of CLAUSE_PATTERNS
+CLAUSE_TYPE_ALIASES = {
+    "indemnification": "indemnity",
+    "liability_cap": "liability",
+    "limitation_of_liability": "liability",
+    "ip": "intellectual_property",
+    "intellectual property": "intellectual_property",
+    "payment_terms": "payment",
+    "auto_renewal": "renewal",
+    "renewal/auto-renewal": "renewal",
+    "nda": "confidentiality",
+}
+
+KEYWORD_AUTOMATON = re.compile(
+    "|".join(f"(?P<{clause_type}>{'|'.join(patterns)})" for clause_type, patterns in CLAUSE_PATTERNS.items()),
+    re.IGNORECASE
+)
+
+UNIT_TOKENS = 300  # Size of the sections the classifier tags
+PREAMBLE_TOKENS = 600  # Opening text always sent (parties, dates, recitals)
+OMISSION_MARKER = "\n[...]\n"
+MIN_TRAINING_EXAMPLES = 20
+MODEL_KEY = "clause_model:v1"  # Redis key of the trained model (bump when the format changes)
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def normalize_clause_type(clause_type: Optional[str]) -> Optional[str]:
+    key = (clause_type or "").strip().lower()
+    key = CLAUSE_TYPE_ALIASES.get(key, key.replace(" ", "_"))
+    return key if key in CLAUSE_PATTERNS else None
+
+
+def keyword_hits(text: str) -> Counter:
+    """Number of keyword matches per clause type"""
+    return Counter(match.lastgroup for match in KEYWORD_AUTOMATON.finditer(text))
+
+
+def _features(text: str) -> List[str]:
+    words = _WORD.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class ClauseModel:
+    """TF-IDF features with one-vs-rest logistic regression, in pure Python"""
+
+    def __init__(self, idf: Dict[str, float], weights: Dict[str, Dict[str, float]], bias: Dict[str, float]):
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def train(
+        cls,
+        examples: List[Tuple[str, str]],
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4
+    ) -> "ClauseModel":
+        """Train on (text, clause_type) pairs; deterministic for the same examples"""
+        document_frequency: Counter = Counter()
+        for text, _ in examples:
+            document_frequency.update(set(_features(text)))
+        idf = {
+            feature: math.log((1 + len(examples)) / (1 + count)) + 1
+            for feature, count in document_frequency.items()
+        }
+
+        model = cls(idf, {}, {})
+        labels = sorted({label for _, label in examples})
+        vectors = [(model.vectorize(text), label) for text, label in examples]
+        order = list(range(len(vectors)))
+
+        for label in labels:
+            weights: Dict[str, float] = defaultdict(float)
+            bias = 0.0
+            shuffler = random.Random(label)
+            for _ in range(epochs):
+                shuffler.shuffle(order)
+                for i in order:
+                    vector, example_label = vectors[i]
+                    target = 1.0 if example_label == label else 0.0
+                    error = _sigmoid(bias + sum(weights[f] * v for f, v in vector.items())) - target
+                    for feature, value in vector.items():
+                        weights[feature] -= learning_rate * (error * value + l2 * weights[feature])
+                    bias -= learning_rate * error
+            model.weights[label] = {f: w for f, w in weights.items() if abs(w) > 1e-4}
+            model.bias[label] = bias
+
+        return model
+
+    def to_json(self) -> str:
+        return json.dumps({"idf": self.idf, "weights": self.weights, "bias": self.bias}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data) -> "ClauseModel":
+        fields = json.loads(data)
+        return cls(fields["idf"], fields["weights"], fields["bias"])
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        counts = Counter(f for f in _features(text) if f in self.idf)
+        vector = {feature: count * self.idf[feature] for feature, count in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {feature: value / norm for feature, value in vector.items()}
+
+    def predict(self, text: str) -> Dict[str, float]:
+        """Probability per clause type"""
+        vector = self.vectorize(text)
+        return {
+            label: _sigmoid(self.bias[label] + sum(weights.get(f, 0.0) * v for f, v in vector.items()))
+            for label, weights in self.weights.items()
+        }
+
+
+def _sigmoid(value: float) -> float:
+    if value < -30:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-value))
+
+
+class ClauseClassifier:
+    """Tag contract sections with candidate clause types and select them for the LLM"""
+
+    def __init__(self, model: Optional[ClauseModel] = None, threshold: Optional[float] = None):
+        self.model = model
+        self.threshold = settings.CLAUSE_MODEL_THRESHOLD if threshold is None else threshold
+
+    def tag(self, text: str) -> Dict[str, float]:
+        """Candidate clause types of a section with a score (keyword hits + model probability)"""
+        scores: Dict[str, float] = {t: float(n) for t, n in keyword_hits(text).items()}
+        if self.model is not None:
+            for clause_type, probability in self.model.predict(text).items():
+                if probability >= self.threshold:
+                    scores[clause_type] = scores.get(clause_type, 0.0) + probability
+        return scores
+
+    def select_relevant(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        """
+        The parts of a contract to send to the LLM within a token budget: the
+        preamble plus the best-scoring section for every clause type found,
+        then further tagged sections by score, in document order with
+        "[...]" where text was left out. Text that already fits is returned
+        whole; when nothing is tagged the leading text is used as before.
+
+        Returns: {"text", "token_count", "sections": [{"start", "end", "heading", "clause_types"}]}
+        """
+        total_tokens = count_tokens(text)
+        if total_tokens <= max_tokens:
+            return {"text": text, "token_count": total_tokens, "sections": []}
+
+        # Units are top-level sections (split when longer than UNIT_TOKENS)
+        units = chunk_document(text, max_tokens=UNIT_TOKENS, min_fill=0.0)
+        tags = [self.tag(unit["text"]) for unit in units]
+        if not any(tags):
+            truncated = truncate_to_tokens(text, max_tokens)
+            return {"text": truncated, "token_count": count_tokens(truncated), "sections": []}
+
+        preamble = truncate_to_tokens(text, min(PREAMBLE_TOKENS, max_tokens // 4))
+        marker_tokens = count_tokens(OMISSION_MARKER)
+        chosen: Dict[int, Dict[str, Any]] = {}
+        budget = max_tokens - count_tokens(preamble) - marker_tokens
+
+        def take(i: int):
+            nonlocal budget
+            cost = units[i]["token_count"] + marker_tokens
+            if i in chosen or units[i]["start"] < len(preamble) or cost > budget:
+                return
+            chosen[i] = units[i]
+            budget -= cost
+
+        # One section per clause type first (so every type is represented), then by score
+        best_by_type: Dict[str, Tuple[float, int]] = {}
+        for i, unit_tags in enumerate(tags):
+            for clause_type, score in unit_tags.items():
+                if score > best_by_type.get(clause_type, (0.0, -1))[0]:
+                    best_by_type[clause_type] = (score, i)
+        for _, i in sorted(best_by_type.values(), reverse=True):
+            take(i)
+        for i in sorted(range(len(units)), key=lambda i: (-sum(tags[i].values()), i)):
+            if tags[i]:
+                take(i)
+
+        parts = [preamble]
+        previous_end = len(preamble)
+        for i in sorted(chosen):
+            unit = units[i]
+            if unit["start"] > previous_end and text[previous_end:unit["start"]].strip():
+                parts.append(OMISSION_MARKER)
+            else:
+                parts.append("\n\n")
+            parts.append(unit["text"])
+            previous_end = unit["end"]
+        if text[previous_end:].strip():
+            parts.append(OMISSION_MARKER)
+        selected = "".join(parts).strip()
+
+        return {
+            "text": selected,
+            "token_count": count_tokens(selected),
+            "sections": [
+                {
+                    "start": units[i]["start"],
+                    "end": units[i]["end"],
+                    "heading": units[i]["heading"],
+                    "clause_types": sorted(tags[i])
+                }
+                for i in sorted(chosen)
+            ]
+        }
+
+
+def training_examples(clause_lists: Iterable[Optional[list]]) -> List[Tuple[str, str]]:
+    """(excerpt, clause_type) pairs from stored detected_clauses lists"""
+    examples = []
+    for clauses in clause_lists:
+        for clause in clauses or []:
+            if not isinstance(clause, dict):
+                continue
+            clause_type = normalize_clause_type(clause.get("type"))
+            excerpt = (clause.get("text") or "").strip()
+            if clause_type and len(excerpt) >= 20:
+                examples.append((excerpt, clause_type))
+    return examples
+
+
+def train_clause_model(db: Session) -> Optional[ClauseModel]:
+    """
+    Model trained on the most recent stored analyses (at most
+    CLAUSE_MODEL_MAX_EXAMPLES excerpts), or None without enough examples
+    """
+    clause_lists = db.exec(
+        select(ContractAnalysis.detected_clauses)
+        .order_by(ContractAnalysis.id.desc())
+        .limit(settings.CLAUSE_MODEL_MAX_ANALYSES)
+    ).all()
+    examples = training_examples(clause_lists)[:settings.CLAUSE_MODEL_MAX_EXAMPLES]
+    labels = {label for _, label in examples}
+    if len(examples) < MIN_TRAINING_EXAMPLES or len(labels) < 2:
+        return None
+    return ClauseModel.train(examples)
+
+
+def store_clause_model(model: Optional[ClauseModel]) -> bool:
+    """Publish a trained model to the workers; False without Redis"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        if model is None:
+            client.delete(MODEL_KEY)
+        else:
+            client.set(MODEL_KEY, model.to_json())
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return False
+    return True
+
+
+_model_lock = threading.Lock()
+_model_state: Dict[str, Any] = {"model": None, "expires_at": 0.0}
+
+
+def _load_clause_model(db: Session) -> Optional[ClauseModel]:
+    client = get_redis()
+    if client is not None:
+        try:
+            data = client.get(MODEL_KEY)
+            return ClauseModel.from_json(data) if data else None
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+    # No Redis: train locally (bounded by CLAUSE_MODEL_MAX_EXAMPLES)
+    return train_clause_model(db)
+
+
+def get_clause_classifier(db: Session) -> ClauseClassifier:
+    """Classifier with the stored model (cached per worker process)"""
+    with _model_lock:
+        expired = _model_state["expires_at"] < time.monotonic()
+        record_cache("clause_model", not expired)
+        if expired:
+            _model_state["model"] = _load_clause_model(db)
+            _model_state["expires_at"] = time.monotonic() + settings.CLAUSE_MODEL_RELOAD_SECONDS
+        return ClauseClassifier(_model_state["model"])
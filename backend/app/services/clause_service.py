@@ -1,4 +1,5 @@
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, select, func, or_, and_
 from datetime import datetime
 import secrets
@@ -247,6 +248,48 @@ class ClauseService:
 
         return clauses
 
+    @staticmethod
+    def get_similar_clauses_by_category(
+        session: Session,
+        categories: Iterable[ClauseCategory],
+        user_id: int,
+        limit: int = 5
+    ) -> Dict[ClauseCategory, List[Clause]]:
+        """get_similar_clauses for several categories in one query"""
+        return ClauseService.top_clauses_per_category(
+            session, categories, limit,
+            or_(Clause.user_id == user_id, Clause.status == ClauseStatus.APPROVED),
+            Clause.is_latest_version == True
+        )
+
+    @staticmethod
+    def top_clauses_per_category(
+        session: Session,
+        categories: Iterable[ClauseCategory],
+        limit: int,
+        *conditions
+    ) -> Dict[ClauseCategory, List[Clause]]:
+        """
+        The `limit` most used clauses of each category matching `conditions`,
+        ranked with a window function so any number of categories is one query
+        """
+        categories = list(dict.fromkeys(categories))
+        if not categories:
+            return {}
+        rank = func.row_number().over(
+            partition_by=Clause.category, order_by=Clause.usage_count.desc()
+        ).label("rank")
+        ranked = select(Clause, rank).where(Clause.category.in_(categories), *conditions).subquery()
+        ranked_clause = aliased(Clause, ranked)
+        clauses = session.exec(
+            select(ranked_clause).where(ranked.c.rank <= limit).order_by(ranked.c.rank)
+        ).all()
+
+        by_category: Dict[ClauseCategory, List[Clause]] = {category: [] for category in categories}
+        for clause in clauses:
+            by_category[clause.category].append(clause)
+        return by_category
+
     @staticmethod
     def create_library(
         session: Session,
@@ -345,17 +388,12 @@ class ClauseService:
         if not library:
             return []
 
-        # Get memberships with clauses
-        memberships = session.exec(
-            select(ClauseLibraryMembership)
+        # Clauses in membership order
+        clauses = session.exec(
+            select(Clause)
+            .join(ClauseLibraryMembership, ClauseLibraryMembership.clause_id == Clause.id)
             .where(ClauseLibraryMembership.library_id == library.id)
             .order_by(ClauseLibraryMembership.sort_order)
         ).all()
 
-        clause_ids = [m.clause_id for m in memberships]
-
-        clauses = session.exec(
-            select(Clause).where(Clause.id.in_(clause_ids))
-        ).all()
-
         return clauses
@@ -4,6 +4,7 @@ from sqlmodel import Session
 from app.models.clause import ClauseCategory, Clause, ClauseSuggestion
 from app.models.contract import ContractAnalysis
 from app.services.clause_service import ClauseService
+from app.core.bulk import bulk_insert
 
 
 class ClauseSuggester:
@@ -20,6 +21,7 @@ class ClauseSuggester:
         Suggest clauses based on missing clauses and detected issues
         """
         suggestions = []
+        suggestion_rows = []
 
         # Get missing clauses from analysis
         missing_clauses = analysis.missing_clauses or []
@@ -34,19 +36,21 @@ class ClauseSuggester:
             "assignment_restrictions": ClauseCategory.ASSIGNMENT
         }
 
+        # Similar library clauses for every missing category (one query)
+        similar_by_category = ClauseService.get_similar_clauses_by_category(
+            session=session,
+            categories=[clause_mapping[m] for m in missing_clauses if m in clause_mapping],
+            user_id=user_id,
+            limit=3
+        )
+
         # For each missing clause, find relevant suggestions
         for missing in missing_clauses:
             category = clause_mapping.get(missing)
             if not category:
                 continue
 
-            # Get similar clauses from library
-            similar_clauses = ClauseService.get_similar_clauses(
-                session=session,
-                category=category,
-                user_id=user_id,
-                limit=3
-            )
+            similar_clauses = similar_by_category[category]
 
             if similar_clauses:
                 suggestion = {
@@ -65,52 +69,52 @@ class ClauseSuggester:
                 }
                 suggestions.append(suggestion)
 
-                # Log suggestion in database
-                clause_suggestion = ClauseSuggestion(
+                # Log suggestion in database (written in bulk below)
+                suggestion_rows.append(dict(
                     contract_id=contract_id,
                     user_id=user_id,
                     category=category,
                     reason=suggestion["reason"],
                     suggested_clause_ids=[c.id for c in similar_clauses]
-                )
-                session.add(clause_suggestion)
+                ))
 
         # Also suggest based on detected high-risk clauses
-        detected_clauses = analysis.detected_clauses or []
-        for clause in detected_clauses:
-            if clause.get("risk_level") in ["high", "medium"]:
-                clause_type = clause.get("type")
-                if clause_type:
-                    try:
-                        category = ClauseCategory(clause_type)
-                        # Find better alternatives
-                        alternatives = session.query(Clause).filter(
-                            Clause.category == category,
-                            Clause.risk_level.in_(["favorable", "neutral"]),
-                            Clause.user_id == user_id,
-                            Clause.is_latest_version == True
-                        ).order_by(Clause.usage_count.desc()).limit(2).all()
-
-                        if alternatives:
-                            suggestion = {
-                                "category": category,
-                                "reason": f"Consider replacing high-risk {clause_type} clause with a more favorable alternative",
-                                "suggested_clauses": [
-                                    {
-                                        "clause_id": c.clause_id,
-                                        "title": c.title,
-                                        "text": c.text,
-                                        "risk_level": c.risk_level,
-                                        "usage_count": c.usage_count
-                                    }
-                                    for c in alternatives
-                                ]
-                            }
-                            suggestions.append(suggestion)
-                    except ValueError:
-                        # Invalid category, skip
-                        pass
+        risky_categories = []
+        for clause in analysis.detected_clauses or []:
+            if clause.get("risk_level") in ["high", "medium"] and clause.get("type"):
+                try:
+                    risky_categories.append((clause["type"], ClauseCategory(clause["type"])))
+                except ValueError:
+                    # Invalid category, skip
+                    pass
+
+        # Better alternatives for every risky category (one query)
+        alternatives_by_category = ClauseService.top_clauses_per_category(
+            session, [category for _, category in risky_categories], 2,
+            Clause.risk_level.in_(["favorable", "neutral"]),
+            Clause.user_id == user_id,
+            Clause.is_latest_version == True
+        )
+        for clause_type, category in risky_categories:
+            alternatives = alternatives_by_category[category]
+            if alternatives:
+                suggestion = {
+                    "category": category,
+                    "reason": f"Consider replacing high-risk {clause_type} clause with a more favorable alternative",
+                    "suggested_clauses": [
+                        {
+                            "clause_id": c.clause_id,
+                            "title": c.title,
+                            "text": c.text,
+                            "risk_level": c.risk_level,
+                            "usage_count": c.usage_count
+                        }
+                        for c in alternatives
+                    ]
+                }
+                suggestions.append(suggestion)
 
+        bulk_insert(session, ClauseSuggestion, suggestion_rows, returning=False)
         session.commit()
         return suggestions
 
@@ -128,12 +132,18 @@ class ClauseSuggester:
             ClauseSuggestion.user_id == user_id
         ).all()
 
+        # The suggested clauses of every suggestion (one query)
+        clause_ids = {clause_id for s in suggestions for clause_id in s.suggested_clause_ids or []}
+        clauses_by_id = {
+            c.id: c for c in session.query(Clause).filter(Clause.id.in_(clause_ids)).all()
+        } if clause_ids else {}
+
         result = []
         for suggestion in suggestions:
-            # Get the actual clauses
-            clauses = session.query(Clause).filter(
-                Clause.id.in_(suggestion.suggested_clause_ids)
-            ).all()
+            clauses = [
+                clauses_by_id[clause_id] for clause_id in suggestion.suggested_clause_ids or []
+                if clause_id in clauses_by_id
+            ]
 
             result.append({
                 "category": suggestion.category,
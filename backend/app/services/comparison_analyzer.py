@@ -1,15 +1,16 @@
 import json
 import difflib
-from typing import Dict, Any, List
-from openai import OpenAI
+from typing import Dict, Any, List, Optional
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
+from app.services.section_index import SectionIndex
 
 
 class ContractComparisonAnalyzer:
     """Compare two contract versions using AI and text diff"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client(feature="contract_comparison")
         self.model = settings.OPENAI_MODEL
 
     def compare_contracts(
@@ -17,11 +18,20 @@ class ContractComparisonAnalyzer:
         original_text: str,
         revised_text: str,
         original_analysis: Dict[str, Any],
-        revised_analysis: Dict[str, Any]
+        revised_analysis: Dict[str, Any],
+        original_sections: Optional[SectionIndex] = None,
+        revised_sections: Optional[SectionIndex] = None
     ) -> Dict[str, Any]:
         """
         Compare two contract versions and return structured diff
+
+        Change locations are resolved against the contracts' section indexes
+        (segmented here when not given), replacing the model's guesses
+        wherever the changed text can be found.
         """
+        original_sections = original_sections or SectionIndex.from_text(original_text)
+        revised_sections = revised_sections or SectionIndex.from_text(revised_text)
+
         # 1. Generate text-level diff
         text_changes = self._generate_text_diff(original_text, revised_text)
 
@@ -41,6 +51,12 @@ class ContractComparisonAnalyzer:
             text_changes
         )
 
+        for key in ("additions", "deletions", "modifications", "substantive_changes", "cosmetic_changes"):
+            for change in ai_analysis.get(key) or []:
+                self._resolve_location(
+                    change, original_text, revised_text, original_sections, revised_sections
+                )
+
         # 5. Combine results
         return {
             "summary": ai_analysis.get("summary"),
@@ -53,6 +69,22 @@ class ContractComparisonAnalyzer:
             "cosmetic_changes": ai_analysis.get("cosmetic_changes", [])
         }
 
+    @staticmethod
+    def _resolve_location(
+        change: Dict[str, Any],
+        original_text: str,
+        revised_text: str,
+        original_sections: SectionIndex,
+        revised_sections: SectionIndex
+    ):
+        """Set a change's location from where its revised (or removed) text sits"""
+        if not isinstance(change, dict):
+            return
+        location = revised_sections.locate(revised_text, change.get("revised_text")) or \
+            original_sections.locate(original_text, change.get("original_text"))
+        if location:
+            change["location"] = location
+
     def _generate_text_diff(self, original: str, revised: str) -> List[Dict[str, Any]]:
         """Generate basic text diff using difflib"""
         original_lines = original.split('\n')
@@ -1,11 +1,12 @@
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from sqlmodel import Session
 
 from app.models.compliance import (
     ComplianceRule, RuleType, RuleSeverity, ComplianceStatus
 )
 from app.models.contract import ContractAnalysis
+from app.services.section_index import SectionIndex
 
 
 class ComplianceEngine:
@@ -15,14 +16,38 @@ class ComplianceEngine:
     def evaluate_rule(
         rule: ComplianceRule,
         contract_analysis: ContractAnalysis,
-        contract_text: str
+        contract_text: str,
+        sections: Optional[SectionIndex] = None
     ) -> Dict[str, Any]:
         """
         Evaluate a single rule against a contract
         Returns: {status, message, location, suggestion, auto_fixable}
+
+        With the contract's section index, location names the section where
+        the matched clause, term or pattern was found (e.g. "Section 3.2, page 4").
+        """
+        result = ComplianceEngine._dispatch(rule, contract_analysis, contract_text, rule.parameters)
+        found_at = result.pop("found_at", None)
+        if sections is not None and result["location"] is None and found_at is not None:
+            if isinstance(found_at, int):
+                result["location"] = sections.location(found_at)
+            else:
+                result["location"] = sections.locate(contract_text, found_at)
+        return result
+
+    @staticmethod
+    def _dispatch(
+        rule: ComplianceRule,
+        contract_analysis: ContractAnalysis,
+        contract_text: str,
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run the handler for the rule type. Handlers may add "found_at" (a text
+        offset or a snippet of the contract) for evaluate_rule to resolve into
+        a location.
         """
         rule_type = rule.rule_type
-        parameters = rule.parameters
 
         # Dispatch to appropriate rule handler
         if rule_type == RuleType.REQUIRED_CLAUSE:
@@ -94,7 +119,8 @@ class ComplianceEngine:
                         "message": f"Required {required_category} clause present with expected content",
                         "location": None,
                         "suggestion": None,
-                        "auto_fixable": False
+                        "auto_fixable": False,
+                        "found_at": clause.get("text")
                     }
 
             return {
@@ -102,7 +128,8 @@ class ComplianceEngine:
                 "message": f"{required_category.capitalize()} clause present but missing required text: '{must_contain}'",
                 "location": None,
                 "suggestion": f"Ensure {required_category} clause contains: {must_contain}",
-                "auto_fixable": rule.auto_fix
+                "auto_fixable": rule.auto_fix,
+                "found_at": matching_clauses[0].get("text")
             }
 
         return {
@@ -110,7 +137,8 @@ class ComplianceEngine:
             "message": f"Required {required_category} clause present",
             "location": None,
             "suggestion": None,
-            "auto_fixable": False
+            "auto_fixable": False,
+            "found_at": matching_clauses[0].get("text")
         }
 
     @staticmethod
@@ -149,7 +177,8 @@ class ComplianceEngine:
                         "message": f"Contract contains prohibited content in {prohibited_category}: '{prohibited_content}'",
                         "location": None,
                         "suggestion": f"Remove or modify {prohibited_category} clause to exclude: {prohibited_content}",
-                        "auto_fixable": False
+                        "auto_fixable": False,
+                        "found_at": clause.get("text")
                     }
 
         # Prohibited category exists but without specific prohibited content
@@ -158,7 +187,8 @@ class ComplianceEngine:
             "message": f"Contract contains {prohibited_category} clause - review recommended",
             "location": None,
             "suggestion": "Review clause to ensure compliance",
-            "auto_fixable": False
+            "auto_fixable": False,
+            "found_at": matching_clauses[0].get("text")
         }
 
     @staticmethod
@@ -182,10 +212,14 @@ class ComplianceEngine:
 
         found_terms = []
         missing_terms = []
+        first_offset = None
+        lowered_text = contract_text.lower()
 
         for term in required_terms:
-            if term.lower() in contract_text.lower():
+            offset = lowered_text.find(term.lower())
+            if offset >= 0:
                 found_terms.append(term)
+                first_offset = offset if first_offset is None else min(first_offset, offset)
             else:
                 missing_terms.append(term)
 
@@ -196,7 +230,8 @@ class ComplianceEngine:
                     "message": f"All required terms present: {', '.join(required_terms)}",
                     "location": None,
                     "suggestion": None,
-                    "auto_fixable": False
+                    "auto_fixable": False,
+                    "found_at": first_offset
                 }
             else:
                 return {
@@ -214,7 +249,8 @@ class ComplianceEngine:
                     "message": f"Found required term(s): {', '.join(found_terms)}",
                     "location": None,
                     "suggestion": None,
-                    "auto_fixable": False
+                    "auto_fixable": False,
+                    "found_at": first_offset
                 }
             else:
                 return {
@@ -244,10 +280,14 @@ class ComplianceEngine:
             }
 
         found_prohibited = []
+        first_offset = None
+        lowered_text = contract_text.lower()
 
         for term in prohibited_terms:
-            if term.lower() in contract_text.lower():
+            offset = lowered_text.find(term.lower())
+            if offset >= 0:
                 found_prohibited.append(term)
+                first_offset = offset if first_offset is None else min(first_offset, offset)
 
         if not found_prohibited:
             return {
@@ -263,7 +303,8 @@ class ComplianceEngine:
                 "message": f"Contract contains prohibited terms: {', '.join(found_prohibited)}",
                 "location": None,
                 "suggestion": f"Remove or replace: {', '.join(found_prohibited)}",
-                "auto_fixable": False
+                "auto_fixable": False,
+                "found_at": first_offset
             }
 
     @staticmethod
@@ -355,7 +396,8 @@ class ComplianceEngine:
                         "message": "Required pattern found in contract",
                         "location": None,
                         "suggestion": None,
-                        "auto_fixable": False
+                        "auto_fixable": False,
+                        "found_at": matches.start()
                     }
                 else:
                     return {
@@ -372,7 +414,8 @@ class ComplianceEngine:
                         "message": "Prohibited pattern found in contract",
                         "location": None,
                         "suggestion": "Remove prohibited content",
-                        "auto_fixable": False
+                        "auto_fixable": False,
+                        "found_at": matches.start()
                     }
                 else:
                     return {
@@ -9,6 +9,8 @@ from app.models.compliance import (
 )
 from app.models.contract import Contract, ContractAnalysis
 from app.services.compliance_engine import ComplianceEngine
+from app.services.section_index import ContractSectionService
+from app.services.text_store import ContractTextStore
 
 
 class ComplianceService:
@@ -137,8 +139,9 @@ class ComplianceService:
             status=ComplianceStatus.PROCESSING
         )
         session.add(check)
-        session.commit()
-        session.refresh(check)
+        # Flushed, not committed: a commit would expire the contract, playbook and
+        # analysis and re-select each of them; the check is committed with its results
+        session.flush()
 
         # Run checks
         try:
@@ -147,7 +150,7 @@ class ComplianceService:
             )
 
             # Update check with results
-            check.status = ComplianceStatus.COMPLETED
+            check.status = results["overall_status"]  # No separate "completed" state: finished checks carry the outcome
             check.overall_status = results["overall_status"]
             check.compliance_score = results["compliance_score"]
             check.rules_checked = results["rules_checked"]
@@ -220,7 +223,8 @@ class ComplianceService:
         warnings = []
         severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
 
-        contract_text = analysis.extracted_text or ""
+        contract_text = ContractTextStore(session).text_for(analysis)
+        sections = ContractSectionService(session).get(contract.id, contract_text)
 
         for rule in rules:
             # Skip if exception exists
@@ -229,7 +233,7 @@ class ComplianceService:
 
             # Evaluate rule
             result = ComplianceEngine.evaluate_rule(
-                rule, analysis, contract_text
+                rule, analysis, contract_text, sections
             )
 
             result_detail = {
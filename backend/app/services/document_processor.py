@@ -1,12 +1,149 @@
+import codecs
+import functools
 import io
-from typing import Tuple
+import zipfile
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
 from pypdf import PdfReader
-from docx import Document
 import pdfminer.high_level
 
+from app.core.config import settings
+from app.core.executors import attachment_executor, in_pool_worker
+from app.services.chunker import PAGE_BREAK, chunk_document
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
+
+PAGE_SEPARATOR = f"\n{PAGE_BREAK}\n"
+TEXT_DECODE_CHUNK_SIZE = 64 * 1024
+ENCODING_SAMPLE_SIZE = 64 * 1024
+MAX_EMAIL_DEPTH = 3  # Nested forwarded messages followed at most this deep
+
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+APP_PAGES_TAG = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}Pages"
+
+
+def _ooxml_blocks(stream) -> List[str]:
+    """
+    Text blocks of one WordprocessingML part in reading order
+
+    Each top-level paragraph is a block and each top-level table is one
+    block with a line per row. Deleted text (tracked changes) and field
+    codes are skipped. Elements are cleared as soon as they are read.
+    """
+    blocks: List[str] = []
+    paragraphs: List[List[str]] = []  # Open paragraphs (text boxes can nest them)
+    cells: List[List[str]] = []  # Open table cells, innermost last
+    tables: List[Dict[str, Any]] = []  # Open tables with their finished rows
+
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == W_NS + "p":
+                paragraphs.append([])
+            elif tag == W_NS + "tbl":
+                tables.append({"rows": [], "row": []})
+            elif tag == W_NS + "tr" and tables:
+                tables[-1]["row"] = []
+            elif tag == W_NS + "tc":
+                cells.append([])
+            continue
+
+        if tag == W_NS + "t" and paragraphs:
+            paragraphs[-1].append(element.text or "")
+        elif tag == W_NS + "tab" and paragraphs:
+            paragraphs[-1].append("\t")
+        elif tag in (W_NS + "br", W_NS + "cr") and paragraphs:
+            paragraphs[-1].append("\n")
+        elif tag == W_NS + "noBreakHyphen" and paragraphs:
+            paragraphs[-1].append("-")
+        elif tag == W_NS + "p":
+            text = "".join(paragraphs.pop()).strip()
+            if text:
+                if cells:
+                    cells[-1].append(text)
+                elif paragraphs:
+                    paragraphs[-1].append(" " + text)
+                else:
+                    blocks.append(text)
+            element.clear()
+        elif tag == W_NS + "tc" and cells:
+            cell_text = " ".join(cells.pop())
+            if tables:
+                tables[-1]["row"].append(cell_text)
+        elif tag == W_NS + "tr" and tables:
+            row = tables[-1]["row"]
+            if any(row):
+                tables[-1]["rows"].append(" | ".join(row))
+            element.clear()
+        elif tag == W_NS + "tbl" and tables:
+            text = "\n".join(tables.pop()["rows"])
+            if text:
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    blocks.append(text)
+            element.clear()
+
+    return blocks
+
+
+def _docx_page_count(stream) -> Optional[int]:
+    """Page count Word stored in docProps/app.xml, if any"""
+    for _, element in ElementTree.iterparse(stream):
+        if element.tag == APP_PAGES_TAG:
+            try:
+                return int(element.text or "")
+            except ValueError:
+                return None
+    return None
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Visible text of an HTML email body"""
+
+    BLOCK_TAGS = {"p", "div", "br", "tr", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
 
 class DocumentProcessor:
-    """Extract text from PDF and DOCX files"""
+    """Extract text from PDF, DOCX, plain text and email files"""
 
     @staticmethod
     def extract_from_pdf(file_content: bytes) -> Tuple[str, int]:
@@ -20,13 +157,10 @@ class DocumentProcessor:
             reader = PdfReader(pdf_file)
             page_count = len(reader.pages)
 
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-
-            extracted_text = "\n\n".join(text_parts)
+            # Pages are separated by form feeds (as pdfminer does) so chunks
+            # can be mapped back to page numbers
+            text_parts = [(page.extract_text() or "").strip() for page in reader.pages]
+            extracted_text = PAGE_SEPARATOR.join(text_parts)
 
             # If pypdf fails to extract much text, try pdfminer
             if len(extracted_text.strip()) < 100:
@@ -42,28 +176,137 @@ class DocumentProcessor:
     def extract_from_docx(file_content: bytes) -> Tuple[str, int]:
         """
         Extract text from DOCX
-        Returns: (extracted_text, estimated_page_count)
+        Returns: (extracted_text, page_count)
+
+        Streams the OOXML parts with iterparse instead of building the
+        python-docx object model. Body paragraphs and tables come out in
+        reading order (one line per table row, cells separated by " | "),
+        followed by footnotes and endnotes, with headers first and footers
+        last. The page count comes from docProps/app.xml when Word saved
+        one, otherwise it is estimated from the word count.
         """
         try:
-            docx_file = io.BytesIO(file_content)
-            doc = Document(docx_file)
+            with zipfile.ZipFile(io.BytesIO(file_content)) as package:
+                names = set(package.namelist())
+                if "word/document.xml" not in names:
+                    raise ValueError("word/document.xml not found")
+
+                def part_blocks(prefix: str) -> List[str]:
+                    blocks = []
+                    for name in sorted(n for n in names if n.startswith(prefix) and n.endswith(".xml")):
+                        with package.open(name) as part:
+                            blocks.extend(_ooxml_blocks(part))
+                    # The same header/footer is often repeated for first/odd/even pages
+                    return list(dict.fromkeys(blocks))
 
-            text_parts = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
+                headers = part_blocks("word/header")
+                with package.open("word/document.xml") as part:
+                    body = _ooxml_blocks(part)
+                notes = part_blocks("word/footnotes") + part_blocks("word/endnotes")
+                footers = part_blocks("word/footer")
 
-            extracted_text = "\n\n".join(text_parts)
+                page_count = None
+                if "docProps/app.xml" in names:
+                    with package.open("docProps/app.xml") as part:
+                        page_count = _docx_page_count(part)
 
-            # Estimate page count (assuming ~700-900 words per page)
-            word_count = len(extracted_text.split())
-            estimated_pages = max(1, word_count // 800)
+            extracted_text = "\n\n".join(headers + body + notes + footers)
 
-            return extracted_text, estimated_pages
+            if not page_count:
+                word_count = len(extracted_text.split())
+                page_count = max(1, word_count // settings.WORDS_PER_PAGE)
+
+            return extracted_text, page_count
 
         except Exception as e:
             raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
 
+    @staticmethod
+    def detect_encoding(file_content: bytes) -> str:
+        """
+        Guess the encoding of a text file from its BOM or first 64KB
+
+        UTF-8 is tried first; charset-normalizer (when installed) handles
+        the rest, with Windows-1252 as the last resort.
+        """
+        for bom, encoding in BOMS:
+            if file_content.startswith(bom):
+                return encoding
+
+        sample = file_content[:ENCODING_SAMPLE_SIZE]
+        try:
+            # Not final: the sample may end in the middle of a character
+            codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            pass
+
+        if detect_charset is not None:
+            match = detect_charset(sample).best()
+            if match is not None:
+                return match.encoding
+
+        return "cp1252"
+
+    @staticmethod
+    def extract_from_txt(file_content: bytes, encoding: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Extract text from a plain text file
+        Returns: (extracted_text, estimated_page_count)
+        """
+        encoding = encoding or DocumentProcessor.detect_encoding(file_content)
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("cp1252")(errors="replace")
+
+        # Decode in chunks so large files don't need a second full-size copy for newline handling
+        parts = []
+        view = memoryview(file_content)
+        for start in range(0, len(file_content), TEXT_DECODE_CHUNK_SIZE):
+            parts.append(decoder.decode(view[start:start + TEXT_DECODE_CHUNK_SIZE]))
+        parts.append(decoder.decode(b"", final=True))
+        extracted_text = "".join(parts).replace("\r\n", "\n").replace("\r", "\n")
+
+        word_count = len(extracted_text.split())
+        return extracted_text, max(1, word_count // settings.WORDS_PER_PAGE)
+
+    @staticmethod
+    def extract_email(file_content: bytes, depth: int = 0) -> Dict[str, Any]:
+        """
+        Parse an RFC 822 email (.eml)
+
+        Returns headers as structured metadata, the body text and the text of
+        each attachment. PDF/DOCX/TXT attachments are extracted in parallel and
+        attached emails are parsed recursively.
+
+        {
+            "metadata": {"from": ..., "to": [...], "cc": [...], "date": "ISO-8601",
+                         "subject": ..., "message_id": ...},
+            "body": "...",
+            "attachments": [{"filename", "content_type", "text", "page_count", "error"}]
+        }
+        """
+        try:
+            message = message_from_bytes(file_content, policy=policy.default)
+        except Exception as e:
+            raise ValueError(f"Failed to parse email: {str(e)}")
+
+        return {
+            "metadata": DocumentProcessor._email_metadata(message),
+            "body": DocumentProcessor._email_body(message),
+            "attachments": DocumentProcessor._email_attachments(message, depth)
+        }
+
+    @staticmethod
+    def extract_from_email(file_content: bytes) -> Tuple[str, int]:
+        """
+        Extract text from an email, with headers and attachment texts inlined
+        Returns: (extracted_text, page_count)
+        """
+        email = DocumentProcessor.extract_email(file_content)
+        return DocumentProcessor._email_text(email), DocumentProcessor._email_pages(email)
+
     @staticmethod
     def process_file(file_content: bytes, file_type: str) -> Tuple[str, int, int]:
         """
@@ -74,6 +317,10 @@ class DocumentProcessor:
             text, pages = DocumentProcessor.extract_from_pdf(file_content)
         elif file_type in ["docx", "doc"]:
             text, pages = DocumentProcessor.extract_from_docx(file_content)
+        elif file_type == "txt":
+            text, pages = DocumentProcessor.extract_from_txt(file_content)
+        elif file_type == "eml":
+            text, pages = DocumentProcessor.extract_from_email(file_content)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
@@ -81,31 +328,158 @@ class DocumentProcessor:
 
         return text, pages, word_count
 
+    @staticmethod
+    def file_type_for(filename: str, content_type: Optional[str] = None) -> Optional[str]:
+        """Map a filename/content type to a process_file type, or None if unsupported"""
+        name = (filename or "").lower()
+        content_type = (content_type or "").lower()
+        if name.endswith(".pdf") or content_type == "application/pdf":
+            return "pdf"
+        if name.endswith((".docx", ".doc")) or "wordprocessingml" in content_type or content_type == "application/msword":
+            return "docx"
+        if name.endswith(".eml") or content_type == "message/rfc822":
+            return "eml"
+        if name.endswith(".txt") or content_type == "text/plain":
+            return "txt"
+        return None
+
+    # ===== Email helpers =====
+
+    @staticmethod
+    def _email_metadata(message: EmailMessage) -> Dict[str, Any]:
+        def addresses(name: str) -> List[str]:
+            header = message.get(name)
+            if header is None:
+                return []
+            return [str(address) for address in getattr(header, "addresses", ())] or [str(header)]
+
+        date_header = message.get("Date")
+        sent_at = getattr(date_header, "datetime", None) if date_header is not None else None
+        return {
+            "from": str(message.get("From", "")) or None,
+            "to": addresses("To"),
+            "cc": addresses("Cc"),
+            "date": sent_at.isoformat() if sent_at else (str(date_header) if date_header else None),
+            "subject": str(message.get("Subject", "")) or None,
+            "message_id": str(message.get("Message-ID", "")) or None
+        }
+
+    @staticmethod
+    def _part_text(part: EmailMessage) -> str:
+        try:
+            return part.get_content()
+        except (LookupError, UnicodeDecodeError):
+            # Unknown or wrong declared charset - detect it from the bytes instead
+            payload = part.get_payload(decode=True) or b""
+            return DocumentProcessor.extract_from_txt(payload)[0]
+
+    @staticmethod
+    def _email_body(message: EmailMessage) -> str:
+        body = message.get_body(preferencelist=("plain", "html"))
+        if body is None:
+            return ""
+        text = DocumentProcessor._part_text(body)
+        if body.get_content_type() == "text/html":
+            parser = _HTMLTextExtractor()
+            parser.feed(text)
+            text = parser.text()
+        return text.replace("\r\n", "\n").strip()
+
+    @staticmethod
+    def _email_attachments(message: EmailMessage, depth: int) -> List[Dict[str, Any]]:
+        attachments = []
+        files = []  # (attachment, file_type, payload) to extract
+
+        for part in message.iter_attachments():
+            content_type = part.get_content_type()
+            attachment = {
+                "filename": part.get_filename() or ("message.eml" if content_type == "message/rfc822" else "attachment"),
+                "content_type": content_type,
+                "text": "",
+                "page_count": 0,
+                "error": None
+            }
+            attachments.append(attachment)
+
+            if content_type == "message/rfc822":
+                if depth >= MAX_EMAIL_DEPTH:
+                    attachment["error"] = "Nested email too deep"
+                    continue
+                email = DocumentProcessor.extract_email(part.get_payload()[0].as_bytes(), depth + 1)
+                attachment["text"] = DocumentProcessor._email_text(email)
+                attachment["page_count"] = DocumentProcessor._email_pages(email)
+                continue
+
+            file_type = DocumentProcessor.file_type_for(attachment["filename"], content_type)
+            if file_type is None or (file_type == "eml" and depth >= MAX_EMAIL_DEPTH):
+                attachment["error"] = f"Unsupported attachment type: {content_type}"
+                continue
+            files.append((attachment, file_type, part.get_payload(decode=True) or b""))
+
+        # Parse large PDF/DOCX attachments side by side on the shared pool; small
+        # ones, everything in forwarded emails, and emails already parsed in a
+        # pool worker (run_cpu, batch extraction) are extracted inline
+        parallel = depth == 0 and not in_pool_worker()
+        heavy = [
+            parallel
+            and file_type in ("pdf", "docx")
+            and len(payload) >= settings.EMAIL_ATTACHMENT_PARALLEL_BYTES
+            for _, file_type, payload in files
+        ]
+        futures = {}
+        if sum(heavy) > 1:
+            futures = {
+                i: attachment_executor.submit(DocumentProcessor.process_file, payload, file_type)
+                for i, (_, file_type, payload) in enumerate(files) if heavy[i]
+            }
+        results = [
+            DocumentProcessor._attachment_result(
+                futures[i].result if i in futures
+                else functools.partial(DocumentProcessor.process_file, payload, file_type)
+            )
+            for i, (_, file_type, payload) in enumerate(files)
+        ]
+
+        for (attachment, _, _), (text, pages, error) in zip(files, results):
+            attachment.update(text=text, page_count=pages, error=error)
+
+        return attachments
+
+    @staticmethod
+    def _attachment_result(extract: Callable[[], Tuple[str, int, int]]) -> Tuple[str, int, Optional[str]]:
+        try:
+            text, pages, _ = extract()
+            return text, pages, None
+        except Exception as e:
+            return "", 0, str(e)
+
+    @staticmethod
+    def _email_text(email: Dict[str, Any]) -> str:
+        metadata = email["metadata"]
+        header_lines = [
+            ("From", metadata["from"]),
+            ("To", ", ".join(metadata["to"])),
+            ("Cc", ", ".join(metadata["cc"])),
+            ("Date", metadata["date"]),
+            ("Subject", metadata["subject"]),
+        ]
+        sections = ["\n".join(f"{name}: {value}" for name, value in header_lines if value)]
+        if email["body"]:
+            sections.append(email["body"])
+        for attachment in email["attachments"]:
+            if attachment["text"].strip():
+                sections.append(f"--- Attachment: {attachment['filename']} ---\n{attachment['text'].strip()}")
+        return "\n\n".join(section for section in sections if section)
+
+    @staticmethod
+    def _email_pages(email: Dict[str, Any]) -> int:
+        return 1 + sum(attachment["page_count"] for attachment in email["attachments"])
+
     @staticmethod
     def chunk_text(text: str, max_chunk_size: int = 4000) -> list[str]:
         """
         Split text into chunks for AI processing
-        Tries to split on paragraph boundaries
-        """
-        paragraphs = text.split("\n\n")
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for para in paragraphs:
-            para_size = len(para)
-
-            if current_size + para_size > max_chunk_size and current_chunk:
-                # Save current chunk and start new one
-                chunks.append("\n\n".join(current_chunk))
-                current_chunk = [para]
-                current_size = para_size
-            else:
-                current_chunk.append(para)
-                current_size += para_size
-
-        # Add remaining chunk
-        if current_chunk:
-            chunks.append("\n\n".join(current_chunk))
-
-        return chunks
+        Splits on clause/section boundaries; max_chunk_size is in characters
+        (about 4 per token), see chunker.chunk_document for offsets and pages
+        """
+        return [chunk["text"] for chunk in chunk_document(text, max_tokens=max(1, max_chunk_size // 4))]
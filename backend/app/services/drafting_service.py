@@ -9,7 +9,7 @@ import re
 from datetime import datetime
 from typing import Optional
 from sqlmodel import Session, select
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 
 from app.models.drafting import ContractTemplate, GeneratedContract, DraftingSession
 from app.models.user import User
@@ -21,7 +21,7 @@ class DraftingService:
 
     def __init__(self, db: Session, openai_api_key: str):
         self.db = db
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_llm_client(openai_api_key, feature="drafting")
 
     # Template Management
     def create_template(
@@ -4,15 +4,18 @@ Extracts obligations, risks, summary, and suggested revisions using GPT-5.1.
 """
 import json
 from typing import Dict, Any
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
+from app.services.chunker import truncate_to_tokens
+
+ANALYSIS_MAX_TOKENS = 5000
 
 
 class InstantDocumentAnalyzer:
     """Analyze documents instantly for obligations, risks, and revisions"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client(feature="instant_analysis")
         self.model = settings.OPENAI_MODEL
 
     def analyze(self, text: str, filename: str = "") -> Dict[str, Any]:
@@ -32,8 +35,8 @@ class InstantDocumentAnalyzer:
             "clarity_score": 0-100
         }
         """
-        # Limit text for cost control (analyze first ~20k chars)
-        text_to_analyze = text[:20000]
+        # Limit text for cost control (leading clauses within ~5k tokens)
+        text_to_analyze = truncate_to_tokens(text, ANALYSIS_MAX_TOKENS)
 
         prompt = self._build_prompt(text_to_analyze, filename)
 
@@ -6,7 +6,7 @@ AI-powered client intake categorization, risk assessment, and lawyer routing.
 
 import json
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
 from datetime import datetime, timedelta
 
@@ -15,7 +15,7 @@ class IntakeTriageService:
     """AI-powered intake analysis and categorization"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client(feature="intake_triage")
         self.model = "gpt-5-mini"
 
     def analyze_intake(
@@ -6,7 +6,7 @@ import json
 import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
 
 
@@ -69,7 +69,7 @@ class LegalResearchChat:
     """Conversational legal research with verified citations"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client(feature="research_chat")
         self.model = settings.OPENAI_MODEL  # Configurable model for legal reasoning
         self.conversations: Dict[str, List[Dict]] = {}
 
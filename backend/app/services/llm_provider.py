@@ -0,0 +1,79 @@
+"""
+LLM Provider
+
+Services get their chat-completions client from get_llm_client() instead
+of constructing OpenAI directly, so the backend is chosen by LLM_PROVIDER:
+
+- "openai" (default): the OpenAI client
+- "mock": MockLLMClient, an offline provider with configurable latency,
+  token throughput and error injection that answers with JSON in the
+  shapes the services expect (for load tests and pipeline benchmarks)
+
+Both expose the same interface the services use:
+
+    client.chat.completions.create(model=..., messages=[...], ...)
+        .choices[0].message.content
+        .usage.prompt_tokens / .usage.completion_tokens
+
+The client is wrapped so every completion records its latency and token
+usage under the calling feature (app.core.metrics, and the request profile
+when the request is profiled); `.client` is the underlying provider client.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from openai import OpenAI
+
+from app.core.config import settings
+from app.core.metrics import record_llm_call
+from app.core.profiling import record_llm_span
+
+PROVIDERS = ("openai", "mock")
+
+
+class InstrumentedLLMClient:
+    """Provider client whose chat completions are recorded in the LLM metrics"""
+
+    def __init__(self, client, feature: str):
+        self.client = client
+        self.feature = feature
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            record_llm_call(self.feature, kwargs.get("model"), elapsed, outcome=type(e).__name__)
+            record_llm_span(self.feature, kwargs.get("model"), elapsed, outcome=type(e).__name__)
+            raise
+        usage = getattr(response, "usage", None)
+        call = dict(
+            feature=self.feature,
+            model=getattr(response, "model", None) or kwargs.get("model"),
+            seconds=time.perf_counter() - started,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0
+        )
+        record_llm_call(**call)
+        record_llm_span(**call)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def get_llm_client(api_key: Optional[str] = None, feature: str = "general") -> InstrumentedLLMClient:
+    """Chat-completions client for the configured LLM provider, metered under `feature`"""
+    provider = settings.LLM_PROVIDER.lower()
+    if provider == "mock":
+        from app.services.mock_llm import MockLLMClient
+        client = MockLLMClient()
+    elif provider == "openai":
+        client = OpenAI(api_key=api_key or settings.OPENAI_API_KEY)
+    else:
+        raise ValueError(f"Unknown LLM_PROVIDER '{settings.LLM_PROVIDER}' (expected one of {', '.join(PROVIDERS)})")
+    return InstrumentedLLMClient(client, feature)
@@ -0,0 +1,494 @@
+"""
+Mock LLM Provider
+
+Offline stand-in for the OpenAI chat-completions client, selected with
+LLM_PROVIDER=mock. It lets the contract, comparison, compliance, timeline
+and research pipelines run end to end without network access or cost:
+
+- latency: log-normal time to first token (median LLM_MOCK_LATENCY_MS,
+  spread LLM_MOCK_LATENCY_SIGMA) plus completion tokens generated at
+  LLM_MOCK_TOKENS_PER_SECOND
+- errors: LLM_MOCK_RATE_LIMIT_RATE of calls raise openai.RateLimitError
+  (429) and LLM_MOCK_ERROR_RATE raise openai.InternalServerError (500),
+  the same exceptions the real client raises
+- responses: JSON in the shape each service's prompt asks for, filled
+  from the document in the prompt (clause excerpts, dates, parties,
+  citations), deterministic for the same prompt
+
+Call counts and token totals are kept in `mock_stats` for benchmarks.
+"""
+
+import difflib
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+
+from app.core.config import settings
+from app.services.chunker import count_tokens
+from app.services.clause_classifier import KEYWORD_AUTOMATON
+
+MOCK_API_URL = "https://mock-llm.local/v1/chat/completions"
+
+ANALYZED_CLAUSES = [
+    "termination", "indemnity", "liability", "intellectual_property", "confidentiality", "payment", "renewal"
+]
+STANDARD_CLAUSES = [
+    "force_majeure", "dispute_resolution", "governing_law", "data_protection", "warranties", "assignment_restrictions"
+]
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_LONG_DATE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)? (January|February|March|April|May|June|July|August|September|October|November|December),? (\d{4})\b"
+)
+_PARTIES = re.compile(r"between\s+(.{3,60}?)\s+(?:\(.*?\)\s+)?and\s+(.{3,60}?)(?:[,.;(\n]|$)", re.IGNORECASE)
+_ORGANISATION = re.compile(r"\b([A-Z][\w&]*(?: [A-Z][\w&]*)* (?:Ltd|Limited|Inc|LLC|LLP|PLC|Corp|GmbH))\b")
+_CITATION = re.compile(r"\d+\s+U\.S\.\s+\d+|\[\d{4}\]\s+[A-Z]{2,6}\s+\d+|\d+\s+F\.\d?d?\s+\d+")
+
+
+class MockLLMStats:
+    """Totals across all mock clients in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.rate_limited = 0
+            self.errors = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.latency_seconds = 0.0
+
+    def record(self, outcome: str, prompt_tokens: int = 0, completion_tokens: int = 0, latency: float = 0.0):
+        with self._lock:
+            self.calls += 1
+            self.rate_limited += outcome == "rate_limited"
+            self.errors += outcome == "error"
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.latency_seconds += latency
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "errors": self.errors,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "latency_seconds": round(self.latency_seconds, 3)
+            }
+
+
+mock_stats = MockLLMStats()
+
+
+class MockLLMClient:
+    """Drop-in replacement for OpenAI() exposing chat.completions.create"""
+
+    def __init__(
+        self,
+        latency_ms: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.latency_ms = settings.LLM_MOCK_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_sigma = settings.LLM_MOCK_LATENCY_SIGMA if latency_sigma is None else latency_sigma
+        self.tokens_per_second = (
+            settings.LLM_MOCK_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+        )
+        self.error_rate = settings.LLM_MOCK_ERROR_RATE if error_rate is None else error_rate
+        self.rate_limit_rate = settings.LLM_MOCK_RATE_LIMIT_RATE if rate_limit_rate is None else rate_limit_rate
+        seed = settings.LLM_MOCK_SEED if seed is None else seed
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(
+        self,
+        model: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> SimpleNamespace:
+        messages = messages or []
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        prompt_tokens = count_tokens(prompt)
+
+        roll = self._random.random()
+        if roll < self.rate_limit_rate + self.error_rate:
+            latency = self.time_to_first_token()
+            self._sleep(latency)
+            if roll < self.rate_limit_rate:
+                mock_stats.record("rate_limited", latency=latency)
+                raise openai.RateLimitError(
+                    "Rate limit reached (mock)", response=_http_response(429, {"retry-after": "1"}), body=None
+                )
+            mock_stats.record("error", latency=latency)
+            raise openai.InternalServerError(
+                "The server had an error (mock)", response=_http_response(500), body=None
+            )
+
+        content = canned_response(messages)
+        if max_tokens and not content.lstrip().startswith(("{", "[")):
+            content = " ".join(content.split(" ")[:max_tokens])
+        completion_tokens = count_tokens(content)
+
+        latency = self.time_to_first_token()
+        if self.tokens_per_second > 0:
+            latency += completion_tokens / self.tokens_per_second
+        self._sleep(latency)
+        mock_stats.record("ok", prompt_tokens, completion_tokens, latency)
+
+        return SimpleNamespace(
+            id=f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model or settings.OPENAI_MODEL,
+            choices=[SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(role="assistant", content=content),
+                finish_reason="stop"
+            )],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
+
+    def time_to_first_token(self) -> float:
+        """Seconds before the first token: log-normal around the configured median"""
+        if self.latency_ms <= 0:
+            return 0.0
+        median = self.latency_ms / 1000
+        if self.latency_sigma <= 0:
+            return median
+        return self._random.lognormvariate(math.log(median), self.latency_sigma)
+
+
+def _http_response(status_code: int, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers, request=httpx.Request("POST", MOCK_API_URL))
+
+
+# ===== Canned responses =====
+
+def canned_response(messages: List[Dict[str, str]]) -> str:
+    """Response content for a conversation, in the format its prompt requests"""
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+
+    for marker, responder in RESPONDERS:
+        if marker in prompt:
+            return json.dumps(responder(prompt, rng))
+
+    if "json" in prompt.lower():
+        return json.dumps({"response": _plain_answer(prompt, rng)})
+    return _plain_answer(prompt, rng)
+
+
+def _document(prompt: str) -> str:
+    """The document a prompt embeds (between its --- fences or after its text heading)"""
+    if "**Contract Text:**" in prompt:
+        return prompt.split("**Contract Text:**", 1)[1].split("Return ONLY valid JSON", 1)[0]
+    parts = prompt.split("\n---\n")
+    if len(parts) >= 3:
+        return parts[1]
+    return prompt
+
+
+def _between(prompt: str, start: str, end: str) -> str:
+    if start not in prompt:
+        return ""
+    return prompt.split(start, 1)[1].split(end, 1)[0]
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE.split(" ".join(text.split())) if len(s.strip()) > 20]
+
+
+def _parties(text: str) -> List[str]:
+    match = _PARTIES.search(text)
+    if match:
+        return [match.group(1).strip(" \"'"), match.group(2).strip(" \"'")]
+    return list(dict.fromkeys(_ORGANISATION.findall(text)))[:4] or ["Party A", "Party B"]
+
+
+def _dates(text: str) -> List[Tuple[str, int]]:
+    """(YYYY-MM-DD, offset) for each date in the text"""
+    months = ["january", "february", "march", "april", "may", "june", "july",
+              "august", "september", "october", "november", "december"]
+    found = [(m.group(0), m.start()) for m in _ISO_DATE.finditer(text)]
+    for m in _LONG_DATE.finditer(text):
+        month = months.index(m.group(2).lower()) + 1
+        found.append((f"{m.group(3)}-{month:02d}-{int(m.group(1)):02d}", m.start()))
+    return sorted(found, key=lambda item: item[1])
+
+
+def _risk_level(score: float) -> str:
+    return "high" if score >= 7 else "medium" if score >= 4 else "low"
+
+
+def _clause_sentences(text: str) -> Dict[str, str]:
+    """First sentence per clause type, found with the pre-classifier's keyword automaton"""
+    found: Dict[str, str] = {}
+    for sentence in _sentences(text):
+        for match in KEYWORD_AUTOMATON.finditer(sentence):
+            found.setdefault(match.lastgroup, sentence[:400])
+    return found
+
+
+def _plain_answer(prompt: str, rng: random.Random) -> str:
+    sentences = _sentences(prompt) or ["The request has been reviewed."]
+    picked = rng.sample(sentences, min(3, len(sentences)))
+    return "\n".join(f"{i}. {s}" for i, s in enumerate(picked, start=1))
+
+
+def _contract_analysis(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    text = _document(prompt)
+    clauses = _clause_sentences(text)
+    score = round(rng.uniform(2.0, 8.0), 1)
+    payment = clauses.get("payment")
+    return {
+        "executive_summary": (_sentences(text)[:3] or ["Contract reviewed."]),
+        "key_terms": {
+            "parties": _parties(text),
+            "effective_date": next(iter(_dates(text)), (None, 0))[0],
+            "term": None,
+            "payment": payment[:120] if payment else None
+        },
+        "detected_clauses": [
+            {
+                "type": clause_type,
+                "risk_level": rng.choice(["low", "medium", "high"]),
+                "text": clauses[clause_type],
+                "explanation": f"Mock assessment of the {clause_type.replace('_', ' ')} clause."
+            }
+            for clause_type in ANALYZED_CLAUSES if clause_type in clauses
+        ],
+        "missing_clauses": [c for c in STANDARD_CLAUSES if c not in clauses],
+        "risk_score": score,
+        "overall_risk_level": _risk_level(score)
+    }
+
+
+def _comparison(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    original = _sentences(_between(prompt, "**ORIGINAL VERSION:**", "**REVISED VERSION:**"))
+    revised = _sentences(_between(prompt, "**REVISED VERSION:**", "Provide a JSON response"))
+    additions, deletions, modifications = [], [], []
+    matcher = difflib.SequenceMatcher(a=original, b=revised, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "insert":
+            additions += [{"type": "addition", "original_text": None, "revised_text": s, "location": None,
+                           "is_substantive": True} for s in revised[j1:j2]]
+        elif tag == "delete":
+            deletions += [{"type": "deletion", "original_text": s, "revised_text": None, "location": None,
+                           "is_substantive": True} for s in original[i1:i2]]
+        elif tag == "replace":
+            modifications += [{"type": "modification", "original_text": a, "revised_text": b, "location": None,
+                               "is_substantive": rng.random() < 0.5}
+                              for a, b in zip(original[i1:i2], revised[j1:j2])]
+    changes = additions + deletions + modifications
+    return {
+        "summary": f"{len(changes)} changes between the versions (mock comparison).",
+        "additions": additions,
+        "deletions": deletions,
+        "modifications": modifications,
+        "substantive_changes": [c for c in changes if c["is_substantive"]],
+        "cosmetic_changes": [c for c in changes if not c["is_substantive"]]
+    }
+
+
+def _instant_analysis(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    text = _document(prompt)
+    parties = _parties(text)
+    clauses = _clause_sentences(text)
+    score = round(rng.uniform(2.0, 8.0), 1)
+    return {
+        "document_type": "Contract",
+        "summary": " ".join(_sentences(text)[:3]) or "Document reviewed.",
+        "key_findings": [f"Contains a {t.replace('_', ' ')} clause." for t in clauses][:5],
+        "obligations": [
+            {"party": parties[i % len(parties)], "description": sentence, "deadline": None,
+             "type": "payment" if t == "payment" else "other", "criticality": rng.choice(["low", "medium", "high"])}
+            for i, (t, sentence) in enumerate(clauses.items())
+        ][:8],
+        "risk_flags": [
+            {"severity": "medium", "title": f"No {c.replace('_', ' ')} clause",
+             "description": f"The document does not address {c.replace('_', ' ')}.",
+             "location": None, "recommendation": f"Add a {c.replace('_', ' ')} clause."}
+            for c in STANDARD_CLAUSES if c not in clauses
+        ][:5],
+        "suggested_revisions": [
+            {"section": t.replace("_", " ").title(), "issue": "Could be clearer", "current_text": s[:120],
+             "suggested_text": s[:120], "reason": "Mock suggestion", "priority": "low"}
+            for t, s in list(clauses.items())[:3]
+        ],
+        "overall_risk_score": score,
+        "compliance_score": rng.randint(50, 95),
+        "clarity_score": rng.randint(50, 95)
+    }
+
+
+def _timeline_extraction(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    text = _document(prompt)
+    parties = _parties(text)
+    events = []
+    for date, offset in _dates(text)[:20]:
+        sentence = next((s for s in _sentences(text[offset:offset + 400])), text[offset:offset + 160].strip())
+        events.append({
+            "date": date,
+            "date_precision": "exact",
+            "event_type": rng.choice(["communication", "agreement", "payment", "notice", "meeting", "other"]),
+            "description": sentence[:200],
+            "parties_involved": parties[:2],
+            "significance": rng.choice(["high", "medium", "low"]),
+            "quote": sentence[:120]
+        })
+    is_hot = rng.random() < 0.2
+    return {
+        "doc_type": "Email" if "subject:" in text.lower() else "Letter",
+        "doc_date": events[0]["date"] if events else None,
+        "importance": "high" if is_hot else rng.choice(["medium", "low"]),
+        "is_hot_doc": is_hot,
+        "hot_doc_reason": "Mock: pivotal communication" if is_hot else "",
+        "summary": " ".join(_sentences(text)[:2]) or "Document reviewed.",
+        "events": events
+    }
+
+
+def _citation_issues(prompt: str, rng: random.Random) -> List[Dict[str, Any]]:
+    text = _between(prompt, "Document (opening section):", "For each citation") or prompt
+    return [
+        {
+            "citation_text": m.group(0),
+            "citation_type": "case",
+            "location_start": m.start(),
+            "location_end": m.end(),
+            "severity": rng.choice(["info", "low", "medium"]),
+            "issue_type": "style_issue",
+            "issue_description": "Mock: check citation formatting",
+            "expected_format": m.group(0),
+            "actual_format": m.group(0),
+            "suggested_fix": None,
+            "is_verified": True,
+            "verification_status": "valid",
+            "surrounding_text": text[max(0, m.start() - 50):m.end() + 50]
+        }
+        for m in _CITATION.finditer(text)
+    ]
+
+
+def _research_results(prompt: str, rng: random.Random) -> List[Dict[str, Any]]:
+    query = _between(prompt, "Query:", "\n").strip() or "the query"
+    return [
+        {
+            "title": f"Mock Authority {n} on {query[:40]}",
+            "citation": f"[20{rng.randint(10, 24)}] HCA {rng.randint(1, 60)}",
+            "document_type": "case",
+            "jurisdiction": "AU",
+            "court": "High Court",
+            "date_decided": f"20{rng.randint(10, 24)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+            "summary": f"Mock summary of authority {n}.",
+            "key_points": ["Point 1", "Point 2", "Point 3"],
+            "relevance_score": round(rng.uniform(5, 9.5), 1),
+            "full_text_url": None,
+            "judges": ["Justice Mock"],
+            "parties": ["Plaintiff", "Defendant"],
+            "topics": ["Contract Law"],
+            "ai_summary": "Mock relevance explanation.",
+            "precedent_value": rng.choice(["binding", "persuasive"])
+        }
+        for n in range(1, 4)
+    ]
+
+
+def _intake_triage(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    urgency = rng.choice(["low", "medium", "high"])
+    scores = [rng.randint(5, 40), rng.randint(5, 25), rng.randint(5, 20), rng.randint(0, 15)]
+    return {
+        "suggested_category": rng.choice(["litigation", "transactional", "advisory", "conveyancing"]),
+        "suggested_practice_area": "General",
+        "suggested_urgency": urgency,
+        "suggested_complexity": rng.choice(["simple", "moderate", "complex"]),
+        "confidence_score": rng.randint(60, 95),
+        "risk_assessment": {"risk_level": rng.choice(["low", "medium", "high"]),
+                            "risk_factors": ["Mock risk factor"], "risk_notes": "Mock assessment"},
+        "recommendations": {
+            "immediate_actions": ["Contact client"],
+            "required_documents": ["Identification"],
+            "searches_required": [],
+            "estimated_duration_days": rng.randint(7, 120),
+            "estimated_fee_range": {"min": 50000, "max": 250000}
+        },
+        "lawyer_requirements": {"required_specialization": "general", "minimum_experience_years": rng.randint(1, 10),
+                                "proficiency_level": "intermediate", "special_skills": []},
+        "priority_calculation": {"urgency_score": scores[0], "value_score": scores[1], "complexity_score": scores[2],
+                                 "risk_score": scores[3], "total_priority": sum(scores),
+                                 "priority_notes": "Mock priority"},
+        "conflict_check": {"requires_conflict_check": True, "conflict_risk_factors": [], "parties_to_check": []},
+        "additional_notes": "Generated by the mock LLM provider."
+    }
+
+
+def _drafting_enhancement(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "enhanced_text": _document(prompt).strip(),
+        "suggestions": [
+            {"type": "language_improvement", "section": "General",
+             "suggestion": "Mock suggestion: define capitalised terms.", "priority": "medium"}
+        ]
+    }
+
+
+def _drafting_risk(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "overall_risk": rng.choice(["low", "medium", "high"]),
+        "risk_factors": ["Mock risk factor"],
+        "recommendations": ["Mock recommendation"]
+    }
+
+
+def _research_chat(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    query = _between(prompt, "LEGAL RESEARCH QUERY:", "\n").strip()
+    return {
+        "response": f"Mock research answer to: {query}",
+        "citations": [],
+        "follow_up_questions": [f"What facts are relevant to {query[:40]}?"],
+        "research_summary": {"query_type": "general", "jurisdiction": "AU", "sources_searched": [],
+                             "confidence_level": "low"}
+    }
+
+
+# Prompt marker -> response builder, checked in order
+RESPONDERS: List[Tuple[str, Callable[[str, random.Random], Any]]] = [
+    ('"detected_clauses"', _contract_analysis),
+    ('"substantive_changes"', _comparison),
+    ('"suggested_revisions"', _instant_analysis),
+    ('"hot_doc_reason"', _timeline_extraction),
+    ('"citation_text"', _citation_issues),
+    ('"precedent_value"', _research_results),
+    ('"suggested_category"', _intake_triage),
+    ('"enhanced_text"', _drafting_enhancement),
+    ('"overall_risk"', _drafting_risk),
+    ("LEGAL RESEARCH QUERY:", _research_chat),
+]
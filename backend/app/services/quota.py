@@ -0,0 +1,248 @@
+"""
+Upload quota reservations
+
+Files and pages used in the current billing period are counted in Redis,
+one hash per user and period (quota:{user_id}:{period start}), and the
+counts include uploads that are still being processed:
+
+- reserve: on upload, one Lua script checks the plan limits and reserves a
+  file and a page (the page count is not known yet), so parallel uploads
+  cannot overshoot the plan; no database query is needed
+- commit: when processing completes (and its UsageRecord is written), the
+  reserved page becomes the actual page count
+- release: when the upload or processing fails, the reservation is returned
+
+Reservations are named after the contract, so a retried step settles one
+only once. Counters start from the user row; reconcile() (a periodic task)
+resets them to the UsageRecord totals plus the reservations still held, and
+drops reservations older than QUOTA_RESERVATION_TIMEOUT_SECONDS.
+
+Without Redis nothing is reserved: uploads are checked against the usage on
+the user row, as before reservations, and commit/release do nothing.
+Counters local to a process would not see the reservations of other API
+processes, nor the commits and releases made by the Celery worker.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, mark_redis_unavailable
+from app.models.usage import UsageRecord
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "quota:"
+RESERVATION_PREFIX = "r:"
+
+# KEYS[1]: counters; ARGV: reservation id, now, files limit, pages limit, seed files, seed pages, ttl.
+# Returns "ok" (reserved, or already held) or the exceeded counter ("files" / "pages").
+_RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], 'files', ARGV[5], 'pages', ARGV[6])
+end
+local field = 'r:' .. ARGV[1]
+if redis.call('HEXISTS', KEYS[1], field) == 1 then
+    return 'ok'
+end
+if tonumber(redis.call('HGET', KEYS[1], 'files')) >= tonumber(ARGV[3]) then
+    return 'files'
+end
+if tonumber(redis.call('HGET', KEYS[1], 'pages')) >= tonumber(ARGV[4]) then
+    return 'pages'
+end
+redis.call('HINCRBY', KEYS[1], 'files', 1)
+redis.call('HINCRBY', KEYS[1], 'pages', 1)
+redis.call('HSET', KEYS[1], field, ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[7])
+return 'ok'
+"""
+
+# KEYS[1]: counters; ARGV: reservation id, files delta, pages delta.
+# Applies the deltas only if the reservation was still held; returns 1 if it was.
+_SETTLE_SCRIPT = """
+if redis.call('HDEL', KEYS[1], 'r:' .. ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'files', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'pages', ARGV[3])
+return 1
+"""
+
+# KEYS[1]: counters; ARGV: recorded files, recorded pages, now, reservation timeout.
+# Returns the number of reservations still held.
+_RECONCILE_SCRIPT = """
+local fields = redis.call('HGETALL', KEYS[1])
+if #fields == 0 then
+    return 0
+end
+local held = 0
+for i = 1, #fields, 2 do
+    if string.sub(fields[i], 1, 2) == 'r:' then
+        if tonumber(ARGV[3]) - tonumber(fields[i + 1]) > tonumber(ARGV[4]) then
+            redis.call('HDEL', KEYS[1], fields[i])
+        else
+            held = held + 1
+        end
+    end
+end
+redis.call('HSET', KEYS[1], 'files', tonumber(ARGV[1]) + held, 'pages', tonumber(ARGV[2]) + held)
+return held
+"""
+
+
+# Python twins of the scripts, on one dict per counter key (tests run them in place of Redis)
+
+def _reserve(counters: Dict[str, Any], reservation_id, now, files_limit, pages_limit, seed_files, seed_pages, ttl):
+    if not counters:
+        counters.update(files=int(seed_files), pages=int(seed_pages))
+    field = RESERVATION_PREFIX + reservation_id
+    if field in counters:
+        return "ok"
+    if counters["files"] >= int(files_limit):
+        return "files"
+    if counters["pages"] >= int(pages_limit):
+        return "pages"
+    counters["files"] += 1
+    counters["pages"] += 1
+    counters[field] = float(now)
+    return "ok"
+
+
+def _settle(counters: Dict[str, Any], reservation_id, files_delta, pages_delta):
+    if counters.pop(RESERVATION_PREFIX + reservation_id, None) is None:
+        return 0
+    counters["files"] += int(files_delta)
+    counters["pages"] += int(pages_delta)
+    return 1
+
+
+def _reconcile(counters: Dict[str, Any], files, pages, now, timeout):
+    if not counters:
+        return 0
+    for field in [f for f in counters if f.startswith(RESERVATION_PREFIX)]:
+        if float(now) - counters[field] > float(timeout):
+            del counters[field]
+    held = sum(1 for f in counters if f.startswith(RESERVATION_PREFIX))
+    counters["files"] = int(files) + held
+    counters["pages"] = int(pages) + held
+    return held
+
+
+_SCRIPTS: Dict[str, Any] = {
+    "reserve": (_RESERVE_SCRIPT, _reserve),
+    "settle": (_SETTLE_SCRIPT, _settle),
+    "reconcile": (_RECONCILE_SCRIPT, _reconcile),
+}
+
+
+class QuotaReservations:
+    """Reserve, commit and release upload quota (see the module docstring)"""
+
+    def __init__(self):
+        self._registered: Dict[str, Callable] = {}
+        self._client = None
+
+    @staticmethod
+    def counter_key(user_id: int, period_start: datetime) -> str:
+        return f"{KEY_PREFIX}{user_id}:{period_start.isoformat()}"
+
+    def reserve(self, user: User, reservation_id: str, plan_config: Dict[str, Any]) -> Optional[str]:
+        """
+        Reserve one file for an upload
+        Returns None if reserved, otherwise the exceeded limit ("files" or "pages")
+        """
+        result = self._run("reserve", self.counter_key(user.id, user.billing_period_start), [
+            reservation_id, time.time(), plan_config["files_per_month"], plan_config["pages_per_month"],
+            user.files_used_current_period, user.pages_used_current_period, settings.QUOTA_COUNTER_TTL_SECONDS
+        ])
+        if result is None:  # No Redis: the usage recorded on the user row
+            if user.files_used_current_period >= plan_config["files_per_month"]:
+                return "files"
+            if user.pages_used_current_period >= plan_config["pages_per_month"]:
+                return "pages"
+            return None
+        return None if result == "ok" else result
+
+    def commit(self, user: User, reservation_id: str, pages: int) -> bool:
+        """Turn a reservation into used quota of `pages` pages; False if it was not held"""
+        return bool(self._run("settle", self.counter_key(user.id, user.billing_period_start),
+                              [reservation_id, 0, pages - 1]))
+
+    def release(self, user: User, reservation_id: str) -> bool:
+        """Return a reservation; False if it was not held"""
+        return bool(self._run("settle", self.counter_key(user.id, user.billing_period_start),
+                              [reservation_id, -1, -1]))
+
+    def reconcile(self, session: Session) -> int:
+        """
+        Reset every counter to its UsageRecord totals plus the reservations
+        still held; returns the number of counters reconciled
+        """
+        keys = self._keys()
+        if not keys:
+            return 0
+
+        periods = {}
+        for key in keys:
+            _, user_id, period_start = key.split(":", 2)
+            periods[key] = (int(user_id), datetime.fromisoformat(period_start))
+
+        rows = session.exec(
+            select(
+                UsageRecord.user_id,
+                UsageRecord.billing_period_start,
+                func.sum(UsageRecord.files_consumed),
+                func.sum(UsageRecord.pages_consumed)
+            )
+            .where(UsageRecord.user_id.in_({user_id for user_id, _ in periods.values()}))
+            .group_by(UsageRecord.user_id, UsageRecord.billing_period_start)
+        ).all()
+        recorded = {(user_id, start): (files or 0, pages or 0) for user_id, start, files, pages in rows}
+
+        now = time.time()
+        for key, period in periods.items():
+            files, pages = recorded.get(period, (0, 0))
+            self._run("reconcile", key, [files, pages, now, settings.QUOTA_RESERVATION_TIMEOUT_SECONDS])
+        return len(periods)
+
+    # ===== Redis =====
+
+    def _redis(self):
+        client = get_redis()
+        if client is not None and client is not self._client:
+            self._registered = {name: client.register_script(script) for name, (script, _) in _SCRIPTS.items()}
+            self._client = client
+        return client
+
+    def _run(self, name: str, key: str, args: List[Any]):
+        """Result of a script, or None without Redis"""
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            result = self._registered[name](keys=[key], args=args)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return None
+        return result.decode() if isinstance(result, bytes) else result
+
+    def _keys(self) -> List[str]:
+        client = self._redis()
+        if client is None:
+            return []
+        try:
+            return [k.decode() for k in client.scan_iter(match=f"{KEY_PREFIX}*", count=500)]
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return []
+
+
+quota_reservations = QuotaReservations()
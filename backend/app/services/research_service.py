@@ -13,7 +13,7 @@ import secrets
 from datetime import datetime
 from typing import Optional
 from sqlmodel import Session, select
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 
 from app.models.research import (
     ResearchQuery,
@@ -22,6 +22,7 @@ from app.models.research import (
     ResearchTemplate
 )
 from app.models.user import User
+from app.core.bulk import bulk_insert, generate_ids
 
 
 class ResearchService:
@@ -29,7 +30,7 @@ class ResearchService:
 
     def __init__(self, db: Session, openai_api_key: str):
         self.db = db
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_llm_client(openai_api_key, feature="legal_research")
 
     def create_research_query(
         self,
@@ -87,11 +88,11 @@ class ResearchService:
                 max_results=max_results
             )
 
-            # Save results to database
-            saved_results = []
-            for result_data in results:
-                result = ResearchResult(
-                    result_id=f"res_{secrets.token_hex(8)}",
+            # Save results to database in one multi-row INSERT
+            result_ids = generate_ids("res", len(results))
+            saved_results = bulk_insert(self.db, ResearchResult, [
+                dict(
+                    result_id=result_id,
                     query_id=query_id,
                     title=result_data["title"],
                     citation=result_data["citation"],
@@ -109,8 +110,8 @@ class ResearchService:
                     ai_summary=result_data.get("ai_summary"),
                     precedent_value=result_data.get("precedent_value", "persuasive")
                 )
-                self.db.add(result)
-                saved_results.append(result)
+                for result_id, result_data in zip(result_ids, results)
+            ])
 
             # Update query status
             end_time = datetime.utcnow()
@@ -120,9 +121,13 @@ class ResearchService:
 
             self.db.commit()
 
-            # Refresh to get relationships
-            for result in saved_results:
-                self.db.refresh(result)
+            # Reload the expired results in a single SELECT
+            if saved_results:
+                self.db.exec(
+                    select(ResearchResult).where(
+                        ResearchResult.id.in_([r.id for r in saved_results])
+                    )
+                ).all()
 
             return saved_results
 
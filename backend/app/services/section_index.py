@@ -0,0 +1,198 @@
+"""
+Contract Section Index
+
+Deterministic segmentation of extracted contract text into a hierarchical
+section tree (numbering, title, character offsets, page), built once after
+extraction and stored per contract. Downstream features look sections up
+by offset in O(log n) and render locations such as "Section 3.2(a),
+page 4" without asking the LLM.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from app.core.metrics import record_cache
+from app.models.contract import ContractSectionIndex
+from app.services.chunker import PAGE_BREAK, parse_heading
+
+MAX_TITLE_LENGTH = 120
+
+# Row layout of ContractSectionIndex.sections
+START, END, LEVEL, PARENT, PAGE, NUMBER, TITLE = range(7)
+
+
+def segment_sections(text: str) -> List[List[Any]]:
+    """
+    Section rows ([start, end, level, parent_index, page, number, title]) in
+    document order. A section ends where the next section at the same or a
+    higher level starts; parent_index is -1 for top-level sections.
+    """
+    page_offsets = [m.start() for m in re.finditer(PAGE_BREAK, text)]
+    rows: List[List[Any]] = []
+    open_sections: List[int] = []  # Stack of row indexes, outermost first
+
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        heading = parse_heading(line)
+        if heading:
+            level, number, title = heading
+            start = offset + (len(line) - len(line.lstrip()))
+            while open_sections and rows[open_sections[-1]][LEVEL] >= level:
+                rows[open_sections.pop()][END] = start
+            rows.append([
+                start,
+                len(text),
+                level,
+                open_sections[-1] if open_sections else -1,
+                bisect.bisect_right(page_offsets, start) + 1,
+                number,
+                title[:MAX_TITLE_LENGTH]
+            ])
+            open_sections.append(len(rows) - 1)
+        offset += len(line)
+
+    return rows
+
+
+class SectionIndex:
+    """Offset lookups over a contract's section rows"""
+
+    def __init__(self, rows: List[List[Any]]):
+        self.rows = rows
+        self._starts = [row[START] for row in rows]
+
+    @classmethod
+    def from_text(cls, text: str) -> "SectionIndex":
+        return cls(segment_sections(text))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def section_at(self, offset: int) -> Optional[int]:
+        """Index of the innermost section containing a character offset"""
+        index = bisect.bisect_right(self._starts, offset) - 1
+        while index >= 0 and self.rows[index][END] <= offset:
+            index = self.rows[index][PARENT]
+        return index if index >= 0 else None
+
+    def path(self, index: int) -> List[int]:
+        """Section indexes from the top-level ancestor down to `index`"""
+        path = []
+        while index >= 0:
+            path.insert(0, index)
+            index = self.rows[index][PARENT]
+        return path
+
+    def label(self, index: int) -> str:
+        """
+        Human-readable reference for a section: "Section 3.2(a)",
+        "Article IV", "Article IV, Section 2"
+        """
+        parts: List[str] = []
+        for i in self.path(index):
+            number = self.rows[i][NUMBER]
+            if number.startswith("(") and parts:
+                parts[-1] += number
+            elif number[0].isdigit():
+                # Deeper decimal numbering (3.2 under 3) replaces its parent
+                if parts and parts[-1].startswith("Section ") and number.startswith(parts[-1][8:] + "."):
+                    parts[-1] = f"Section {number}"
+                else:
+                    parts.append(f"Section {number}")
+            else:
+                parts.append(number)
+        return ", ".join(parts)
+
+    def location(self, offset: int) -> Optional[str]:
+        """Location string for an offset, e.g. "Section 3.2(a) (Payment), page 4" """
+        index = self.section_at(offset)
+        if index is None:
+            return None
+        # Title of the nearest numbered heading (lettered clauses carry body text, not titles)
+        title = next(
+            (self.rows[i][TITLE] for i in reversed(self.path(index))
+             if self.rows[i][TITLE] and not self.rows[i][NUMBER].startswith("(")),
+            None
+        )
+        label = self.label(index)
+        # Only short heading-style titles, not clause sentences
+        if title and len(title) <= 60 and not title.endswith((".", ";", ",")):
+            label += f" ({title})"
+        return f"{label}, page {self.rows[index][PAGE]}"
+
+    def locate(self, text: str, snippet: Optional[str]) -> Optional[str]:
+        """Location of the first case-insensitive occurrence of a snippet in the text"""
+        if not snippet or not snippet.strip():
+            return None
+        needle = " ".join(snippet.split())[:200].lower()
+        offset = text.lower().find(needle)
+        if offset < 0:
+            # Extracted text and quoted text often differ in whitespace; retry on a prefix
+            offset = text.lower().find(needle[:60])
+        return self.location(offset) if offset >= 0 else None
+
+    def section(self, index: int) -> Dict[str, Any]:
+        row = self.rows[index]
+        return {
+            "index": index,
+            "number": row[NUMBER],
+            "title": row[TITLE],
+            "label": self.label(index),
+            "level": row[LEVEL],
+            "parent": row[PARENT] if row[PARENT] >= 0 else None,
+            "start": row[START],
+            "end": row[END],
+            "page": row[PAGE]
+        }
+
+    def tree(self) -> List[Dict[str, Any]]:
+        """Nested sections ({..., "children": [...]}) for display"""
+        nodes = [dict(self.section(i), children=[]) for i in range(len(self.rows))]
+        roots = []
+        for node in nodes:
+            if node["parent"] is None:
+                roots.append(node)
+            else:
+                nodes[node["parent"]]["children"].append(node)
+        return roots
+
+
+class ContractSectionService:
+    """Build, store and load per-contract section indexes"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build(self, contract_id: int, text: str) -> SectionIndex:
+        """Segment a contract's text and store (or replace) its index"""
+        index = SectionIndex.from_text(text)
+        record = self._record(contract_id) or ContractSectionIndex(contract_id=contract_id)
+        record.sections = index.rows
+        record.section_count = len(index)
+        record.text_length = len(text)
+        self.db.add(record)
+        return index
+
+    def get(self, contract_id: int, text: Optional[str] = None) -> Optional[SectionIndex]:
+        """
+        Stored index of a contract; when it is missing (contracts analysed
+        before indexing existed) and the text is given, it is built now
+        """
+        record = self._record(contract_id)
+        stored = record is not None and (text is None or record.text_length == len(text))
+        record_cache("section_index", stored)
+        if stored:
+            return SectionIndex(record.sections or [])
+        if text is None:
+            return None
+        index = self.build(contract_id, text)
+        self.db.commit()
+        return index
+
+    def _record(self, contract_id: int) -> Optional[ContractSectionIndex]:
+        return self.db.exec(
+            select(ContractSectionIndex).where(ContractSectionIndex.contract_id == contract_id)
+        ).first()
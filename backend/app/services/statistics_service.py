@@ -0,0 +1,218 @@
+"""
+Statistics Service
+
+Per-tenant summary statistics for the intake and conveyancing dashboards,
+computed with grouped aggregate queries instead of loading every row.
+"""
+
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlmodel import Session, select, func
+from sqlalchemy import Integer, case, cast
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.models.intake import ClientIntake
+from app.models.conveyancing import (
+    ConveyancingTransaction, OfficialSearch, ConveyancingDocument
+)
+from app.schemas.intake import IntakeStatistics
+from app.schemas.conveyancing import ConveyancingStatistics
+
+
+class SnapshotCache:
+    """Small in-process TTL cache for statistics snapshots"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Tuple[str, int], value: Any, ttl_seconds: int):
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop the entry closest to expiry to stay bounded
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across requests within a worker process
+snapshot_cache = SnapshotCache()
+
+
+class StatisticsService:
+    """Aggregate statistics for intake and conveyancing"""
+
+    def __init__(self, db: Session, cache_ttl_seconds: Optional[int] = None):
+        self.db = db
+        self.cache_ttl_seconds = (
+            settings.STATISTICS_CACHE_TTL_SECONDS
+            if cache_ttl_seconds is None else cache_ttl_seconds
+        )
+
+    # ===== Intake =====
+
+    def get_intake_statistics(self, user_id: int, use_cache: bool = True) -> IntakeStatistics:
+        """Get intake statistics for a user's firm"""
+        return self._cached(
+            ("intake", user_id), use_cache,
+            lambda: self._compute_intake_statistics(user_id)
+        )
+
+    def _compute_intake_statistics(self, user_id: int) -> IntakeStatistics:
+        scope = ClientIntake.user_id == user_id
+
+        by_status = self._group_counts(ClientIntake.status, ClientIntake.id, scope)
+        total = sum(by_status.values())
+
+        row = self.db.exec(
+            select(
+                # Zero/NULL processing times are excluded from the average
+                func.avg(case(
+                    (ClientIntake.processing_time_seconds > 0, ClientIntake.processing_time_seconds)
+                )),
+                self._count_where(ClientIntake.conflict_check_required == True),
+                self._count_where(ClientIntake.conflict_check_passed == True),
+                self._count_where(ClientIntake.conflict_check_passed == False),
+            ).where(scope)
+        ).one()
+        avg_processing, conflict_required, conflict_passed, conflict_failed = row
+
+        return IntakeStatistics(
+            total_intakes=total,
+            pending_intakes=by_status.get("pending", 0),
+            assigned_intakes=by_status.get("assigned", 0),
+            completed_intakes=by_status.get("completed", 0),
+            declined_intakes=by_status.get("declined", 0),
+            by_matter_type=self._group_counts(ClientIntake.matter_type, ClientIntake.id, scope),
+            by_practice_area=self._group_counts(ClientIntake.practice_area, ClientIntake.id, scope),
+            by_urgency=self._group_counts(ClientIntake.urgency, ClientIntake.id, scope),
+            by_complexity=self._group_counts(ClientIntake.complexity, ClientIntake.id, scope),
+            average_processing_time_seconds=float(avg_processing or 0),
+            average_response_time_hours=0.0,  # Would calculate from assignment records
+            conflict_checks_required=conflict_required or 0,
+            conflict_checks_passed=conflict_passed or 0,
+            conflict_checks_failed=conflict_failed or 0
+        )
+
+    # ===== Conveyancing =====
+
+    def get_conveyancing_statistics(self, user_id: int, use_cache: bool = True) -> ConveyancingStatistics:
+        """Get conveyancing statistics for a user's transactions"""
+        return self._cached(
+            ("conveyancing", user_id), use_cache,
+            lambda: self._compute_conveyancing_statistics(user_id)
+        )
+
+    def _compute_conveyancing_statistics(self, user_id: int) -> ConveyancingStatistics:
+        Txn = ConveyancingTransaction
+        scope = Txn.user_id == user_id
+
+        by_status = self._group_counts(Txn.status, Txn.id, scope)
+        total = sum(by_status.values())
+        completed = by_status.get("completion", 0)
+        cancelled = by_status.get("cancelled", 0)
+
+        row = self.db.exec(
+            select(
+                self._count_where(
+                    (Txn.is_active == True) & Txn.status.notin_(["completion", "cancelled"])
+                ),
+                func.coalesce(func.sum(Txn.purchase_price), 0),
+                func.avg(case(
+                    (Txn.completed_at.isnot(None), self._whole_days_between(Txn.completed_at, Txn.instruction_date))
+                )),
+            ).where(scope)
+        ).one()
+        active, total_value, avg_days = row
+
+        # Searches and documents are scoped to this user's transactions
+        user_transactions = select(Txn.id).where(scope)
+
+        searches_pending, searches_with_issues = self.db.exec(
+            select(
+                self._count_where(OfficialSearch.status.in_(["pending", "applied"])),
+                self._count_where(OfficialSearch.has_issues == True),
+            ).where(OfficialSearch.transaction_id.in_(user_transactions))
+        ).one()
+
+        docs_pending = self.db.exec(
+            select(func.count(ConveyancingDocument.id)).where(
+                ConveyancingDocument.transaction_id.in_(user_transactions),
+                ConveyancingDocument.status.in_(["draft", "review"])
+            )
+        ).one()
+
+        return ConveyancingStatistics(
+            total_transactions=total,
+            active_transactions=active or 0,
+            completed_transactions=completed,
+            cancelled_transactions=cancelled,
+            by_transaction_type=self._group_counts(Txn.transaction_type, Txn.id, scope),
+            by_status=by_status,
+            by_stage=self._group_counts(Txn.current_stage, Txn.id, scope),
+            total_property_value=Decimal(str(total_value or 0)),
+            average_transaction_days=float(avg_days or 0),
+            average_completion_rate=100.0 * completed / total if total > 0 else 0.0,
+            searches_pending=searches_pending or 0,
+            searches_with_issues=searches_with_issues or 0,
+            documents_pending_execution=docs_pending,
+            stamp_duty_collected=Decimal("0.00"),  # Would sum from calculations
+            legal_fees_collected=Decimal("0.00")  # Would sum from transactions
+        )
+
+    # ===== Helpers =====
+
+    def _cached(self, key: Tuple[str, int], use_cache: bool, compute):
+        if use_cache and self.cache_ttl_seconds > 0:
+            cached = snapshot_cache.get(key)
+            record_cache("statistics_snapshot", cached is not None)
+            if cached is not None:
+                return cached.model_copy()
+
+        result = compute()
+
+        if self.cache_ttl_seconds > 0:
+            snapshot_cache.set(key, result.model_copy(), self.cache_ttl_seconds)
+        return result
+
+    def _group_counts(self, column, id_column, scope) -> Dict[str, int]:
+        """Count rows per distinct value of a column"""
+        rows = self.db.exec(
+            select(column, func.count(id_column)).where(scope).group_by(column)
+        ).all()
+        return {value: count for value, count in rows}
+
+    @staticmethod
+    def _count_where(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    def _whole_days_between(self, end, start):
+        """Dialect-aware whole-day difference between two timestamps"""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return cast(func.julianday(end) - func.julianday(start), Integer)
+        return func.floor(func.extract("epoch", end - start) / 86400)
@@ -2,7 +2,9 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 from app.core.config import settings
+from app.core.metrics import STORAGE_SECONDS
 from typing import Optional
+from pathlib import Path
 import io
 
 
@@ -17,6 +19,7 @@ class CloudinaryStorage:
             secure=True
         )
 
+    @STORAGE_SECONDS.labels(backend="cloudinary", operation="upload").time()
     def upload_file(self, file_content: bytes, s3_key: str, content_type: str) -> bool:
         """
         Upload file to Cloudinary
@@ -34,6 +37,7 @@ class CloudinaryStorage:
         except Exception as e:
             raise ValueError(f"Cloudinary upload failed: {str(e)}")
 
+    @STORAGE_SECONDS.labels(backend="cloudinary", operation="download").time()
     def download_file(self, s3_key: str) -> Optional[bytes]:
         """
         Download file from Cloudinary
@@ -53,6 +57,7 @@ class CloudinaryStorage:
         except Exception as e:
             raise ValueError(f"Cloudinary download failed: {str(e)}")
 
+    @STORAGE_SECONDS.labels(backend="cloudinary", operation="delete").time()
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete file from Cloudinary
@@ -82,5 +87,50 @@ class CloudinaryStorage:
             raise ValueError(f"Cloudinary URL generation failed: {str(e)}")
 
 
+class LocalStorage:
+    """Store documents on the local filesystem (development and load tests)"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.LOCAL_STORAGE_PATH).resolve()
+
+    def _path(self, s3_key: str) -> Path:
+        path = (self.root / s3_key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {s3_key}")
+        return path
+
+    @STORAGE_SECONDS.labels(backend="local", operation="upload").time()
+    def upload_file(self, file_content: bytes, s3_key: str, content_type: str) -> bool:
+        path = self._path(s3_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(file_content)
+        return True
+
+    @STORAGE_SECONDS.labels(backend="local", operation="download").time()
+    def download_file(self, s3_key: str) -> Optional[bytes]:
+        path = self._path(s3_key)
+        if not path.exists():
+            raise ValueError(f"File not found: {s3_key}")
+        return path.read_bytes()
+
+    @STORAGE_SECONDS.labels(backend="local", operation="delete").time()
+    def delete_file(self, s3_key: str) -> bool:
+        path = self._path(s3_key)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def generate_presigned_url(self, s3_key: str, expiration: int = 3600) -> str:
+        return self._path(s3_key).as_uri()
+
+
+def get_storage():
+    """Document storage for the configured STORAGE_BACKEND"""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage()
+    return CloudinaryStorage()
+
+
 # Alias for backward compatibility
 S3Storage = CloudinaryStorage
@@ -0,0 +1,135 @@
+"""
+Contract Text Store
+
+Keeps the full extracted text of contracts out of contract_analyses: the
+text is split into segments of whole pages (pages are separated by form
+feeds), compressed with zstd or zlib and written to contract_texts. Only
+the features that read the text load it, and they can load just the pages
+or character range they need.
+"""
+
+import zlib
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.contract import ContractAnalysis, ContractText
+from app.services.chunker import PAGE_BREAK
+
+try:
+    import zstandard
+except ImportError:  # Optional; zlib is used instead
+    zstandard = None
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 6
+
+
+def compress_text(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress text, returning (codec actually used, data)"""
+    codec = codec or settings.CONTRACT_TEXT_CODEC
+    data = text.encode("utf-8")
+    if codec == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return "zlib", zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Contract text is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def split_segments(text: str, pages_per_segment: int) -> List[Tuple[int, int, int, str]]:
+    """
+    (first_page, page_count, start_offset, text) segments of whole pages;
+    joining the segment texts with PAGE_BREAK gives back the original text
+    """
+    pages = text.split(PAGE_BREAK)
+    segments = []
+    offset = 0
+    for first in range(0, len(pages), pages_per_segment):
+        chunk = PAGE_BREAK.join(pages[first:first + pages_per_segment])
+        segments.append((first + 1, len(pages[first:first + pages_per_segment]), offset, chunk))
+        offset += len(chunk) + len(PAGE_BREAK)
+    return segments
+
+
+class ContractTextStore:
+    """Save and load compressed contract text"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, contract_id: int, text: str):
+        """Store (or replace) a contract's text; the caller commits"""
+        self.delete(contract_id)
+        for segment, (first_page, page_count, start_offset, chunk) in enumerate(
+            split_segments(text, max(1, settings.CONTRACT_TEXT_PAGES_PER_SEGMENT))
+        ):
+            codec, content = compress_text(chunk)
+            self.db.add(ContractText(
+                contract_id=contract_id,
+                segment=segment,
+                first_page=first_page,
+                page_count=page_count,
+                start_offset=start_offset,
+                char_length=len(chunk),
+                codec=codec,
+                content=content
+            ))
+
+    def delete(self, contract_id: int):
+        self.db.exec(delete(ContractText).where(ContractText.contract_id == contract_id))
+
+    def load(self, contract_id: int) -> Optional[str]:
+        """Full text of a contract, or None if none is stored"""
+        segments = self._segments(select(ContractText).where(ContractText.contract_id == contract_id))
+        if not segments:
+            return None
+        return PAGE_BREAK.join(decompress_text(s.codec, s.content) for s in segments)
+
+    def load_pages(self, contract_id: int, first_page: int, last_page: int) -> str:
+        """Text of pages first_page..last_page (1-based, inclusive)"""
+        segments = self._segments(
+            select(ContractText).where(
+                ContractText.contract_id == contract_id,
+                ContractText.first_page <= last_page,
+                ContractText.first_page + ContractText.page_count > first_page
+            )
+        )
+        pages = []
+        for segment in segments:
+            for number, page in enumerate(
+                decompress_text(segment.codec, segment.content).split(PAGE_BREAK), start=segment.first_page
+            ):
+                if first_page <= number <= last_page:
+                    pages.append(page)
+        return PAGE_BREAK.join(pages)
+
+    def load_range(self, contract_id: int, start: int, end: int) -> str:
+        """text[start:end] of a contract, decompressing only the segments it overlaps"""
+        segments = self._segments(
+            select(ContractText).where(
+                ContractText.contract_id == contract_id,
+                ContractText.start_offset < end,
+                ContractText.start_offset + ContractText.char_length + len(PAGE_BREAK) > start
+            )
+        )
+        if not segments:
+            return ""
+        base = segments[0].start_offset
+        text = PAGE_BREAK.join(decompress_text(s.codec, s.content) for s in segments)
+        return text[max(0, start - base):max(0, end - base)]
+
+    def text_for(self, analysis: ContractAnalysis) -> str:
+        """Full text behind an analysis, falling back to the legacy inline copy"""
+        text = self.load(analysis.contract_id)
+        return text if text is not None else (analysis.extracted_text or "")
+
+    def _segments(self, statement) -> List[ContractText]:
+        return self.db.exec(statement.order_by(ContractText.segment)).all()
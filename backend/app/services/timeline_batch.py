@@ -0,0 +1,211 @@
+"""
+Timeline Batch Ingestion
+
+Processes a batch of spooled documents for a matter in the background:
+text extraction runs in a process pool, event extraction (OpenAI) runs in
+a bounded thread pool, and each document is stored as soon as its events
+are back so progress can be streamed per document.
+"""
+
+import logging
+import uuid
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel import Session, or_, select
+
+from app.core.config import settings
+from app.core.executors import make_pool
+from app.models.timeline import TimelineBatch, TimelineBatchItem
+from app.services.document_processor import DocumentProcessor
+from app.services.storage import get_storage
+from app.services.timeline_builder import TimelineBuilder
+from app.services.timeline_service import TimelineService
+
+logger = logging.getLogger(__name__)
+
+MIN_TEXT_LENGTH = 50
+IN_FLIGHT = ("extracting", "analyzing")  # Statuses of files a worker is processing
+
+
+def extract_document_text(content: bytes, file_type: str) -> Tuple[str, int, int]:
+    """Text extraction entry point for worker processes"""
+    return DocumentProcessor.process_file(content, file_type)
+
+
+class TimelineBatchIngestor:
+    """Run a queued TimelineBatch to completion"""
+
+    def __init__(self, db: Session, storage=None, builder: Optional[TimelineBuilder] = None):
+        self.db = db
+        self.storage = storage or get_storage()
+        self.builder = builder or TimelineBuilder()
+        self.timeline = TimelineService(db)
+
+    def run(self, batch_id: str, extraction_pool: Optional[Executor] = None):
+        batch = self.db.exec(select(TimelineBatch).where(TimelineBatch.batch_id == batch_id)).first()
+        if not batch:
+            return
+
+        # Queued files, plus files a lost worker left half-processed
+        items = self.db.exec(
+            select(TimelineBatchItem)
+            .where(TimelineBatchItem.batch_id == batch_id, or_(
+                TimelineBatchItem.status == "queued",
+                _stale_in_flight()
+            ))
+            .order_by(TimelineBatchItem.position)
+        ).all()
+
+        batch.status = "processing"
+        batch.started_at = batch.started_at or datetime.utcnow()
+        self.db.add(batch)
+        self.db.commit()
+
+        owns_pool = extraction_pool is None
+        extraction_pool = extraction_pool or make_pool("process", settings.TIMELINE_BATCH_EXTRACT_WORKERS)
+        llm_pool = ThreadPoolExecutor(max_workers=settings.TIMELINE_BATCH_LLM_CONCURRENCY)
+
+        # future -> (stage, item, payload)
+        pending: Dict[Future, Tuple[str, TimelineBatchItem, Dict[str, Any]]] = {}
+        try:
+            for item in items:
+                try:
+                    content = self.storage.download_file(item.spool_key)
+                    if content is None:
+                        raise ValueError("Spooled file is missing")
+                    future = extraction_pool.submit(extract_document_text, content, item.file_type)
+                    pending[future] = ("extract", item, {})
+                    self._set_status(batch, item, "extracting")
+                except Exception as e:
+                    self._fail(batch, item, e)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item, payload = pending.pop(future)
+                    try:
+                        if stage == "extract":
+                            next_future, payload = self._start_analysis(llm_pool, item, future.result())
+                            pending[next_future] = ("analyze", item, payload)
+                            self._set_status(batch, item, "analyzing")
+                        else:
+                            self._store(batch, item, future.result(), payload)
+                    except Exception as e:
+                        self._fail(batch, item, e)
+        finally:
+            llm_pool.shutdown(wait=True)
+            if owns_pool:
+                extraction_pool.shutdown(wait=True)
+            for item in items:
+                self._release_spool(item)
+
+        batch.status = "completed"
+        batch.completed_at = datetime.utcnow()
+        self.db.add(batch)
+        self.db.commit()
+
+    # ===== Stages =====
+
+    def _start_analysis(
+        self,
+        llm_pool: ThreadPoolExecutor,
+        item: TimelineBatchItem,
+        extracted: Tuple[str, int, int]
+    ) -> Tuple[Future, Dict[str, Any]]:
+        text, page_count, word_count = extracted
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+            raise ValueError("Could not extract sufficient text from the document.")
+
+        doc_id = f"doc_{uuid.uuid4().hex[:12]}"
+        future = llm_pool.submit(self.builder.extract_events_from_document, text, item.filename, doc_id)
+        return future, {"text": text, "page_count": page_count, "word_count": word_count}
+
+    def _store(self, batch: TimelineBatch, item: TimelineBatchItem, extraction: Dict[str, Any], payload: Dict):
+        matter = self.timeline.get_matter(batch.matter_id)
+        if not matter:
+            raise ValueError("Matter no longer exists")
+
+        document = self.timeline.add_document(
+            matter, extraction, payload["text"], payload["page_count"], payload["word_count"]
+        )
+        item.doc_id = document.doc_id
+        item.event_count = document.event_count
+        item.is_hot_doc = document.is_hot_doc
+        batch.processed_documents += 1
+        self._set_status(batch, item, "completed")
+
+    # ===== Progress =====
+
+    def _set_status(self, batch: TimelineBatch, item: TimelineBatchItem, status: str):
+        item.status = status
+        item.updated_at = datetime.utcnow()
+        self.db.add(item)
+        self.db.add(batch)
+        self.db.commit()
+
+    def _fail(self, batch: TimelineBatch, item: TimelineBatchItem, error: Exception):
+        logger.warning(f"Timeline batch {batch.batch_id}: {item.filename} failed: {error}")
+        self.db.rollback()
+        item.error = str(error)
+        batch.failed_documents += 1
+        self._set_status(batch, item, "failed")
+
+    def _release_spool(self, item: TimelineBatchItem):
+        if not item.spool_key:
+            return
+        delete_spooled_files(self.storage, [item.spool_key])
+        item.spool_key = None
+        self.db.add(item)
+        self.db.commit()
+
+
+def delete_spooled_files(storage, keys: List[str]):
+    """Remove spooled batch files, logging (not raising) storage failures"""
+    for key in keys:
+        try:
+            storage.delete_file(key)
+        except Exception as e:
+            logger.warning(f"Could not delete spooled file {key}: {e}")
+
+
+def _stale_in_flight():
+    """Condition for files in flight for longer than TIMELINE_BATCH_STALE_SECONDS"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.TIMELINE_BATCH_STALE_SECONDS)
+    return TimelineBatchItem.status.in_(IN_FLIGHT) & (TimelineBatchItem.updated_at < cutoff)
+
+
+def stale_batches(db: Session) -> List[str]:
+    """Ids of batches still processing with files whose worker was lost"""
+    return db.exec(
+        select(TimelineBatch.batch_id)
+        .join(TimelineBatchItem, TimelineBatchItem.batch_id == TimelineBatch.batch_id)
+        .where(TimelineBatch.status == "processing", _stale_in_flight())
+        .distinct()
+    ).all()
+
+
+def batch_progress(batch: TimelineBatch, items: List[TimelineBatchItem]) -> Dict[str, Any]:
+    """Batch status as returned by the API and progress stream"""
+    finished = batch.processed_documents + batch.failed_documents
+    return {
+        "batch_id": batch.batch_id,
+        "matter_id": batch.matter_id,
+        "status": batch.status,
+        "total_documents": batch.total_documents,
+        "processed_documents": batch.processed_documents,
+        "failed_documents": batch.failed_documents,
+        "progress": round(100 * finished / batch.total_documents) if batch.total_documents else 100,
+        "documents": [
+            {
+                "filename": item.filename,
+                "status": item.status,
+                "doc_id": item.doc_id,
+                "event_count": item.event_count,
+                "is_hot_doc": item.is_hot_doc,
+                "error": item.error
+            }
+            for item in items
+        ]
+    }
@@ -2,18 +2,23 @@
 Matter Timeline & Fact Chronology Builder Service
 Extracts dates, events, and key facts from documents to build a searchable timeline.
 """
+import hashlib
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from openai import OpenAI
+from app.services.llm_provider import get_llm_client
 from app.core.config import settings
+from app.services.chunker import truncate_to_tokens
+
+SUMMARY_UNAVAILABLE = "Unable to generate summary."
+EXTRACTION_MAX_TOKENS = 4000
 
 
 class TimelineBuilder:
     """Build chronological timelines from multiple documents"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client(feature="timeline")
         self.model = settings.OPENAI_MODEL
 
     def extract_events_from_document(self, text: str, filename: str, doc_id: str) -> Dict[str, Any]:
@@ -44,7 +49,7 @@ class TimelineBuilder:
         }
         """
         # Limit text for cost control
-        text_to_analyze = text[:15000]
+        text_to_analyze = truncate_to_tokens(text, EXTRACTION_MAX_TOKENS)
 
         prompt = self._build_extraction_prompt(text_to_analyze, filename)
 
@@ -169,6 +174,74 @@ A "hot doc" is a document that could be particularly important in litigation - s
             }
         }
 
+    # ===== Assembly from stored events =====
+    #
+    # A matter's events live in timeline_events, indexed on (matter_id,
+    # sort_date). TimelineService reads one page of date entries plus SQL
+    # aggregates (date range, party counts, totals); assemble_timeline turns
+    # them into the shape build_timeline returns, so the whole timeline is
+    # never loaded or re-sorted in Python.
+
+    def assemble_timeline(
+        self,
+        entries: List[Dict[str, Any]],
+        overview: Dict[str, Any],
+        documents: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Timeline in the shape of build_timeline from a page of date entries,
+        the matter's aggregates (TimelineService.timeline_overview) and its
+        document metadata
+        """
+        hot_docs = [
+            {
+                "doc_id": doc.get("doc_id", ""),
+                "filename": doc.get("filename", ""),
+                "importance": doc.get("importance", "medium"),
+                "reason": doc.get("hot_doc_reason", ""),
+                "doc_type": doc.get("doc_type", "Document"),
+                "doc_date": doc.get("doc_date"),
+                "summary": doc.get("summary", "")
+            }
+            for doc in documents if doc.get("is_hot_doc")
+        ]
+        party_counts = overview["party_counts"]
+        first, last = overview["first_date"], overview["last_date"]
+
+        return {
+            "date_range": {
+                "start": datetime.combine(first, datetime.min.time()).isoformat() if first else None,
+                "end": datetime.combine(last, datetime.min.time()).isoformat() if last else None
+            },
+            "key_parties": sorted(party_counts, key=lambda p: party_counts[p], reverse=True),
+            "hot_docs": sorted(hot_docs, key=lambda x: x.get("importance", "") == "high", reverse=True),
+            "timeline": entries,
+            "statistics": {
+                "total_events": overview["total_events"],
+                "total_documents": len(documents),
+                "hot_docs_count": len(hot_docs),
+                "date_range_days": (last - first).days if first and last else 0,
+                "total_dates": overview["total_dates"]
+            }
+        }
+
+    @staticmethod
+    def summary_key(timeline_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Hash of exactly the content generate_matter_summary reads, so a cached
+        summary stays valid until those events change.
+        """
+        entries = timeline_data.get("timeline") or []
+        if not entries:
+            return None
+        digest = hashlib.sha256()
+        for entry in entries[:30]:
+            digest.update(entry["date"].encode())
+            for event in entry.get("events", []):
+                digest.update(b"\x1f" + event.get("description", "").encode())
+            digest.update(b"\x1e")
+        return digest.hexdigest()
+
     def generate_matter_summary(self, timeline_data: Dict[str, Any]) -> str:
         """Generate an AI summary of the entire matter based on timeline"""
         events_text = ""
@@ -195,7 +268,7 @@ A "hot doc" is a document that could be particularly important in litigation - s
             )
             return response.choices[0].message.content
         except:
-            return "Unable to generate summary."
+            return SUMMARY_UNAVAILABLE
 
     def _build_extraction_prompt(self, text: str, filename: str) -> str:
         """Build the event extraction prompt"""
@@ -0,0 +1,252 @@
+"""
+Matter Timeline Search Index
+
+Per-matter inverted index over timeline events and documents. Postings
+(token -> event/document, field, positions) are written when a document is
+uploaded, so a search only reads the postings for the query terms instead
+of scanning every event of the matter.
+
+Query syntax:
+    breach notice          all terms must match (AND); terms match word prefixes
+    "termination notice"   quoted phrases must appear as consecutive words
+"""
+
+import re
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, or_
+from sqlmodel import Session, select
+
+from app.core.bulk import bulk_insert
+from app.models.timeline import MatterDocument, MatterEvent, MatterEventParty, MatterSearchPosting
+
+TOKEN_PATTERN = re.compile(r"\w+")
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+SIGNIFICANCE_WEIGHT = {"high": 3, "medium": 2, "low": 1}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens of a string"""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into loose terms and quoted phrases (as token lists)"""
+    phrases = [tokenize(p) for p in PHRASE_PATTERN.findall(query)]
+    phrases = [p for p in phrases if p]
+    terms = tokenize(PHRASE_PATTERN.sub(" ", query))
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _field_postings(
+    matter_id: str,
+    doc_id: str,
+    event_id: Optional[int],
+    field: str,
+    *texts: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Postings for one field; multiple texts are spaced apart so phrases can't span them"""
+    positions: Dict[str, List[int]] = defaultdict(list)
+    offset = 0
+    for text in texts:
+        tokens = tokenize(text)
+        for position, token in enumerate(tokens, start=offset):
+            positions[token].append(position)
+        offset += len(tokens) + 1
+    return [
+        dict(matter_id=matter_id, token=token, doc_id=doc_id, event_id=event_id, field=field, positions=offsets)
+        for token, offsets in positions.items()
+    ]
+
+
+class TimelineSearchIndex:
+    """Build and query the inverted index for matter timelines"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== Indexing =====
+
+    def index_document(self, document: MatterDocument, events: Sequence[MatterEvent]):
+        """Add postings for a document and its (already persisted) events"""
+        matter_id, doc_id = document.matter_id, document.doc_id
+
+        rows = _field_postings(matter_id, doc_id, None, "filename", document.filename)
+        rows += _field_postings(matter_id, doc_id, None, "summary", document.summary)
+        for event in events:
+            rows += _field_postings(matter_id, doc_id, event.id, "description", event.description)
+            rows += _field_postings(matter_id, doc_id, event.id, "quote", event.quote)
+            rows += _field_postings(matter_id, doc_id, event.id, "party", *(event.parties_involved or []))
+
+        bulk_insert(self.db, MatterSearchPosting, rows, returning=False)
+
+    def remove_document(self, doc_id: str):
+        self.db.exec(delete(MatterSearchPosting).where(MatterSearchPosting.doc_id == doc_id))
+
+    def remove_matter(self, matter_id: str):
+        self.db.exec(delete(MatterSearchPosting).where(MatterSearchPosting.matter_id == matter_id))
+
+    def is_indexed(self, matter_id: str) -> bool:
+        return self.db.exec(
+            select(MatterSearchPosting.id).where(MatterSearchPosting.matter_id == matter_id).limit(1)
+        ).first() is not None
+
+    def rebuild(self, matter_id: str):
+        """Index every document of a matter from its stored events (backfill)"""
+        self.remove_matter(matter_id)
+        events_by_doc: Dict[str, List[MatterEvent]] = defaultdict(list)
+        for event in self.db.exec(select(MatterEvent).where(MatterEvent.matter_id == matter_id)).all():
+            events_by_doc[event.doc_id].append(event)
+        for document in self.db.exec(select(MatterDocument).where(MatterDocument.matter_id == matter_id)).all():
+            self.index_document(document, events_by_doc.get(document.doc_id, []))
+        self.db.commit()
+
+    # ===== Search =====
+
+    def search(
+        self,
+        matter_id: str,
+        query: str,
+        party: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Ranked events and documents matching every term and phrase of the query
+
+        Party and date facets narrow event results; when either is given,
+        document-level matches are left out. Results are ranked by hot-doc
+        status, significance and number of term hits.
+        """
+        terms, phrases = parse_query(query)
+        phrase_terms = [t for phrase in phrases for t in phrase]
+        required = list(dict.fromkeys(terms + phrase_terms))
+        empty = {"results": [], "facets": {"parties": {}, "dates": {}}}
+        if not required:
+            return empty
+
+        # target -> term -> [(field, positions)]; phrases only use exact-token hits
+        hits: Dict[Tuple[str, Any], Dict[str, List[Tuple[str, List[int]]]]] = defaultdict(lambda: defaultdict(list))
+        exact: Dict[Tuple[str, Any], Dict[str, List[Tuple[str, List[int]]]]] = defaultdict(lambda: defaultdict(list))
+        for token, doc_id, event_id, field, positions in self._postings(matter_id, terms, phrase_terms):
+            target = ("event", event_id) if event_id is not None else ("document", doc_id)
+            for term in required:
+                if token == term or (term in terms and token.startswith(term)):
+                    hits[target][term].append((field, positions))
+            if token in phrase_terms:
+                exact[target][token].append((field, positions))
+
+        matched = {
+            target: term_hits for target, term_hits in hits.items()
+            if len(term_hits) == len(required) and all(self._has_phrase(exact[target], p) for p in phrases)
+        }
+        if not matched:
+            return empty
+
+        event_ids = [key for kind, key in matched if kind == "event"]
+        doc_ids = [key for kind, key in matched if kind == "document"]
+        facets_applied = bool(party or date_from or date_to)
+
+        events = self._load_events(event_ids, party, date_from, date_to)
+        documents = [] if facets_applied or not doc_ids else self.db.exec(
+            select(MatterDocument).where(MatterDocument.doc_id.in_(doc_ids))
+        ).all()
+
+        results = []
+        for event in events:
+            term_hits = matched[("event", event.id)]
+            results.append((
+                (event.source_is_hot, SIGNIFICANCE_WEIGHT.get(event.significance, 0), self._hit_count(term_hits)),
+                {
+                    "type": "event",
+                    "date": event.event_date,
+                    "description": event.description,
+                    "source_doc_id": event.doc_id,
+                    "source_filename": event.source_filename,
+                    "is_hot_doc": event.source_is_hot,
+                    "significance": event.significance,
+                    "quote": event.quote
+                }
+            ))
+        for document in documents:
+            term_hits = matched[("document", document.doc_id)]
+            results.append((
+                (document.is_hot_doc, SIGNIFICANCE_WEIGHT.get(document.importance, 0), self._hit_count(term_hits)),
+                {
+                    "type": "document",
+                    "doc_id": document.doc_id,
+                    "filename": document.filename,
+                    "summary": document.summary,
+                    "is_hot_doc": document.is_hot_doc
+                }
+            ))
+
+        results.sort(key=lambda item: item[0], reverse=True)
+
+        return {
+            "results": [result for _, result in results[:limit]],
+            "facets": {
+                "parties": dict(Counter(p for e in events for p in dict.fromkeys(e.parties_involved or [])).most_common()),
+                "dates": dict(sorted(Counter(e.event_date[:7] for e in events).items()))
+            }
+        }
+
+    def _postings(self, matter_id: str, terms: List[str], phrase_terms: List[str]):
+        # Prefix LIKE on (matter_id, token); on PostgreSQL the index uses text_pattern_ops
+        # so it serves LIKE 'x%' under any collation
+        conditions = [MatterSearchPosting.token.startswith(term, autoescape=True) for term in terms]
+        if phrase_terms:
+            conditions.append(MatterSearchPosting.token.in_(phrase_terms))
+        return self.db.exec(
+            select(
+                MatterSearchPosting.token,
+                MatterSearchPosting.doc_id,
+                MatterSearchPosting.event_id,
+                MatterSearchPosting.field,
+                MatterSearchPosting.positions
+            ).where(MatterSearchPosting.matter_id == matter_id, or_(*conditions))
+        ).all()
+
+    def _load_events(
+        self,
+        event_ids: List[int],
+        party: Optional[str],
+        date_from: Optional[date],
+        date_to: Optional[date]
+    ) -> List[MatterEvent]:
+        if not event_ids:
+            return []
+        statement = select(MatterEvent).where(MatterEvent.id.in_(event_ids))
+        if party:
+            statement = statement.where(MatterEvent.id.in_(
+                select(MatterEventParty.event_id).where(MatterEventParty.party == party)
+            ))
+        if date_from:
+            statement = statement.where(MatterEvent.sort_date >= date_from)
+        if date_to:
+            statement = statement.where(MatterEvent.sort_date <= date_to)
+        return self.db.exec(statement.order_by(MatterEvent.sort_date, MatterEvent.id)).all()
+
+    @staticmethod
+    def _has_phrase(term_hits: Dict[str, List[Tuple[str, List[int]]]], phrase: List[str]) -> bool:
+        """Whether the phrase tokens occur consecutively within one field"""
+        positions_by_field: List[Dict[str, set]] = []
+        for token in phrase:
+            by_field: Dict[str, set] = defaultdict(set)
+            for field, positions in term_hits.get(token, []):
+                by_field[field].update(positions)
+            positions_by_field.append(by_field)
+
+        for field, starts in positions_by_field[0].items():
+            for start in starts:
+                if all(start + i in positions_by_field[i].get(field, ()) for i in range(1, len(phrase))):
+                    return True
+        return False
+
+    @staticmethod
+    def _hit_count(term_hits: Dict[str, List[Tuple[str, List[int]]]]) -> int:
+        return sum(len(positions) for hits in term_hits.values() for _, positions in hits)
@@ -0,0 +1,349 @@
+"""
+Matter Timeline Persistence Service
+
+Stores matters, documents, extracted text and timeline events in the
+database so timelines are shared across workers and survive restarts.
+"""
+
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from app.core.bulk import bulk_insert
+from app.models.timeline import (
+    TimelineMatter, MatterDocument, MatterDocumentText, MatterEvent, MatterEventParty,
+    TimelineBatch, TimelineBatchItem
+)
+from app.services.timeline_search import TimelineSearchIndex
+
+UNDATED = date(1900, 1, 1)
+
+
+def parse_event_date(value: Optional[str]) -> date:
+    """Parse an extracted YYYY-MM-DD date, falling back to UNDATED"""
+    try:
+        return date.fromisoformat((value or "")[:10])
+    except ValueError:
+        return UNDATED
+
+
+def event_to_dict(event: MatterEvent) -> Dict[str, Any]:
+    """Event in the shape produced by TimelineBuilder.extract_events_from_document"""
+    return {
+        "date": event.event_date,
+        "date_precision": event.date_precision,
+        "event_type": event.event_type,
+        "description": event.description,
+        "parties_involved": event.parties_involved or [],
+        "significance": event.significance,
+        "quote": event.quote
+    }
+
+
+def document_to_dict(document: MatterDocument, events: List[MatterEvent]) -> Dict[str, Any]:
+    """Document in the shape expected by TimelineBuilder.build_timeline"""
+    return {
+        "doc_id": document.doc_id,
+        "filename": document.filename,
+        "doc_type": document.doc_type,
+        "doc_date": document.doc_date,
+        "importance": document.importance,
+        "is_hot_doc": document.is_hot_doc,
+        "hot_doc_reason": document.hot_doc_reason,
+        "summary": document.summary,
+        "uploaded_at": document.uploaded_at,
+        "events": [event_to_dict(e) for e in events]
+    }
+
+
+class TimelineService:
+    """Database access for matters, documents and events"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.search_index = TimelineSearchIndex(db)
+
+    # ===== Matters =====
+
+    def create_matter(self, user_id: int, name: str, description: Optional[str] = None) -> TimelineMatter:
+        """Create a new matter"""
+        matter = TimelineMatter(
+            matter_id=f"mat_{uuid.uuid4().hex[:12]}",
+            user_id=user_id,
+            name=name,
+            description=description
+        )
+        self.db.add(matter)
+        self.db.commit()
+        self.db.refresh(matter)
+        return matter
+
+    def get_matter(self, matter_id: str) -> Optional[TimelineMatter]:
+        return self.db.exec(
+            select(TimelineMatter).where(TimelineMatter.matter_id == matter_id)
+        ).first()
+
+    def _lock_matter(self, matter: TimelineMatter) -> TimelineMatter:
+        """Re-read a matter row FOR UPDATE so concurrent uploads don't lose aggregate updates"""
+        return self.db.exec(
+            select(TimelineMatter)
+            .where(TimelineMatter.id == matter.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).one()
+
+    def list_matters(self, user_id: int) -> List[TimelineMatter]:
+        return self.db.exec(
+            select(TimelineMatter)
+            .where(TimelineMatter.user_id == user_id)
+            .order_by(TimelineMatter.created_at.desc())
+        ).all()
+
+    def delete_matter(self, matter: TimelineMatter) -> List[str]:
+        """
+        Delete a matter with all its documents, text, events and batches
+
+        Returns the storage keys of files still spooled by its batches; the
+        caller removes them (see timeline_batch.delete_spooled_files).
+        """
+        doc_ids = select(MatterDocument.doc_id).where(MatterDocument.matter_id == matter.matter_id)
+        batch_ids = select(TimelineBatch.batch_id).where(TimelineBatch.matter_id == matter.matter_id)
+
+        spool_keys = self.db.exec(
+            select(TimelineBatchItem.spool_key)
+            .where(TimelineBatchItem.batch_id.in_(batch_ids), TimelineBatchItem.spool_key.is_not(None))
+        ).all()
+
+        self.search_index.remove_matter(matter.matter_id)
+        self.db.exec(delete(TimelineBatchItem).where(TimelineBatchItem.batch_id.in_(batch_ids)))
+        self.db.exec(delete(TimelineBatch).where(TimelineBatch.matter_id == matter.matter_id))
+        self.db.exec(delete(MatterEventParty).where(MatterEventParty.matter_id == matter.matter_id))
+        self.db.exec(delete(MatterEvent).where(MatterEvent.matter_id == matter.matter_id))
+        self.db.exec(delete(MatterDocumentText).where(MatterDocumentText.doc_id.in_(doc_ids)))
+        self.db.exec(delete(MatterDocument).where(MatterDocument.matter_id == matter.matter_id))
+        self.db.delete(matter)
+        self.db.commit()
+        return list(spool_keys)
+
+    # ===== Documents =====
+
+    def add_document(
+        self,
+        matter: TimelineMatter,
+        extraction: Dict[str, Any],
+        text: str,
+        page_count: int,
+        word_count: int
+    ) -> MatterDocument:
+        """Persist a document's extraction, text and events and update matter aggregates"""
+        events = extraction.get("events", [])
+        is_hot = extraction.get("is_hot_doc", False)
+
+        matter = self._lock_matter(matter)
+
+        document = MatterDocument(
+            doc_id=extraction["doc_id"],
+            matter_id=matter.matter_id,
+            filename=extraction["filename"],
+            doc_type=extraction.get("doc_type", "Other"),
+            doc_date=extraction.get("doc_date"),
+            importance=extraction.get("importance", "medium"),
+            is_hot_doc=is_hot,
+            hot_doc_reason=extraction.get("hot_doc_reason", ""),
+            summary=extraction.get("summary", ""),
+            page_count=page_count,
+            word_count=word_count,
+            event_count=len(events)
+        )
+        self.db.add(document)
+        self.db.add(MatterDocumentText(doc_id=document.doc_id, content=text))
+        self.db.flush()
+
+        saved_events = bulk_insert(self.db, MatterEvent, [
+            dict(
+                matter_id=matter.matter_id,
+                doc_id=document.doc_id,
+                event_date=event.get("date", ""),
+                sort_date=parse_event_date(event.get("date")),
+                date_precision=event.get("date_precision", "exact"),
+                event_type=event.get("event_type", "other"),
+                description=event.get("description", ""),
+                parties_involved=event.get("parties_involved", []),
+                significance=event.get("significance", "medium"),
+                quote=event.get("quote"),
+                source_filename=document.filename,
+                source_is_hot=is_hot
+            )
+            for event in events
+        ])
+
+        bulk_insert(self.db, MatterEventParty, [
+            dict(matter_id=matter.matter_id, event_id=saved.id, party=party)
+            for saved in saved_events
+            for party in dict.fromkeys(saved.parties_involved or [])
+        ], returning=False)
+
+        self.search_index.index_document(document, saved_events)
+
+        matter.document_count += 1
+        matter.event_count += len(events)
+        matter.hot_docs_count += 1 if is_hot else 0
+        matter.updated_at = datetime.utcnow()
+        self.db.add(matter)
+        self.db.commit()
+        self.db.refresh(document)
+        return document
+
+    def get_document(self, matter_id: str, doc_id: str) -> Optional[MatterDocument]:
+        return self.db.exec(
+            select(MatterDocument).where(
+                MatterDocument.matter_id == matter_id,
+                MatterDocument.doc_id == doc_id
+            )
+        ).first()
+
+    def list_documents(self, matter_id: str) -> List[MatterDocument]:
+        return self.db.exec(
+            select(MatterDocument)
+            .where(MatterDocument.matter_id == matter_id)
+            .order_by(MatterDocument.uploaded_at, MatterDocument.id)
+        ).all()
+
+    def get_document_text(self, doc_id: str) -> str:
+        """Load a document's extracted text (only when actually needed)"""
+        content = self.db.exec(
+            select(MatterDocumentText.content).where(MatterDocumentText.doc_id == doc_id)
+        ).first()
+        return content or ""
+
+    def delete_document(self, matter: TimelineMatter, document: MatterDocument):
+        """Remove a document and its events from a matter"""
+        event_ids = select(MatterEvent.id).where(MatterEvent.doc_id == document.doc_id)
+
+        self.search_index.remove_document(document.doc_id)
+        self.db.exec(delete(MatterEventParty).where(MatterEventParty.event_id.in_(event_ids)))
+        self.db.exec(delete(MatterEvent).where(MatterEvent.doc_id == document.doc_id))
+        self.db.exec(delete(MatterDocumentText).where(MatterDocumentText.doc_id == document.doc_id))
+
+        matter = self._lock_matter(matter)
+        matter.document_count = max(0, matter.document_count - 1)
+        matter.event_count = max(0, matter.event_count - document.event_count)
+        matter.hot_docs_count = max(0, matter.hot_docs_count - (1 if document.is_hot_doc else 0))
+        matter.updated_at = datetime.utcnow()
+
+        self.db.delete(document)
+        self.db.add(matter)
+        self.db.commit()
+
+    # ===== Events =====
+
+    def list_events(self, matter_id: str, doc_id: Optional[str] = None) -> List[MatterEvent]:
+        """Events in chronological order (served by the matter/date index)"""
+        statement = select(MatterEvent).where(MatterEvent.matter_id == matter_id)
+        if doc_id:
+            statement = statement.where(MatterEvent.doc_id == doc_id)
+        return self.db.exec(statement.order_by(MatterEvent.sort_date, MatterEvent.id)).all()
+
+    # ===== Assembled timeline =====
+
+    def timeline_entries(self, matter_id: str, offset: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        One page of the timeline: up to `limit` dates (from the `offset`-th)
+        with their events, in date order, read through the matter/date index
+        """
+        page = self.db.exec(
+            select(MatterEvent.sort_date, MatterEvent.event_date)
+            .where(MatterEvent.matter_id == matter_id)
+            .group_by(MatterEvent.sort_date, MatterEvent.event_date)
+            .order_by(MatterEvent.sort_date, MatterEvent.event_date)
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        if not page:
+            return []
+
+        keys = set(page)
+        events = self.db.exec(
+            select(MatterEvent)
+            .where(
+                MatterEvent.matter_id == matter_id,
+                MatterEvent.sort_date >= page[0][0],
+                MatterEvent.sort_date <= page[-1][0]
+            )
+            .order_by(MatterEvent.sort_date, MatterEvent.event_date, MatterEvent.id)
+        ).all()
+
+        entries: List[Dict[str, Any]] = []
+        previous = None
+        for event in events:
+            key = (event.sort_date, event.event_date)
+            if key not in keys:  # Another date string on a boundary day of the page
+                continue
+            if key != previous:
+                entries.append({
+                    "date": event.event_date or "Unknown",
+                    "events": [],
+                    "source_docs": [],
+                    "event_count": 0,
+                    "has_hot_doc": False
+                })
+                previous = key
+            entry = entries[-1]
+            entry["events"].append({
+                **event_to_dict(event),
+                "source_doc_id": event.doc_id,
+                "source_filename": event.source_filename,
+                "source_is_hot": event.source_is_hot
+            })
+            entry["event_count"] += 1
+            entry["has_hot_doc"] = entry["has_hot_doc"] or event.source_is_hot
+            if event.doc_id not in entry["source_docs"]:
+                entry["source_docs"].append(event.doc_id)
+        return entries
+
+    def timeline_overview(self, matter_id: str) -> Dict[str, Any]:
+        """Aggregates of a matter's whole timeline (date range, totals, party mentions)"""
+        first, last = self.db.exec(
+            select(func.min(MatterEvent.sort_date), func.max(MatterEvent.sort_date))
+            .where(MatterEvent.matter_id == matter_id, MatterEvent.sort_date != UNDATED)
+        ).one()
+        dates = (
+            select(MatterEvent.sort_date, MatterEvent.event_date)
+            .where(MatterEvent.matter_id == matter_id)
+            .group_by(MatterEvent.sort_date, MatterEvent.event_date)
+            .subquery()
+        )
+        total_dates = self.db.exec(select(func.count()).select_from(dates)).one()
+        total_events = self.db.exec(
+            select(func.count(MatterEvent.id)).where(MatterEvent.matter_id == matter_id)
+        ).one()
+        party_counts = dict(self.db.exec(
+            select(MatterEventParty.party, func.count(MatterEventParty.id))
+            .where(MatterEventParty.matter_id == matter_id)
+            .group_by(MatterEventParty.party)
+        ).all())
+        return {
+            "first_date": first,
+            "last_date": last,
+            "total_events": total_events,
+            "total_dates": total_dates,
+            "party_counts": party_counts
+        }
+
+    def store_summary(self, matter: TimelineMatter, summary_key: str, summary: str):
+        """Cache the AI matter summary for the timeline content it describes"""
+        matter.matter_summary = summary
+        matter.summary_key = summary_key
+        self.db.add(matter)
+        self.db.commit()
+
+    # ===== Search =====
+
+    def search(self, matter: TimelineMatter, query: str, **filters) -> Dict[str, Any]:
+        """Search a matter's events and documents through its inverted index"""
+        if matter.document_count and not self.search_index.is_indexed(matter.matter_id):
+            self.search_index.rebuild(matter.matter_id)
+        return self.search_index.search(matter.matter_id, query, **filters)
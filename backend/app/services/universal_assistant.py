@@ -6,9 +6,10 @@ based on the current page context and matter information.
 """
 
 from typing import Optional, Dict, Any
-import openai
 from datetime import datetime
 
+from app.services.llm_provider import get_llm_client
+
 
 class UniversalAssistant:
     """
@@ -19,7 +20,7 @@ class UniversalAssistant:
     """
 
     def __init__(self, openai_api_key: str):
-        self.client = openai.OpenAI(api_key=openai_api_key)
+        self.client = get_llm_client(openai_api_key, feature="universal_assistant")
 
         # Context-specific system prompts
         self.context_prompts = {
@@ -2,8 +2,10 @@
 Virus scanning service using ClamAV
 """
 import logging
+import time
 from typing import Tuple, Optional
 from app.core.config import settings
+from app.core.metrics import VIRUS_SCAN_SECONDS
 
 # Try to import clamd, but don't fail if not available
 try:
@@ -77,46 +79,53 @@ class VirusScanner:
             logger.warning(f"Virus scanning disabled - allowing file: {filename}")
             return (True, None)
 
+        outcome = "error"
+        started = time.perf_counter()
         try:
-            # Scan the file content
-            result = self.scanner.instream(file_content)
-
-            # Parse result
-            # Result format: {'stream': ('FOUND', 'virus-name')} or {'stream': ('OK', None)}
-            status = result.get('stream')
+            try:
+                # Scan the file content
+                result = self.scanner.instream(file_content)
+
+                # Parse result
+                # Result format: {'stream': ('FOUND', 'virus-name')} or {'stream': ('OK', None)}
+                status = result.get('stream')
+
+                if status is None:
+                    logger.error(f"Invalid scan result for {filename}: {result}")
+                    raise Exception("Invalid virus scan result")
+
+                scan_status, virus_name = status
+
+                if scan_status == 'OK':
+                    outcome = "clean"
+                    logger.info(f"File scanned clean: {filename}")
+                    return (True, None)
+                elif scan_status == 'FOUND':
+                    outcome = "infected"
+                    logger.warning(f"Virus detected in {filename}: {virus_name}")
+                    return (False, virus_name)
+                elif scan_status == 'ERROR':
+                    logger.error(f"ClamAV scan error for {filename}: {virus_name}")
+                    raise Exception(f"Virus scan error: {virus_name}")
+                else:
+                    logger.error(f"Unknown scan status for {filename}: {scan_status}")
+                    raise Exception(f"Unknown virus scan status: {scan_status}")
 
-            if status is None:
-                logger.error(f"Invalid scan result for {filename}: {result}")
-                raise Exception("Invalid virus scan result")
+            except Exception as e:
+                # Check if it's a ClamAV connection error (only if clamd is available)
+                is_connection_error = CLAMD_AVAILABLE and clamd and isinstance(e, clamd.ConnectionError)
 
-            scan_status, virus_name = status
+                if is_connection_error:
+                    logger.error(f"ClamAV connection error while scanning {filename}: {str(e)}")
+                else:
+                    logger.error(f"Error scanning {filename}: {str(e)}")
 
-            if scan_status == 'OK':
-                logger.info(f"File scanned clean: {filename}")
+                # In production, allow files through with warning if ClamAV unavailable
+                # This prevents blocking uploads if ClamAV service has issues
+                logger.warning(f"Allowing file {filename} due to scan error - virus scanning unavailable")
                 return (True, None)
-            elif scan_status == 'FOUND':
-                logger.warning(f"Virus detected in {filename}: {virus_name}")
-                return (False, virus_name)
-            elif scan_status == 'ERROR':
-                logger.error(f"ClamAV scan error for {filename}: {virus_name}")
-                raise Exception(f"Virus scan error: {virus_name}")
-            else:
-                logger.error(f"Unknown scan status for {filename}: {scan_status}")
-                raise Exception(f"Unknown virus scan status: {scan_status}")
-
-        except Exception as e:
-            # Check if it's a ClamAV connection error (only if clamd is available)
-            is_connection_error = CLAMD_AVAILABLE and clamd and isinstance(e, clamd.ConnectionError)
-
-            if is_connection_error:
-                logger.error(f"ClamAV connection error while scanning {filename}: {str(e)}")
-            else:
-                logger.error(f"Error scanning {filename}: {str(e)}")
-
-            # In production, allow files through with warning if ClamAV unavailable
-            # This prevents blocking uploads if ClamAV service has issues
-            logger.warning(f"Allowing file {filename} due to scan error - virus scanning unavailable")
-            return (True, None)
+        finally:
+            VIRUS_SCAN_SECONDS.labels(result=outcome).observe(time.perf_counter() - started)
 
     def get_version(self) -> Optional[str]:
         """Get ClamAV version information"""
@@ -1,5 +1,8 @@
+import os
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_ready
 from app.core.config import settings
+from app.core.metrics import mark_process_dead, start_worker_metrics_server
 
 # Create Celery app
 celery_app = Celery(
@@ -19,4 +22,39 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=600,  # 10 minutes max per task
     task_soft_time_limit=540,  # 9 minutes soft limit
+    beat_schedule={
+        # Upload quota counters back in line with UsageRecord (app/services/quota.py)
+        "reconcile-usage-quotas": {
+            "task": "reconcile_usage_quotas",
+            "schedule": settings.QUOTA_RECONCILE_SECONDS,
+        },
+        # Timeline batches whose worker was lost mid-file (app/services/timeline_batch.py)
+        "requeue-stale-timeline-batches": {
+            "task": "requeue_stale_timeline_batches",
+            "schedule": settings.TIMELINE_BATCH_STALE_SECONDS,
+        },
+        # Clause pre-classifier model, loaded by the workers (app/services/clause_classifier.py)
+        "train-clause-model": {
+            "task": "train_clause_model",
+            "schedule": settings.CLAUSE_MODEL_REFRESH_SECONDS,
+        },
+    },
 )
+
+
+# Metrics: serve them from the worker host if configured, and drop the live
+# gauges of prefork children as they exit (multiprocess mode)
+@worker_ready.connect
+def start_metrics_server(**kwargs):
+    start_worker_metrics_server()
+
+
+# Train the clause model at startup rather than an interval later
+@worker_ready.connect
+def train_clause_model_at_startup(**kwargs):
+    celery_app.send_task("train_clause_model")
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
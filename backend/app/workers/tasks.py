@@ -3,13 +3,19 @@ from datetime import datetime
 from sqlmodel import Session, select
 from app.workers.celery_app import celery_app
 from app.core.database import engine
+from app.core.metrics import TASKS_TOTAL, task_stage
 from app.models.contract import Contract, ContractAnalysis, ContractStatus, RiskLevel, ContractComparison
 from app.models.usage import UsageRecord
 from app.models.user import User
-from app.services.storage import S3Storage
+from app.services.storage import get_storage
 from app.services.document_processor import DocumentProcessor
+from app.services.quota import quota_reservations
 from app.services.ai_analyzer import AIContractAnalyzer
+from app.services.clause_classifier import get_clause_classifier, store_clause_model, train_clause_model
 from app.services.comparison_analyzer import ContractComparisonAnalyzer
+from app.services.section_index import ContractSectionService
+from app.services.text_store import ContractTextStore
+from app.services.timeline_batch import TimelineBatchIngestor, stale_batches
 
 
 @celery_app.task(bind=True, name="process_contract")
@@ -32,68 +38,77 @@ def process_contract_task(self, contract_id: int):
             session.commit()
 
             # Download file from S3
-            storage = S3Storage()
-            file_content = storage.download_file(contract.s3_key)
+            with task_stage("process_contract", "download"):
+                storage = get_storage()
+                file_content = storage.download_file(contract.s3_key)
 
             # Extract text
-            processor = DocumentProcessor()
-            extracted_text, page_count, word_count = processor.process_file(
-                file_content,
-                contract.file_type
-            )
-
-            # Update contract metadata
-            contract.page_count = page_count
-            contract.word_count = word_count
-            session.add(contract)
-            session.commit()
+            with task_stage("process_contract", "extract"):
+                processor = DocumentProcessor()
+                extracted_text, page_count, word_count = processor.process_file(
+                    file_content,
+                    contract.file_type
+                )
+
+            # Update contract metadata, store the full text and segment it into sections
+            with task_stage("process_contract", "persist"):
+                contract.page_count = page_count
+                contract.word_count = word_count
+                session.add(contract)
+                ContractTextStore(session).save(contract.id, extracted_text)
+                ContractSectionService(session).build(contract.id, extracted_text)
+                session.commit()
 
             # Run AI analysis
-            analyzer = AIContractAnalyzer()
-            analysis_result = analyzer.analyze_contract(extracted_text)
-
-            # Create analysis record
-            analysis = ContractAnalysis(
-                contract_id=contract.id,
-                executive_summary=analysis_result["executive_summary"],
-                parties=analysis_result["key_terms"]["parties"],
-                effective_date=analysis_result["key_terms"].get("effective_date"),
-                term_duration=analysis_result["key_terms"].get("term"),
-                payment_terms=analysis_result["key_terms"].get("payment"),
-                detected_clauses=analysis_result["detected_clauses"],
-                missing_clauses=analysis_result["missing_clauses"],
-                risk_score=analysis_result["risk_score"],
-                overall_risk_level=RiskLevel(analysis_result["overall_risk_level"]),
-                extracted_text=extracted_text[:50000],  # Store first 50k chars
-                processing_time_seconds=time.time() - start_time
-            )
-
-            session.add(analysis)
-
-            # Update contract status
-            contract.status = ContractStatus.COMPLETED
-            contract.processed_at = datetime.utcnow()
-            session.add(contract)
+            with task_stage("process_contract", "llm"):
+                analyzer = AIContractAnalyzer(classifier=get_clause_classifier(session))
+                analysis_result = analyzer.analyze_contract(extracted_text)
 
-            # Record usage
-            user = session.get(User, contract.user_id)
-            if user:
-                user.pages_used_current_period += page_count
-                user.files_used_current_period += 1
-                session.add(user)
-
-                usage_record = UsageRecord(
-                    user_id=user.id,
-                    resource_type="contract_analysis",
-                    pages_consumed=page_count,
-                    files_consumed=1,
+            with task_stage("process_contract", "persist"):
+                # Create analysis record
+                analysis = ContractAnalysis(
                     contract_id=contract.id,
-                    billing_period_start=user.billing_period_start,
-                    billing_period_end=user.billing_period_end
+                    executive_summary=analysis_result["executive_summary"],
+                    parties=analysis_result["key_terms"]["parties"],
+                    effective_date=analysis_result["key_terms"].get("effective_date"),
+                    term_duration=analysis_result["key_terms"].get("term"),
+                    payment_terms=analysis_result["key_terms"].get("payment"),
+                    detected_clauses=analysis_result["detected_clauses"],
+                    missing_clauses=analysis_result["missing_clauses"],
+                    risk_score=analysis_result["risk_score"],
+                    overall_risk_level=RiskLevel(analysis_result["overall_risk_level"]),
+                    processing_time_seconds=time.time() - start_time
                 )
-                session.add(usage_record)
 
-            session.commit()
+                session.add(analysis)
+
+                # Update contract status
+                contract.status = ContractStatus.COMPLETED
+                contract.processed_at = datetime.utcnow()
+                session.add(contract)
+
+                # Record usage
+                user = session.get(User, contract.user_id)
+                if user:
+                    user.pages_used_current_period += page_count
+                    user.files_used_current_period += 1
+                    session.add(user)
+
+                    usage_record = UsageRecord(
+                        user_id=user.id,
+                        resource_type="contract_analysis",
+                        pages_consumed=page_count,
+                        files_consumed=1,
+                        contract_id=contract.id,
+                        billing_period_start=user.billing_period_start,
+                        billing_period_end=user.billing_period_end
+                    )
+                    session.add(usage_record)
+
+                session.commit()
+                if user:
+                    quota_reservations.commit(user, contract.contract_id, page_count)
+            TASKS_TOTAL.labels(task="process_contract", status="completed").inc()
 
             return {
                 "status": "completed",
@@ -108,6 +123,10 @@ def process_contract_task(self, contract_id: int):
             contract.error_message = str(e)
             session.add(contract)
             session.commit()
+            user = session.get(User, contract.user_id)
+            if user:
+                quota_reservations.release(user, contract.contract_id)
+            TASKS_TOTAL.labels(task="process_contract", status="failed").inc()
 
             return {"status": "failed", "error": str(e)}
 
@@ -160,19 +179,27 @@ def process_comparison_task(self, comparison_id: int):
                 raise ValueError("Both contracts must have completed analyses")
 
             # Run comparison
-            analyzer = ContractComparisonAnalyzer()
-            comparison_result = analyzer.compare_contracts(
-                original_text=original_analysis.extracted_text or "",
-                revised_text=revised_analysis.extracted_text or "",
-                original_analysis={
-                    "detected_clauses": original_analysis.detected_clauses,
-                    "risk_score": original_analysis.risk_score
-                },
-                revised_analysis={
-                    "detected_clauses": revised_analysis.detected_clauses,
-                    "risk_score": revised_analysis.risk_score
-                }
-            )
+            text_store = ContractTextStore(session)
+            original_text = text_store.text_for(original_analysis)
+            revised_text = text_store.text_for(revised_analysis)
+            section_service = ContractSectionService(session)
+
+            with task_stage("process_comparison", "llm"):
+                analyzer = ContractComparisonAnalyzer()
+                comparison_result = analyzer.compare_contracts(
+                    original_text=original_text,
+                    revised_text=revised_text,
+                    original_analysis={
+                        "detected_clauses": original_analysis.detected_clauses,
+                        "risk_score": original_analysis.risk_score
+                    },
+                    revised_analysis={
+                        "detected_clauses": revised_analysis.detected_clauses,
+                        "risk_score": revised_analysis.risk_score
+                    },
+                    original_sections=section_service.get(original_contract.id, original_text),
+                    revised_sections=section_service.get(revised_contract.id, revised_text)
+                )
 
             # Update comparison record
             comparison.summary = comparison_result.get("summary")
@@ -189,6 +216,7 @@ def process_comparison_task(self, comparison_id: int):
 
             session.add(comparison)
             session.commit()
+            TASKS_TOTAL.labels(task="process_comparison", status="completed").inc()
 
             return {
                 "status": "completed",
@@ -202,5 +230,66 @@ def process_comparison_task(self, comparison_id: int):
             comparison.error_message = str(e)
             session.add(comparison)
             session.commit()
+            TASKS_TOTAL.labels(task="process_comparison", status="failed").inc()
 
             return {"status": "failed", "error": str(e)}
+
+
+@celery_app.task(bind=True, name="process_timeline_batch")
+def process_timeline_batch_task(self, batch_id: str):
+    """
+    Background task to ingest a batch of documents into a matter timeline
+    """
+    start_time = time.time()
+
+    with Session(engine) as session:
+        TimelineBatchIngestor(session).run(batch_id)
+    TASKS_TOTAL.labels(task="process_timeline_batch", status="completed").inc()
+
+    return {
+        "status": "completed",
+        "batch_id": batch_id,
+        "processing_time": time.time() - start_time
+    }
+
+
+@celery_app.task(name="requeue_stale_timeline_batches")
+def requeue_stale_timeline_batches_task():
+    """
+    Periodic task: resume batches whose worker was lost mid-file; the files
+    it left extracting/analyzing are processed again
+    """
+    with Session(engine) as session:
+        batch_ids = stale_batches(session)
+
+    for batch_id in batch_ids:
+        process_timeline_batch_task.delay(batch_id)
+
+    return {"status": "completed", "batches_requeued": len(batch_ids)}
+
+
+@celery_app.task(name="reconcile_usage_quotas")
+def reconcile_usage_quotas_task():
+    """
+    Periodic task: reset the upload quota counters to the recorded usage
+    (UsageRecord) plus the reservations still held
+    """
+    with Session(engine) as session:
+        reconciled = quota_reservations.reconcile(session)
+
+    return {"status": "completed", "counters_reconciled": reconciled}
+
+
+@celery_app.task(name="train_clause_model")
+def train_clause_model_task():
+    """
+    Periodic task: retrain the clause pre-classifier on the stored analyses
+    and publish it to the workers
+    """
+    with Session(engine) as session:
+        model = train_clause_model(session)
+
+    return {
+        "status": "completed" if store_clause_model(model) else "not_stored",
+        "labels": sorted(model.weights) if model is not None else []
+    }
@@ -0,0 +1,10 @@
+"""
+Performance tooling for the DafLegal backend
+
+- perf.loadtest: end-to-end load harness (upload -> SSE -> analysis ->
+  compliance -> export) against the app in-process or a running stack
+- perf.synthetic: generators for synthetic contracts and documents
+- perf.stats: latency recording, percentiles and baseline comparison
+
+Run from the backend directory, e.g. `python -m perf.loadtest --help`.
+"""
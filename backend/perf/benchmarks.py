@@ -0,0 +1,398 @@
+"""
+Micro-benchmarks for the CPU-bound services and the ASGI middleware stack
+
+Each case runs one service call on synthetic input of a given size
+(contracts of 1-500 pages, playbooks of 10-500 rules, rosters of 10-10k
+lawyers, ...) or drives a batch of requests through the middlewares
+(middleware.security_stack minus middleware.bare_app is their per-request
+overhead) or renders and compresses the largest responses (perf.payloads),
+and records the median and minimum wall time over repeated
+runs plus the peak Python heap allocation of one run (tracemalloc, measured
+separately so tracing does not skew the timings).
+
+    python -m perf.benchmarks                       # all cases, compared to the stored baseline
+    python -m perf.benchmarks --quick               # smallest size of each case
+    python -m perf.benchmarks -k compliance         # cases whose name contains "compliance"
+    python -m perf.benchmarks --save-baseline       # record perf/benchmark_baseline.json
+
+A case regresses when its median time exceeds the baseline by more than
+--time-tolerance (a ratio, default 1.5, since baselines come from another
+machine) or its peak memory by more than --memory-tolerance (default 1.25);
+the exit status is then 1.
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+MIN_TIME_SECONDS = 0.5
+MIN_TIME_DELTA_MS = 1.0  # Smaller slowdowns are timer noise
+MIN_MEMORY_DELTA_KIB = 64.0
+
+
+def _configure_environment():
+    """Settings the services need at import time; benchmarks never reach the LLM or the database"""
+    for key, value in {
+        "DATABASE_URL": "sqlite://",
+        "REDIS_URL": "redis://localhost:6379/0",
+        "SECRET_KEY": "benchmark",
+        "OPENAI_API_KEY": "sk-benchmark",
+        "LLM_PROVIDER": "mock",
+    }.items():
+        os.environ.setdefault(key, value)
+
+
+# ===== Cases =====
+#
+# Each case: {"name", "param", "sizes", "setup"}; setup(size) builds the input
+# (untimed) and returns the zero-argument callable that is measured.
+
+def _compliance_setup(rules: int) -> Callable[[], Any]:
+    from app.models.compliance import ComplianceRule
+    from app.models.contract import ContractAnalysis
+    from app.services.compliance_engine import ComplianceEngine
+    from app.services.section_index import SectionIndex
+    from perf.synthetic import contract_analysis_fields, contract_text, playbook_rules
+
+    text = contract_text(pages=20)
+    analysis = ContractAnalysis(**contract_analysis_fields(text))
+    sections = SectionIndex.from_text(text)
+    playbook = [ComplianceRule(**fields) for fields in playbook_rules(rules)]
+
+    def run():
+        return [ComplianceEngine.evaluate_rule(rule, analysis, text, sections) for rule in playbook]
+    return run
+
+
+def _diff_setup(pages: int) -> Callable[[], Any]:
+    from app.services.comparison_analyzer import ContractComparisonAnalyzer
+    from perf.synthetic import contract_text, revised_text
+
+    original = contract_text(pages=pages)
+    revised = revised_text(original)
+    analyzer = ContractComparisonAnalyzer()
+    return lambda: analyzer._generate_text_diff(original, revised)
+
+
+def _chunk_setup(pages: int) -> Callable[[], Any]:
+    from app.services.document_processor import DocumentProcessor
+    from perf.synthetic import contract_text
+
+    text = contract_text(pages=pages)
+    return lambda: DocumentProcessor.chunk_text(text)
+
+
+def _pdf_setup(pages: int) -> Callable[[], Any]:
+    from app.services.document_processor import DocumentProcessor
+    from perf.synthetic import contract_pdf, contract_text
+
+    content = contract_pdf(contract_text(pages=pages))
+    return lambda: DocumentProcessor.extract_from_pdf(content)
+
+
+def _docx_setup(pages: int) -> Callable[[], Any]:
+    from app.services.document_processor import DocumentProcessor
+    from perf.synthetic import contract_docx, contract_text
+
+    content = contract_docx(contract_text(pages=pages))
+    return lambda: DocumentProcessor.extract_from_docx(content)
+
+
+def _timeline_setup(documents: int) -> Callable[[], Any]:
+    import copy
+
+    from app.services.timeline_builder import TimelineBuilder
+    from perf.synthetic import timeline_documents
+
+    builder = TimelineBuilder()
+    extracted = timeline_documents(documents)
+    # build_timeline annotates the events it is given; give every run fresh ones
+    return lambda: builder.build_timeline(copy.deepcopy(extracted))
+
+
+def _match_lawyers_setup(lawyers: int) -> Callable[[], Any]:
+    from app.services.intake_service import IntakeTriageService
+    from perf.synthetic import lawyer_roster
+
+    service = IntakeTriageService()
+    roster = lawyer_roster(lawyers)
+    return lambda: service.match_lawyers("litigation", 5, "senior", matter_value=100000, available_lawyers=roster)
+
+
+def _transactions(count: int) -> List[Dict[str, Any]]:
+    import random
+
+    rng = random.Random(count)
+    return [
+        {
+            "value": Decimal(rng.randrange(1_000_000, 200_000_000)),
+            "type": rng.choice(["residential", "commercial", "agricultural"]),
+            "affordable": rng.random() < 0.1,
+            "acquired": datetime(rng.randint(2000, 2023), rng.randint(1, 12), 1),
+        }
+        for _ in range(count)
+    ]
+
+
+def _stamp_duty_setup(transactions: int) -> Callable[[], Any]:
+    from app.services.conveyancing_service import StampDutyCalculator
+
+    calculator = StampDutyCalculator()
+    batch = _transactions(transactions)
+    return lambda: [
+        calculator.calculate_stamp_duty(t["value"], t["type"], is_affordable_housing=t["affordable"]) for t in batch
+    ]
+
+
+def _cgt_setup(transactions: int) -> Callable[[], Any]:
+    from app.services.conveyancing_service import StampDutyCalculator
+
+    calculator = StampDutyCalculator()
+    batch = _transactions(transactions)
+    return lambda: [
+        calculator.calculate_capital_gains_tax(t["value"], t["value"] * Decimal("1.3"), t["acquired"]) for t in batch
+    ]
+
+
+def _total_cost_setup(transactions: int) -> Callable[[], Any]:
+    from app.services.conveyancing_service import StampDutyCalculator
+
+    calculator = StampDutyCalculator()
+    batch = _transactions(transactions)
+    return lambda: [
+        calculator.calculate_total_transaction_cost(t["value"], t["type"], has_mortgage=True) for t in batch
+    ]
+
+
+def _asgi_requests(app, count: int, body: bytes = b"", headers=()) -> Callable[[], Any]:
+    """Drive `count` POST requests straight through an ASGI app (no server, no sockets)"""
+    import asyncio
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/api/v1/contracts", "raw_path": b"/api/v1/contracts", "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-length", str(len(body)).encode()),
+                    (b"authorization", b"Bearer dfk_benchmark"), *headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    async def many():
+        async def send(message):
+            pass
+
+        for _ in range(count):
+            messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+            async def receive():
+                return messages.pop() if messages else {"type": "http.disconnect"}
+
+            await app(dict(scope), receive, send)
+
+    return lambda: asyncio.run(many())
+
+
+async def _endpoint(scope, receive, send):
+    """Minimal ASGI endpoint: reads the body and returns a small JSON response"""
+    more_body = True
+    while more_body:
+        more_body = (await receive()).get("more_body", False)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"status":"ok"}'})
+
+
+def _bare_app_setup(requests: int) -> Callable[[], Any]:
+    return _asgi_requests(_endpoint, requests, body=b"x" * 1024)
+
+
+def _middleware_stack_setup(requests: int) -> Callable[[], Any]:
+    from app.middleware.rate_limit import RateLimitMiddleware
+    from app.middleware.security import RequestSizeLimitMiddleware, SecurityHeadersMiddleware
+
+    # Same layers as app.main (the last added is the outermost)
+    app = SecurityHeadersMiddleware(RateLimitMiddleware(RequestSizeLimitMiddleware(_endpoint, max_size=1024 * 1024)))
+    return _asgi_requests(app, requests, body=b"x" * 1024)
+
+
+def _render_json_setup(documents: int) -> Callable[[], Any]:
+    from fastapi.responses import JSONResponse
+    from perf.payloads import timeline
+
+    content = timeline(documents)
+    return lambda: JSONResponse(content)
+
+
+def _render_orjson_setup(documents: int) -> Callable[[], Any]:
+    from app.core.responses import DefaultJSONResponse
+    from perf.payloads import timeline
+
+    content = timeline(documents)
+    return lambda: DefaultJSONResponse(content)
+
+
+def _compression_setup(documents: int) -> Callable[[], Any]:
+    from app.core.responses import DefaultJSONResponse
+    from app.middleware.compression import CompressionMiddleware
+    from perf.payloads import timeline
+
+    response = DefaultJSONResponse(timeline(documents))
+
+    async def endpoint(scope, receive, send):
+        await response(scope, receive, send)
+
+    return _asgi_requests(CompressionMiddleware(endpoint), 1, headers=[(b"accept-encoding", b"gzip")])
+
+
+CASES: List[Dict[str, Any]] = [
+    {"name": "compliance.evaluate_rule", "param": "rules", "sizes": [10, 100, 500], "setup": _compliance_setup},
+    {"name": "comparison.text_diff", "param": "pages", "sizes": [1, 20, 100, 500], "setup": _diff_setup},
+    {"name": "document.chunk_text", "param": "pages", "sizes": [1, 50, 500], "setup": _chunk_setup},
+    {"name": "document.extract_pdf", "param": "pages", "sizes": [1, 20, 100, 500], "setup": _pdf_setup},
+    {"name": "document.extract_docx", "param": "pages", "sizes": [1, 50, 500], "setup": _docx_setup},
+    {"name": "timeline.build_timeline", "param": "documents", "sizes": [10, 100, 1000], "setup": _timeline_setup},
+    {"name": "intake.match_lawyers", "param": "lawyers", "sizes": [10, 1000, 10000], "setup": _match_lawyers_setup},
+    {"name": "conveyancing.stamp_duty", "param": "transactions", "sizes": [1000], "setup": _stamp_duty_setup},
+    {"name": "conveyancing.capital_gains_tax", "param": "transactions", "sizes": [1000], "setup": _cgt_setup},
+    {"name": "conveyancing.total_transaction_cost", "param": "transactions", "sizes": [1000],
+     "setup": _total_cost_setup},
+    {"name": "middleware.bare_app", "param": "requests", "sizes": [1000], "setup": _bare_app_setup},
+    {"name": "middleware.security_stack", "param": "requests", "sizes": [1000], "setup": _middleware_stack_setup},
+    {"name": "responses.render_json", "param": "documents", "sizes": [100, 1000], "setup": _render_json_setup},
+    {"name": "responses.render_orjson", "param": "documents", "sizes": [100, 1000], "setup": _render_orjson_setup},
+    {"name": "responses.gzip", "param": "documents", "sizes": [100, 1000], "setup": _compression_setup},
+]
+
+
+def case_id(case: Dict[str, Any], size: int) -> str:
+    return f"{case['name']}[{case['param']}={size}]"
+
+
+# ===== Measurement =====
+
+def measure(fn: Callable[[], Any], min_time: float = MIN_TIME_SECONDS, max_repeats: int = MAX_REPEATS) -> Dict[str, Any]:
+    """Median/min wall time over repeated runs (after one warm-up) and the peak heap of one run"""
+    fn()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MIN_REPEATS or (time.perf_counter() - started < min_time and len(timings) < max_repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeats": len(timings),
+        "median_ms": round(1000 * statistics.median(timings), 3),
+        "min_ms": round(1000 * min(timings), 3),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def run_cases(
+    keyword: Optional[str] = None,
+    quick: bool = False,
+    min_time: float = MIN_TIME_SECONDS,
+    report: Callable[[str, Dict[str, Any]], None] = lambda name, result: None
+) -> Dict[str, Dict[str, Any]]:
+    _configure_environment()
+    results = {}
+    for case in CASES:
+        if keyword and keyword not in case["name"]:
+            continue
+        for size in case["sizes"][:1] if quick else case["sizes"]:
+            name = case_id(case, size)
+            results[name] = measure(case["setup"](size), min_time=min_time)
+            report(name, results[name])
+    return results
+
+
+def load_baseline_cases(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    from perf.stats import load_json
+
+    return load_json(path).get("cases", {}) if os.path.exists(path) else {}
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    time_tolerance: float = 1.5,
+    memory_tolerance: float = 1.25
+) -> List[str]:
+    """Cases slower or larger than the baseline beyond the tolerances"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        if (result["median_ms"] > base["median_ms"] * time_tolerance
+                and result["median_ms"] - base["median_ms"] >= MIN_TIME_DELTA_MS):
+            regressions.append(
+                f"{name}: median {result['median_ms']:.2f}ms vs baseline {base['median_ms']:.2f}ms"
+            )
+        if (result["peak_kib"] > base["peak_kib"] * memory_tolerance
+                and result["peak_kib"] - base["peak_kib"] >= MIN_MEMORY_DELTA_KIB):
+            regressions.append(
+                f"{name}: peak {result['peak_kib']:.0f}KiB vs baseline {base['peak_kib']:.0f}KiB"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from perf.stats import write_json
+
+    parser = argparse.ArgumentParser(prog="python -m perf.benchmarks", description="DafLegal service micro-benchmarks")
+    parser.add_argument("-k", "--keyword", help="Only cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest size of each case")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_SECONDS, help="Seconds to repeat each case for")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=1.5)
+    parser.add_argument("--memory-tolerance", type=float, default=1.25)
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<58} {'median ms':>11} {'min ms':>11} {'peak KiB':>10}")
+    results = run_cases(
+        args.keyword, args.quick, args.min_time,
+        report=lambda name, r: print(f"{name:<58} {r['median_ms']:>11.2f} {r['min_ms']:>11.2f} {r['peak_kib']:>10.0f}")
+    )
+    document = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cases": results
+    }
+    if args.output:
+        write_json(args.output, document)
+
+    if args.save_baseline:
+        # Keep baseline entries of cases that were not run (-k / --quick)
+        document["cases"] = {**load_baseline_cases(args.baseline), **results}
+        write_json(args.baseline, document)
+        return 0
+
+    baseline = {"cases": load_baseline_cases(args.baseline)}
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+The largest API responses, for serialization and compression benchmarks
+
+Each payload is what the endpoint hands the response class: the response
+model dumped through jsonable_encoder (strings for datetimes, enums and
+decimals). The report shows render time (json.dumps vs orjson) and bytes on
+the wire (identity, gzip and, when installed, brotli) for each payload:
+
+    python -m perf.payloads
+    python -m perf.payloads --pages 500 --documents 2000
+"""
+
+import argparse
+import gzip
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+CREATED_AT = datetime(2024, 3, 1, 9, 30)
+
+
+def _encoded(model) -> Any:
+    from fastapi.encoders import jsonable_encoder
+
+    return jsonable_encoder(model)
+
+
+def contract_analysis(pages: int) -> Any:
+    """GET /contracts/{id}/analysis for a contract with one detected clause per paragraph"""
+    from app.schemas.contract import ContractAnalysisResponse
+    from perf.synthetic import COMPANIES, contract_text
+
+    paragraphs = [line for line in contract_text(pages=pages).split("\n") if len(line) > 40]
+    return _encoded(ContractAnalysisResponse(
+        contract_id="ctr_benchmark",
+        status="completed",
+        executive_summary=["Synthetic services agreement"] * 5,
+        key_terms={"parties": COMPANIES[:2], "term": "36 months", "payment": "$25,000 per month"},
+        detected_clauses=[
+            {"type": "obligation", "risk_level": ["low", "medium", "high"][n % 3], "text": text,
+             "explanation": "Standard wording with a notable carve-out.", "page_reference": n // 10 + 1}
+            for n, text in enumerate(paragraphs)
+        ],
+        missing_clauses=["force_majeure", "data_protection"],
+        risk_score=5.5,
+        overall_risk_level="medium",
+        pages_processed=pages,
+        processing_time_seconds=12.5,
+        created_at=CREATED_AT,
+    ))
+
+
+def contract_comparison(pages: int) -> Any:
+    """GET /comparisons/{id} for a revision of a `pages`-page contract"""
+    from app.schemas.contract import ContractComparisonResponse
+    from app.services.comparison_analyzer import ContractComparisonAnalyzer
+    from perf.synthetic import contract_text, revised_text
+
+    original = contract_text(pages=pages)
+    changes = ContractComparisonAnalyzer()._generate_text_diff(original, revised_text(original, change_rate=0.2))
+    changes = [{**c, "is_substantive": n % 2 == 0} for n, c in enumerate(changes)]
+    return _encoded(ContractComparisonResponse(
+        comparison_id="cmp_benchmark",
+        status="completed",
+        original_contract_id="ctr_original",
+        revised_contract_id="ctr_revised",
+        summary="Synthetic revision",
+        additions=[c for c in changes if c["type"] == "addition"],
+        deletions=[c for c in changes if c["type"] == "deletion"],
+        modifications=[c for c in changes if c["type"] == "modification"],
+        clause_changes=[],
+        risk_delta=0.5,
+        substantive_changes=[c for c in changes if c["is_substantive"]],
+        cosmetic_changes=[c for c in changes if not c["is_substantive"]],
+        created_at=CREATED_AT,
+        processed_at=CREATED_AT,
+    ))
+
+
+def timeline(documents: int) -> Any:
+    """A built timeline (events, parties, hot documents, statistics) over `documents` documents"""
+    from app.services.timeline_builder import TimelineBuilder
+    from perf.synthetic import timeline_documents
+
+    return _encoded(TimelineBuilder().build_timeline(timeline_documents(documents)))
+
+
+def _best_ms(fn: Callable[[], Any], repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def report(payloads: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Render time and encoded sizes of each payload"""
+    from fastapi.responses import JSONResponse
+
+    from app.core.responses import DefaultJSONResponse
+    from app.middleware.compression import brotli
+
+    rows = []
+    for name, content in payloads.items():
+        body = DefaultJSONResponse(content).body
+        rows.append({
+            "payload": name,
+            "json_ms": _best_ms(lambda: JSONResponse(content)),
+            "orjson_ms": _best_ms(lambda: DefaultJSONResponse(content)),
+            "identity_kib": len(body) / 1024,
+            "gzip_kib": len(gzip.compress(body, 5)) / 1024,
+            "br_kib": len(brotli.compress(body, quality=4)) / 1024 if brotli is not None else None,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from perf.benchmarks import _configure_environment
+
+    parser = argparse.ArgumentParser(prog="python -m perf.payloads", description="API response size and render time")
+    parser.add_argument("--pages", type=int, default=100, help="Contract pages for analysis and comparison")
+    parser.add_argument("--documents", type=int, default=1000, help="Documents in the timeline")
+    args = parser.parse_args(argv)
+    _configure_environment()
+
+    rows = report({
+        f"contract_analysis[pages={args.pages}]": contract_analysis(args.pages),
+        f"contract_comparison[pages={args.pages}]": contract_comparison(args.pages),
+        f"timeline[documents={args.documents}]": timeline(args.documents),
+    })
+    print(f"{'payload':<34} {'json ms':>9} {'orjson ms':>10} {'KiB':>9} {'gzip KiB':>9} {'br KiB':>9}")
+    for row in rows:
+        br = f"{row['br_kib']:>9.1f}" if row["br_kib"] is not None else f"{'-':>9}"
+        print(f"{row['payload']:<34} {row['json_ms']:>9.2f} {row['orjson_ms']:>10.2f} "
+              f"{row['identity_kib']:>9.1f} {row['gzip_kib']:>9.1f} {br}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
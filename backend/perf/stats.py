@@ -0,0 +1,126 @@
+"""
+Latency statistics for the load harness and benchmarks
+"""
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0 for no samples)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyRecorder:
+    """Per-operation latency samples and error counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, name: str, seconds: float, error: Optional[str] = None):
+        with self._lock:
+            self.samples[name].append(seconds)
+            if error:
+                self.errors[name][error] += 1
+
+    @contextmanager
+    def measure(self, name: str):
+        """Time a block; an exception is counted as an error of its type and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, type(e).__name__)
+            raise
+        self.record(name, time.perf_counter() - start)
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        {"duration_seconds", "operations": {name: {"count", "errors",
+        "error_types", "throughput_per_second", "mean_ms", "p50_ms", "p95_ms",
+        "p99_ms", "max_ms"}}}
+        """
+        duration = (self.finished_at or time.perf_counter()) - self.started_at
+        operations = {}
+        with self._lock:
+            for name in sorted(self.samples):
+                samples = self.samples[name]
+                operations[name] = {
+                    "count": len(samples),
+                    "errors": sum(self.errors[name].values()),
+                    "error_types": dict(self.errors[name]),
+                    "throughput_per_second": round(len(samples) / duration, 3) if duration else 0.0,
+                    "mean_ms": round(1000 * sum(samples) / len(samples), 2),
+                    "p50_ms": round(1000 * percentile(samples, 50), 2),
+                    "p95_ms": round(1000 * percentile(samples, 95), 2),
+                    "p99_ms": round(1000 * percentile(samples, 99), 2),
+                    "max_ms": round(1000 * max(samples), 2)
+                }
+        return {"duration_seconds": round(duration, 3), "operations": operations}
+
+
+def format_table(summary: Dict[str, Any]) -> str:
+    """Plain-text report of a LatencyRecorder summary"""
+    header = f"{'operation':<44} {'count':>6} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for name, op in summary["operations"].items():
+        lines.append(
+            f"{name:<44} {op['count']:>6} {op['errors']:>5} {op['throughput_per_second']:>8.2f} "
+            f"{op['p50_ms']:>9.1f} {op['p95_ms']:>9.1f} {op['p99_ms']:>9.1f}"
+        )
+    lines.append(f"duration: {summary['duration_seconds']:.1f}s")
+    return "\n".join(lines)
+
+
+def compare_to_baseline(
+    summary: Dict[str, Any],
+    baseline: Dict[str, Any],
+    metric: str = "p95_ms",
+    max_regression: float = 0.25,
+    min_delta_ms: float = 5.0
+) -> List[str]:
+    """
+    Regressions of `metric` beyond `max_regression` (a fraction) against a
+    baseline summary; differences under min_delta_ms are ignored as noise.
+    Operations that error now but did not in the baseline are reported too.
+    """
+    regressions = []
+    for name, base in baseline.get("operations", {}).items():
+        current = summary["operations"].get(name)
+        if current is None:
+            continue
+        limit = base[metric] * (1 + max_regression)
+        if current[metric] > limit and current[metric] - base[metric] >= min_delta_ms:
+            regressions.append(
+                f"{name}: {metric} {current[metric]:.1f} > {limit:.1f} (baseline {base[metric]:.1f})"
+            )
+        if current["errors"] and not base.get("errors"):
+            regressions.append(f"{name}: {current['errors']} errors (baseline 0)")
+    return regressions
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -0,0 +1,277 @@
+"""
+Synthetic documents for load tests and benchmarks
+
+Generated text looks like what the pipeline sees in production (numbered
+articles and sections, lettered sub-clauses, dates, party names, the clause
+types the analyzer and compliance rules look for) and is deterministic for
+a given seed.
+"""
+
+import random
+from datetime import date, timedelta
+from io import BytesIO
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+WORDS_PER_PAGE = 450
+
+COMPANIES = [
+    "Acme Holdings Ltd", "Globex Corporation Inc", "Initech Solutions LLC", "Umbrella Logistics PLC",
+    "Stark Industrial Ltd", "Wayne Enterprises Inc", "Hooli Technologies LLC", "Vandelay Imports Ltd"
+]
+
+CLAUSE_TEMPLATES = {
+    "Payment": [
+        "The Customer shall pay each invoice within {days} days of receipt.",
+        "Fees are exclusive of VAT and other applicable taxes.",
+        "Late payments accrue interest at {rate} percent per annum above the base rate.",
+    ],
+    "Term and Renewal": [
+        "This Agreement commences on the Effective Date and continues for {months} months.",
+        "The term shall renew automatically for successive periods of twelve months unless either party "
+        "gives notice of non-renewal.",
+    ],
+    "Termination": [
+        "Either party may terminate this Agreement for convenience on {notice} days written notice.",
+        "Either party may terminate immediately if the other commits a material breach that is not remedied "
+        "within thirty days.",
+    ],
+    "Confidentiality": [
+        "Each party shall keep the Confidential Information of the other party secret and use it only for "
+        "the purposes of this Agreement.",
+        "The obligations in this clause survive termination for {years} years.",
+    ],
+    "Intellectual Property": [
+        "All intellectual property rights in the Deliverables vest in the Customer on payment.",
+        "The Supplier grants the Customer a non-exclusive licence to use the Background Materials.",
+    ],
+    "Indemnity": [
+        "The Supplier shall indemnify and hold harmless the Customer against all losses arising from any "
+        "third-party claim.",
+    ],
+    "Limitation of Liability": [
+        "In no event shall either party be liable for indirect or consequential damages.",
+        "Each party's aggregate liability is limited to {cap} percent of the fees paid in the preceding year.",
+    ],
+    "Data Protection": [
+        "Each party shall comply with applicable data protection laws when processing personal data.",
+    ],
+    "Force Majeure": [
+        "Neither party is liable for delay caused by a force majeure event, including acts of God.",
+    ],
+    "Governing Law": [
+        "This Agreement is governed by the laws of England and Wales.",
+        "The courts of London have exclusive jurisdiction over any dispute.",
+    ],
+}
+
+FILLER = [
+    "The parties shall act in good faith in performing their obligations under this Agreement.",
+    "Any notice must be given in writing and delivered by hand or by recorded delivery.",
+    "The Supplier shall provide the Services with reasonable skill and care and in accordance with good "
+    "industry practice.",
+    "No variation of this Agreement is effective unless it is in writing and signed by both parties.",
+    "Each party shall maintain adequate records relating to the performance of the Services.",
+    "The Customer shall provide the Supplier with access to its premises as reasonably required.",
+]
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        days=rng.choice([14, 30, 45, 60]), rate=rng.choice([2, 4, 8]), months=rng.choice([12, 24, 36]),
+        notice=rng.choice([30, 60, 90]), years=rng.choice([2, 3, 5]), cap=rng.choice([100, 125, 150])
+    )
+
+
+def contract_text(pages: int = 5, seed: int = 0) -> str:
+    """A services agreement of roughly `pages` pages"""
+    rng = random.Random(seed)
+    supplier, customer = rng.sample(COMPANIES, 2)
+    effective = date(2024, 1, 1) + timedelta(days=rng.randrange(365))
+    lines = [
+        "MASTER SERVICES AGREEMENT",
+        "",
+        f"This Agreement is made on {effective.day} {effective.strftime('%B %Y')} between {supplier} "
+        f"(the \"Supplier\") and {customer} (the \"Customer\").",
+        "",
+    ]
+    words = sum(len(line.split()) for line in lines)
+    titles = list(CLAUSE_TEMPLATES)
+    article = 0
+    while words < pages * WORDS_PER_PAGE:
+        title = titles[article % len(titles)]
+        article += 1
+        lines += [f"{article}. {title}", ""]
+        for section, template in enumerate(CLAUSE_TEMPLATES[title] + rng.sample(FILLER, 2), start=1):
+            paragraph = f"{article}.{section} {_fill(template, rng)}"
+            if rng.random() < 0.3:
+                paragraph += " " + " ".join(
+                    f"({letter}) {rng.choice(FILLER).rstrip('.').lower()};" for letter in "abc"
+                )
+            lines += [paragraph, ""]
+            words += len(paragraph.split())
+    lines += ["IN WITNESS WHEREOF the parties have signed this Agreement.", f"{supplier}", f"{customer}"]
+    return "\n".join(lines)
+
+
+def revised_text(text: str, change_rate: float = 0.05, seed: int = 0) -> str:
+    """A revision of `text` with about `change_rate` of its lines edited, dropped or added"""
+    rng = random.Random(seed)
+    lines = []
+    for line in text.split("\n"):
+        roll = rng.random()
+        if line and roll < change_rate / 3:
+            continue
+        if line and roll < 2 * change_rate / 3:
+            line = line.replace("shall", "must").replace("thirty", "forty-five") + " (as amended)"
+        lines.append(line)
+        if line and roll > 1 - change_rate / 3:
+            lines.append(rng.choice(FILLER))
+    return "\n".join(lines)
+
+
+def correspondence_text(events: int = 5, seed: int = 0) -> str:
+    """An email thread mentioning `events` dated events"""
+    rng = random.Random(seed)
+    sender, recipient = rng.sample(COMPANIES, 2)
+    day = date(2024, 1, 1) + timedelta(days=rng.randrange(200))
+    lines = [f"From: legal@{sender.split()[0].lower()}.com", f"To: counsel@{recipient.split()[0].lower()}.com",
+             "Subject: Delivery dispute", ""]
+    for _ in range(events):
+        day += timedelta(days=rng.randint(1, 20))
+        lines.append(f"On {day.isoformat()} {rng.choice(FILLER).lower()}")
+    return "\n".join(lines)
+
+
+def contract_pdf(text: str) -> bytes:
+    """Render text as a PDF (one paragraph per blank-line separated block)"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    buffer = BytesIO()
+    styles = getSampleStyleSheet()
+    story: List = [
+        Paragraph(escape(block).replace("\n", "<br/>"), styles["BodyText"])
+        for block in text.split("\n\n") if block.strip()
+    ]
+    SimpleDocTemplate(buffer, pagesize=A4).build(story)
+    return buffer.getvalue()
+
+
+def contract_docx(text: str) -> bytes:
+    """Render text as a DOCX (one paragraph per line)"""
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        if line.strip():
+            document.add_paragraph(line)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+# ===== Structured inputs =====
+
+RULE_SPECS = [
+    ("required_clause", {"category": "termination", "must_contain": "notice"}),
+    ("prohibited_clause", {"category": "non_compete"}),
+    ("required_term", {"terms": ["governing law", "governed by"]}),
+    ("prohibited_term", {"terms": ["unlimited liability", "perpetual", "irrevocable"]}),
+    ("numeric_threshold", {"field": "payment_amount", "min": 1000, "max": 1000000}),
+    ("custom_pattern", {"should_match": True}),
+]
+
+PATTERNS = [r"within \d+ days", r"(?i)indemnif\w+", r"\bterminat\w+ .{0,40}notice", r"aggregate liability"]
+
+
+def playbook_rules(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """ComplianceRule field dicts cycling through every rule type"""
+    rng = random.Random(seed)
+    rules = []
+    for n in range(count):
+        rule_type, parameters = RULE_SPECS[n % len(RULE_SPECS)]
+        rules.append({
+            "rule_id": f"rul_bench_{n}",
+            "playbook_id": 1,
+            "name": f"{rule_type} rule {n}",
+            "description": "Synthetic rule",
+            "rule_type": rule_type,
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "parameters": dict(parameters),
+            "pattern": rng.choice(PATTERNS) if rule_type == "custom_pattern" else None,
+        })
+    return rules
+
+
+def contract_analysis_fields(text: str) -> Dict[str, Any]:
+    """ContractAnalysis field dicts with clause excerpts taken from the text"""
+    clauses = []
+    for line in text.split("\n"):
+        lowered = line.lower()
+        for clause_type in ("termination", "payment", "confidentiality", "indemnify", "liability"):
+            if clause_type in lowered and not any(c["type"] == clause_type for c in clauses):
+                clauses.append({"type": clause_type, "risk_level": "medium", "text": line, "explanation": ""})
+    return {
+        "contract_id": 1,
+        "executive_summary": ["Synthetic services agreement"],
+        "parties": COMPANIES[:2],
+        "payment_terms": "$25,000 per month payable within 30 days",
+        "detected_clauses": clauses,
+        "missing_clauses": ["force_majeure"],
+        "risk_score": 5.0,
+    }
+
+
+def lawyer_roster(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Lawyer dicts in the shape IntakeTriageService.match_lawyers takes"""
+    rng = random.Random(seed)
+    specializations = ["conveyancing", "litigation", "corporate", "employment", "family", "commercial litigation"]
+    return [
+        {
+            "user_id": n,
+            "name": f"Lawyer {n}",
+            "specialization": rng.choice(specializations),
+            "proficiency_level": rng.choice(["junior", "intermediate", "senior", "expert"]),
+            "years_experience": rng.randint(0, 30),
+            "is_available": rng.random() < 0.8,
+            "is_accepting_new_matters": rng.random() < 0.9,
+            "current_workload": rng.randint(0, 12),
+            "max_capacity": 10,
+            "minimum_matter_value": rng.choice([None, 50000, 250000]),
+        }
+        for n in range(count)
+    ]
+
+
+def timeline_documents(count: int, events_per_document: int = 8, seed: int = 0) -> List[Dict[str, Any]]:
+    """Extraction results (as TimelineBuilder.extract_events_from_document returns them)"""
+    rng = random.Random(seed)
+    start = date(2022, 1, 1)
+    documents = []
+    for n in range(count):
+        events = []
+        for _ in range(events_per_document):
+            day = start + timedelta(days=rng.randrange(900))
+            events.append({
+                "date": day.isoformat(),
+                "date_precision": rng.choice(["exact", "approximate"]),
+                "event_type": rng.choice(["communication", "payment", "notice", "meeting"]),
+                "description": rng.choice(FILLER),
+                "parties_involved": rng.sample(COMPANIES, 2),
+                "significance": rng.choice(["high", "medium", "low"]),
+                "quote": "",
+            })
+        documents.append({
+            "doc_id": f"doc_{n}",
+            "filename": f"document_{n}.pdf",
+            "doc_type": "Letter",
+            "doc_date": events[0]["date"],
+            "importance": rng.choice(["high", "medium", "low"]),
+            "is_hot_doc": rng.random() < 0.1,
+            "hot_doc_reason": "",
+            "summary": "Synthetic document",
+            "events": events,
+        })
+    return documents
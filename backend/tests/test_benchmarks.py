@@ -0,0 +1,41 @@
+"""
+Micro-benchmark Suite Tests
+"""
+from perf.benchmarks import CASES, case_id, compare, load_baseline_cases, run_cases
+
+
+def test_every_case_runs_at_its_smallest_size():
+    results = run_cases(quick=True, min_time=0)
+
+    assert set(results) == {case_id(case, case["sizes"][0]) for case in CASES}
+    for result in results.values():
+        assert result["repeats"] >= 3
+        assert result["median_ms"] >= result["min_ms"] > 0
+        assert result["peak_kib"] > 0
+
+
+def test_stored_baseline_covers_every_case():
+    baseline = load_baseline_cases()
+
+    assert {case_id(case, size) for case in CASES for size in case["sizes"]} <= set(baseline)
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {"cases": {
+        "a[n=1]": {"median_ms": 10.0, "peak_kib": 100.0},
+        "b[n=1]": {"median_ms": 0.1, "peak_kib": 1000.0},
+        "c[n=1]": {"median_ms": 10.0, "peak_kib": 100.0},
+    }}
+    results = {
+        "a[n=1]": {"median_ms": 20.0, "peak_kib": 100.0},
+        "b[n=1]": {"median_ms": 0.5, "peak_kib": 2000.0},  # 5x slower but under the 1ms noise floor
+        "c[n=1]": {"median_ms": 12.0, "peak_kib": 110.0},
+        "new[n=1]": {"median_ms": 99.0, "peak_kib": 99.0},
+    }
+
+    regressions = compare(results, baseline, time_tolerance=1.5, memory_tolerance=1.25)
+
+    assert regressions == [
+        "a[n=1]: median 20.00ms vs baseline 10.00ms",
+        "b[n=1]: peak 2000KiB vs baseline 1000KiB",
+    ]
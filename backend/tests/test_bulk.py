@@ -0,0 +1,62 @@
+"""
+Bulk Persistence Tests
+"""
+import pytest
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.core.bulk import bulk_insert, generate_ids
+from app.models.user import User
+from app.models.research import ResearchQuery, ResearchResult
+from app.core.security import get_password_hash
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_generate_ids_unique():
+    """Generated IDs carry the prefix and don't collide"""
+    ids = generate_ids("res", 500)
+    assert len(set(ids)) == 500
+    assert all(i.startswith("res_") and len(i) == 20 for i in ids)
+
+
+def test_bulk_insert_returns_ordered_instances(session: Session):
+    """Rows come back in input order with primary keys and defaults set"""
+    user = User(email="bulk@example.com", hashed_password=get_password_hash("password"), full_name="Bulk")
+    session.add(user)
+    session.commit()
+    query = ResearchQuery(query_id="req_1", user_id=user.id, query_text="q", query_type="case_law")
+    session.add(query)
+    session.commit()
+
+    rows = [
+        dict(result_id=result_id, query_id="req_1", title=f"Case {n}", citation=f"{n} U.S. 1",
+             document_type="case", summary="Summary", key_points=[f"point {n}"])
+        for n, result_id in enumerate(generate_ids("res", 150))
+    ]
+    results = bulk_insert(session, ResearchResult, rows)
+    session.commit()
+
+    assert [r.title for r in results] == [f"Case {n}" for n in range(150)]
+    assert all(r.id is not None for r in results)
+
+    stored = session.exec(select(ResearchResult).order_by(ResearchResult.id)).all()
+    assert len(stored) == 150
+    assert stored[3].key_points == ["point 3"]
+    assert stored[3].topics == []
+    assert stored[3].created_at is not None
+
+
+def test_bulk_insert_empty(session: Session):
+    """No statement is issued for an empty batch"""
+    assert bulk_insert(session, ResearchResult, []) == []
@@ -0,0 +1,91 @@
+"""
+Document Chunker Tests
+"""
+from app.services.chunker import chunk_document, count_tokens, heading_level, truncate_to_tokens
+from app.services.document_processor import DocumentProcessor
+
+CONTRACT = (
+    "ARTICLE I DEFINITIONS\n\n"
+    "1.1 \"Agreement\" means this agreement.\n"
+    "1.2 \"Fees\" means the fees set out in Schedule 1.\n"
+    "\f\n"
+    "ARTICLE II PAYMENT\n\n"
+    "2.1 The Client shall pay the Fees within thirty days.\n"
+    "(a) Late payments accrue interest.\n"
+    + "The Supplier may suspend the services for non-payment. " * 40 + "\n"
+    "\f\n"
+    "ARTICLE III TERM\n\n"
+    "3.1 This agreement lasts one year.\n"
+)
+
+
+def test_heading_levels():
+    assert heading_level("ARTICLE IV Termination") == 1
+    assert heading_level("3. Term") == 1
+    assert heading_level("3.2.1 Notice periods") == 3
+    assert heading_level("(a) the Fees; and") == 4
+    assert heading_level("The parties agree") is None
+
+
+def test_chunks_are_bounded_and_traceable():
+    """Chunks respect the token budget and their offsets and pages point back into the text"""
+    chunks = chunk_document(CONTRACT, max_tokens=80)
+
+    assert len(chunks) > 3
+    for chunk in chunks:
+        assert chunk["text"] == CONTRACT[chunk["start"]:chunk["end"]]
+        assert chunk["token_count"] <= 80
+        assert not chunk["text"][0].isspace() and not chunk["text"][-1].isspace()
+        # Long sentences are never cut mid-word
+        assert CONTRACT[chunk["end"]:chunk["end"] + 1] in ("", " ", "\n")
+
+    assert chunks[0]["page_start"] == 1 and chunks[0]["heading"] == "ARTICLE I DEFINITIONS"
+    assert chunks[-1]["page_end"] == 3
+    assert (chunks[0]["page_start"], chunks[0]["page_end"]) == (1, 2)
+    assert chunks[1]["heading"] == "2.1 The Client shall pay the Fees within thirty days."
+    assert all(chunk["heading"] != "(a) Late payments accrue interest." for chunk in chunks)
+
+
+def test_chunks_break_at_top_level_sections():
+    """A chunk that is already half full ends rather than running into the next article"""
+    text = "1. Term\n\nThe term is one year.\n\n2. Fees\n\nThe fees are due monthly.\n"
+    chunks = chunk_document(text, max_tokens=30, min_fill=0.25)
+
+    assert [chunk["heading"] for chunk in chunks] == ["1. Term", "2. Fees"]
+    assert chunks[1]["text"].startswith("2. Fees")
+
+
+def test_overlap_repeats_trailing_blocks():
+    text = "\n\n".join(f"Paragraph {i} has a few words in it." for i in range(10))
+    chunks = chunk_document(text, max_tokens=30, overlap_tokens=12)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk["start"] < previous["end"]
+    assert chunks[-1]["end"] == len(text)
+
+
+def test_truncate_to_tokens():
+    assert truncate_to_tokens("Short text.", 100) == "Short text."
+
+    truncated = truncate_to_tokens(CONTRACT, 60)
+    assert CONTRACT.startswith(truncated)
+    assert count_tokens(truncated) <= 60
+    assert truncated.endswith(".")
+
+
+def test_truncate_to_tokens_only_reads_a_prefix():
+    # One paragraph of about 2 MB (no blank lines or headings)
+    text = " ".join(["The Supplier shall deliver the Goods to the Site on the Delivery Date."] * 30000)
+
+    truncated = truncate_to_tokens(text, 500)
+    assert text.startswith(truncated)
+    assert 450 <= count_tokens(truncated) <= 500
+    assert truncated.endswith(".")
+    assert truncate_to_tokens("x" * 100000, 100) == "x" * 400
+
+
+def test_chunk_text_keeps_legacy_signature():
+    chunks = DocumentProcessor.chunk_text(CONTRACT, max_chunk_size=400)
+
+    assert len(chunks) > 1
+    assert all(chunk in CONTRACT for chunk in chunks)
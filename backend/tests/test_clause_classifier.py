@@ -0,0 +1,164 @@
+"""
+Clause Pre-Classifier Tests
+"""
+import pytest
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.core.security import get_password_hash
+from app.models.contract import Contract, ContractAnalysis
+from app.models.user import User
+from app.services import clause_classifier
+from app.services.chunker import count_tokens
+from app.services.clause_classifier import (
+    ClauseClassifier, ClauseModel, get_clause_classifier, keyword_hits, store_clause_model, training_examples
+)
+
+FILLER = "The parties shall cooperate in good faith on the operational matters described in this agreement. " * 20
+
+CONTRACT = "\n\n".join([
+    "MASTER SERVICES AGREEMENT between Acme Ltd and Widget Inc dated 1 January 2024.",
+    "1. SERVICES\n" + FILLER,
+    "2. FEES\nThe Client shall pay the fees within 30 days of invoice.",
+    "3. SERVICE LEVELS\n" + FILLER,
+    "4. CONFIDENTIALITY\nEach party shall keep the other's Confidential Information secret.",
+    "5. REPORTING\n" + FILLER,
+    "6. TERM\nEither party may terminate this Agreement for material breach on 30 days notice.",
+    "7. STAFF\n" + FILLER,
+    "8. EXPOSURE\nNeither party's total exposure under this agreement shall exceed the amounts paid "
+    "in the twelve months before the claim.",
+])
+
+EXPOSURE_EXAMPLES = [
+    "Total exposure of the supplier shall not exceed the amounts paid in the preceding twelve months.",
+    "The aggregate exposure of either party shall not exceed the amounts paid under this agreement.",
+    "A party's exposure for all claims shall not exceed twice the amounts paid in the prior year.",
+]
+OTHER_EXAMPLES = [
+    ("Either party may terminate this agreement on ninety days written notice.", "termination"),
+    ("This agreement may be terminated immediately upon a material breach.", "termination"),
+    ("The Recipient shall hold all Confidential Information in strict confidence.", "confidentiality"),
+    ("Confidential Information shall not be disclosed to any third party.", "confidentiality"),
+    ("The Customer shall pay each invoice within thirty days of receipt.", "payment"),
+    ("Fees are payable monthly in advance by bank transfer.", "payment"),
+]
+
+
+def _examples():
+    return [(text, "liability") for text in EXPOSURE_EXAMPLES] * 3 + OTHER_EXAMPLES * 2
+
+
+def test_keyword_automaton():
+    hits = keyword_hits("Either party may terminate. The Supplier shall indemnify and hold harmless the Client.")
+
+    assert hits["termination"] == 1
+    assert hits["indemnity"] == 2
+    assert "payment" not in hits
+
+
+def test_selects_relevant_sections_within_budget():
+    classifier = ClauseClassifier()
+    selected = classifier.select_relevant(CONTRACT, 400)
+
+    assert count_tokens(CONTRACT) > 1000
+    assert selected["token_count"] <= 400
+    assert selected["text"].startswith("MASTER SERVICES AGREEMENT")
+    for heading in ("2. FEES", "4. CONFIDENTIALITY", "6. TERM"):
+        assert heading in selected["text"]
+    assert "3. SERVICE LEVELS" not in selected["text"]
+    assert "[...]" in selected["text"]
+    # Sections stay in document order
+    starts = [section["start"] for section in selected["sections"]]
+    assert starts == sorted(starts)
+
+    # Short contracts go to the model unchanged
+    assert classifier.select_relevant("1. FEES\nThe fees are $10.", 400)["text"] == "1. FEES\nThe fees are $10."
+
+
+def test_model_tags_clauses_without_keywords():
+    section = "8. EXPOSURE\nNeither party's total exposure shall exceed the amounts paid in the last year."
+    assert "liability" not in ClauseClassifier().tag(section)
+
+    model = ClauseModel.train(_examples())
+    assert model.predict(section)["liability"] > 0.6
+    assert "liability" in ClauseClassifier(model).tag(section)
+    assert "8. EXPOSURE" in ClauseClassifier(model).select_relevant(CONTRACT, 400)["text"]
+
+    # Training is deterministic
+    assert ClauseModel.train(_examples()).weights == model.weights
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+class DictRedis:
+    """The get/set/delete subset of a Redis client"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value.encode()
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_model_trained_from_stored_analyses(session: Session, monkeypatch):
+    # Without Redis the worker trains its own model
+    monkeypatch.setattr(clause_classifier, "get_redis", lambda: None)
+    monkeypatch.setattr(clause_classifier, "_model_state", {"model": None, "expires_at": 0.0})
+    user = User(email="clauses@example.com", hashed_password=get_password_hash("password"), full_name="C")
+    session.add(user)
+    session.commit()
+
+    assert get_clause_classifier(session).model is None  # Nothing to learn from yet
+
+    for n, (text, clause_type) in enumerate(_examples()):
+        contract = Contract(contract_id=f"ctr_{n}", user_id=user.id, filename="c.pdf",
+                            file_size_bytes=1, file_type="pdf", s3_key="k")
+        session.add(contract)
+        session.commit()
+        session.add(ContractAnalysis(
+            contract_id=contract.id, executive_summary=[], parties=[], missing_clauses=[],
+            detected_clauses=[{"type": "Liability_Cap" if clause_type == "liability" else clause_type, "text": text}]
+        ))
+    session.commit()
+
+    assert training_examples([[{"type": "indemnification", "text": "The Supplier shall indemnify the Client."}]]) == [
+        ("The Supplier shall indemnify the Client.", "indemnity")
+    ]
+    monkeypatch.setattr(clause_classifier, "_model_state", {"model": None, "expires_at": 0.0})
+    model = get_clause_classifier(session).model
+    assert model is not None
+    assert set(model.weights) == {"liability", "termination", "confidentiality", "payment"}
+
+
+def test_workers_load_the_stored_model_without_training(session: Session, monkeypatch):
+    client = DictRedis()
+    monkeypatch.setattr(clause_classifier, "get_redis", lambda: client)
+    monkeypatch.setattr(clause_classifier, "_model_state", {"model": None, "expires_at": 0.0})
+    model = ClauseModel.train(_examples())
+
+    assert store_clause_model(model)
+    monkeypatch.setattr(ClauseModel, "train", None)  # Loading must not train
+    loaded = get_clause_classifier(session).model
+    assert loaded.weights == model.weights and loaded.idf == model.idf
+    assert loaded.predict(EXPOSURE_EXAMPLES[0]) == model.predict(EXPOSURE_EXAMPLES[0])
+
+    # Nothing stored (too few examples): keywords only
+    store_clause_model(None)
+    monkeypatch.setattr(clause_classifier, "_model_state", {"model": None, "expires_at": 0.0})
+    assert get_clause_classifier(session).model is None
@@ -0,0 +1,64 @@
+"""
+Read Replica Routing Tests
+"""
+from sqlalchemy import insert
+from sqlmodel import create_engine, select
+from sqlmodel.pool import StaticPool
+from starlette.requests import Request
+
+from app.core import database
+from app.core.database import RoutingSession, ReplicaRouter, engine
+from app.models.user import User
+
+
+def _replica():
+    return create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def _request(method: str = "GET", token: str = "dfk_test") -> Request:
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+
+def test_routing_session_sends_selects_to_replica():
+    """SELECTs use the replica until the session writes"""
+    replica = _replica()
+    session = RoutingSession(engine, info={"replica": replica})
+
+    assert session.get_bind(clause=select(User)) is replica
+    assert session.get_bind(clause=insert(User)) is engine
+    # Pinned to the primary after a write so it reads its own writes
+    assert session.get_bind(clause=select(User)) is engine
+
+
+def test_router_without_replicas_uses_primary(monkeypatch):
+    """No replicas configured means every read stays on the primary, without a Redis lookup"""
+    def no_redis():
+        raise AssertionError("Redis consulted without replicas")
+
+    monkeypatch.setattr(database, "get_redis", no_redis)
+    router = ReplicaRouter([])
+    assert router.choose() is None
+    assert not router.wrote_recently(_request())
+    assert [m["name"] for m in router.pool_metrics()] == ["primary"]
+
+
+def test_router_read_your_writes():
+    """A caller that just wrote is kept off the replicas"""
+    router = ReplicaRouter([_replica()])
+
+    assert router.choose() is not None
+    assert not router.wrote_recently(_request())
+
+    router.mark_write(_request("POST"))
+
+    assert router.wrote_recently(_request())
+    assert not router.wrote_recently(_request(token="dfk_other"))
@@ -0,0 +1,182 @@
+"""
+Document Processor Tests (plain text and email extraction)
+"""
+import io
+import zipfile
+from types import SimpleNamespace
+from email.message import EmailMessage
+
+from docx import Document
+
+from app.core.config import settings
+from app.core import executors
+from app.core.executors import BoundedExecutor, make_pool
+from app.services import document_processor
+from app.services.document_processor import DocumentProcessor
+
+
+def _docx_bytes(text: str) -> bytes:
+    document = Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _email(subject: str, body: str, html: bool = False) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "Alice Smith <alice@acme.com>"
+    message["To"] = "bob@widget.com, carol@widget.com"
+    message["Date"] = "Mon, 15 Jan 2024 10:30:00 +0000"
+    message["Subject"] = subject
+    message["Message-ID"] = "<abc@acme.com>"
+    if html:
+        message.set_content(body, subtype="html")
+    else:
+        message.set_content(body)
+    return message
+
+
+def test_txt_encoding_detection():
+    """UTF-8, BOM-marked UTF-16 and legacy Windows text all decode"""
+    text = "Café agreement – clause 4.1\r\nPayment due"
+
+    assert DocumentProcessor.process_file(text.encode("utf-8"), "txt")[0] == "Café agreement – clause 4.1\nPayment due"
+    assert DocumentProcessor.process_file(text.encode("utf-16"), "txt")[0].startswith("Café agreement –")
+    assert DocumentProcessor.process_file(text.encode("cp1252"), "txt")[0].startswith("Café agreement")
+
+    text, pages, words = DocumentProcessor.process_file(b"word " * 2000, "txt")
+    assert (pages, words) == (2, 2000)
+
+
+def test_email_headers_body_and_attachments():
+    """Headers become metadata; attachments (incl. forwarded emails) are extracted"""
+    message = _email("Notice of breach", "<p>Please see the <b>attached</b> notice.</p><style>p {}</style>", html=True)
+    message.add_attachment(
+        _docx_bytes("Termination notice under clause 12"),
+        maintype="application",
+        subtype="vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename="notice.docx"
+    )
+    message.add_attachment("Schedule of payments", filename="schedule.txt")
+    message.add_attachment(b"\x00\x01", maintype="image", subtype="png", filename="logo.png")
+    message.add_attachment(_email("Earlier thread", "We accept the terms."))
+
+    email = DocumentProcessor.extract_email(message.as_bytes())
+
+    assert email["metadata"]["subject"] == "Notice of breach"
+    assert email["metadata"]["to"] == ["bob@widget.com", "carol@widget.com"]
+    assert email["metadata"]["date"] == "2024-01-15T10:30:00+00:00"
+    assert email["body"] == "Please see the attached notice."
+
+    by_name = {a["filename"]: a for a in email["attachments"]}
+    assert "clause 12" in by_name["notice.docx"]["text"]
+    assert by_name["schedule.txt"]["text"].strip() == "Schedule of payments"
+    assert by_name["logo.png"]["error"].startswith("Unsupported attachment type")
+
+    text, pages, _ = DocumentProcessor.process_file(message.as_bytes(), "eml")
+    assert text.startswith("From: Alice Smith <alice@acme.com>\nTo: bob@widget.com, carol@widget.com")
+    assert "--- Attachment: notice.docx ---\nTermination notice under clause 12" in text
+    assert "Subject: Earlier thread" in text and "We accept the terms." in text
+    assert pages >= 3
+
+
+def test_only_large_attachments_use_the_shared_pool(monkeypatch):
+    """Small attachments are extracted inline; large ones share one pool across emails"""
+    pool = BoundedExecutor("attachments", "thread", 2, 0)
+    submitted = []
+    submit = pool.submit
+    monkeypatch.setattr(pool, "submit", lambda fn, *args: submitted.append(args[1]) or submit(fn, *args))
+    monkeypatch.setattr(document_processor, "attachment_executor", pool)
+
+    message = _email("Bundle", "Two notices attached.")
+    for n in (1, 2):
+        message.add_attachment(
+            _docx_bytes(f"Notice number {n}"),
+            maintype="application",
+            subtype="vnd.openxmlformats-officedocument.wordprocessingml.document",
+            filename=f"notice{n}.docx"
+        )
+
+    email = DocumentProcessor.extract_email(message.as_bytes())
+    assert submitted == []
+    assert [a["text"].strip() for a in email["attachments"]] == ["Notice number 1", "Notice number 2"]
+
+    monkeypatch.setattr(settings, "EMAIL_ATTACHMENT_PARALLEL_BYTES", 0)
+    for _ in range(2):
+        email = DocumentProcessor.extract_email(message.as_bytes())
+    assert submitted == ["docx"] * 4
+    assert [a["text"].strip() for a in email["attachments"]] == ["Notice number 1", "Notice number 2"]
+
+    # Inside a CPU pool worker (run_cpu) attachments are extracted inline; as in a
+    # Celery child, the pool falls back to threads, so submissions would be seen here
+    monkeypatch.setattr(executors.multiprocessing, "current_process", lambda: SimpleNamespace(daemon=True))
+    with make_pool("process", 1) as cpu_pool:
+        email = cpu_pool.submit(DocumentProcessor.extract_email, message.as_bytes()).result()
+    assert submitted == ["docx"] * 4
+    assert [a["text"].strip() for a in email["attachments"]] == ["Notice number 1", "Notice number 2"]
+    pool.shutdown()
+
+
+def test_file_type_for():
+    assert DocumentProcessor.file_type_for("a.PDF") == "pdf"
+    assert DocumentProcessor.file_type_for("mail", "message/rfc822") == "eml"
+    assert DocumentProcessor.file_type_for("notes.txt") == "txt"
+    assert DocumentProcessor.file_type_for("a.msg", "application/vnd.ms-outlook") is None
+
+
+def test_docx_reading_order_tables_headers_footers():
+    """Tables come out in place with cells joined; headers first, footers last"""
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "PRIVILEGED & CONFIDENTIAL"
+    document.sections[0].footer.paragraphs[0].text = "Page footer"
+    document.add_paragraph("1. Fees")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = "Item", "Fee"
+    table.cell(1, 0).text, table.cell(1, 1).text = "Retainer", "$5,000"
+    document.add_paragraph("2. Term")
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    text, pages, _ = DocumentProcessor.process_file(buffer.getvalue(), "docx")
+
+    assert text.split("\n\n") == [
+        "PRIVILEGED & CONFIDENTIAL",
+        "1. Fees",
+        "Item | Fee\nRetainer | $5,000",
+        "2. Term",
+        "Page footer",
+    ]
+    assert pages == 1
+
+
+def test_docx_footnotes_page_count_and_tracked_changes():
+    """Footnotes are included, deleted text skipped, pages read from app.xml"""
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    document_xml = (
+        f'<w:document {w}><w:body>'
+        '<w:p><w:r><w:t>Payment is due</w:t></w:r><w:del><w:r><w:delText> never</w:delText></w:r></w:del>'
+        '<w:r><w:tab/><w:t>monthly.</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Outer</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Inner</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '</w:tc></w:tr></w:tbl>'
+        '</w:body></w:document>'
+    )
+    footnotes_xml = (
+        f'<w:footnotes {w}><w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:id="1"><w:p><w:r><w:t>See Schedule 2.</w:t></w:r></w:p></w:footnote></w:footnotes>'
+    )
+    app_xml = (
+        '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+        '<Pages>7</Pages></Properties>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        package.writestr("word/document.xml", document_xml)
+        package.writestr("word/footnotes.xml", footnotes_xml)
+        package.writestr("docProps/app.xml", app_xml)
+
+    text, pages = DocumentProcessor.extract_from_docx(buffer.getvalue())
+
+    assert text == "Payment is due\tmonthly.\n\nOuter Inner\n\nSee Schedule 2."
+    assert pages == 7
@@ -0,0 +1,48 @@
+"""
+Executor Pool Tests
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executors import BoundedExecutor, ExecutorSaturated
+
+
+def test_runs_work_in_pools():
+    """Process and thread pools return results to the caller"""
+    cpu = BoundedExecutor("cpu", "process", max_workers=1, max_queue=1)
+    io = BoundedExecutor("io", "thread", max_workers=2, max_queue=0)
+    try:
+        assert asyncio.run(cpu.run(sum, [1, 2, 3])) == 6
+        assert asyncio.run(io.run(str.upper, "done")) == "DONE"
+        assert io.stats()["in_flight"] == 0
+    finally:
+        cpu.shutdown()
+        io.shutdown()
+
+
+def test_rejects_when_saturated():
+    """Work beyond workers + queue is refused with 503 and Retry-After"""
+    pool = BoundedExecutor("io", "thread", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(ExecutorSaturated) as exc:
+                await pool.run(str, 1)
+        finally:
+            release.set()
+            await busy
+        return exc.value
+
+    try:
+        error = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert error.status_code == 503
+    assert "Retry-After" in error.headers
+    assert pool.stats()["rejected"] == 1
@@ -0,0 +1,116 @@
+"""
+Prometheus Metrics Tests
+"""
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.metrics import statement_operation, task_stage
+from app.main import app
+from app.models.user import User
+from app.services.llm_provider import get_llm_client
+from app.services.mock_llm import mock_stats
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_metrics_endpoint_exposes_request_latency(client: TestClient):
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'daflegal_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "daflegal_celery_queue_depth" in response.text
+
+
+def test_requests_are_labelled_by_route_template(client: TestClient):
+    labels = {"method": "GET", "route": "/api/v1/contracts/{contract_id}"}
+    before = sum(_sample("daflegal_http_request_duration_seconds_count", status=s, **labels) for s in ("401", "403"))
+
+    client.get("/api/v1/contracts/ctr_one")
+    client.get("/api/v1/contracts/ctr_two")
+    client.get("/no/such/path")
+
+    after = sum(_sample("daflegal_http_request_duration_seconds_count", status=s, **labels) for s in ("401", "403"))
+    assert after - before == 2
+    assert _sample("daflegal_http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+
+
+def test_metrics_token_is_required_when_configured(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_production_needs_a_metrics_token(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_database_queries_are_counted(session: Session):
+    before = _sample("daflegal_db_query_duration_seconds_count", operation="select")
+
+    session.exec(select(User)).all()
+    session.exec(select(User).where(User.id == 1)).first()
+
+    assert _sample("daflegal_db_query_duration_seconds_count", operation="select") - before == 2
+    assert statement_operation("  INSERT INTO users VALUES (1)") == "insert"
+    assert statement_operation("PRAGMA foreign_keys") == "other"
+
+
+def test_llm_calls_record_tokens_per_feature(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "mock")
+    monkeypatch.setattr(settings, "LLM_MOCK_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "LLM_MOCK_TOKENS_PER_SECOND", 0)
+    mock_stats.reset()
+    labels = {"feature": "metrics_test", "model": "gpt-4o-mini"}
+
+    response = get_llm_client(feature="metrics_test").chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "Summarise: the parties agree."}]
+    )
+
+    assert _sample("daflegal_llm_tokens_total", direction="prompt", **labels) == response.usage.prompt_tokens
+    assert _sample("daflegal_llm_tokens_total", direction="completion", **labels) == response.usage.completion_tokens
+    assert _sample("daflegal_llm_request_duration_seconds_count", outcome="ok", **labels) == 1
+
+
+def test_task_stage_records_duration_on_failure():
+    labels = {"task": "metrics_test", "stage": "extract"}
+
+    with pytest.raises(ValueError):
+        with task_stage("metrics_test", "extract"):
+            raise ValueError("corrupt file")
+
+    assert _sample("daflegal_task_stage_duration_seconds_count", **labels) == 1
@@ -0,0 +1,103 @@
+"""
+Mock LLM Provider Tests
+"""
+import openai
+import pytest
+
+from app.core.config import settings
+from app.services.ai_analyzer import AIContractAnalyzer
+from app.services.clause_classifier import ClauseClassifier
+from app.services.llm_provider import get_llm_client
+from app.services.mock_llm import MockLLMClient, mock_stats
+from app.services.timeline_builder import TimelineBuilder
+
+CONTRACT = """SERVICES AGREEMENT
+
+This Agreement is made on 1 March 2024 between Acme Ltd and Globex Inc.
+
+1. Payment. The Customer shall pay each invoice within 30 days of receipt.
+
+2. Termination. Either party may terminate this Agreement on 60 days written notice.
+
+3. Confidentiality. Each party shall keep the Confidential Information of the other secret.
+
+4. Governing Law. This Agreement is governed by the laws of England.
+"""
+
+EMAIL = """From: alice@acme.com
+Subject: Late delivery
+
+On 2024-02-10 we told you the goods were late. Payment was withheld on 15 March 2024 pending delivery.
+"""
+
+
+@pytest.fixture(name="mock_provider")
+def mock_provider_fixture(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "mock")
+    monkeypatch.setattr(settings, "LLM_MOCK_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "LLM_MOCK_TOKENS_PER_SECOND", 0)
+    mock_stats.reset()
+
+
+def test_provider_selection(mock_provider, monkeypatch):
+    assert isinstance(get_llm_client().client, MockLLMClient)
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    assert isinstance(get_llm_client().client, openai.OpenAI)
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "bogus")
+    with pytest.raises(ValueError):
+        get_llm_client()
+
+
+def test_contract_analysis_shape(mock_provider):
+    result = AIContractAnalyzer(classifier=ClauseClassifier()).analyze_contract(CONTRACT)
+
+    detected = {clause["type"] for clause in result["detected_clauses"]}
+    assert {"payment", "termination", "confidentiality"} <= detected
+    assert "governing_law" not in result["missing_clauses"]
+    assert "force_majeure" in result["missing_clauses"]
+    assert result["key_terms"]["parties"] == ["Acme Ltd", "Globex Inc"]
+    assert result["key_terms"]["effective_date"] == "2024-03-01"
+    assert 0 <= result["risk_score"] <= 10
+    assert mock_stats.snapshot()["calls"] == 1
+
+
+def test_timeline_extraction_shape(mock_provider):
+    result = TimelineBuilder().extract_events_from_document(EMAIL, "email.eml", "doc_1")
+
+    assert result["doc_type"] == "Email"
+    assert [event["date"] for event in result["events"]] == ["2024-02-10", "2024-03-15"]
+    assert result["doc_date"] == "2024-02-10"
+
+
+def test_responses_are_deterministic(mock_provider):
+    messages = [{"role": "user", "content": "Return JSON with \"detected_clauses\".\n**Contract Text:**\n"
+                 + CONTRACT + "\nReturn ONLY valid JSON"}]
+    first = MockLLMClient(seed=1).chat.completions.create(model="m", messages=messages)
+    second = MockLLMClient(seed=2).chat.completions.create(model="m", messages=messages)
+
+    assert first.choices[0].message.content == second.choices[0].message.content
+    assert first.usage.total_tokens == first.usage.prompt_tokens + first.usage.completion_tokens
+
+
+def test_rate_limit_injection(mock_provider):
+    client = MockLLMClient(rate_limit_rate=1.0, seed=0)
+
+    with pytest.raises(openai.RateLimitError) as exc_info:
+        client.chat.completions.create(model="m", messages=[{"role": "user", "content": "hi"}])
+    assert exc_info.value.status_code == 429
+    assert mock_stats.snapshot()["rate_limited"] == 1
+
+
+def test_latency_model():
+    slept = []
+    client = MockLLMClient(latency_ms=200, latency_sigma=0, tokens_per_second=10, seed=0, sleep=slept.append)
+
+    response = client.chat.completions.create(model="m", messages=[{"role": "user", "content": "Say hello."}])
+
+    assert slept == [pytest.approx(0.2 + response.usage.completion_tokens / 10)]
+
+    jittered = MockLLMClient(latency_ms=200, latency_sigma=0.5, seed=3, sleep=slept.append)
+    samples = sorted(jittered.time_to_first_token() for _ in range(501))
+    assert 0.15 < samples[250] < 0.25
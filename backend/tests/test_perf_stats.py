@@ -0,0 +1,60 @@
+"""
+Load Harness Statistics Tests
+"""
+import pytest
+
+from perf.stats import LatencyRecorder, compare_to_baseline, percentile
+from perf.synthetic import contract_text
+from app.services.section_index import SectionIndex
+
+
+def test_percentile_nearest_rank():
+    samples = [float(n) for n in range(1, 101)]
+
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_recorder_summary_counts_errors():
+    recorder = LatencyRecorder()
+    recorder.record("GET /contracts/{id}", 0.010)
+    recorder.record("GET /contracts/{id}", 0.030, "HTTP 500")
+    with pytest.raises(ValueError):
+        with recorder.measure("flow:contract"):
+            raise ValueError("boom")
+    recorder.finish()
+
+    operations = recorder.summary()["operations"]
+    assert operations["GET /contracts/{id}"]["count"] == 2
+    assert operations["GET /contracts/{id}"]["errors"] == 1
+    assert operations["GET /contracts/{id}"]["p99_ms"] == 30.0
+    assert operations["flow:contract"]["error_types"] == {"ValueError": 1}
+
+
+def test_baseline_comparison():
+    baseline = {"operations": {
+        "POST /contracts/analyze": {"p95_ms": 100.0, "errors": 0},
+        "GET /contracts/{id}": {"p95_ms": 10.0, "errors": 0},
+    }}
+    current = {"operations": {
+        "POST /contracts/analyze": {"p95_ms": 140.0, "errors": 0},
+        "GET /contracts/{id}": {"p95_ms": 14.0, "errors": 2},
+    }}
+
+    regressions = compare_to_baseline(current, baseline, max_regression=0.25)
+
+    # 40% slower upload is reported; the 4ms change is under the noise floor but its errors are not
+    assert len(regressions) == 2
+    assert regressions[0].startswith("POST /contracts/analyze: p95_ms 140.0")
+    assert regressions[1] == "GET /contracts/{id}: 2 errors (baseline 0)"
+
+
+def test_synthetic_contract_is_deterministic_and_sectioned():
+    text = contract_text(pages=3, seed=7)
+
+    assert text == contract_text(pages=3, seed=7)
+    assert len(text.split()) >= 3 * 450
+    assert len(SectionIndex.from_text(text)) > 10
@@ -0,0 +1,146 @@
+"""
+Plan Rate Limit Tests (GCRA windows, local leases, enforcement per API key)
+"""
+import itertools
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.main import app
+from app.core.database import get_session
+from app.core.security import get_password_hash, create_api_key
+from app.middleware import rate_limit
+from app.middleware.rate_limit import PlanRateLimiter, gcra_acquire, get_plan_rate_limits, plan_rate_limiter
+from app.models.user import User, APIKey, PlanType
+
+
+class SharedScriptClient:
+    """
+    Stands in for Redis: the acquire script runs as gcra_acquire on one shared
+    state, with `clock` as the server's TIME
+    """
+
+    def __init__(self, clock=time.time):
+        self.tats = {}
+        self.calls = 0
+        self.clock = clock
+
+    def register_script(self, script):
+        assert "redis.call('TIME')" in script
+
+        def run(keys, args):
+            self.calls += 1
+            requested, returned = int(args[0]), int(args[1])
+            windows = [(key, args[2 + 2 * n], args[3 + 2 * n]) for n, key in enumerate(keys)]
+            granted, retry_after = gcra_acquire(self.tats, windows, requested, self.clock(), returned)
+            return [granted, str(retry_after)]
+
+        run.registered_client = self
+        return run
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    plan_rate_limiter.reset()
+    app.dependency_overrides[get_session] = lambda: session
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+    plan_rate_limiter.reset()
+
+
+def test_gcra_allows_a_burst_then_spaces_requests():
+    tats = {}
+    window = [("k", 10, 60)]
+
+    assert gcra_acquire(tats, window, 10, now=1000.0) == (10, 0.0)
+    granted, retry_after = gcra_acquire(tats, window, 1, now=1000.0)
+    assert granted == 0 and retry_after == pytest.approx(6.0)
+    assert gcra_acquire(tats, window, 5, now=1006.0)[0] == 1
+    # Giving back unspent requests makes room again
+    assert gcra_acquire(tats, window, 3, now=1006.0, returned=3)[0] == 3
+
+
+def test_gcra_tightest_window_decides():
+    tats = {}
+    windows = [("minute", 10, 60), ("hour", 12, 3600)]
+
+    assert gcra_acquire(tats, windows, 10, now=0.0)[0] == 10
+    assert gcra_acquire(tats, windows, 10, now=60.0)[0] == 2  # the minute window is free again, the hour is not
+    granted, retry_after = gcra_acquire(tats, windows, 1, now=60.0)
+    assert granted == 0 and retry_after == pytest.approx(240.0)
+
+
+def test_plan_names_map_to_rate_limits():
+    assert get_plan_rate_limits(PlanType.FREE.value) == get_plan_rate_limits("free_trial")
+    assert get_plan_rate_limits(PlanType.ENTERPRISE.value)["requests_per_minute"] == 120
+    assert get_plan_rate_limits("unknown")["requests_per_minute"] == 10
+
+
+def test_workers_share_limits_and_lease_locally(monkeypatch):
+    shared = SharedScriptClient()
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: shared)
+    workers = [PlanRateLimiter(sync_seconds=60, lease_fraction=0.1) for _ in range(3)]
+
+    admitted = sum(
+        workers[n % 3].hit("caller", "team") is None  # 120/minute, leases of 12
+        for n in range(300)
+    )
+
+    assert admitted == 120
+    assert shared.calls <= 120 / 12 + 3  # one acquisition per lease, one denial per worker
+
+
+def test_expired_lease_gives_back_unspent_requests(monkeypatch):
+    shared = SharedScriptClient()
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: shared)
+    idle, busy = PlanRateLimiter(sync_seconds=0, lease_fraction=0.5), PlanRateLimiter(lease_fraction=0.5)
+
+    assert idle.hit("caller", "free_trial") is None  # leases 5 of 10, spends 1
+    assert all(busy.hit("caller", "free_trial") is None for _ in range(5))
+    assert busy.hit("caller", "free_trial") is not None
+    assert idle.hit("caller", "free_trial") is None  # expired lease returns 4, then leases again
+
+
+def test_limits_follow_the_redis_clock_not_the_workers(monkeypatch):
+    shared = SharedScriptClient(clock=lambda: 1000.0)
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: shared)
+    skewed = itertools.cycle([1000.0, 4600.0])  # one worker's clock is an hour ahead
+    monkeypatch.setattr(rate_limit.time, "time", lambda: next(skewed))
+    workers = [PlanRateLimiter(sync_seconds=0, lease_fraction=0.1) for _ in range(2)]
+
+    admitted = sum(workers[n % 2].hit("caller", "free_trial") is None for n in range(40))
+
+    assert admitted == 10
+
+
+def test_authenticated_requests_get_429_over_the_plan_limit(client: TestClient, session: Session):
+    user = User(email="limits@example.com", hashed_password=get_password_hash("password"), full_name="Limits")
+    session.add(user)
+    session.commit()
+    key = create_api_key()
+    session.add(APIKey(user_id=user.id, key=key, name="Limit Key"))
+    session.commit()
+    auth = {"Authorization": f"Bearer {key}"}
+
+    statuses = [client.get("/api/v1/contracts/", headers=auth).status_code for _ in range(11)]
+
+    assert statuses == [200] * 10 + [429]
+    response = client.get("/api/v1/contracts/", headers=auth)
+    assert response.json()["detail"] == "Rate limit exceeded. Please try again later."
+    assert 1 <= int(response.headers["retry-after"]) <= 6
@@ -0,0 +1,165 @@
+"""
+Request Profiling and Slow-Request Capture Tests
+"""
+import contextvars
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.main import app
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.profiling import RequestProfile, SlowRequestLog, current_profile, record_llm_span, slow_requests
+from app.core.security import get_password_hash, create_api_key
+from app.models.user import User, APIKey
+
+ADMIN_TOKEN = "profile-admin-secret"
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", ADMIN_TOKEN)
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 60000)
+    slow_requests.clear()
+    app.dependency_overrides[get_session] = lambda: session
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+    slow_requests.clear()
+
+
+@pytest.fixture(name="api_key")
+def api_key_fixture(session: Session):
+    user = User(email="profile@example.com", hashed_password=get_password_hash("password"), full_name="Profile")
+    session.add(user)
+    session.commit()
+    key = create_api_key()
+    session.add(APIKey(user_id=user.id, key=key, name="Profile Key"))
+    session.commit()
+    return key
+
+
+def test_unprofiled_fast_requests_are_not_captured(client: TestClient):
+    response = client.get("/health")
+
+    assert "x-profile-id" not in response.headers
+    assert slow_requests.summaries() == []
+
+
+def test_requested_profile_records_queries(client: TestClient, api_key: str):
+    auth = {"Authorization": f"Bearer {api_key}"}
+
+    response = client.get("/api/v1/contracts/ctr_missing", headers={**auth, "X-Profile-Token": ADMIN_TOKEN})
+    capture_id = response.headers["x-profile-id"]
+
+    listing = client.get("/api/v1/analytics/slow-requests", headers={**auth, "X-Profile-Token": ADMIN_TOKEN})
+    assert listing.status_code == 200
+    summary = next(r for r in listing.json()["requests"] if r["id"] == capture_id)
+    assert summary["route"] == "/api/v1/contracts/{contract_id}"
+    assert summary["status"] == 404
+    assert summary["reason"] == "requested"
+    assert summary["query_count"] >= 2  # API key lookup and the contract lookup
+
+    capture = client.get(f"/api/v1/analytics/slow-requests/{capture_id}",
+                         headers={**auth, "X-Profile-Token": ADMIN_TOKEN}).json()
+    assert len(capture["queries"]) == summary["query_count"]
+    assert any("api_keys" in q["statement"] for q in capture["queries"])
+
+
+def test_admin_token_required_to_read_captures(client: TestClient, api_key: str):
+    auth = {"Authorization": f"Bearer {api_key}"}
+
+    assert client.get("/api/v1/analytics/slow-requests", headers=auth).status_code == 403
+    assert client.get("/api/v1/analytics/slow-requests",
+                      headers={**auth, "X-Profile-Token": "wrong"}).status_code == 403
+    # Pool internals and replica hosts are admin-only too
+    assert client.get("/api/v1/analytics/database-pools", headers=auth).status_code == 403
+    pools = client.get("/api/v1/analytics/database-pools", headers={**auth, "X-Profile-Token": ADMIN_TOKEN})
+    assert pools.status_code == 200 and pools.json()["engines"][0]["name"] == "primary"
+
+
+def test_slow_requests_are_captured_without_profiling(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0)
+
+    client.get("/health")
+
+    [summary] = slow_requests.summaries()
+    assert summary["route"] == "/health"
+    assert summary["profiled"] is False
+    assert summary["reason"] == "slow"
+
+
+def test_ring_buffer_keeps_the_newest_captures():
+    log = SlowRequestLog(size=3)
+    for n in range(5):
+        log.add("GET", f"/r/{n}", "/r/{n}", 200, 0.01 * n)
+
+    assert [s["path"] for s in log.summaries()] == ["/r/4", "/r/3", "/r/2"]
+
+
+def test_stop_does_not_wait_for_the_sampler():
+    """stop() runs on the event loop, so it only signals the sampler thread"""
+    profile = RequestProfile("requested", interval_ms=200)
+    profile.start()
+    time.sleep(0.01)
+    started = time.perf_counter()
+    profile.stop()
+    assert time.perf_counter() - started < 0.1
+    profile._sampler.join()
+    assert profile.to_dict()["sample_count"] == 0
+
+
+def test_profile_samples_stacks_and_llm_spans():
+    profile = RequestProfile("requested", interval_ms=1)
+    token = current_profile.set(profile)
+    profile.start()
+    try:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        record_llm_span("contract_analysis", "gpt-4o-mini", 0.2, prompt_tokens=100, completion_tokens=20)
+    finally:
+        profile.stop()
+        current_profile.reset(token)
+
+    result = profile.to_dict()
+    time.sleep(0.01)
+    assert profile.to_dict()["sample_count"] == result["sample_count"]  # Nothing sampled after stop
+    assert result["sample_count"] > 0
+    assert any("test_profile_samples_stacks_and_llm_spans" in s["stack"] for s in result["stacks"])
+    assert result["llm_calls"] == [{
+        "feature": "contract_analysis", "model": "gpt-4o-mini", "duration_ms": 200.0, "outcome": "ok",
+        "prompt_tokens": 100, "completion_tokens": 20
+    }]
+
+
+def test_profile_follows_the_request_into_worker_threads(session: Session):
+    profile = RequestProfile("requested")
+    token = current_profile.set(profile)
+    try:
+        worker = threading.Thread(target=contextvars.copy_context().run,
+                                  args=(lambda: session.exec(select(User)).all(),))
+        worker.start()
+        worker.join()
+    finally:
+        current_profile.reset(token)
+
+    assert profile.query_count == 1
+    assert worker.ident in profile.threads
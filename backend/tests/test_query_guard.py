@@ -0,0 +1,245 @@
+"""
+Query Guard and Query Budget Tests
+
+Endpoints with a budget are requested with small and large data; the query
+count must stay within the budget and must not grow with the data (N+1).
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.main import app
+from app.core.database import get_session
+from app.core.query_guard import QueryBudgetExceeded, count_queries, normalize_statement, query_budget
+from app.core.security import get_password_hash, create_api_key
+from app.models.clause import Clause, ClauseCategory, ClauseLibrary, ClauseLibraryMembership, ClauseRiskLevel
+from app.models.compliance import ComplianceRule, Playbook
+from app.models.contract import Contract, ContractAnalysis, ContractStatus
+from app.models.user import User, APIKey
+from app.services.section_index import ContractSectionService
+from app.services.text_store import ContractTextStore
+from perf.synthetic import contract_analysis_fields, contract_text, playbook_rules
+
+# Statements per request, including authentication (API key lookup, last-used update, user)
+QUERY_BUDGETS = {
+    "GET /api/v1/contracts/{contract_id}/clause-suggestions (generate)": 9,
+    "GET /api/v1/contracts/{contract_id}/clause-suggestions (stored)": 6,
+    "GET /api/v1/clauses/libraries/{library_id}/clauses": 5,
+    "POST /api/v1/compliance/checks": 15,
+}
+
+MISSING_CATEGORIES = {
+    "force_majeure": ClauseCategory.FORCE_MAJEURE,
+    "dispute_resolution": ClauseCategory.DISPUTE_RESOLUTION,
+    "governing_law": ClauseCategory.GOVERNING_LAW,
+    "data_protection": ClauseCategory.DATA_PROTECTION,
+    "warranties": ClauseCategory.WARRANTIES,
+    "assignment_restrictions": ClauseCategory.ASSIGNMENT,
+}
+RISKY_TYPES = ["termination", "indemnification", "liability", "confidentiality", "payment"]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    # A session per request, as in production, so counts do not depend on the test's identity map
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="user")
+def user_fixture(session: Session):
+    user = User(email="queries@example.com", hashed_password=get_password_hash("password"), full_name="Queries")
+    session.add(user)
+    session.commit()
+    return user
+
+
+@pytest.fixture(name="auth")
+def auth_fixture(session: Session, user: User):
+    key = create_api_key()
+    session.add(APIKey(user_id=user.id, key=key, name="Query Key"))
+    session.commit()
+    return {"Authorization": f"Bearer {key}"}
+
+
+def _add_library_clauses(session: Session, user: User, categories, per_category: int):
+    clauses = [
+        Clause(clause_id=f"cls_{category.value}_{n}", user_id=user.id, title=f"{category.value} {n}",
+               category=category, text="Clause text", usage_count=n, risk_level=ClauseRiskLevel.FAVORABLE)
+        for category in categories for n in range(per_category)
+    ]
+    session.add_all(clauses)
+    session.commit()
+    return clauses
+
+
+def _completed_contract(session: Session, user: User, name: str, missing, risky) -> Contract:
+    contract = Contract(contract_id=f"ctr_{name}", user_id=user.id, filename=f"{name}.pdf", file_size_bytes=1,
+                        file_type="pdf", s3_key=name, status=ContractStatus.COMPLETED)
+    session.add(contract)
+    session.commit()
+    text = contract_text(pages=2)
+    fields = contract_analysis_fields(text)
+    fields.update(
+        contract_id=contract.id,
+        missing_clauses=list(missing),
+        detected_clauses=[{"type": t, "risk_level": "high", "text": "", "explanation": ""} for t in risky]
+    )
+    session.add(ContractAnalysis(**fields))
+    ContractTextStore(session).save(contract.id, text)
+    ContractSectionService(session).build(contract.id, text)
+    session.commit()
+    return contract
+
+
+def _queries(client: TestClient, method: str, url: str, headers, **kwargs) -> int:
+    with count_queries() as counter:
+        response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code < 300, response.text
+    return counter.count
+
+
+def test_normalize_statement_collapses_in_lists():
+    assert normalize_statement("SELECT *\n  FROM clauses WHERE id IN (?, ?, ?)") == \
+        normalize_statement("SELECT * FROM clauses WHERE id IN (?,?)") == \
+        "SELECT * FROM clauses WHERE id IN (?)"
+    assert normalize_statement("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == \
+        "SELECT * FROM t WHERE id IN (?)"
+
+
+def test_query_budget_flags_n_plus_one(session: Session, user: User):
+    ids = [c.id for c in _add_library_clauses(session, user, [ClauseCategory.PAYMENT], 5)]
+
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1: 5x SELECT"):
+        with query_budget(10):
+            for clause_id in ids:
+                session.exec(select(Clause).where(Clause.id == clause_id)).one()
+
+    with query_budget(1):
+        session.exec(select(Clause).where(Clause.id.in_(ids))).all()
+
+
+def test_query_budget_flags_too_many_queries(session: Session):
+    with pytest.raises(QueryBudgetExceeded, match="3 queries, budget 2"):
+        with query_budget(2, max_repeats=None):
+            for _ in range(3):
+                session.exec(select(User)).all()
+
+
+def test_clause_suggestion_queries_do_not_grow(client: TestClient, session: Session, user: User, auth):
+    categories = list(MISSING_CATEGORIES.values()) + [ClauseCategory(t) for t in RISKY_TYPES]
+    _add_library_clauses(session, user, categories, 3)
+    small = _completed_contract(session, user, "small", ["force_majeure"], ["termination"])
+    large = _completed_contract(session, user, "large", MISSING_CATEGORIES, RISKY_TYPES)
+    full = _completed_contract(session, user, "full", MISSING_CATEGORIES, RISKY_TYPES)
+
+    generate = [_queries(client, "GET", f"/api/v1/contracts/{c.contract_id}/clause-suggestions", auth)
+                for c in (small, large)]
+    stored = [_queries(client, "GET", f"/api/v1/contracts/{c.contract_id}/clause-suggestions", auth)
+              for c in (small, large)]
+
+    assert generate[0] == generate[1] <= QUERY_BUDGETS[
+        "GET /api/v1/contracts/{contract_id}/clause-suggestions (generate)"]
+    assert stored[0] == stored[1] <= QUERY_BUDGETS["GET /api/v1/contracts/{contract_id}/clause-suggestions (stored)"]
+
+    # One suggestion per missing clause and per risky clause; only the missing-clause ones are stored
+    generated = client.get(f"/api/v1/contracts/{full.contract_id}/clause-suggestions", headers=auth).json()
+    assert len(generated["suggestions"]) == len(MISSING_CATEGORIES) + len(RISKY_TYPES)
+    assert all(len(s["suggested_clauses"]) == 3 for s in generated["suggestions"][:len(MISSING_CATEGORIES)])
+    assert [c["usage_count"] for c in generated["suggestions"][-1]["suggested_clauses"]] == [2, 1]
+    stored = client.get(f"/api/v1/contracts/{full.contract_id}/clause-suggestions", headers=auth).json()
+    assert [s["suggested_clauses"] for s in stored["suggestions"]] == \
+        [s["suggested_clauses"] for s in generated["suggestions"][:len(MISSING_CATEGORIES)]]
+
+
+def test_inactive_user_is_rejected_before_the_key_is_touched(client: TestClient, session: Session, user: User, auth):
+    user.is_active = False
+    session.add(user)
+    session.commit()
+
+    response = client.get("/api/v1/clauses/libraries/lib_none/clauses", headers=auth)
+    assert response.status_code == 401
+    session.expire_all()
+    assert session.exec(select(APIKey)).one().last_used_at is None
+
+
+def test_library_clause_queries_do_not_grow(client: TestClient, session: Session, user: User, auth):
+    counts = []
+    for name, size in (("small", 2), ("large", 25)):
+        library = ClauseLibrary(library_id=f"lib_{name}", name=name, owner_user_id=user.id)
+        session.add(library)
+        session.commit()
+        clauses = _add_library_clauses(session, user, [ClauseCategory.CUSTOM], size)
+        for n, clause in enumerate(clauses):
+            clause.clause_id = f"cls_{name}_{n}"
+            session.add(ClauseLibraryMembership(clause_id=clause.id, library_id=library.id, sort_order=size - n))
+        session.commit()
+        counts.append(_queries(client, "GET", f"/api/v1/clauses/libraries/lib_{name}/clauses", auth))
+
+    assert counts[0] == counts[1] <= QUERY_BUDGETS["GET /api/v1/clauses/libraries/{library_id}/clauses"]
+    # Returned in membership order
+    ids = [c["clause_id"] for c in client.get("/api/v1/clauses/libraries/lib_large/clauses", headers=auth).json()]
+    assert ids == [f"cls_large_{n}" for n in reversed(range(25))]
+
+
+def test_compliance_check_queries_do_not_grow(client: TestClient, session: Session, user: User, auth):
+    contract = _completed_contract(session, user, "compliance", [], [])
+    counts = []
+    for name, rules in (("small", 2), ("large", 60)):
+        playbook = Playbook(playbook_id=f"plb_{name}", user_id=user.id, name=name)
+        session.add(playbook)
+        session.commit()
+        for fields in playbook_rules(rules):
+            fields.update(playbook_id=playbook.id, rule_id=f"{fields['rule_id']}_{name}")
+            session.add(ComplianceRule(**fields))
+        session.commit()
+        counts.append(_queries(client, "POST", "/api/v1/compliance/checks", auth,
+                               json={"contract_id": contract.contract_id, "playbook_id": playbook.playbook_id}))
+
+    assert counts[0] == counts[1] <= QUERY_BUDGETS["POST /api/v1/compliance/checks"]
+
+
+def test_guard_middleware_reports_query_count_and_logs_n_plus_one(engine, caplog):
+    from fastapi import FastAPI
+    from app.middleware.query_guard import QueryGuardMiddleware
+
+    guarded = FastAPI()
+    guarded.add_middleware(QueryGuardMiddleware, max_queries=10)
+
+    @guarded.get("/users/{n}")
+    def list_users(n: int):
+        with Session(engine) as session:
+            for user_id in range(n):
+                session.exec(select(User).where(User.id == user_id)).first()
+        return {}
+
+    client = TestClient(guarded)
+    assert client.get("/users/2").headers["x-query-count"] == "2"
+    assert "Query guard" not in caplog.text
+
+    client.get("/users/4")
+    assert "Query guard: GET /users/{n} ran 4 queries (budget 10); N+1 4x: SELECT" in caplog.text
@@ -0,0 +1,144 @@
+"""
+Upload Quota Reservation Tests (reserve, commit/release, reconciliation)
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.api.dependencies import check_quota
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.usage import UsageRecord
+from app.models.user import User, PlanType
+from app.services import quota
+from app.services.quota import quota_reservations
+
+PLAN = settings.PLANS["free_trial"]  # 3 files, 30 pages
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+class ScriptClient:
+    """Stands in for Redis: each script runs as its Python twin on a dict per key"""
+
+    def __init__(self):
+        self.counters = {}
+
+    def register_script(self, script):
+        twin = next(fn for text, fn in quota._SCRIPTS.values() if text == script)
+
+        def run(keys, args):
+            counters = self.counters.setdefault(keys[0], {})
+            result = twin(counters, *args)
+            if not counters:
+                del self.counters[keys[0]]
+            return result
+
+        return run
+
+    def scan_iter(self, match, count):
+        return [key.encode() for key in self.counters]
+
+
+@pytest.fixture(autouse=True)
+def client(monkeypatch):
+    client = ScriptClient()
+    monkeypatch.setattr(quota, "get_redis", lambda: client)
+    return client
+
+
+@pytest.fixture(name="user")
+def user_fixture(session: Session):
+    user = User(email="quota@example.com", hashed_password=get_password_hash("password"), full_name="Quota",
+                plan=PlanType.FREE_TRIAL, files_used_current_period=1, pages_used_current_period=4,
+                billing_period_start=datetime(2026, 10, 1, 9, 30, 0, 123456))
+    session.add(user)
+    session.commit()
+    return user
+
+
+@pytest.fixture(name="counters")
+def counters_fixture(client: ScriptClient, user: User):
+    return lambda: client.counters[quota_reservations.counter_key(user.id, user.billing_period_start)]
+
+
+def test_reservations_stop_at_the_file_limit(user: User, counters):
+    # One file used already; every upload in flight holds a reservation until processed
+    assert quota_reservations.reserve(user, "ctr_a", PLAN) is None
+    assert quota_reservations.reserve(user, "ctr_b", PLAN) is None
+    assert quota_reservations.reserve(user, "ctr_c", PLAN) == "files"
+    # A retried reservation is not counted twice
+    assert quota_reservations.reserve(user, "ctr_a", PLAN) is None
+    assert counters()["files"] == 3
+
+
+def test_commit_records_pages_and_release_frees_the_file(user: User, counters):
+    quota_reservations.reserve(user, "ctr_a", PLAN)
+    quota_reservations.reserve(user, "ctr_b", PLAN)
+
+    assert quota_reservations.commit(user, "ctr_a", 26) is True
+    assert quota_reservations.release(user, "ctr_b") is True
+    assert quota_reservations.release(user, "ctr_b") is False  # settled once only
+
+    assert {k: counters()[k] for k in ("files", "pages")} == {"files": 2, "pages": 30}
+    assert quota_reservations.reserve(user, "ctr_c", PLAN) == "pages"
+
+
+def test_check_quota_reserves_and_raises_plan_errors(user: User):
+    assert check_quota(user, reservation_id="ctr_a") is True
+    assert check_quota(user, reservation_id="ctr_b") is True
+
+    with pytest.raises(HTTPException) as error:
+        check_quota(user, reservation_id="ctr_c")
+    assert error.value.status_code == 429
+    assert error.value.detail == "File quota exceeded. Limit: 3 files/month. Upgrade your plan."
+    # Without a reservation id only the user row is checked
+    assert check_quota(user) is True
+
+
+def test_reconcile_resets_counters_to_recorded_usage(session: Session, user: User, counters, monkeypatch):
+    for pages in (3, 5):
+        session.add(UsageRecord(user_id=user.id, resource_type="contract_analysis", pages_consumed=pages,
+                                files_consumed=1, billing_period_start=user.billing_period_start,
+                                billing_period_end=user.billing_period_end))
+    session.add(UsageRecord(user_id=user.id, resource_type="contract_analysis", pages_consumed=99,
+                            billing_period_start=datetime(2026, 9, 1), billing_period_end=datetime(2026, 10, 1)))
+    session.commit()
+    quota_reservations.reserve(user, "ctr_stale", PLAN)
+    monkeypatch.setattr(settings, "QUOTA_RESERVATION_TIMEOUT_SECONDS", -1)
+    assert quota_reservations.reconcile(session) == 1
+    assert {k: counters()[k] for k in ("files", "pages")} == {"files": 2, "pages": 8}  # stale reservation dropped
+
+    monkeypatch.setattr(settings, "QUOTA_RESERVATION_TIMEOUT_SECONDS", 3600)
+    quota_reservations.reserve(user, "ctr_held", PLAN)
+    quota_reservations.reconcile(session)
+    assert {k: counters()[k] for k in ("files", "pages")} == {"files": 3, "pages": 9}
+    assert quota_reservations.commit(user, "ctr_held", 2) is True
+
+
+def test_without_redis_the_user_row_is_checked(user: User, monkeypatch):
+    # Counters per process would miss the worker's commits and releases; nothing is reserved
+    monkeypatch.setattr(quota, "get_redis", lambda: None)
+
+    for contract_id in ("ctr_a", "ctr_b", "ctr_c"):
+        assert quota_reservations.reserve(user, contract_id, PLAN) is None
+    assert quota_reservations.commit(user, "ctr_a", 5) is False
+    assert quota_reservations.release(user, "ctr_b") is False
+
+    user.pages_used_current_period = 30
+    assert quota_reservations.reserve(user, "ctr_d", PLAN) == "pages"
+    user.files_used_current_period = 3
+    assert quota_reservations.reserve(user, "ctr_d", PLAN) == "files"
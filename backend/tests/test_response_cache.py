@@ -0,0 +1,170 @@
+"""
+Response Cache and Conditional GET Tests (immutable analysis results)
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.main import app
+from app.core import response_cache as response_cache_module
+from app.core.database import get_session
+from app.core.query_guard import count_queries
+from app.core.response_cache import etag_matches, response_cache
+from app.core.security import get_password_hash, create_api_key
+from app.models.compliance import ComplianceCheck, ComplianceStatus, Playbook
+from app.models.contract import Contract, ContractAnalysis, ContractStatus
+from app.models.user import User, APIKey
+from perf.synthetic import contract_analysis_fields, contract_text
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine, monkeypatch):
+    # Redis is not available in the test environment; the in-process cache is used
+    monkeypatch.setattr(response_cache_module, "get_redis", lambda: None)
+    response_cache.clear()
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+    response_cache.clear()
+
+
+@pytest.fixture(name="user")
+def user_fixture(session: Session):
+    user = User(email="etag@example.com", hashed_password=get_password_hash("password"), full_name="ETag")
+    session.add(user)
+    session.commit()
+    return user
+
+
+@pytest.fixture(name="auth")
+def auth_fixture(session: Session, user: User):
+    key = create_api_key()
+    session.add(APIKey(user_id=user.id, key=key, name="ETag Key"))
+    session.commit()
+    return {"Authorization": f"Bearer {key}"}
+
+
+def _contract(session: Session, user: User, status=ContractStatus.COMPLETED) -> Contract:
+    contract = Contract(contract_id="ctr_etag", user_id=user.id, filename="etag.pdf", file_size_bytes=1,
+                        file_type="pdf", s3_key="etag", status=status, page_count=2,
+                        processed_at=datetime(2026, 10, 1, 12, 0, 0))
+    session.add(contract)
+    session.commit()
+    fields = contract_analysis_fields(contract_text(pages=2))
+    fields.update(contract_id=contract.id)
+    session.add(ContractAnalysis(**fields))
+    session.commit()
+    return contract
+
+
+def _queries(client: TestClient, url: str, headers):
+    with count_queries() as counter:
+        response = client.get(url, headers=headers)
+    return response, counter.count
+
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_completed_analysis_is_cached_and_revalidated(client: TestClient, session: Session, user: User, auth):
+    _contract(session, user)
+    url = "/api/v1/contracts/ctr_etag"
+
+    first, built = _queries(client, url, auth)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    body = first.json()
+    assert body["contract_id"] == "ctr_etag" and body["status"] == "completed"
+    assert body["pages_processed"] == 2 and len(body["detected_clauses"]) > 0
+
+    cached, from_cache = _queries(client, url, auth)
+    assert cached.content == first.content
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert from_cache == built - 1  # no analysis SELECT
+
+    not_modified, revalidated = _queries(client, url, {**auth, "If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == first.headers["etag"]
+    assert revalidated == from_cache
+
+
+def test_reprocessed_analysis_gets_a_new_etag(client: TestClient, session: Session, user: User, auth):
+    contract = _contract(session, user)
+    etag = client.get("/api/v1/contracts/ctr_etag", headers=auth).headers["etag"]
+
+    contract.processed_at = datetime(2026, 10, 2, 12, 0, 0)
+    session.add(contract)
+    session.commit()
+
+    response = client.get("/api/v1/contracts/ctr_etag", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_unfinished_results_are_not_cached(client: TestClient, session: Session, user: User, auth):
+    _contract(session, user, status=ContractStatus.PROCESSING)
+    response = client.get("/api/v1/contracts/ctr_etag", headers=auth)
+    assert response.status_code == 202
+    assert "etag" not in response.headers
+
+    contract = session.get(Contract, 1)
+    playbook = Playbook(playbook_id="plb_etag", user_id=user.id, name="ETag")
+    session.add(playbook)
+    session.commit()
+    session.add(ComplianceCheck(check_id="chk_etag", user_id=user.id, contract_id=contract.id,
+                                playbook_id=playbook.id, status=ComplianceStatus.PROCESSING))
+    session.commit()
+
+    response = client.get("/api/v1/compliance/checks/chk_etag", headers=auth)
+    assert response.status_code == 200 and "etag" not in response.headers
+
+
+def test_finished_compliance_check_is_cached(client: TestClient, session: Session, user: User, auth):
+    contract = _contract(session, user)
+    playbook = Playbook(playbook_id="plb_etag", user_id=user.id, name="ETag")
+    session.add(playbook)
+    session.commit()
+    session.add(ComplianceCheck(check_id="chk_etag", user_id=user.id, contract_id=contract.id,
+                                playbook_id=playbook.id, status=ComplianceStatus.COMPLIANT,
+                                overall_status=ComplianceStatus.COMPLIANT, compliance_score=100.0,
+                                processed_at=datetime(2026, 10, 1, 12, 5, 0)))
+    session.commit()
+
+    first = client.get("/api/v1/compliance/checks/chk_etag", headers=auth)
+    assert first.json()["contract_id"] == "ctr_etag" and first.json()["playbook_id"] == "plb_etag"
+    assert first.json()["processed_at"] == "2026-10-01T12:05:00"
+
+    response = client.get("/api/v1/compliance/checks/chk_etag", headers={**auth, "If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
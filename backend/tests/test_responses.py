@@ -0,0 +1,121 @@
+"""
+JSON Rendering and Response Compression Tests
+"""
+import gzip
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.response_cache import etag_matches
+from app.core.responses import DefaultJSONResponse
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+from app.models.contract import ContractStatus, RiskLevel
+
+LARGE = {"events": [{"description": "Notice of termination served", "n": n} for n in range(200)]}
+ETAG = '"abc123"'
+
+
+def _compressed_app() -> FastAPI:
+    compressed = FastAPI(default_response_class=DefaultJSONResponse)
+    compressed.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @compressed.get("/large")
+    def large():
+        return LARGE
+
+    @compressed.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    @compressed.get("/events")
+    def events():
+        return StreamingResponse(iter(["data: x\n\n"] * 500), media_type="text/event-stream")
+
+    @compressed.get("/stream")
+    def stream():
+        return StreamingResponse(iter(["line of text\n"] * 500), media_type="text/csv")
+
+    @compressed.get("/result")
+    def result(request: Request):
+        if etag_matches(request.headers.get("if-none-match"), ETAG):
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return Response(json.dumps(LARGE).encode(), media_type="application/json", headers={"ETag": ETAG})
+
+    return compressed
+
+
+def test_default_response_matches_json_response():
+    content = jsonable_encoder({
+        "status": ContractStatus.COMPLETED,
+        "risk": [RiskLevel.HIGH, None, True],
+        "amount": Decimal("1250.50"),
+        "created_at": datetime(2024, 3, 1, 9, 30, 15, 120000),
+        "processed_at": datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc),
+        "due": date(2024, 4, 1),
+        "parties": {"Mwangi & Otieno Advocates": "Ksh 1,000,000 — “net”"},
+        "score": 7.25,
+    })
+
+    assert DefaultJSONResponse(content).body == JSONResponse(content).body
+    # Values the encoder has not already converted are still rendered
+    raw = {"at": datetime(2024, 3, 1, 9, 30), "amount": Decimal("2.5"), "level": RiskLevel.LOW, 1: "one"}
+    assert json.loads(DefaultJSONResponse(raw).body) == json.loads(JSONResponse(jsonable_encoder(raw)).body)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("identity") is None
+
+
+def test_large_json_is_gzipped_with_vary():
+    client = TestClient(_compressed_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == LARGE
+    raw = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert len(gzip.compress(raw.content)) >= int(response.headers["content-length"]) - 32
+
+
+def test_small_bodies_and_event_streams_are_not_compressed():
+    client = TestClient(_compressed_app())
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in events.headers
+    assert events.text == "data: x\n\n" * 500
+
+
+def test_streaming_bodies_are_compressed_incrementally():
+    response = TestClient(_compressed_app()).get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "line of text\n" * 500
+
+
+def test_compressed_etag_is_weak_and_still_revalidates():
+    client = TestClient(_compressed_app())
+
+    response = client.get("/result", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f"W/{ETAG}"
+
+    revalidated = client.get("/result", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_api_uses_default_response_class():
+    assert app.router.default_response_class is DefaultJSONResponse
+    assert "content-encoding" not in TestClient(app).get("/health", headers={"Accept-Encoding": "gzip"}).headers
@@ -0,0 +1,117 @@
+"""
+Contract Section Index Tests
+"""
+import pytest
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.core.security import get_password_hash
+from app.models.compliance import ComplianceRule, RuleType
+from app.models.contract import Contract, ContractAnalysis
+from app.models.user import User
+from app.services.compliance_engine import ComplianceEngine
+from app.services.section_index import ContractSectionService, SectionIndex
+
+CONTRACT = (
+    "MASTER SERVICES AGREEMENT\n\n"
+    "ARTICLE I. DEFINITIONS\n"
+    "1.1 \"Agreement\" means this agreement.\n"
+    "1.2 \"Fees\" means the fees in Schedule 1.\n"
+    "\f\n"
+    "ARTICLE II PAYMENT\n"
+    "2.1 Invoices\n"
+    "The Client shall pay:\n"
+    "(a) the Fees; and\n"
+    "(b) expenses within 30 days of invoice.\n"
+    "2.2 Late payment accrues interest at 2% per month.\n"
+    "\f\n"
+    "ARTICLE III LIABILITY\n"
+    "3.1 Liability is unlimited for gross negligence.\n"
+)
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_segments_hierarchy_with_offsets_and_pages():
+    index = SectionIndex.from_text(CONTRACT)
+    sections = [index.section(i) for i in range(len(index))]
+
+    assert [s["number"] for s in sections] == [
+        "Article I", "1.1", "1.2", "Article II", "2.1", "(a)", "(b)", "2.2", "Article III", "3.1"
+    ]
+    assert [s["page"] for s in sections] == [1, 1, 1, 2, 2, 2, 2, 2, 3, 3]
+    assert sections[0]["title"] == "DEFINITIONS"
+    assert sections[5]["parent"] == 4 and sections[4]["parent"] == 3
+    # Sections end where the next sibling (or higher) begins
+    assert sections[4]["end"] == sections[7]["start"]
+    assert sections[3]["end"] == sections[8]["start"]
+    assert sections[-1]["end"] == len(CONTRACT)
+    assert CONTRACT[sections[6]["start"]:].startswith("(b) expenses")
+
+    tree = index.tree()
+    assert [node["number"] for node in tree] == ["Article I", "Article II", "Article III"]
+    assert [node["number"] for node in tree[1]["children"][0]["children"]] == ["(a)", "(b)"]
+
+
+def test_lookup_by_offset():
+    index = SectionIndex.from_text(CONTRACT)
+
+    assert index.section_at(0) is None  # Title before the first section
+    assert index.location(CONTRACT.index("expenses within")) == "Article II, Section 2.1(b) (Invoices), page 2"
+    assert index.location(CONTRACT.index("accrues interest")) == "Article II, Section 2.2, page 2"
+    assert index.locate(CONTRACT, "LIABILITY IS   unlimited") == "Article III, Section 3.1, page 3"
+    assert index.locate(CONTRACT, "not in the contract") is None
+
+
+def test_index_persisted_per_contract(session: Session):
+    user = User(email="sections@example.com", hashed_password=get_password_hash("password"), full_name="S")
+    session.add(user)
+    session.commit()
+    contract = Contract(contract_id="ctr_sections", user_id=user.id, filename="msa.pdf",
+                        file_size_bytes=1, file_type="pdf", s3_key="k")
+    session.add(contract)
+    session.commit()
+
+    service = ContractSectionService(session)
+    assert service.get(contract.id) is None
+
+    service.build(contract.id, CONTRACT)
+    session.commit()
+    stored = ContractSectionService(session).get(contract.id)
+    assert stored.rows == SectionIndex.from_text(CONTRACT).rows
+
+    # Text of a different length (re-extracted) rebuilds the index
+    rebuilt = service.get(contract.id, CONTRACT + "4. NOTICES\n")
+    assert rebuilt.section(len(rebuilt) - 1)["number"] == "4"
+
+
+def test_compliance_results_carry_locations():
+    index = SectionIndex.from_text(CONTRACT)
+    analysis = ContractAnalysis(
+        contract_id=1, executive_summary=[], parties=[], missing_clauses=[],
+        detected_clauses=[{"type": "liability", "text": "Liability is unlimited for gross negligence."}]
+    )
+
+    prohibited = ComplianceRule(rule_id="rul_1", playbook_id=1, name="No unlimited liability", description="",
+                                rule_type=RuleType.PROHIBITED_TERM, parameters={"terms": ["unlimited"]})
+    result = ComplianceEngine.evaluate_rule(prohibited, analysis, CONTRACT, index)
+    assert result["status"] == "failed"
+    assert result["location"] == "Article III, Section 3.1, page 3"
+
+    clause = ComplianceRule(rule_id="rul_2", playbook_id=1, name="Liability clause", description="",
+                            rule_type=RuleType.REQUIRED_CLAUSE, parameters={"category": "liability"})
+    assert ComplianceEngine.evaluate_rule(clause, analysis, CONTRACT, index)["location"] == \
+        "Article III, Section 3.1, page 3"
+
+    # Without an index the engine behaves as before
+    assert ComplianceEngine.evaluate_rule(prohibited, analysis, CONTRACT)["location"] is None
@@ -0,0 +1,101 @@
+"""
+Security Middleware Tests (headers and request size limit)
+"""
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from app.main import app
+from app.middleware.security import RequestSizeLimitMiddleware, SecurityHeadersMiddleware
+
+LIMIT = 1024
+
+
+def _limited_app() -> FastAPI:
+    limited = FastAPI()
+    limited.add_middleware(RequestSizeLimitMiddleware, max_size=LIMIT)
+
+    @limited.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    @limited.post("/raw")
+    async def raw(body: dict):
+        return {"keys": len(body)}
+
+    return limited
+
+
+def _run(asgi_app, body_chunks, headers=()):
+    """Send a request body in chunks; returns (sent messages, chunks the app read)"""
+    chunks = [{"type": "http.request", "body": c, "more_body": n < len(body_chunks) - 1}
+              for n, c in enumerate(body_chunks)]
+    read = 0
+    sent = []
+
+    async def receive():
+        nonlocal read
+        if read < len(chunks):
+            read += 1
+            return chunks[read - 1]
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/raw", "raw_path": b"/raw", "query_string": b"",
+             "root_path": "", "scheme": "http", "http_version": "1.1", "server": ("test", 80),
+             "client": ("127.0.0.1", 1), "headers": [(b"content-type", b"application/json"), *headers]}
+    asyncio.run(asgi_app(scope, receive, send))
+    return sent, read
+
+
+def test_security_headers_are_added():
+    response = TestClient(app).get("/health")
+
+    assert response.headers["strict-transport-security"] == "max-age=31536000; includeSubDomains"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "frame-ancestors 'none'" in response.headers["content-security-policy"]
+
+
+def test_security_headers_replace_endpoint_values():
+    framed = FastAPI()
+    framed.add_middleware(SecurityHeadersMiddleware)
+
+    @framed.get("/framed")
+    def framed_page():
+        return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    response = TestClient(framed).get("/framed")
+
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
+
+
+def test_declared_oversize_body_is_rejected_before_the_app_runs():
+    client = TestClient(_limited_app())
+
+    response = client.post("/upload", files={"file": ("big.pdf", b"x" * (LIMIT + 1))})
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large. Maximum size: 0.0MB"}
+    assert client.post("/upload", files={"file": ("small.pdf", b"x" * 100)}).json() == {"size": 100}
+
+
+def test_chunked_oversize_body_stops_at_the_limit():
+    chunks = [b"{" + b" " * 510, b" " * 512, b" " * 512] + [b" " * 512] * 20 + [b"}"]
+
+    sent, read = _run(_limited_app(), chunks)
+
+    assert sent[0]["status"] == 413
+    assert read == 3  # the first chunk past the limit, not the whole body
+
+
+def test_chunked_body_under_the_limit_passes():
+    sent, read = _run(SecurityHeadersMiddleware(_limited_app()), [b'{"a": 1,', b' "b": 2}'])
+
+    assert sent[0]["status"] == 200
+    assert (b"x-frame-options", b"DENY") in sent[0]["headers"]
+    assert sent[1]["body"] == b'{"keys":2}'
+    assert read == 2
@@ -0,0 +1,166 @@
+"""
+Dashboard Statistics Tests
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlmodel import Session, create_engine, select, SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.models.user import User
+from app.models.intake import ClientIntake
+from app.models.conveyancing import ConveyancingTransaction, OfficialSearch, ConveyancingDocument
+from app.core.security import get_password_hash
+from app.services.statistics_service import StatisticsService, snapshot_cache
+from app.api.v1.intake import update_intake
+from app.schemas.intake import ClientIntakeUpdate
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    snapshot_cache.clear()
+    with Session(engine) as session:
+        yield session
+
+
+def _user(session: Session, email: str) -> User:
+    user = User(email=email, hashed_password=get_password_hash("password"), full_name="Stats")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _intake(user_id: int, n: int, **kwargs) -> ClientIntake:
+    fields = dict(
+        intake_id=f"int_{user_id}_{n}",
+        user_id=user_id,
+        client_name="Client",
+        client_email="client@example.com",
+        matter_title="Matter",
+        matter_description="Description",
+        matter_type="litigation",
+        practice_area="contract",
+    )
+    fields.update(kwargs)
+    return ClientIntake(**fields)
+
+
+def test_intake_statistics_aggregates(session: Session):
+    """Intake counts are grouped per status and dimension for the user only"""
+    user = _user(session, "intake@example.com")
+    other = _user(session, "other@example.com")
+    session.add_all([
+        _intake(user.id, 1, status="pending", processing_time_seconds=2.0, conflict_check_passed=True),
+        _intake(user.id, 2, status="assigned", urgency="high", processing_time_seconds=4.0, conflict_check_passed=False),
+        _intake(user.id, 3, status="pending", matter_type="advisory", processing_time_seconds=0.0,
+                conflict_check_required=False),
+        _intake(other.id, 4, status="completed"),
+    ])
+    session.commit()
+
+    stats = StatisticsService(session, cache_ttl_seconds=0).get_intake_statistics(user.id)
+
+    assert stats.total_intakes == 3
+    assert stats.pending_intakes == 2
+    assert stats.assigned_intakes == 1
+    assert stats.completed_intakes == 0
+    assert stats.by_matter_type == {"litigation": 2, "advisory": 1}
+    assert stats.by_urgency == {"medium": 2, "high": 1}
+    assert stats.average_processing_time_seconds == 3.0
+    assert stats.conflict_checks_required == 2
+    assert stats.conflict_checks_passed == 1
+    assert stats.conflict_checks_failed == 1
+
+
+def test_conveyancing_statistics_scoped_to_user(session: Session):
+    """Searches and documents from other users' transactions are not counted"""
+    user = _user(session, "conv@example.com")
+    other = _user(session, "conv-other@example.com")
+    start = datetime(2024, 1, 1)
+
+    mine = ConveyancingTransaction(
+        transaction_id="cvt_1", user_id=user.id, transaction_type="purchase",
+        transaction_title="Plot 1", client_role="buyer",
+        purchase_price=Decimal("1000000"), status="completion",
+        instruction_date=start, completed_at=start + timedelta(days=30, hours=5)
+    )
+    active = ConveyancingTransaction(
+        transaction_id="cvt_2", user_id=user.id, transaction_type="sale",
+        transaction_title="Plot 2", client_role="seller",
+        purchase_price=Decimal("500000"), status="due_diligence"
+    )
+    theirs = ConveyancingTransaction(
+        transaction_id="cvt_3", user_id=other.id, transaction_type="sale",
+        transaction_title="Plot 3", client_role="seller"
+    )
+    session.add_all([mine, active, theirs])
+    session.commit()
+
+    session.add_all([
+        OfficialSearch(search_id="srh_1", transaction_id=active.id, search_type="official_search",
+                       search_name="Title", description="Title search", issuing_authority="Lands Registry",
+                       status="pending", has_issues=True),
+        OfficialSearch(search_id="srh_2", transaction_id=theirs.id, search_type="official_search",
+                       search_name="Title", description="Title search", issuing_authority="Lands Registry",
+                       status="pending"),
+        ConveyancingDocument(document_id="doc_1", transaction_id=active.id, document_type="sale_agreement",
+                             document_name="Agreement", generated_by=user.id, status="draft"),
+        ConveyancingDocument(document_id="doc_2", transaction_id=theirs.id, document_type="sale_agreement",
+                             document_name="Agreement", generated_by=user.id, status="draft"),
+    ])
+    session.commit()
+
+    stats = StatisticsService(session, cache_ttl_seconds=0).get_conveyancing_statistics(user.id)
+
+    assert stats.total_transactions == 2
+    assert stats.active_transactions == 1
+    assert stats.completed_transactions == 1
+    assert stats.by_transaction_type == {"purchase": 1, "sale": 1}
+    assert stats.total_property_value == Decimal("1500000")
+    assert stats.average_transaction_days == 30.0
+    assert stats.average_completion_rate == 50.0
+    assert stats.searches_pending == 1
+    assert stats.searches_with_issues == 1
+    assert stats.documents_pending_execution == 1
+
+
+def test_statistics_snapshot_cache(session: Session):
+    """Cached snapshots are reused until refreshed"""
+    user = _user(session, "cache@example.com")
+    service = StatisticsService(session, cache_ttl_seconds=60)
+
+    assert service.get_intake_statistics(user.id).total_intakes == 0
+
+    session.add(_intake(user.id, 1))
+    session.commit()
+
+    assert service.get_intake_statistics(user.id).total_intakes == 0
+    assert service.get_intake_statistics(user.id, use_cache=False).total_intakes == 1
+
+
+def test_intake_update_invalidates_snapshot(session: Session):
+    """Writing through the intake API drops the writer's cached snapshot only"""
+    user = _user(session, "writer@example.com")
+    other = _user(session, "bystander@example.com")
+    session.add_all([_intake(user.id, 1), _intake(other.id, 1)])
+    session.commit()
+    service = StatisticsService(session, cache_ttl_seconds=60)
+
+    assert service.get_intake_statistics(user.id).pending_intakes == 1
+    assert service.get_intake_statistics(other.id).pending_intakes == 1
+
+    asyncio.run(update_intake(f"int_{user.id}_1", ClientIntakeUpdate(status="assigned"), user, session))
+    bystander = session.exec(select(ClientIntake).where(ClientIntake.user_id == other.id)).one()
+    bystander.status = "assigned"
+    session.commit()
+
+    assert service.get_intake_statistics(user.id).pending_intakes == 0
+    assert service.get_intake_statistics(other.id).pending_intakes == 1
@@ -0,0 +1,90 @@
+"""
+Contract Text Store Tests
+"""
+import pytest
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.contract import Contract, ContractAnalysis, ContractText
+from app.models.user import User
+from app.services.text_store import ContractTextStore, compress_text, decompress_text
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="contract")
+def contract_fixture(session: Session):
+    user = User(email="text@example.com", hashed_password=get_password_hash("password"), full_name="Text")
+    session.add(user)
+    session.commit()
+    contract = Contract(contract_id="ctr_text", user_id=user.id, filename="long.pdf",
+                        file_size_bytes=1, file_type="pdf", s3_key="k")
+    session.add(contract)
+    session.commit()
+    return contract
+
+
+def _long_contract(pages: int) -> str:
+    return "\n\f\n".join(
+        f"{n}. CLAUSE {n}\n" + f"Obligations of the parties on page {n}. " * 150 for n in range(1, pages + 1)
+    )
+
+
+def test_compression_round_trip():
+    text = "Café – clause 4.1 " * 500
+    codec, data = compress_text(text, "zlib")
+
+    assert codec == "zlib"
+    assert len(data) < len(text.encode("utf-8")) / 10
+    assert decompress_text(codec, data) == text
+
+
+def test_full_text_stored_without_truncation(session: Session, contract: Contract, monkeypatch):
+    monkeypatch.setattr(settings, "CONTRACT_TEXT_PAGES_PER_SEGMENT", 4)
+    text = _long_contract(25)
+    assert len(text) > 50000
+
+    store = ContractTextStore(session)
+    store.save(contract.id, text)
+    session.commit()
+
+    segments = session.exec(select(ContractText).order_by(ContractText.segment)).all()
+    assert [(s.first_page, s.page_count) for s in segments] == [(1, 4), (5, 4), (9, 4), (13, 4), (17, 4), (21, 4), (25, 1)]
+    assert sum(len(s.content) for s in segments) < len(text) / 5
+    assert store.load(contract.id) == text
+
+    pages = text.split("\f")
+    assert store.load_pages(contract.id, 6, 9) == "\f".join(pages[5:9])
+    start = text.index("7. CLAUSE 7")
+    assert store.load_range(contract.id, start, start + 100) == text[start:start + 100]
+    assert store.load_range(contract.id, 0, len(text)) == text
+
+    # Saving again replaces the stored text
+    store.save(contract.id, "1. Short")
+    session.commit()
+    assert store.load(contract.id) == "1. Short"
+
+
+def test_legacy_inline_text_fallback(session: Session, contract: Contract):
+    analysis = ContractAnalysis(contract_id=contract.id, executive_summary=[], parties=[],
+                                detected_clauses=[], missing_clauses=[], extracted_text="Legacy text")
+    store = ContractTextStore(session)
+
+    assert store.load(contract.id) is None
+    assert store.text_for(analysis) == "Legacy text"
+
+    store.save(contract.id, "Full text")
+    session.commit()
+    assert store.text_for(analysis) == "Full text"
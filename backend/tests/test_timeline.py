@@ -0,0 +1,342 @@
+"""
+Matter Timeline Tests
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, SQLModel, select
+from sqlmodel.pool import StaticPool
+
+from app.models.user import User
+from app.models.timeline import MatterEventParty, MatterDocumentText, TimelineBatch, TimelineBatchItem
+from app.core.security import get_password_hash
+from app.services.timeline_batch import TimelineBatchIngestor, batch_progress, delete_spooled_files, stale_batches
+from app.services.timeline_builder import TimelineBuilder
+from app.services.timeline_service import TimelineService, document_to_dict
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="user")
+def user_fixture(session: Session):
+    user = User(email="timeline@example.com", hashed_password=get_password_hash("password"), full_name="Timeline")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _extraction(doc_id: str, filename: str, events: list, is_hot: bool = False) -> dict:
+    return {
+        "doc_id": doc_id,
+        "filename": filename,
+        "doc_type": "Email",
+        "doc_date": events[0]["date"] if events else None,
+        "importance": "high" if is_hot else "medium",
+        "is_hot_doc": is_hot,
+        "hot_doc_reason": "Key admission" if is_hot else "",
+        "summary": f"Summary of {filename}",
+        "events": events
+    }
+
+
+def _event(date: str, description: str, parties: list = None) -> dict:
+    return {
+        "date": date,
+        "date_precision": "exact",
+        "event_type": "communication",
+        "description": description,
+        "parties_involved": parties or [],
+        "significance": "medium",
+        "quote": None
+    }
+
+
+def test_documents_and_events_persist(session: Session, user: User):
+    """Documents, text and events are stored and read back in date order"""
+    service = TimelineService(session)
+    matter = service.create_matter(user.id, "Acme v Widget")
+
+    service.add_document(matter, _extraction("doc_1", "notice.pdf", [
+        _event("2024-03-01", "Termination notice sent", ["Acme", "Widget"]),
+        _event("2024-01-15", "Contract signed", ["Acme"]),
+    ]), "Full notice text", page_count=2, word_count=300)
+    service.add_document(matter, _extraction("doc_2", "email.eml", [
+        _event("2024-02-10", "Payment missed", ["Widget"]),
+    ], is_hot=True), "Email text", page_count=1, word_count=100)
+
+    matter = service.get_matter(matter.matter_id)
+    assert (matter.document_count, matter.event_count, matter.hot_docs_count) == (2, 3, 1)
+
+    events = service.list_events(matter.matter_id)
+    assert [e.description for e in events] == ["Contract signed", "Payment missed", "Termination notice sent"]
+    assert events[1].source_is_hot is True
+
+    assert service.get_document_text("doc_1") == "Full notice text"
+    parties = session.exec(select(MatterEventParty.party).where(MatterEventParty.event_id == events[2].id)).all()
+    assert sorted(parties) == ["Acme", "Widget"]
+
+
+def test_delete_document_updates_aggregates(session: Session, user: User):
+    """Deleting a document removes its events and text"""
+    service = TimelineService(session)
+    matter = service.create_matter(user.id, "Matter")
+    service.add_document(matter, _extraction("doc_1", "a.pdf", [_event("2024-01-01", "A", ["X"])], is_hot=True),
+                         "text", page_count=1, word_count=10)
+
+    service.delete_document(matter, service.get_document(matter.matter_id, "doc_1"))
+
+    matter = service.get_matter(matter.matter_id)
+    assert (matter.document_count, matter.event_count, matter.hot_docs_count) == (0, 0, 0)
+    assert service.list_events(matter.matter_id) == []
+    assert session.exec(select(MatterDocumentText)).all() == []
+
+    service.delete_matter(matter)
+    assert service.get_matter(matter.matter_id) is None
+
+
+def test_timeline_assembled_from_stored_events(session: Session, user: User):
+    """Timelines are read a page of dates at a time from the events table, plus SQL aggregates"""
+    service = TimelineService(session)
+    matter = service.create_matter(user.id, "Matter")
+    service.add_document(matter, _extraction("doc_1", "a.pdf", [
+        _event("2024-03-01", "Notice", ["Acme"]),
+        _event("2024-01-15", "Signed", ["Acme", "Widget"]),
+    ]), "text", page_count=1, word_count=10)
+    service.add_document(matter, _extraction("doc_2", "b.pdf", [
+        _event("2024-01-15", "Countersigned", ["Widget"]),
+        _event("2024-02-10", "Missed payment", ["Widget"]),
+        _event("", "Undated call", ["Acme"]),
+    ], is_hot=True), "text", page_count=1, word_count=10)
+
+    entries = service.timeline_entries(matter.matter_id)
+    assert [e["date"] for e in entries] == ["Unknown", "2024-01-15", "2024-02-10", "2024-03-01"]
+    assert entries[1]["source_docs"] == ["doc_1", "doc_2"]
+    assert entries[1]["has_hot_doc"] is True
+    assert [e["date"] for e in service.timeline_entries(matter.matter_id, offset=1, limit=2)] == [
+        "2024-01-15", "2024-02-10"
+    ]
+    overview = service.timeline_overview(matter.matter_id)
+    assert overview["party_counts"] == {"Acme": 3, "Widget": 3}
+    assert (overview["first_date"], overview["last_date"]) == (date(2024, 1, 15), date(2024, 3, 1))
+    assert (overview["total_events"], overview["total_dates"]) == (5, 4)
+
+    # Assembled as the timeline endpoint does
+    documents = [document_to_dict(d, []) for d in service.list_documents(matter.matter_id)]
+    assembled = TimelineBuilder().assemble_timeline(entries, overview, documents)
+    assert [e["description"] for e in assembled["timeline"][1]["events"]] == ["Signed", "Countersigned"]
+    assert [d["doc_id"] for d in assembled["hot_docs"]] == ["doc_2"]
+    assert sorted(assembled["key_parties"]) == ["Acme", "Widget"]
+    assert assembled["date_range"] == {"start": "2024-01-15T00:00:00", "end": "2024-03-01T00:00:00"}
+    assert assembled["statistics"] == {
+        "total_events": 5, "total_documents": 2, "hot_docs_count": 1, "date_range_days": 46, "total_dates": 4
+    }
+
+    service.delete_document(matter, service.get_document(matter.matter_id, "doc_2"))
+    entries = service.timeline_entries(matter.matter_id)
+    assert [e["date"] for e in entries] == ["2024-01-15", "2024-03-01"]
+    assert entries[0]["has_hot_doc"] is False
+    assert service.timeline_overview(matter.matter_id)["party_counts"] == {"Acme": 2, "Widget": 1}
+
+
+def test_summary_key_tracks_timeline_content():
+    """The cached summary is invalidated only when summarized events change"""
+    entry = {"date": "2024-01-01", "events": [_event("2024-01-01", "Signed")]}
+    key = TimelineBuilder.summary_key({"timeline": [entry]})
+    assert key == TimelineBuilder.summary_key({"timeline": [dict(entry, source_docs=["doc_1"])]})
+
+    breached = {"date": "2024-02-01", "events": [_event("2024-02-01", "Breached")]}
+    assert TimelineBuilder.summary_key({"timeline": [entry, breached]}) != key
+    assert TimelineBuilder.summary_key({"timeline": []}) is None
+
+
+def test_search_index(session: Session, user: User):
+    """Search uses the inverted index: AND terms, phrases, facets and ranking"""
+    service = TimelineService(session)
+    matter = service.create_matter(user.id, "Matter")
+    service.add_document(matter, _extraction("doc_1", "notice.pdf", [
+        _event("2024-01-15", "Notice of breach sent to Widget", ["Acme Corp", "Widget Ltd"]),
+        _event("2024-03-01", "Breach notice withdrawn", ["Acme Corp"]),
+    ]), "text", page_count=1, word_count=10)
+    service.add_document(matter, _extraction("doc_2", "email.eml", [
+        _event("2024-02-10", "Widget admits breach", ["Widget Ltd"]),
+    ], is_hot=True), "text", page_count=1, word_count=10)
+    matter = service.get_matter(matter.matter_id)
+
+    found = service.search(matter, "breach")
+    assert [r["description"] for r in found["results"]][0] == "Widget admits breach"  # Hot doc ranks first
+    assert len(found["results"]) == 3
+    assert found["facets"]["parties"] == {"Acme Corp": 2, "Widget Ltd": 2}
+
+    assert [r["description"] for r in service.search(matter, "breach widg")["results"]] == [
+        "Widget admits breach", "Notice of breach sent to Widget"
+    ]
+    assert [r["description"] for r in service.search(matter, '"breach notice"')["results"]] == [
+        "Breach notice withdrawn"
+    ]
+    assert service.search(matter, '"corp widget"')["results"] == []  # Phrases don't span parties
+    # A loose term's prefix hits ("notices") don't complete a phrase ("breach notice")
+    service.add_document(matter, _extraction("doc_3", "letter.pdf", [
+        _event("2024-04-01", "Breach notices filed", ["Acme Corp"]),
+    ]), "text", page_count=1, word_count=3)
+    assert [r["description"] for r in service.search(matter, 'notice "breach notice"')["results"]] == [
+        "Breach notice withdrawn"
+    ]
+    service.delete_document(matter, service.get_document(matter.matter_id, "doc_3"))
+
+    filtered = service.search(matter, "breach", party="Acme Corp", date_to=date(2024, 2, 1))
+    assert [r["description"] for r in filtered["results"]] == ["Notice of breach sent to Widget"]
+
+    assert [r["type"] for r in service.search(matter, "email")["results"]] == ["document"]
+
+    service.delete_document(matter, service.get_document(matter.matter_id, "doc_2"))
+    assert len(service.search(service.get_matter(matter.matter_id), "breach")["results"]) == 2
+
+
+class _MemoryStorage:
+    def __init__(self, files: dict):
+        self.files = dict(files)
+
+    def download_file(self, key):
+        return self.files.get(key)
+
+    def delete_file(self, key):
+        self.files.pop(key, None)
+        return True
+
+
+class _StubBuilder:
+    def extract_events_from_document(self, text: str, filename: str, doc_id: str) -> dict:
+        return {**_extraction(doc_id, filename, [_event("2024-01-01", text[:20])]), "doc_id": doc_id}
+
+
+def test_batch_ingestion(session: Session, user: User):
+    """A spooled batch is processed in the background with per-document status"""
+    service = TimelineService(session)
+    matter = service.create_matter(user.id, "Matter")
+
+    batch = TimelineBatch(batch_id="bat_test", matter_id=matter.matter_id, user_id=user.id, total_documents=3)
+    session.add(batch)
+    storage = _MemoryStorage({
+        "spool/0.txt": b"Letter of claim sent to the defendant on 1 January 2024 " * 2,
+        "spool/1.txt": b"too short",
+    })
+    for position, key in enumerate(["spool/0.txt", "spool/1.txt", "spool/missing.txt"]):
+        session.add(TimelineBatchItem(
+            batch_id="bat_test", position=position, filename=f"{position}.txt", file_type="txt", spool_key=key
+        ))
+    session.commit()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        TimelineBatchIngestor(session, storage=storage, builder=_StubBuilder()).run("bat_test", extraction_pool=pool)
+
+    session.refresh(batch)
+    items = session.exec(select(TimelineBatchItem).order_by(TimelineBatchItem.position)).all()
+    progress = batch_progress(batch, items)
+
+    assert (progress["status"], progress["processed_documents"], progress["failed_documents"]) == ("completed", 1, 2)
+    assert progress["progress"] == 100
+    assert [d["status"] for d in progress["documents"]] == ["completed", "failed", "failed"]
+    assert "sufficient text" in progress["documents"][1]["error"]
+    assert service.get_matter(matter.matter_id).document_count == 1
+    assert service.get_document(matter.matter_id, items[0].doc_id).event_count == 1
+    assert storage.files == {}
+    assert all(item.spool_key is None for item in items)
+
+
+def test_delete_matter_after_batch_upload():
+    """Batches, their items and spooled files go with the matter (foreign keys enforced)"""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    event.listen(engine, "connect", lambda connection, _: connection.execute("PRAGMA foreign_keys=ON"))
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = User(email="fk@example.com", hashed_password=get_password_hash("password"), full_name="FK")
+        session.add(user)
+        session.commit()
+        service = TimelineService(session)
+        matter = service.create_matter(user.id, "Matter")
+        session.add(TimelineBatch(batch_id="bat_fk", matter_id=matter.matter_id, user_id=user.id, total_documents=2))
+        session.add(TimelineBatchItem(batch_id="bat_fk", position=0, filename="0.txt", file_type="txt",
+                                      spool_key="spool/0.txt"))
+        session.add(TimelineBatchItem(batch_id="bat_fk", position=1, filename="1.txt", file_type="txt",
+                                      spool_key="spool/1.txt"))
+        session.commit()
+
+        storage = _MemoryStorage({
+            "spool/0.txt": b"Letter of claim sent to the defendant on 1 January 2024 " * 2,
+            "spool/1.txt": b"Defence filed by the defendant on 1 February 2024 " * 2,
+            "other/keep.txt": b"unrelated",
+        })
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            TimelineBatchIngestor(session, storage=storage, builder=_StubBuilder()).run("bat_fk", extraction_pool=pool)
+        storage.files["spool/1.txt"] = b"left behind"
+        session.exec(select(TimelineBatchItem).where(TimelineBatchItem.position == 1)).one().spool_key = "spool/1.txt"
+        session.commit()
+
+        spool_keys = service.delete_matter(service.get_matter(matter.matter_id))
+        delete_spooled_files(storage, spool_keys)
+
+        assert spool_keys == ["spool/1.txt"]
+        assert storage.files == {"other/keep.txt": b"unrelated"}
+        assert session.exec(select(TimelineBatch)).all() == []
+        assert session.exec(select(TimelineBatchItem)).all() == []
+        assert service.get_matter(matter.matter_id) is None
+
+
+def test_batch_files_left_in_flight_are_retried(session: Session, user: User):
+    """Files a lost worker left extracting are picked up again once stale"""
+    matter = TimelineService(session).create_matter(user.id, "Matter")
+    session.add(TimelineBatch(batch_id="bat_lost", matter_id=matter.matter_id, user_id=user.id,
+                              total_documents=2, status="processing"))
+    session.add(TimelineBatchItem(batch_id="bat_lost", position=0, filename="0.txt", file_type="txt",
+                                  spool_key="spool/0.txt", status="extracting",
+                                  updated_at=datetime.utcnow() - timedelta(hours=1)))
+    session.add(TimelineBatchItem(batch_id="bat_lost", position=1, filename="1.txt", file_type="txt",
+                                  spool_key="spool/1.txt", status="extracting"))
+    session.commit()
+
+    assert stale_batches(session) == ["bat_lost"]
+
+    storage = _MemoryStorage({"spool/0.txt": b"Letter of claim sent to the defendant on 1 January 2024 " * 2})
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        TimelineBatchIngestor(session, storage=storage, builder=_StubBuilder()).run("bat_lost", extraction_pool=pool)
+
+    items = session.exec(select(TimelineBatchItem).order_by(TimelineBatchItem.position)).all()
+    assert [item.status for item in items] == ["completed", "extracting"]  # The recent one is still in flight
+    assert stale_batches(session) == []
+
+
+def test_batch_progress_stream(session: Session, user: User):
+    """The progress stream polls with its own sessions and closes when the batch completes"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.api.dependencies import get_current_user
+    from app.core.database import get_session
+
+    matter = TimelineService(session).create_matter(user.id, "Matter")
+    session.add(TimelineBatch(batch_id="bat_done", matter_id=matter.matter_id, user_id=user.id,
+                              total_documents=1, processed_documents=1, status="completed"))
+    session.add(TimelineBatchItem(batch_id="bat_done", filename="0.txt", file_type="txt", status="completed"))
+    session.commit()
+
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        body = TestClient(app).get("/api/v1/timeline/batches/bat_done/events").text
+    finally:
+        app.dependency_overrides.clear()
+
+    assert body.startswith('event: document\ndata: {"filename": "0.txt", "status": "completed"')
+    assert 'event: close\ndata: {"batch_id": "bat_done"' in body